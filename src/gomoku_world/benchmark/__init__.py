@@ -0,0 +1,58 @@
+"""
+Benchmark package for Gomoku World
+五子棋世界基准测试包
+"""
+
+from .corpus import BenchmarkPosition, CORPUS, get_positions, parse_moves, format_moves
+from .ai import (
+    STRATEGIES, Regression, run_ai_benchmark, benchmark_strategy, benchmark_evaluator,
+    compare, save_results, load_results, format_results
+)
+from .perft import (
+    BACKENDS, PerftBackend, PerftResult, perft, run_perft, cross_check, format_perft
+)
+from .tournament import (
+    ROUND_ROBIN, GAUNTLET, EngineConfig, GameRecord, Standing, TournamentResult,
+    parse_engine, play_game, schedule, elo_estimate, standings, save_games, run_tournament
+)
+from .puzzles import generate_puzzles, save_puzzles, load_puzzles
+
+__all__ = [
+    'BenchmarkPosition',
+    'CORPUS',
+    'get_positions',
+    'parse_moves',
+    'format_moves',
+    'STRATEGIES',
+    'Regression',
+    'run_ai_benchmark',
+    'benchmark_strategy',
+    'benchmark_evaluator',
+    'compare',
+    'save_results',
+    'load_results',
+    'format_results',
+    'BACKENDS',
+    'PerftBackend',
+    'PerftResult',
+    'perft',
+    'run_perft',
+    'cross_check',
+    'format_perft',
+    'ROUND_ROBIN',
+    'GAUNTLET',
+    'EngineConfig',
+    'GameRecord',
+    'Standing',
+    'TournamentResult',
+    'parse_engine',
+    'play_game',
+    'schedule',
+    'elo_estimate',
+    'standings',
+    'save_games',
+    'run_tournament',
+    'generate_puzzles',
+    'save_puzzles',
+    'load_puzzles'
+]
@@ -0,0 +1,320 @@
+"""
+AI benchmark suite
+AI基准测试套件
+
+Every strategy of ``core/ai`` plays the corpus positions with a fixed
+random seed, so node counts and chosen moves repeat from run to run and
+only the timings vary. Plain positions give nodes per second and, for
+depth-limited strategies, the time to complete each depth; puzzles give
+the solve rate. Results are plain JSON and can be compared against a
+stored baseline, where throughput may drop by a relative tolerance and
+the solve rate may not drop at all.
+
+``core/ai``中的每个策略使用固定随机种子下完局面库中的局面，因此节点数和
+选择的着法每次相同，只有耗时会变化。普通局面用于测量每秒节点数，以及深度
+受限策略完成每个深度的时间；谜题用于测量解题率。结果为纯JSON，可与保存的
+基线比较：吞吐量允许按相对容差下降，解题率则不允许下降。
+"""
+
+import json
+import os
+import platform
+import random
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from .corpus import BenchmarkPosition, get_positions
+from ..core.ai.evaluation import PositionEvaluator
+from ..core.ai.info import SearchInfo
+from ..core.ai.strategies import MinMaxStrategy, MCTSStrategy
+from ..core.ai.strategy import AIStrategy
+from ..core.board import Board
+from ..utils.logger import get_logger
+from .._version import __version__
+from ..config import (
+    BENCHMARK_DEPTH, BENCHMARK_SIMULATIONS, BENCHMARK_SEED, BENCHMARK_TOLERANCE
+)
+
+logger = get_logger(__name__)
+
+STRATEGIES = ("minmax", "mcts", "priority")
+# Strategies whose search is bounded by depth / 按深度限定搜索的策略
+DEPTH_STRATEGIES = ("minmax",)
+
+Searcher = Callable[[Board, int, int], SearchInfo]
+
+
+def _search_minmax(depth: int, simulations: int) -> Searcher:
+    strategy = MinMaxStrategy()
+
+    def search(board: Board, player: int, search_depth: int) -> SearchInfo:
+        strategy.get_move(board, player, search_depth)
+        return strategy.info
+    return search
+
+
+def _search_mcts(depth: int, simulations: int) -> Searcher:
+    strategy = MCTSStrategy(simulation_limit=simulations)
+
+    def search(board: Board, player: int, search_depth: int) -> SearchInfo:
+        strategy.get_move(board, player)
+        return strategy.info
+    return search
+
+
+def _search_priority(depth: int, simulations: int) -> Searcher:
+    def search(board: Board, player: int, search_depth: int) -> SearchInfo:
+        # A new instance per move, the strategy caches its moves by position
+        strategy = AIStrategy("hard")
+        strategy.get_move(board, player)
+        return strategy.info
+    return search
+
+
+_SEARCHERS: Dict[str, Callable[[int, int], Searcher]] = {
+    'minmax': _search_minmax,
+    'mcts': _search_mcts,
+    'priority': _search_priority,
+}
+
+
+@dataclass
+class Regression:
+    """A metric that got worse than the baseline"""
+    metric: str
+    baseline: float
+    current: float
+
+    def __str__(self) -> str:
+        return f"{self.metric}: {self.current:.4g} (baseline {self.baseline:.4g})"
+
+
+def _timed_search(search: Searcher, position: BenchmarkPosition, depth: int,
+                  seed: int, rounds: int) -> SearchInfo:
+    """Search a position several times and keep the fastest run"""
+    best = None
+    for _ in range(rounds):
+        random.seed(seed)
+        info = search(position.board(), position.player, depth)
+        if best is None or info.time < best.time:
+            best = info
+    return best
+
+
+def benchmark_evaluator(positions: Sequence[BenchmarkPosition],
+                        repeats: int = 20) -> Dict[str, float]:
+    """
+    Measure evaluator throughput
+
+    Args:
+        positions: Positions to evaluate
+        repeats: Evaluations of each position for both players
+
+    Returns:
+        Dict[str, float]: Number of evaluations, seconds and evaluations per second
+    """
+    evaluator = PositionEvaluator()
+    boards = [position.board().board for position in positions]
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for board in boards:
+            evaluator.evaluate(board, 1)
+            evaluator.evaluate(board, 2)
+    seconds = time.perf_counter() - start
+    evals = repeats * len(boards) * 2
+    return {
+        'evals': evals,
+        'seconds': seconds,
+        'evals_per_second': evals / seconds if seconds > 0 else 0.0
+    }
+
+
+def benchmark_strategy(name: str, positions: Sequence[BenchmarkPosition],
+                       depth: int = BENCHMARK_DEPTH,
+                       simulations: int = BENCHMARK_SIMULATIONS,
+                       seed: int = BENCHMARK_SEED, rounds: int = 1) -> Dict[str, Any]:
+    """
+    Benchmark one strategy
+
+    Args:
+        name: Strategy name, one of ``STRATEGIES``
+        positions: Corpus positions; plain ones are timed, puzzles are solved
+        depth: Search depth of depth-limited strategies
+        simulations: MCTS simulations per move
+        seed: Random seed set before every move
+        rounds: Runs per timed position, the fastest one counts
+
+    Returns:
+        Dict[str, Any]: Nodes, time, nodes per second, time per depth and
+                        solve rate
+    """
+    search = _SEARCHERS[name](depth, simulations)
+    plain = [position for position in positions if not position.is_puzzle]
+    puzzles = [position for position in positions if position.is_puzzle]
+
+    time_to_depth = {}
+    depths = range(1, depth + 1) if name in DEPTH_STRATEGIES else [depth]
+    nodes, seconds = 0, 0.0
+    for search_depth in depths:
+        infos = [_timed_search(search, position, search_depth, seed, rounds)
+                 for position in plain]
+        if infos and name in DEPTH_STRATEGIES:
+            time_to_depth[str(search_depth)] = sum(info.time for info in infos) / len(infos)
+        nodes = sum(info.nodes for info in infos)
+        seconds = sum(info.time for info in infos)
+
+    failed = []
+    for position in puzzles:
+        random.seed(seed)
+        info = search(position.board(), position.player, depth)
+        if not position.is_solved_by(info.move):
+            failed.append(position.name)
+
+    result = {
+        'nodes': nodes,
+        'time': seconds,
+        'nps': nodes / seconds if seconds > 0 else 0.0,
+        'time_to_depth': time_to_depth,
+        'puzzles': len(puzzles),
+        'solved': len(puzzles) - len(failed),
+        'solve_rate': (len(puzzles) - len(failed)) / len(puzzles) if puzzles else 0.0,
+        'failed': failed
+    }
+    logger.info(f"Benchmarked {name}: {result['nps']:.0f} nodes/s, "
+                f"{result['solved']}/{result['puzzles']} puzzles solved")
+    return result
+
+
+def run_ai_benchmark(strategies: Sequence[str] = STRATEGIES,
+                     positions: Optional[List[str]] = None,
+                     depth: int = BENCHMARK_DEPTH,
+                     simulations: int = BENCHMARK_SIMULATIONS,
+                     seed: int = BENCHMARK_SEED, rounds: int = 1) -> Dict[str, Any]:
+    """
+    Run the AI benchmark suite
+
+    Args:
+        strategies: Strategies to benchmark
+        positions: Corpus position names, all if None
+        depth: Search depth of depth-limited strategies
+        simulations: MCTS simulations per move
+        seed: Random seed set before every move
+        rounds: Runs per timed position, the fastest one counts
+
+    Returns:
+        Dict[str, Any]: JSON-serializable results
+
+    Raises:
+        ValueError: If a strategy is unknown
+        KeyError: If a position is not in the corpus
+    """
+    unknown = [name for name in strategies if name not in _SEARCHERS]
+    if unknown:
+        raise ValueError(f"Unknown strategies: {', '.join(unknown)}")
+    selected = get_positions(positions)
+
+    return {
+        'meta': {
+            'version': __version__,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'time': time.time()
+        },
+        'settings': {
+            'positions': [position.name for position in selected],
+            'depth': depth,
+            'simulations': simulations,
+            'seed': seed
+        },
+        'evaluator': benchmark_evaluator(selected),
+        'strategies': {
+            name: benchmark_strategy(name, selected, depth, simulations, seed, rounds)
+            for name in strategies
+        }
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = BENCHMARK_TOLERANCE) -> List[Regression]:
+    """
+    Compare results against a baseline
+
+    Throughput may drop and time to depth may grow by ``tolerance``
+    (relative); the solve rate may not drop. Metrics missing on either
+    side are skipped.
+
+    Args:
+        results: Results of ``run_ai_benchmark``
+        baseline: Earlier results
+        tolerance: Allowed relative slowdown
+
+    Returns:
+        List[Regression]: Metrics worse than the baseline
+
+    Raises:
+        ValueError: If the runs used different settings
+    """
+    if results.get('settings') != baseline.get('settings'):
+        raise ValueError("Benchmark settings differ from the baseline")
+
+    regressions = []
+
+    def check(metric: str, current: Optional[float], base: Optional[float],
+              higher_is_better: bool, allowed: float):
+        if current is None or base is None:
+            return
+        if higher_is_better:
+            worse = current < base * (1 - allowed)
+        else:
+            worse = current > base * (1 + allowed)
+        if worse:
+            regressions.append(Regression(metric, base, current))
+
+    check('evaluator.evals_per_second',
+          results.get('evaluator', {}).get('evals_per_second'),
+          baseline.get('evaluator', {}).get('evals_per_second'), True, tolerance)
+
+    for name, current in results.get('strategies', {}).items():
+        base = baseline.get('strategies', {}).get(name)
+        if base is None:
+            continue
+        check(f"{name}.nps", current['nps'], base['nps'], True, tolerance)
+        check(f"{name}.solve_rate", current['solve_rate'], base['solve_rate'], True, 0.0)
+        for depth, seconds in current['time_to_depth'].items():
+            check(f"{name}.time_to_depth.{depth}", seconds,
+                  base['time_to_depth'].get(depth), False, tolerance)
+    return regressions
+
+
+def save_results(results: Dict[str, Any], path: Union[str, Path]):
+    """Write results as JSON, creating the directory if needed"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def load_results(path: Union[str, Path]) -> Dict[str, Any]:
+    """Read results written by ``save_results``"""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def format_results(results: Dict[str, Any]) -> str:
+    """Format results as a text table"""
+    evaluator = results['evaluator']
+    lines = [
+        f"Evaluator: {evaluator['evals_per_second']:.0f} evals/s ({evaluator['evals']} evals)",
+        "",
+        f"{'strategy':<10} {'nodes':>10} {'nodes/s':>10} {'solved':>8}  time to depth",
+    ]
+    for name, result in results['strategies'].items():
+        depths = "  ".join(f"d{depth} {seconds:.3f}s"
+                           for depth, seconds in result['time_to_depth'].items())
+        lines.append(f"{name:<10} {result['nodes']:>10} {result['nps']:>10.0f} "
+                     f"{result['solved']:>3}/{result['puzzles']:<4}  {depths or '-'}")
+    return "\n".join(lines)
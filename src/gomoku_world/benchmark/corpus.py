@@ -0,0 +1,135 @@
+"""
+Benchmark position corpus
+基准测试局面库
+
+Positions are stored as move strings in the notation of
+``AIUtils.get_move_notation`` ("H8" is column H, row 8), black moving
+first, so the side to move follows from the number of moves. Puzzles
+list every move that solves them: completing a five, blocking the
+opponent's only winning cell, making a double threat, or starting a
+forced win found by the puzzle generator.
+
+局面以``AIUtils.get_move_notation``记法的着法字符串保存（"H8"表示H列第8行），
+黑方先行，因此轮到哪一方由着法数决定。谜题列出所有正解：连成五子、
+封堵对手唯一的胜点、形成双重威胁，或开始谜题生成器找到的强制胜利。
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from ..core.ai.utils import AIUtils
+from ..core.board import Board
+
+Move = Tuple[int, int]
+
+
+def parse_moves(moves: str) -> List[Move]:
+    """
+    Parse a move string
+
+    Args:
+        moves: Space separated moves, e.g. "H8 I9 G7"
+
+    Returns:
+        List[Tuple[int, int]]: Row and column of each move
+    """
+    return [AIUtils.get_move_coordinates(move) for move in moves.split()]
+
+
+def format_moves(moves: List[Move]) -> str:
+    """Format moves as a move string"""
+    return " ".join(AIUtils.get_move_notation(row, col) for row, col in moves)
+
+
+@dataclass(frozen=True)
+class BenchmarkPosition:
+    """
+    A position of the benchmark corpus
+    基准测试局面
+    """
+    name: str
+    moves: str
+    solutions: str = ""  # Moves solving a puzzle, empty for plain positions
+    kind: str = "midgame"  # "midgame", "win", "defend", "double_threat" or "forced_win"
+    size: int = 15
+
+    @property
+    def player(self) -> int:
+        """Player to move"""
+        return 1 if len(self.moves.split()) % 2 == 0 else 2
+
+    @property
+    def is_puzzle(self) -> bool:
+        """Whether the position has known solutions"""
+        return bool(self.solutions)
+
+    def solution_moves(self) -> List[Move]:
+        """Coordinates of the solutions"""
+        return parse_moves(self.solutions)
+
+    def board(self) -> Board:
+        """Set up a fresh board with the position"""
+        board = Board(self.size)
+        for i, (row, col) in enumerate(parse_moves(self.moves)):
+            board.place_piece(row, col, 1 if i % 2 == 0 else 2)
+        return board
+
+    def is_solved_by(self, move: Optional[Move]) -> bool:
+        """Check a move against the solutions"""
+        return move is not None and (int(move[0]), int(move[1])) in self.solution_moves()
+
+
+CORPUS: List[BenchmarkPosition] = [
+    # Opening and middle-game positions used for speed measurements
+    # 用于速度测量的开局和中局局面
+    BenchmarkPosition("opening_center", "H8 I9 G9 I8 I7 G7"),
+    BenchmarkPosition("midgame_cluster", "H8 H9 I9 G7 J10 K11 I7 I8 G8 J8 F9 E10"),
+    BenchmarkPosition("midgame_crossfire", "H8 I7 J8 I8 I9 G7 H7 H6 J9 J10 K8 L7 G9 F10"),
+    BenchmarkPosition("edge_fight", "B2 C3 D3 C4 C2 D2 E4 B3 A1 E3"),
+
+    # Tactical puzzles / 战术谜题
+    BenchmarkPosition("open_four_row", "H8 H10 I8 I10 J8 J10 K8 K11",
+                      "G8 L8", "win"),
+    BenchmarkPosition("split_four_row", "H8 A15 I8 C15 K8 E15 L8 G15",
+                      "J8", "win"),
+    BenchmarkPosition("open_four_diagonal", "E5 E6 F6 F7 G7 G8 H8 A12",
+                      "D4 I9", "win"),
+    BenchmarkPosition("white_four_column", "H8 J2 H10 J3 F12 J4 L12 J5 N2",
+                      "J1 J6", "win"),
+    BenchmarkPosition("win_before_block", "C3 B3 D3 H8 E3 I8 F3 J8 G8 K8",
+                      "G3", "win"),
+    BenchmarkPosition("block_diagonal_four", "G7 H8 A1 I9 A3 J10 A5 K11",
+                      "L12", "defend"),
+    BenchmarkPosition("block_anti_diagonal_four", "M3 L4 A1 K5 C1 J6 E1 I7",
+                      "H8", "defend"),
+    BenchmarkPosition("open_three_to_open_four", "G8 A1 H8 O1 I8 A15",
+                      "F8 J8", "double_threat"),
+]
+
+
+def get_positions(names: Optional[List[str]] = None,
+                  puzzles: Optional[bool] = None) -> List[BenchmarkPosition]:
+    """
+    Select positions from the corpus
+
+    Args:
+        names: Only these positions, all if None
+        puzzles: Only puzzles (True) or only plain positions (False)
+
+    Returns:
+        List[BenchmarkPosition]: Matching positions in corpus order
+
+    Raises:
+        KeyError: If a name is not in the corpus
+    """
+    if names is not None:
+        known = {position.name: position for position in CORPUS}
+        missing = [name for name in names if name not in known]
+        if missing:
+            raise KeyError(f"Unknown benchmark positions: {', '.join(missing)}")
+        positions = [known[name] for name in names]
+    else:
+        positions = list(CORPUS)
+    if puzzles is not None:
+        positions = [position for position in positions if position.is_puzzle == puzzles]
+    return positions
@@ -0,0 +1,297 @@
+"""
+Perft move-generation benchmark
+Perft着法生成基准测试
+
+Perft counts every legal move sequence of a given length from a
+position, the standard oracle for move generators. A move that wins ends
+its line, so leaves are sequences of full length, winning sequences and
+full boards. The same count is run on each board backend: the numpy
+``Board`` with ``Rules.check_win``, ``CompactBoard`` and the legacy
+list-of-lists ``gomoku_world.game.Game``. Counts must agree across
+backends, and moves made per second measure the raw speed of placing,
+clearing, listing empty cells and checking wins. Copy-make mode copies
+the board for every move instead of undoing it, to measure ``copy``.
+
+Perft统计从某一局面出发的所有给定长度的合法着法序列，是检验着法生成器的
+标准方法。获胜的着法会结束该分支，因此叶节点为满长度序列、获胜序列和满盘。
+同一统计在每种棋盘实现上运行：带``Rules.check_win``的numpy ``Board``、
+``CompactBoard``以及旧版列表棋盘``gomoku_world.game.Game``。各实现的结果必须
+一致，每秒着法数衡量落子、清除、列出空位和判断胜负的原始速度。复制模式为每步
+复制棋盘而不是撤销，用于测量``copy``。
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Type
+
+from .corpus import BenchmarkPosition, Move, get_positions, parse_moves
+from ..core.board import Board, CompactBoard
+from ..core.rules import Rules
+from ..game import Game
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PerftBackend:
+    """
+    Board operations used by perft
+    Perft使用的棋盘操作
+    """
+
+    name = ""
+
+    def moves(self) -> List[Move]:
+        """Empty cells"""
+        raise NotImplementedError
+
+    def play(self, row: int, col: int, player: int) -> bool:
+        """Place a stone and report whether it wins"""
+        raise NotImplementedError
+
+    def undo(self, row: int, col: int):
+        """Remove a stone"""
+        raise NotImplementedError
+
+    def copy(self) -> 'PerftBackend':
+        """Independent copy of the position"""
+        raise NotImplementedError
+
+    @classmethod
+    def from_position(cls, position: BenchmarkPosition) -> 'PerftBackend':
+        """Set up a backend with a corpus position"""
+        backend = cls(position.size)
+        for i, (row, col) in enumerate(parse_moves(position.moves)):
+            backend.play(row, col, 1 if i % 2 == 0 else 2)
+        return backend
+
+
+class BoardBackend(PerftBackend):
+    """numpy ``Board`` checked by ``Rules.check_win``"""
+
+    name = "board"
+
+    def __init__(self, size: int = 15):
+        self.board = Board(size)
+
+    def moves(self) -> List[Move]:
+        return self.board.get_empty_cells()
+
+    def play(self, row: int, col: int, player: int) -> bool:
+        self.board.place_piece(row, col, player)
+        return Rules.check_win(self.board, row, col)
+
+    def undo(self, row: int, col: int):
+        self.board.clear_cell(row, col)
+
+    def copy(self) -> 'BoardBackend':
+        backend = BoardBackend.__new__(BoardBackend)
+        backend.board = self.board.copy()
+        return backend
+
+
+class CompactBoardBackend(PerftBackend):
+    """Flat ``CompactBoard``"""
+
+    name = "compact"
+
+    def __init__(self, size: int = 15):
+        self.board = CompactBoard(size)
+
+    def moves(self) -> List[Move]:
+        return self.board.get_empty_cells()
+
+    def play(self, row: int, col: int, player: int) -> bool:
+        self.board.place_piece(row, col, player)
+        return self.board.check_win(row, col)
+
+    def undo(self, row: int, col: int):
+        self.board.clear_cell(row, col)
+
+    def copy(self) -> 'CompactBoardBackend':
+        backend = CompactBoardBackend.__new__(CompactBoardBackend)
+        backend.board = self.board.copy()
+        return backend
+
+
+class LegacyGameBackend(PerftBackend):
+    """List-of-lists board of the legacy ``gomoku_world.game.Game``"""
+
+    name = "legacy"
+
+    def __init__(self, size: int = 15):
+        self.game = Game(size)
+
+    def moves(self) -> List[Move]:
+        board = self.game.board
+        return [(row, col) for row, cells in enumerate(board)
+                for col, value in enumerate(cells) if not value]
+
+    def play(self, row: int, col: int, player: int) -> bool:
+        self.game.board[row][col] = player
+        return self.game.check_win(row, col)
+
+    def undo(self, row: int, col: int):
+        self.game.board[row][col] = 0
+
+    def copy(self) -> 'LegacyGameBackend':
+        backend = LegacyGameBackend.__new__(LegacyGameBackend)
+        backend.game = Game(self.game.board_size)
+        backend.game.board = [cells[:] for cells in self.game.board]
+        return backend
+
+
+BACKENDS: Dict[str, Type[PerftBackend]] = {
+    backend.name: backend for backend in (BoardBackend, CompactBoardBackend, LegacyGameBackend)
+}
+
+
+@dataclass
+class PerftResult:
+    """Counts and timing of one perft run"""
+    backend: str
+    position: str
+    depth: int
+    nodes: int  # Leaf sequences / 叶节点序列数
+    wins: int  # Sequences ending with a win / 以获胜结束的序列数
+    moves: int  # Stones placed / 落子次数
+    time: float
+    copy: bool = False
+
+    @property
+    def moves_per_second(self) -> float:
+        """Stones placed per second"""
+        return self.moves / self.time if self.time > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        return {
+            'backend': self.backend,
+            'position': self.position,
+            'depth': self.depth,
+            'nodes': self.nodes,
+            'wins': self.wins,
+            'moves': self.moves,
+            'time': self.time,
+            'copy': self.copy,
+            'moves_per_second': self.moves_per_second
+        }
+
+
+def perft(backend: PerftBackend, player: int, depth: int,
+          copy: bool = False) -> PerftResult:
+    """
+    Count the move sequences of a position
+
+    Args:
+        backend: Position to start from, restored afterwards
+        player: Player to move
+        depth: Sequence length
+        copy: Copy the board for every move instead of undoing it
+
+    Returns:
+        PerftResult: Leaf, win and move counts (position name left empty)
+    """
+    counts = [0, 0]  # wins, moves
+
+    def count(node: PerftBackend, player: int, depth: int) -> int:
+        if depth == 0:
+            return 1
+        moves = node.moves()
+        if not moves:
+            return 1
+        leaves = 0
+        opponent = 3 - player
+        for row, col in moves:
+            counts[1] += 1
+            child = node.copy() if copy else node
+            if child.play(row, col, player):
+                counts[0] += 1
+                leaves += 1
+            else:
+                leaves += count(child, opponent, depth - 1)
+            if not copy:
+                node.undo(row, col)
+        return leaves
+
+    start = time.perf_counter()
+    nodes = count(backend, player, depth)
+    elapsed = time.perf_counter() - start
+    return PerftResult(backend.name, "", depth, nodes, counts[0], counts[1], elapsed, copy)
+
+
+def run_perft(positions: Optional[List[str]] = None, depth: int = 2,
+              backends: Sequence[str] = tuple(BACKENDS), copy: bool = False
+              ) -> List[PerftResult]:
+    """
+    Run perft for every position on every backend
+
+    Args:
+        positions: Corpus position names, all if None
+        depth: Sequence length
+        backends: Backend names, see ``BACKENDS``
+        copy: Use copy-make instead of make/unmake
+
+    Returns:
+        List[PerftResult]: One result per position and backend
+
+    Raises:
+        ValueError: If a backend is unknown
+        KeyError: If a position is not in the corpus
+    """
+    unknown = [name for name in backends if name not in BACKENDS]
+    if unknown:
+        raise ValueError(f"Unknown perft backends: {', '.join(unknown)}")
+
+    results = []
+    for position in get_positions(positions):
+        for name in backends:
+            result = perft(BACKENDS[name].from_position(position), position.player, depth, copy)
+            result.position = position.name
+            results.append(result)
+            logger.info(f"Perft {position.name} depth {depth} on {name}: {result.nodes} nodes, "
+                        f"{result.moves_per_second:.0f} moves/s")
+    return results
+
+
+def cross_check(results: Sequence[PerftResult]) -> List[str]:
+    """
+    Compare counts between backends
+
+    Args:
+        results: Results of ``run_perft``
+
+    Returns:
+        List[str]: One message per position whose backends disagree
+    """
+    by_position: Dict[tuple, List[PerftResult]] = {}
+    for result in results:
+        by_position.setdefault((result.position, result.depth), []).append(result)
+
+    mismatches = []
+    for (position, depth), group in by_position.items():
+        counts = {(result.nodes, result.wins, result.moves) for result in group}
+        if len(counts) > 1:
+            detail = ", ".join(f"{result.backend}={result.nodes}/{result.wins}/{result.moves}"
+                               for result in group)
+            mismatches.append(f"{position} depth {depth}: {detail}")
+    return mismatches
+
+
+def format_perft(results: Sequence[PerftResult]) -> str:
+    """Format results as a text table"""
+    lines = [f"{'position':<26} {'backend':<8} {'depth':>5} {'nodes':>10} "
+             f"{'wins':>8} {'moves/s':>10}"]
+    for result in results:
+        lines.append(f"{result.position:<26} {result.backend:<8} {result.depth:>5} "
+                     f"{result.nodes:>10} {result.wins:>8} {result.moves_per_second:>10.0f}")
+
+    totals: Dict[str, List[float]] = {}
+    for result in results:
+        total = totals.setdefault(result.backend, [0, 0.0])
+        total[0] += result.moves
+        total[1] += result.time
+    lines.append("")
+    for backend, (moves, seconds) in totals.items():
+        lines.append(f"{backend:<8} {moves / seconds if seconds > 0 else 0.0:>10.0f} moves/s overall")
+    return "\n".join(lines)
@@ -0,0 +1,150 @@
+"""
+Offline tactical puzzle generator
+离线战术谜题生成器
+
+Puzzles are mined from self-play. After a few random opening moves
+near the centre, a depth-two MinMax with evaluation noise plays both
+sides; it takes forced moves at once and declines moves after which
+the proof-number search proves a win for the opponent, so games do not
+end on the first open three. Before every move the side to move is
+asked for a forced win: the first position of a game whose winning
+line is at least ``min_depth`` moves long becomes a puzzle, listing
+every threat move that wins as its solutions.
+
+谜题取自自对弈。在中心附近随机走几步开局后，由带评估噪声的两层MinMax为双方
+行棋；它立即走出唯一应着，并拒绝证明数搜索能证明对手获胜的着法，因此对局
+不会在第一个活三处结束。每步之前都检查行棋方是否有强制胜利：一局中获胜变例
+不少于``min_depth``步的第一个局面成为谜题，所有获胜的威胁着法都列为正解。
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Callable, List, Optional, Union
+
+from .ai import save_results
+from .corpus import BenchmarkPosition, Move, format_moves
+from ..core.ai.dfpn import ProofNumberStrategy
+from ..core.ai.strategies import MinMaxStrategy
+from ..core.ai.timecontrol import forced_move
+from ..core.ai.utils import AIUtils
+from ..core.board import Board
+from ..core.rules import Rules
+from ..config import (
+    BENCHMARK_SEED, PUZZLE_COUNT, PUZZLE_FILE, PUZZLE_MIN_DEPTH, PUZZLE_NODE_BUDGET
+)
+from ..utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+OPENING_MOVES = 4  # Random moves starting every game / 每局开始的随机着法数
+OPENING_RADIUS = 2  # Distance of opening moves from the centre / 开局着法离中心的距离
+CANDIDATES = 8  # Moves the self-play players consider / 自对弈棋手考虑的着法数
+EVAL_NOISE = 30.0  # Evaluation noise making games differ / 使对局各不相同的评估噪声
+
+
+class _SelfPlayer:
+    """Noisy MinMax that avoids moves losing to a proven win"""
+
+    def __init__(self, guard: ProofNumberStrategy):
+        self.minmax = MinMaxStrategy(CANDIDATES, EVAL_NOISE)
+        self.guard = guard
+
+    def get_move(self, board: Board, player: int) -> Move:
+        move = forced_move(board, player)
+        if move is not None:
+            return move
+        first = self.minmax.get_move(board, player, 2)
+        candidates = [first] + [move for move in AIUtils.get_candidate_moves(board, CANDIDATES)
+                                if move != first]
+        for row, col in candidates:
+            board.place_piece(row, col, player)
+            try:
+                lost = self.guard.prove(board, 3 - player)
+            finally:
+                board.clear_cell(row, col)
+            if not lost:
+                return row, col
+        return first
+
+
+def _opening_move(board: Board, rng: random.Random) -> Move:
+    center = board.size // 2
+    while True:
+        row = center + rng.randint(-OPENING_RADIUS, OPENING_RADIUS)
+        col = center + rng.randint(-OPENING_RADIUS, OPENING_RADIUS)
+        if board.is_valid_move(row, col):
+            return row, col
+
+
+def generate_puzzles(count: int = PUZZLE_COUNT, seed: int = BENCHMARK_SEED, size: int = 15,
+                     min_depth: int = PUZZLE_MIN_DEPTH, node_budget: int = PUZZLE_NODE_BUDGET,
+                     max_games: Optional[int] = None,
+                     on_puzzle: Optional[Callable[[BenchmarkPosition, int], None]] = None
+                     ) -> List[BenchmarkPosition]:
+    """
+    Generate forced-win puzzles from self-play
+
+    Args:
+        count: Puzzles wanted
+        seed: Random seed, the same seed gives the same puzzles
+        size: Board size
+        min_depth: Shortest winning line, in moves of both sides
+        node_budget: Proof-number nodes per position, positions that
+                     are not proven within it are skipped
+        max_games: Games played at most, ``10 * count`` if None
+        on_puzzle: Called with every puzzle and the length of its line
+
+    Returns:
+        List[BenchmarkPosition]: Puzzles of kind ``"forced_win"``, fewer
+                                 than ``count`` if the games ran out
+    """
+    prover = ProofNumberStrategy(node_budget)
+    player = _SelfPlayer(ProofNumberStrategy(max(1, node_budget // 10)))
+    max_games = max_games if max_games is not None else 10 * count
+    puzzles: List[BenchmarkPosition] = []
+
+    for game in range(max_games):
+        if len(puzzles) >= count:
+            break
+        rng = random.Random(seed + game)
+        random.seed(seed + game)
+        board = Board(size)
+        history: List[Move] = []
+        color = 1
+        while not board.is_full():
+            if len(history) < OPENING_MOVES:
+                move = _opening_move(board, rng)
+            else:
+                if prover.prove(board, color) and len(prover.proof) >= min_depth:
+                    depth = len(prover.proof)
+                    solutions = prover.winning_moves(board, color)
+                    if solutions:
+                        puzzle = BenchmarkPosition(f"forced_win_{len(puzzles) + 1:02d}",
+                                                   format_moves(history), format_moves(solutions),
+                                                   "forced_win", size)
+                        puzzles.append(puzzle)
+                        logger.info(f"Puzzle {puzzle.name}: {depth} moves to win, "
+                                    f"solutions {puzzle.solutions}")
+                        if on_puzzle is not None:
+                            on_puzzle(puzzle, depth)
+                        break
+                move = player.get_move(board, color)
+            board.place_piece(move[0], move[1], color)
+            history.append(move)
+            if Rules.check_win(board, move[0], move[1]):
+                break
+            color = 3 - color
+    return puzzles
+
+
+def save_puzzles(puzzles: List[BenchmarkPosition], path: Union[str, Path] = PUZZLE_FILE):
+    """Write puzzles as JSON, creating the directory if needed"""
+    save_results([{'name': puzzle.name, 'moves': puzzle.moves, 'solutions': puzzle.solutions,
+                   'kind': puzzle.kind, 'size': puzzle.size} for puzzle in puzzles], path)
+
+
+def load_puzzles(path: Union[str, Path] = PUZZLE_FILE) -> List[BenchmarkPosition]:
+    """Read puzzles written by ``save_puzzles``"""
+    with open(path, encoding='utf-8') as f:
+        return [BenchmarkPosition(**entry) for entry in json.load(f)]
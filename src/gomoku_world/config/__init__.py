@@ -29,17 +29,44 @@ from .settings import (
     BOARD_SIZE, WIN_LENGTH, CELL_SIZE, PIECE_RADIUS,
     DEFAULT_THEME, DEFAULT_LANGUAGE, FALLBACK_LANGUAGE,
     RESOURCES_DIR, TRANSLATIONS_DIR, THEMES_DIR, SOUNDS_DIR, IMAGES_DIR,
-    SAVE_DIR, WINDOW_SIZE, 
+    SAVE_DIR, AUTO_SAVE_DIR, WINDOW_SIZE, 
     # Network settings
+    DEFAULT_HOST, DEFAULT_PORT,
+    MAX_SPECTATORS_PER_GAME, SPECTATOR_UPDATE_INTERVAL,
+    MAX_MESSAGE_SIZE, OUTBOUND_QUEUE_LIMIT, SLOW_CLIENT_MAX_OVERFLOWS,
+    MATCHMAKING_INTERVAL, MATCHMAKING_BUCKET_SIZE, MATCHMAKING_BASE_WINDOW,
+    MATCHMAKING_WINDOW_GROWTH, MATCHMAKING_MAX_WINDOW, CLUSTER_PEER_TIMEOUT,
+    PLAYER_RATE_LIMIT, COMMAND_RATE_LIMITS,
+    LOBBY_PAGE_SIZE, LOBBY_MAX_PAGE_SIZE, LOBBY_CHANGE_LOG_SIZE,
+    CLIENT_REQUEST_TIMEOUT, HEARTBEAT_INTERVAL, HEARTBEAT_TIMEOUT,
+    MAX_CONNECTIONS, CONNECTION_IDLE_TIMEOUT, WRITE_BUFFER_HIGH_WATER,
     SPECTATOR_CHAT_ENABLED, SPECTATOR_CHAT_HISTORY, SPECTATOR_FEATURES,
+    CHAT_BATCH_INTERVAL, CHAT_MAX_MESSAGE_LENGTH,
     # AI settings
     AI_THINKING_TIME, AI_CACHE_SIZE,
-    AI_DEPTH_EASY, AI_DEPTH_MEDIUM, AI_DEPTH_HARD,
+    AI_DEPTH_EASY, AI_DEPTH_MEDIUM, AI_DEPTH_HARD, AI_INFO_INTERVAL,
+    AI_MOVE_OVERHEAD, AI_TIME_HORIZON, AI_TIME_HARD_FACTOR, AI_TIME_MAX_SHARE,
+    AI_TIME_INSTABILITY_FACTOR, AI_TIME_MIN_BUDGET, AI_TIME_CHECK_INTERVAL,
+    SOLVER_MAX_EMPTY, SOLVER_SMALL_BOARD, SOLVER_NODE_BUDGET, SOLVER_TIME_SHARE, SOLVER_TABLE_SIZE, SOLVER_CACHE_FILE,
+    PNS_NODE_BUDGET, PNS_TABLE_SIZE, PNS_TIME_SHARE, PNS_INFO_INTERVAL,
     # Network settings
     NETWORK_CHECK_TIMEOUT, NETWORK_RETRY_INTERVAL, NETWORK_MAX_RETRIES,
+    # Monitoring settings
+    METRICS_HOST, METRICS_PORT, METRICS_FILE, METRICS_DUMP_INTERVAL, METRICS_LATENCY_BUCKETS,
+    PROFILER_INTERVAL, PROFILER_MAX_DEPTH, PROFILER_SIGNAL, PROFILE_DIR,
+    TRACE_SAMPLE_RATE, TRACE_BUFFER_SIZE, TRACE_FILE, TRACE_EXPORT_INTERVAL,
+    HEALTH_HOST, HEALTH_PORT, HEALTH_LAG_INTERVAL, HEALTH_THRESHOLDS,
+    # Benchmark settings
+    BENCHMARK_DIR, BENCHMARK_BASELINE, BENCHMARK_TOLERANCE,
+    BENCHMARK_DEPTH, BENCHMARK_SIMULATIONS, BENCHMARK_SEED,
+    TOURNAMENT_WORKERS, TOURNAMENT_ROUNDS,
+    PUZZLE_FILE, PUZZLE_COUNT, PUZZLE_MIN_DEPTH, PUZZLE_NODE_BUDGET,
     # Debug settings
     DEBUG_ENABLED, DEBUG_LOG_LEVEL
 )
+from .ai_config import (
+    DifficultyProfile, AI_DIFFICULTY_LEVELS, AI_DEFAULT_DIFFICULTY, get_difficulty
+)
 
 __all__ = [
     # Configuration managers
@@ -53,15 +80,40 @@ __all__ = [
     # Display settings
     "DEFAULT_THEME", "DEFAULT_LANGUAGE", "FALLBACK_LANGUAGE", "WINDOW_SIZE",
     # Network settings
+    "DEFAULT_HOST", "DEFAULT_PORT",
+    "MAX_SPECTATORS_PER_GAME", "SPECTATOR_UPDATE_INTERVAL",
+    "MAX_MESSAGE_SIZE", "OUTBOUND_QUEUE_LIMIT", "SLOW_CLIENT_MAX_OVERFLOWS",
+    "MATCHMAKING_INTERVAL", "MATCHMAKING_BUCKET_SIZE", "MATCHMAKING_BASE_WINDOW",
+    "MATCHMAKING_WINDOW_GROWTH", "MATCHMAKING_MAX_WINDOW", "CLUSTER_PEER_TIMEOUT",
+    "PLAYER_RATE_LIMIT", "COMMAND_RATE_LIMITS",
+    "LOBBY_PAGE_SIZE", "LOBBY_MAX_PAGE_SIZE", "LOBBY_CHANGE_LOG_SIZE",
+    "CLIENT_REQUEST_TIMEOUT", "HEARTBEAT_INTERVAL", "HEARTBEAT_TIMEOUT",
+    "MAX_CONNECTIONS", "CONNECTION_IDLE_TIMEOUT", "WRITE_BUFFER_HIGH_WATER",
     "SPECTATOR_CHAT_ENABLED", "SPECTATOR_CHAT_HISTORY", "SPECTATOR_FEATURES",
+    "CHAT_BATCH_INTERVAL", "CHAT_MAX_MESSAGE_LENGTH",
     # Resource paths
     "RESOURCES_DIR", "TRANSLATIONS_DIR", "THEMES_DIR", "SOUNDS_DIR", "IMAGES_DIR",
-    "SAVE_DIR",
+    "SAVE_DIR", "AUTO_SAVE_DIR",
     # AI settings
     "AI_THINKING_TIME", "AI_CACHE_SIZE",
-    "AI_DEPTH_EASY", "AI_DEPTH_MEDIUM", "AI_DEPTH_HARD",
+    "AI_DEPTH_EASY", "AI_DEPTH_MEDIUM", "AI_DEPTH_HARD", "AI_INFO_INTERVAL",
+    "AI_MOVE_OVERHEAD", "AI_TIME_HORIZON", "AI_TIME_HARD_FACTOR", "AI_TIME_MAX_SHARE",
+    "AI_TIME_INSTABILITY_FACTOR", "AI_TIME_MIN_BUDGET", "AI_TIME_CHECK_INTERVAL",
+    "SOLVER_MAX_EMPTY", "SOLVER_SMALL_BOARD", "SOLVER_NODE_BUDGET", "SOLVER_TIME_SHARE", "SOLVER_TABLE_SIZE", "SOLVER_CACHE_FILE",
+    "PNS_NODE_BUDGET", "PNS_TABLE_SIZE", "PNS_TIME_SHARE", "PNS_INFO_INTERVAL",
+    "DifficultyProfile", "AI_DIFFICULTY_LEVELS", "AI_DEFAULT_DIFFICULTY", "get_difficulty",
     # Network settings
     "NETWORK_CHECK_TIMEOUT", "NETWORK_RETRY_INTERVAL", "NETWORK_MAX_RETRIES",
+    # Monitoring settings
+    "METRICS_HOST", "METRICS_PORT", "METRICS_FILE", "METRICS_DUMP_INTERVAL", "METRICS_LATENCY_BUCKETS",
+    "PROFILER_INTERVAL", "PROFILER_MAX_DEPTH", "PROFILER_SIGNAL", "PROFILE_DIR",
+    "TRACE_SAMPLE_RATE", "TRACE_BUFFER_SIZE", "TRACE_FILE", "TRACE_EXPORT_INTERVAL",
+    "HEALTH_HOST", "HEALTH_PORT", "HEALTH_LAG_INTERVAL", "HEALTH_THRESHOLDS",
+    # Benchmark settings
+    "BENCHMARK_DIR", "BENCHMARK_BASELINE", "BENCHMARK_TOLERANCE",
+    "BENCHMARK_DEPTH", "BENCHMARK_SIMULATIONS", "BENCHMARK_SEED",
+    "TOURNAMENT_WORKERS", "TOURNAMENT_ROUNDS",
+    "PUZZLE_FILE", "PUZZLE_COUNT", "PUZZLE_MIN_DEPTH", "PUZZLE_NODE_BUDGET",
     # Debug settings
     "DEBUG_ENABLED", "DEBUG_LOG_LEVEL"
 ]
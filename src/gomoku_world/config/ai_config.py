@@ -1,19 +1,67 @@
 """AI configuration constants.
 
 AI配置常量。
+
+Difficulty levels are compute budgets rather than bare depths: every
+level caps the nodes searched per move (MCTS counts simulations) and the
+seconds spent, adds Gaussian noise to evaluations and limits the moves
+considered at each node to the most promising neighbours of existing
+stones. The depth is only an upper bound for iterative deepening, so the
+cost of a move is set by the budgets and stays predictable per level.
+Above the easiest level, small boards and endgames are solved exactly;
+the hardest level also plays any forced win it can prove.
+
+难度级别以计算预算而非单纯的深度表示：每个级别限制每步搜索的节点数（MCTS为
+模拟次数）和耗时，为评估加入高斯噪声，并把每个节点考虑的着法限制为已有棋子
+周围最有希望的位置。深度只是迭代加深的上限，因此每步的开销由预算决定，每个
+级别的开销都可预测。简单以上的级别会精确求解小棋盘和残局；最难的级别还会走出
+它能证明的强制胜利。
 """
 
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class DifficultyProfile:
+    """Search budgets of one difficulty level.
+
+    一个难度级别的搜索预算。
+    """
+    name: str
+    strategy: str  # "minmax" or "mcts" / 使用的搜索策略
+    max_depth: int  # Iterative deepening limit / 迭代加深的深度上限
+    node_budget: int  # Nodes per move, simulations for MCTS / 每步节点数，MCTS为模拟次数
+    time_budget: float  # Seconds per move / 每步秒数
+    eval_noise: float  # Std deviation of evaluation noise in score points / 评估噪声的标准差（分）
+    candidate_limit: int  # Moves considered per node, 0 for every empty cell / 每个节点考虑的着法数，0为所有空位
+    solve_endgame: bool = True  # Play small boards and endgames exactly / 对小棋盘和残局精确作答
+    prove_wins: bool = False  # Look for forced wins by proof-number search first / 先用证明数搜索寻找强制胜利
+
+
 # AI思考时间限制（秒）
 AI_THINKING_TIME = 5.0
 
 # AI缓存大小限制
 AI_CACHE_SIZE = 100000
 
+# AI难度级别
+AI_DIFFICULTY_LEVELS = {
+    "easy": DifficultyProfile("easy", "minmax", max_depth=2, node_budget=1000,
+                              time_budget=0.5, eval_noise=300.0, candidate_limit=8,
+                              solve_endgame=False),
+    "medium": DifficultyProfile("medium", "minmax", max_depth=4, node_budget=8000,
+                                time_budget=2.0, eval_noise=50.0, candidate_limit=12),
+    "hard": DifficultyProfile("hard", "mcts", max_depth=6, node_budget=150,
+                              time_budget=AI_THINKING_TIME, eval_noise=0.0, candidate_limit=15,
+                              prove_wins=True),
+}
+
+# 默认难度
+AI_DEFAULT_DIFFICULTY = "medium"
+
 # AI搜索深度限制
 AI_MAX_SEARCH_DEPTH = {
-    "easy": 2,
-    "medium": 3,
-    "hard": 4
+    name: profile.max_depth for name, profile in AI_DIFFICULTY_LEVELS.items()
 }
 
 # AI评估分数权重
@@ -24,9 +72,31 @@ AI_EVALUATION_WEIGHTS = {
     "defense": 1.0
 }
 
+
+def get_difficulty(name: str) -> DifficultyProfile:
+    """Get the profile of a difficulty level.
+
+    获取难度级别的配置。
+
+    Args:
+        name (str): Difficulty level, unknown levels fall back to
+                    ``AI_DEFAULT_DIFFICULTY``.
+                    难度级别，未知级别使用``AI_DEFAULT_DIFFICULTY``。
+
+    Returns:
+        DifficultyProfile: Budgets of the level.
+                           该级别的预算。
+    """
+    return AI_DIFFICULTY_LEVELS.get(name, AI_DIFFICULTY_LEVELS[AI_DEFAULT_DIFFICULTY])
+
+
 __all__ = [
+    "DifficultyProfile",
     "AI_THINKING_TIME",
     "AI_CACHE_SIZE",
+    "AI_DIFFICULTY_LEVELS",
+    "AI_DEFAULT_DIFFICULTY",
     "AI_MAX_SEARCH_DEPTH",
-    "AI_EVALUATION_WEIGHTS"
-]
\ No newline at end of file
+    "AI_EVALUATION_WEIGHTS",
+    "get_difficulty"
+]
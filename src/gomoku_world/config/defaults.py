@@ -25,7 +25,8 @@ GAME_DEFAULTS = {
     },
     "debug": {
         "enabled": False,
-        "log_level": "INFO"
+        "log_level": "INFO",
+        "profiler": False
     },
     "test": {
         "string": "value",
@@ -6,6 +6,8 @@ Global settings and constants.
 import logging
 from pathlib import Path
 
+from .ai_config import AI_DIFFICULTY_LEVELS
+
 # Package information / 包信息
 PACKAGE_NAME = "gomoku_world"
 VERSION = "2.1.2"
@@ -15,6 +17,7 @@ BASE_DIR = Path(__file__).parent.parent.parent.parent
 LOG_DIR = BASE_DIR / "logs"
 LOG_FILE = LOG_DIR / "gomoku_world.log"
 SAVE_DIR = BASE_DIR / "saves"
+AUTO_SAVE_DIR = SAVE_DIR / "auto"
 
 # Logging / 日志
 LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -27,8 +30,40 @@ CELL_SIZE = 40  # Size of each board cell in pixels / 棋盘每个格子的像
 PIECE_RADIUS = 15  # Radius of game pieces in pixels / 棋子半径（像素）
 
 # Network settings / 网络设置
+DEFAULT_HOST = "localhost"  # Default game server host / 默认游戏服务器主机
+DEFAULT_PORT = 5000  # Default game server port / 默认游戏服务器端口
+MAX_SPECTATORS_PER_GAME = 2000  # Maximum spectators per game / 每局最大观战人数
+SPECTATOR_UPDATE_INTERVAL = 1.0  # Spectator refresh interval in seconds / 观战刷新间隔（秒）
+MAX_MESSAGE_SIZE = 64 * 1024  # Maximum size of one message frame in bytes / 单条消息帧的最大字节数
+OUTBOUND_QUEUE_LIMIT = 256  # Queued push frames per connection before coalescing / 每个连接合并前可排队的推送帧数
+SLOW_CLIENT_MAX_OVERFLOWS = 3  # Queue overflows tolerated before dropping a client / 断开慢客户端前允许的队列溢出次数
+MATCHMAKING_INTERVAL = 1.0  # Seconds between matchmaking passes / 匹配轮询间隔（秒）
+MATCHMAKING_BUCKET_SIZE = 100  # Rating range covered by one queue bucket / 每个队列桶覆盖的等级分范围
+MATCHMAKING_BASE_WINDOW = 100  # Initial rating difference accepted / 初始可接受的等级分差
+MATCHMAKING_WINDOW_GROWTH = 50  # Window growth per second of waiting / 每等待一秒窗口增长量
+MATCHMAKING_MAX_WINDOW = 1000  # Maximum rating difference accepted / 最大可接受的等级分差
+MAX_CONNECTIONS = 10000  # Concurrent client connections accepted / 可同时接受的客户端连接数
+CONNECTION_IDLE_TIMEOUT = 60.0  # Seconds of silence before a connection is closed / 连接静默多少秒后关闭
+WRITE_BUFFER_HIGH_WATER = 256 * 1024  # Socket write buffer size that pauses reads / 暂停读取的写缓冲区大小
+HEARTBEAT_INTERVAL = 15.0  # Seconds between heartbeat pings / 心跳间隔（秒）
+HEARTBEAT_TIMEOUT = 10.0  # Seconds to wait for a pong / 等待心跳响应的秒数
+CLIENT_REQUEST_TIMEOUT = 10.0  # Seconds a client waits for a response / 客户端等待响应的秒数
+CLUSTER_PEER_TIMEOUT = 5.0  # Seconds to wait for another worker to answer / 等待其他工作进程响应的秒数
+PLAYER_RATE_LIMIT = (200.0, 400)  # Requests per second and burst per connection / 每个连接每秒请求数及突发量
+COMMAND_RATE_LIMITS = {
+    "login": (1.0, 5),            # Login attempts / 登录尝试
+    "find_game": (2.0, 10),       # Matchmaking requests / 匹配请求
+    "list_games": (5.0, 10),      # Game list requests / 对局列表请求
+    "spectate_game": (5.0, 10),   # Spectate requests / 观战请求
+    "spectator_chat": (2.0, 5),   # Chat lines / 聊天消息
+}
+LOBBY_PAGE_SIZE = 50  # Games per lobby page by default / 大厅每页默认对局数
+LOBBY_MAX_PAGE_SIZE = 200  # Largest lobby page a client may request / 客户端可请求的最大大厅页
+LOBBY_CHANGE_LOG_SIZE = 1024  # Lobby changes kept for incremental updates / 为增量更新保留的大厅变更数
 SPECTATOR_CHAT_ENABLED = True  # Enable chat in spectator mode / 启用观战模式聊天功能
 SPECTATOR_CHAT_HISTORY = 100  # Number of chat messages to keep in history / 保留的聊天记录数量
+CHAT_BATCH_INTERVAL = 0.2  # Seconds chat messages are collected into one frame / 聊天消息合并为一帧的收集时间（秒）
+CHAT_MAX_MESSAGE_LENGTH = 500  # Longest chat message in characters / 聊天消息最大字符数
 SPECTATOR_FEATURES = {
     "chat": True,           # Enable chat / 启用聊天
     "analysis": True,       # Enable game analysis / 启用游戏分析
@@ -53,25 +88,83 @@ IMAGES_DIR = RESOURCES_DIR / "images"
 # AI settings / AI设置
 AI_THINKING_TIME = 5.0  # Maximum thinking time in seconds / AI最大思考时间（秒）
 AI_CACHE_SIZE = 100000  # Maximum number of cached positions / 最大缓存局面数量
-AI_DEPTH_EASY = 2      # Search depth for easy difficulty / 简单难度的搜索深度
-AI_DEPTH_MEDIUM = 4    # Search depth for medium difficulty / 中等难度的搜索深度
-AI_DEPTH_HARD = 6      # Search depth for hard difficulty / 困难难度的搜索深度
+AI_DEPTH_EASY = AI_DIFFICULTY_LEVELS["easy"].max_depth      # Search depth for easy difficulty / 简单难度的搜索深度
+AI_DEPTH_MEDIUM = AI_DIFFICULTY_LEVELS["medium"].max_depth  # Search depth for medium difficulty / 中等难度的搜索深度
+AI_DEPTH_HARD = AI_DIFFICULTY_LEVELS["hard"].max_depth      # Search depth for hard difficulty / 困难难度的搜索深度
+AI_INFO_INTERVAL = 100  # MCTS simulations between streamed search statistics / MCTS流式搜索统计之间的模拟次数
+AI_MOVE_OVERHEAD = 0.05  # Seconds reserved per move for communication / 每步为通信预留的秒数
+AI_TIME_HORIZON = 30  # Moves the remaining time is spread over / 剩余时间分配到的步数
+AI_TIME_HARD_FACTOR = 3.0  # Hard budget as a multiple of the soft budget / 硬限制相对软限制的倍数
+AI_TIME_MAX_SHARE = 0.5  # Largest share of the remaining time one move may use / 单步最多可用的剩余时间比例
+AI_TIME_INSTABILITY_FACTOR = 1.5  # Soft budget extension when the best move changes / 最佳着法改变时软限制的延长倍数
+AI_TIME_MIN_BUDGET = 0.01  # Smallest per-move budget in seconds / 每步最小时间预算（秒）
+AI_TIME_CHECK_INTERVAL = 256  # Nodes between deadline checks / 两次检查截止时间之间的节点数
+SOLVER_MAX_EMPTY = 12  # Empty cells at which positions are solved exactly / 精确求解的空位数上限
+SOLVER_SMALL_BOARD = 5  # Boards up to this size are solved from any position / 不超过此尺寸的棋盘从任意局面求解
+SOLVER_NODE_BUDGET = 1000000  # Nodes a solve may visit before giving up / 求解放弃前可访问的节点数
+SOLVER_TIME_SHARE = 0.5  # Share of a move's time budget the solver may use / 求解器可用的每步时间预算比例
+SOLVER_TABLE_SIZE = 200000  # Transposition table entries kept between solves / 求解之间保留的置换表条目数
+SOLVER_CACHE_FILE = BASE_DIR / "cache" / "endgame.json"  # Persistent cache of solved positions / 已求解局面的持久化缓存
+PNS_NODE_BUDGET = 100000  # Nodes a proof-number search may visit before giving up / 证明数搜索放弃前可访问的节点数
+PNS_TABLE_SIZE = 200000  # Proof-number table entries before it is trimmed / 证明数表裁剪前的条目数
+PNS_TIME_SHARE = 0.3  # Share of a move's time budget the proof-number search may use / 证明数搜索可用的每步时间预算比例
+PNS_INFO_INTERVAL = 1000  # Nodes between streamed proof-number statistics / 流式证明数搜索统计之间的节点数
 
 # Network settings / 网络设置
 NETWORK_CHECK_TIMEOUT = 5.0  # Network check timeout in seconds / 网络检查超时时间（秒）
 NETWORK_CHECK_INTERVAL = 60.0  # Network check interval in seconds / 网络检查间隔时间（秒）
 NETWORK_RETRY_INTERVAL = 1.0  # Retry interval in seconds / 重试间隔时间（秒）
 NETWORK_MAX_RETRIES = 3      # Maximum number of retries / 最大重试次数
-NETWORK_CHECK_HOSTS = [      # Hosts to check for network connectivity / 用于检查网络连接的主机
-    "www.google.com",
-    "www.github.com",
-    "www.baidu.com"
+NETWORK_CHECK_HOSTS = [      # (host, port) pairs checked for connectivity / 用于检查网络连接的(主机, 端口)
+    (DEFAULT_HOST, DEFAULT_PORT)
 ]
 
+# Monitoring settings / 监控设置
+METRICS_HOST = "127.0.0.1"  # Host of the metrics HTTP endpoint / 指标HTTP端点主机
+METRICS_PORT = 9464  # Port of the metrics HTTP endpoint / 指标HTTP端点端口
+METRICS_FILE = LOG_DIR / "metrics.prom"  # File the metrics exposition is written to / 指标输出文件
+METRICS_DUMP_INTERVAL = 15.0  # Seconds between metrics file writes / 指标文件写入间隔（秒）
+METRICS_LATENCY_BUCKETS = (  # Histogram bounds in seconds / 直方图桶边界（秒）
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+PROFILER_INTERVAL = 0.005  # Seconds between profiler stack samples / 分析器采样间隔（秒）
+PROFILER_MAX_DEPTH = 64  # Innermost frames kept per stack sample / 每个采样保留的最内层栈帧数
+PROFILER_SIGNAL = "SIGUSR2"  # Signal toggling the profiler / 切换分析器的信号
+PROFILE_DIR = LOG_DIR / "profiles"  # Directory of profile dumps / 分析结果目录
+TRACE_SAMPLE_RATE = 0.01  # Share of new traces that are recorded / 记录的新追踪比例
+TRACE_BUFFER_SIZE = 10000  # Finished spans kept in memory / 内存中保留的已完成Span数
+TRACE_FILE = LOG_DIR / "traces.jsonl"  # File spans are exported to / Span导出文件
+TRACE_EXPORT_INTERVAL = 5.0  # Seconds between span exports / Span导出间隔（秒）
+HEALTH_HOST = "127.0.0.1"  # Host of the health endpoint / 健康检查端点主机
+HEALTH_PORT = 9465  # Port of the health endpoint / 健康检查端点端口
+HEALTH_LAG_INTERVAL = 0.5  # Seconds between event-loop lag measurements / 事件循环延迟测量间隔（秒）
+HEALTH_THRESHOLDS = {  # (degraded, critical) value per health probe / 各健康探针的(降级, 严重)阈值
+    'loop_lag': (0.1, 1.0),  # Event-loop lag in seconds / 事件循环延迟（秒）
+    'rss': (1024, 4096),  # Resident memory in MB / 常驻内存（MB）
+    'open_fds': (0.8, 0.95),  # Open files as share of the limit / 打开文件数占上限比例
+    'clients': (0.9, 1.0),  # Connections as share of MAX_CONNECTIONS / 连接数占MAX_CONNECTIONS比例
+    'matchmaking_queue': (1000, None),  # Players waiting for a match / 等待匹配的玩家数
+    'tt_fill': (0.95, None),  # Transposition table fill ratio / 置换表填充率
+}
+
+# Benchmark settings / 基准测试设置
+BENCHMARK_DIR = BASE_DIR / "benchmarks"  # Directory of benchmark results / 基准测试结果目录
+BENCHMARK_BASELINE = BENCHMARK_DIR / "ai_baseline.json"  # Stored AI baseline / 保存的AI基线
+BENCHMARK_TOLERANCE = 0.2  # Allowed relative slowdown against the baseline / 相对基线允许的性能下降比例
+BENCHMARK_DEPTH = 2  # MinMax depth of the AI benchmark / AI基准测试的MinMax深度
+BENCHMARK_SIMULATIONS = 50  # MCTS simulations per benchmark move / 每步基准测试的MCTS模拟次数
+BENCHMARK_SEED = 12345  # Random seed making benchmark moves repeatable / 使基准测试着法可复现的随机种子
+TOURNAMENT_WORKERS = 4  # Worker processes of self-play tournaments / 自对弈锦标赛的工作进程数
+TOURNAMENT_ROUNDS = 1  # Repetitions of the tournament schedule / 锦标赛赛程的重复次数
+PUZZLE_FILE = BENCHMARK_DIR / "puzzles.json"  # Generated puzzle collection / 生成的谜题集
+PUZZLE_COUNT = 20  # Puzzles generated per run / 每次生成的谜题数
+PUZZLE_MIN_DEPTH = 5  # Shortest winning line of a generated puzzle in moves / 生成谜题获胜变例的最少步数
+PUZZLE_NODE_BUDGET = 20000  # Proof-number nodes spent per candidate position / 每个候选局面的证明数搜索节点数
+
 # Debug settings / 调试设置
 DEBUG_ENABLED = True         # Enable debug mode / 启用调试模式
 DEBUG_LOG_LEVEL = "DEBUG"    # Debug log level / 调试日志级别
 
 # Create directories if they don't exist / 如果目录不存在则创建
-for directory in [LOG_DIR, SAVE_DIR, RESOURCES_DIR, TRANSLATIONS_DIR, THEMES_DIR, SOUNDS_DIR, IMAGES_DIR]:
+for directory in [LOG_DIR, SAVE_DIR, AUTO_SAVE_DIR, RESOURCES_DIR, TRANSLATIONS_DIR, THEMES_DIR, SOUNDS_DIR, IMAGES_DIR]:
     directory.mkdir(parents=True, exist_ok=True)
\ No newline at end of file
@@ -3,8 +3,9 @@
 五子棋核心模块。
 """
 
-from .board import Game, InvalidMoveError, Position, Board
+from .board import Game, InvalidMoveError, Position, Board, CompactBoard
 from .rules import Rules
+from .codec import PackedMoves
 from .ai.strategy import AIStrategy as AI
 
 __all__ = [
@@ -12,6 +13,8 @@ __all__ = [
     'InvalidMoveError',
     'Position',
     'Board',
+    'CompactBoard',
     'Rules',
+    'PackedMoves',
     'AI'
 ]
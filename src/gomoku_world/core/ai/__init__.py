@@ -6,10 +6,24 @@ AI module for Gomoku
 from .engine import AI
 from .strategies import MinMaxStrategy, MCTSStrategy
 from .evaluation import PositionEvaluator
+from .info import SearchInfo
+from .dfpn import ProofNumberStrategy
+from .solver import EndgameSolver, Solution, SolverCache
+from .timecontrol import GameClock, SearchDeadline, TimeBudget, allocate_time, forced_move
 
 __all__ = [
     'AI',
     'MinMaxStrategy',
     'MCTSStrategy',
-    'PositionEvaluator'
+    'PositionEvaluator',
+    'SearchInfo',
+    'EndgameSolver',
+    'Solution',
+    'SolverCache',
+    'ProofNumberStrategy',
+    'GameClock',
+    'SearchDeadline',
+    'TimeBudget',
+    'allocate_time',
+    'forced_move'
 ] 
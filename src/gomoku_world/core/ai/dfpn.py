@@ -0,0 +1,445 @@
+"""
+Proof-number search for forced wins
+强制胜利的证明数搜索
+
+``ProofNumberStrategy`` answers "does this side have a forced win?" with
+depth-first proof-number search (df-pn). Every node carries a proof
+number, the fewest leaves still to prove for the win, and a disproof
+number, the fewest to refute it; the search always descends into the
+most proving child under thresholds, so it needs memory only for its
+transposition table, which is bounded and keeps the most valuable
+entries when it is trimmed.
+
+The search stays in threat space. The attacker only plays fours and,
+when ``threes`` is set, moves that make three, and must answer the
+defender's only winning cell. The defender only answers with the cells
+that stop the attacker's double threats or with fours of their own:
+any other reply lets the attacker make two fives at once, so a proof
+covers every defence. A disproof only means that no threat sequence
+wins.
+
+``ProofNumberStrategy``用深度优先证明数搜索（df-pn）回答"这一方是否有强制
+胜利"。每个节点带有证明数，即证明胜利还需的最少叶子数，以及反证数，即反驳它
+还需的最少叶子数；搜索总在阈值内进入最有希望证明的子节点，因此只需置换表的
+内存，置换表有容量上限，裁剪时保留最有价值的条目。
+
+搜索限定在威胁空间内。进攻方只走冲四，以及设置``threes``时成三的着法，并须
+封堵防守方唯一的胜点。防守方只考虑阻止进攻方双重威胁的位置或自己的冲四：
+其他任何应着都让进攻方同时形成两个五连点，因此证明覆盖所有防守。反证只表示
+没有获胜的威胁序列。
+"""
+
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from ..board import Board
+from .info import SearchInfo, InfoCallback
+from .solver import _AbortSearch, _lines
+from .timecontrol import SearchDeadline
+from ...config import (
+    WIN_LENGTH, AI_TIME_CHECK_INTERVAL, PNS_NODE_BUDGET, PNS_TABLE_SIZE, PNS_INFO_INTERVAL
+)
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+INF = 10 ** 9  # Proof or disproof number of a solved node / 已解节点的证明数或反证数
+
+Move = Tuple[int, int]
+
+
+@lru_cache(maxsize=None)
+def _windows(size: int, length: int) -> Tuple[np.ndarray, Tuple[np.ndarray, ...]]:
+    """
+    Every ``length`` cells in a row on the board, as arrays
+
+    Returns:
+        Tuple: Cell indices per window, and the windows through each cell
+    """
+    windows = _lines(size, length)
+    cell_windows = [[] for _ in range(size * size)]
+    for number, window in enumerate(windows):
+        for index in window:
+            cell_windows[index].append(number)
+    return (np.array(windows, dtype=np.intp).reshape(-1, length),
+            tuple(np.array(numbers, dtype=np.intp) for numbers in cell_windows))
+
+
+class ProofNumberStrategy:
+    """
+    Depth-first proof-number search over threat sequences
+    基于威胁序列的深度优先证明数搜索
+    """
+
+    def __init__(self, node_budget: int = PNS_NODE_BUDGET, table_size: int = PNS_TABLE_SIZE,
+                 threes: bool = True, win_length: int = WIN_LENGTH):
+        """
+        Initialize the search
+
+        Args:
+            node_budget: Nodes a proof may visit before giving up
+            table_size: Transposition table entries kept, the table is
+                        trimmed to half when it grows past this
+            threes: Let the attacker make threes as well as fours
+            win_length: Stones in a row needed to win
+        """
+        self.node_budget = node_budget
+        self.table_size = table_size
+        self.threes = threes
+        self.win_length = win_length
+        self.table: Dict[bytes, Tuple[int, int, int]] = {}  # key -> (pn, dn, work)
+        self.nodes = 0
+        self.proven: Optional[bool] = None  # Result of the last proof / 上一次证明的结果
+        self.proof: List[Move] = []  # Winning line of the last proof / 上一次证明的获胜变例
+        self.info = SearchInfo("pns")  # Statistics of the last proof
+        self._deadline: Optional[SearchDeadline] = None
+        self._on_info: Optional[InfoCallback] = None
+        self._start = 0.0
+        logger.info("Proof-number search initialized")
+
+    def get_move(self, board: Board, player: int, on_info: Optional[InfoCallback] = None,
+                 deadline: Optional[SearchDeadline] = None) -> Optional[Move]:
+        """
+        Find a move that wins by force
+
+        Args:
+            board: Current game board, left unchanged
+            player: Player to move
+            on_info: Called with the statistics every ``PNS_INFO_INTERVAL``
+                     nodes and once at the end
+            deadline: Time budget and stop flag, the search also gives up
+                      after ``node_budget`` nodes
+
+        Returns:
+            Optional[Tuple[int, int]]: First move of the proof, None if
+                                       no forced win was found
+        """
+        if self.prove(board, player, deadline=deadline, on_info=on_info) and self.proof:
+            return self.proof[0]
+        return None
+
+    def prove(self, board: Board, attacker: int, to_move: Optional[int] = None,
+              deadline: Optional[SearchDeadline] = None,
+              on_info: Optional[InfoCallback] = None) -> Optional[bool]:
+        """
+        Prove or disprove a forced win
+
+        Args:
+            board: Current game board, left unchanged
+            attacker: Player looking for the win
+            to_move: Player to move, the attacker if None
+            deadline: Time budget and stop flag
+            on_info: Called with the statistics every ``PNS_INFO_INTERVAL``
+                     nodes and once at the end
+
+        Returns:
+            Optional[bool]: True if the attacker wins by force, False if
+                            no threat sequence wins, None if the budget
+                            ran out first
+        """
+        self._start = time.perf_counter()
+        self.nodes = 0
+        self.proven = None
+        self.proof = []
+        self.info = SearchInfo("pns")
+        self._deadline = deadline
+        self._on_info = on_info
+        self._setup(board, attacker)
+        or_node = to_move is None or to_move == attacker
+        try:
+            pn, dn = self._mid(self._key(or_node), or_node, INF, INF, 0)
+        except _AbortSearch:
+            logger.debug(f"Proof-number search gave up after {self.nodes} nodes")
+            self._report(on_info)
+            return None
+        finally:
+            self._deadline = None
+            self._on_info = None
+
+        self.proven = pn == 0
+        if self.proven:
+            self.proof = self._proof_line(or_node)
+        self.info.depth = len(self.proof)
+        self.info.score = 1.0 if self.proven else -1.0
+        self.info.pv = list(self.proof)
+        self._report(on_info)
+        logger.debug(f"Proof-number search {'proved' if self.proven else 'disproved'} "
+                     f"the win in {self.nodes} nodes")
+        return self.proven
+
+    def winning_moves(self, board: Board, player: int,
+                      deadline: Optional[SearchDeadline] = None) -> Optional[List[Move]]:
+        """
+        Find every threat move that wins by force
+
+        Args:
+            board: Current game board, left unchanged
+            player: Player to move
+            deadline: Time budget and stop flag shared by all the proofs
+
+        Returns:
+            Optional[List[Tuple[int, int]]]: Winning moves, None if a
+                                             proof ran out of budget
+        """
+        self._setup(board, player)
+        pn, _, moves = self._expand(True)
+        if pn is not None:
+            return [divmod(index, board.size) for index in moves] if pn == 0 else []
+        wins = []
+        for index in moves:
+            row, col = divmod(index, board.size)
+            board.place_piece(row, col, player)
+            try:
+                proven = self.prove(board, player, 3 - player, deadline)
+            finally:
+                board.clear_cell(row, col)
+            if proven is None:
+                return None
+            if proven:
+                wins.append((row, col))
+        return wins
+
+    def _setup(self, board: Board, attacker: int):
+        """Load the position and its stone counts per window"""
+        size = board.size
+        self._size = size
+        self._attacker = attacker
+        self._cells = bytearray(int(value) for value in board.board.flat)
+        self._windows, self._cell_windows = _windows(size, self.win_length)
+        # Stones of each player per window, kept as arrays so a scan is one mask / 每个窗口中双方的棋子数，用数组保存以便一次掩码完成扫描
+        stones = np.frombuffer(bytes(self._cells), dtype=np.uint8)[self._windows]
+        self._counts = [(stones == player).sum(axis=1, dtype=np.int8) for player in range(3)]
+
+    def _play(self, index: int, player: int):
+        self._cells[index] = player
+        self._counts[player][self._cell_windows[index]] += 1
+
+    def _undo(self, index: int, player: int):
+        self._cells[index] = 0
+        self._counts[player][self._cell_windows[index]] -= 1
+
+    def _key(self, or_node: bool) -> bytes:
+        return bytes(self._cells) + bytes((self._attacker, or_node))
+
+    def _threats(self, player: int, threes: bool
+                 ) -> Tuple[Set[int], Dict[int, Set[int]], Dict[int, int]]:
+        """
+        Threats of one side
+
+        Returns:
+            Tuple: Cells completing five, fours as the cell to play mapped
+                   to the cells it makes winning, and cells making three
+                   with their number of windows when ``threes`` is set
+        """
+        length = self.win_length
+        own = self._counts[player]
+        free = self._counts[3 - player] == 0
+        cells = self._cells
+        fives: Set[int] = set()
+        fours: Dict[int, Set[int]] = {}
+        makes_three: Dict[int, int] = {}
+        for window in self._windows[free & (own == length - 1)].tolist():
+            fives.add(next(index for index in window if not cells[index]))
+        for window in self._windows[free & (own == length - 2)].tolist():
+            first, second = [index for index in window if not cells[index]]
+            fours.setdefault(first, set()).add(second)
+            fours.setdefault(second, set()).add(first)
+        if threes and length > 3:
+            for window in self._windows[free & (own == length - 3)].tolist():
+                for index in window:
+                    if not cells[index]:
+                        makes_three[index] = makes_three.get(index, 0) + 1
+        return fives, fours, makes_three
+
+    def _expand(self, or_node: bool) -> Tuple[Optional[int], Optional[int], List[int]]:
+        """
+        Evaluate a node
+
+        Returns:
+            Tuple: Proof and disproof number of a solved node with the
+                   attacker's winning cells when it is proven, or None,
+                   None and the moves to search
+        """
+        attacker = self._attacker
+        defender = 3 - attacker
+        if 0 not in self._cells:
+            return INF, 0, []
+        if or_node:
+            fives, fours, makes_three = self._threats(attacker, self.threes)
+            if fives:
+                return 0, INF, sorted(fives)
+            blocks = self._threats(defender, False)[0]
+            if len(blocks) > 1:
+                return INF, 0, []
+            if blocks:
+                return None, None, list(blocks)
+            # Fours making the most winning cells first / 形成最多胜点的冲四优先
+            moves = sorted(fours, key=lambda index: -len(fours[index]))
+            moves += sorted((index for index in makes_three if index not in fours),
+                            key=lambda index: -makes_three[index])
+            if not moves:
+                return INF, 0, []
+            return None, None, moves
+
+        blocks, counter_fours, _ = self._threats(defender, False)
+        if blocks:
+            return INF, 0, []
+        fives, fours, _ = self._threats(attacker, False)
+        if len(fives) > 1:
+            return 0, INF, sorted(fives)
+        if fives:
+            return None, None, list(fives)
+        doubles = {index: made for index, made in fours.items() if len(made) > 1}
+        if not doubles:
+            # The attacker has no follow-up threat / 进攻方没有后续威胁
+            return INF, 0, []
+        # Any other reply lets the attacker make two fives / 其他应着都让进攻方形成两个五连点
+        replies = set(doubles)
+        for made in doubles.values():
+            replies |= made
+        replies |= set(counter_fours)
+        return None, None, sorted(replies, key=lambda index: -len(doubles.get(index, ())))
+
+    def _tick(self, ply: int):
+        """Count a node, check the budgets and stream the statistics"""
+        self.nodes += 1
+        if ply > self.info.seldepth:
+            self.info.seldepth = ply
+        if self.nodes % AI_TIME_CHECK_INTERVAL == 0 and (
+                self.nodes >= self.node_budget
+                or (self._deadline is not None and self._deadline.expired())):
+            raise _AbortSearch()
+        if self._on_info is not None and self.nodes % PNS_INFO_INTERVAL == 0:
+            self._report(self._on_info)
+
+    def _report(self, on_info: Optional[InfoCallback] = None):
+        """Fill in the statistics and pass them on"""
+        self.info.nodes = self.nodes
+        self.info.time = time.perf_counter() - self._start
+        if on_info is not None:
+            on_info(self.info)
+
+    def fill_ratio(self) -> float:
+        """Share of the transposition table in use"""
+        return len(self.table) / self.table_size if self.table_size else 0.0
+
+    def _store(self, key: bytes, pn: int, dn: int, work: int):
+        """Store a node, trimming the table when it is full"""
+        table = self.table
+        table[key] = (pn, dn, work)
+        if len(table) > self.table_size:
+            # Keep solved nodes, then the ones that took most work / 保留已解节点，其次是耗费最多的节点
+            kept = sorted(table.items(), key=lambda item: (0 not in item[1][:2], -item[1][2]))
+            self.table = dict(kept[:self.table_size // 2])
+            logger.debug(f"Proof-number table trimmed to {len(self.table)} entries")
+
+    def _lookup(self, key: bytes) -> Tuple[int, int]:
+        self.info.tt_probes += 1
+        entry = self.table.get(key)
+        if entry is None:
+            return 1, 1
+        self.info.tt_hits += 1
+        return entry[0], entry[1]
+
+    def _mid(self, key: bytes, or_node: bool, pn_threshold: int, dn_threshold: int,
+             ply: int) -> Tuple[int, int]:
+        """
+        Search a node until its proof or disproof number reaches its threshold
+
+        Returns:
+            Tuple[int, int]: Proof and disproof number of the node
+        """
+        self._tick(ply)
+        start_nodes = self.nodes
+        pn, dn, moves = self._expand(or_node)
+        if pn is not None:
+            self._store(key, pn, dn, 1)
+            return pn, dn
+
+        player = self._attacker if or_node else 3 - self._attacker
+        cells = self._cells
+        tag = bytes((self._attacker, not or_node))
+        # Children as [move, key, number minimised here, number summed here] / 子节点为[着法, 键, 此处取最小的数, 此处求和的数]
+        children = []
+        for index in moves:
+            cells[index] = player
+            child_key = bytes(cells) + tag
+            cells[index] = 0
+            child_pn, child_dn = self._lookup(child_key)
+            children.append([index, child_key] + ([child_pn, child_dn] if or_node else [child_dn, child_pn]))
+
+        while True:
+            # OR nodes need one proven child, AND nodes all of them / 或节点需一个子节点得证，与节点需全部得证
+            best = children[0]
+            second_value = INF
+            total = 0
+            for child in children:
+                total += child[3]
+                if child[2] < best[2]:
+                    second_value = best[2]
+                    best = child
+                elif child is not best and child[2] < second_value:
+                    second_value = child[2]
+            total = min(INF, total)
+            pn, dn = (best[2], total) if or_node else (total, best[2])
+            if pn >= pn_threshold or dn >= dn_threshold:
+                break
+
+            index, child_key, _, child_other = best
+            # Thresholds that make the child return once another one is more promising / 使子节点在别的子节点更有希望时返回的阈值
+            value_threshold = min(pn_threshold if or_node else dn_threshold, second_value + 1)
+            other_threshold = dn_threshold if or_node else pn_threshold
+            if other_threshold < INF:
+                other_threshold += child_other - (dn if or_node else pn)
+            self._play(index, player)
+            try:
+                if or_node:
+                    best[2], best[3] = self._mid(child_key, False, value_threshold, other_threshold, ply + 1)
+                else:
+                    best[3], best[2] = self._mid(child_key, True, other_threshold, value_threshold, ply + 1)
+            finally:
+                self._undo(index, player)
+
+        self._store(key, pn, dn, self.nodes - start_nodes)
+        return pn, dn
+
+    def _proof_line(self, or_node: bool) -> List[Move]:
+        """Winning line of a proven position, the most stubborn defence at AND nodes"""
+        line: List[int] = []
+        played: List[Tuple[int, int]] = []
+        attacker = self._attacker
+        try:
+            while True:
+                pn, _, moves = self._expand(or_node)
+                if pn is not None:
+                    if pn == 0:
+                        # The five, after a block of one of two at AND nodes / 五连，与节点先封堵两点之一
+                        line += moves[:1] if or_node else moves[:2]
+                    break
+                player = attacker if or_node else 3 - attacker
+                tag = bytes((attacker, not or_node))
+                best, best_work = None, -1
+                for index in moves:
+                    self._cells[index] = player
+                    entry = self.table.get(bytes(self._cells) + tag)
+                    self._cells[index] = 0
+                    if entry is None or entry[0] != 0:
+                        continue
+                    if or_node:
+                        best = index
+                        break
+                    if entry[2] > best_work:
+                        best, best_work = index, entry[2]
+                if best is None:
+                    break
+                self._play(best, player)
+                played.append((best, player))
+                line.append(best)
+                or_node = not or_node
+        finally:
+            for index, player in reversed(played):
+                self._undo(index, player)
+        return [divmod(index, self._size) for index in line]
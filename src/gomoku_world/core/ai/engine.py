@@ -3,14 +3,33 @@ AI engine implementation
 AI寮曟搸瀹炵幇
 """
 
-from typing import Tuple, List, Optional
+import weakref
+from typing import Tuple, List, Optional, Union
 from ..board import Board
 from .strategies import MinMaxStrategy, MCTSStrategy
 from .evaluation import PositionEvaluator
+from .info import SearchInfo, InfoCallback
+from .dfpn import ProofNumberStrategy
+from .solver import LOSS, EndgameSolver
+from .timecontrol import GameClock, SearchDeadline
+from ...config import HEALTH_THRESHOLDS, PNS_TIME_SHARE, SOLVER_TIME_SHARE
+from ...config.ai_config import DifficultyProfile, get_difficulty
 from ...utils.logger import get_logger
+from ...utils.monitoring import health_checker, tracer
 
 logger = get_logger(__name__)
 
+_engines: "weakref.WeakSet[AI]" = weakref.WeakSet()  # Live engines / 存活的引擎
+
+
+def _table_fill() -> Optional[float]:
+    """Fill ratio of the fullest proof-number table, None without engines"""
+    return max((ai.proof_strategy.fill_ratio() for ai in list(_engines)), default=None)
+
+
+# One probe for the process, holding no engine alive / 每个进程一个探针，不延长引擎生命周期
+health_checker.register("tt_fill", _table_fill, *HEALTH_THRESHOLDS['tt_fill'])
+
 class AI:
     """
     AI engine that manages game strategies and move generation
@@ -23,12 +42,20 @@ class AI:
         鍒濆鍖朅I寮曟搸
         
         Args:
-            difficulty: AI difficulty level ("easy", "medium", "hard")
+            difficulty: AI difficulty level ("easy", "medium", "hard"),
+                        see ``AI_DIFFICULTY_LEVELS``
         """
         self.difficulty = difficulty
-        self.minmax_strategy = MinMaxStrategy()
-        self.mcts_strategy = MCTSStrategy()
+        profile = get_difficulty(difficulty)
+        self.minmax_strategy = MinMaxStrategy(profile.candidate_limit, profile.eval_noise)
+        self.mcts_strategy = MCTSStrategy(profile.node_budget, profile.candidate_limit,
+                                          profile.eval_noise)
         self.evaluator = PositionEvaluator()
+        self.solver = EndgameSolver()
+        self.proof_strategy = ProofNumberStrategy()
+        self.last_info: Optional[SearchInfo] = None  # Statistics of the last move
+        self.deadline: Optional[SearchDeadline] = None  # Deadline of the running search
+        _engines.add(self)  # Reported by the tt_fill probe / 由tt_fill探针报告
         
         # Set depth based on difficulty
         self.depth = self._get_depth_for_difficulty()
@@ -41,41 +68,103 @@ class AI:
         鏍规嵁闅惧害鑾峰彇鎼滅储娣卞害
         
         Returns:
-            int: Search depth
+            int: Search depth, the iterative deepening limit of the difficulty
         """
-        depths = {
-            "easy": 2,
-            "medium": 4,
-            "hard": 6
-        }
-        return depths.get(self.difficulty, 4)
+        return get_difficulty(self.difficulty).max_depth
+    
+    def _configure(self, profile: DifficultyProfile):
+        """Apply the candidate limit and evaluation noise of a difficulty"""
+        for strategy in (self.minmax_strategy, self.mcts_strategy):
+            strategy.candidate_limit = profile.candidate_limit
+            strategy.evaluator.noise = profile.eval_noise
+        self.mcts_strategy.simulation_limit = profile.node_budget
     
-    def get_move(self, board: Board, player: int) -> Tuple[int, int]:
+    def get_move(self, board: Board, player: int, return_info: bool = False,
+                 on_info: Optional[InfoCallback] = None,
+                 clock: Optional[GameClock] = None,
+                 deadline: Optional[SearchDeadline] = None
+                 ) -> Union[Tuple[int, int], Tuple[Tuple[int, int], SearchInfo]]:
         """
         Get next move for the AI
         鑾峰彇AI鐨勪笅涓姝ョЩ鍔?
         
+        Small boards and endgames are first given to the exact solver,
+        with ``SOLVER_TIME_SHARE`` of the budget, when the difficulty
+        allows it; the strategy searches when they are not proven, or
+        proven lost, where it picks the most stubborn defence. Difficulties
+        that prove wins then spend ``PNS_TIME_SHARE`` of the rest on a
+        proof-number search for a forced win before the strategy searches.
+        
         Args:
             board: Current game board
             player: Current player (1 or 2)
+            return_info: Also return the search statistics
+            on_info: Called with intermediate statistics during the search
+            clock: Clock of the side to move, further limits the budgets
+                   of the difficulty when given
+            deadline: Explicit budget, used instead of the difficulty
+                      budgets and ``clock``
             
         Returns:
-            Tuple[int, int]: Row and column of the move
+            Tuple[int, int]: Row and column of the move, paired with its
+                             SearchInfo when return_info is set
         """
-        # Use different strategies based on difficulty
-        if self.difficulty == "hard":
-            # Use MCTS for hard difficulty
-            move = self.mcts_strategy.get_move(board, player)
-        else:
-            # Use MinMax with alpha-beta pruning for easy/medium
-            move = self.minmax_strategy.get_move(
-                board, 
-                player, 
-                self.depth
-            )
+        profile = get_difficulty(self.difficulty)
+        self._configure(profile)
+        if deadline is None:
+            if clock is not None:
+                deadline = SearchDeadline.from_clock(clock, max_nodes=profile.node_budget)
+            else:
+                deadline = SearchDeadline(max_nodes=profile.node_budget)
+            deadline.cap(profile.time_budget)
+        self.deadline = deadline
+        with tracer.span("ai.get_move", difficulty=self.difficulty) as span:
+            solution = None
+            if profile.solve_endgame and self.solver.applicable(board):
+                solution = self.solver.solve(board, player, deadline.share(SOLVER_TIME_SHARE), on_info)
+            
+            move = None
+            if solution is not None and solution.result != LOSS:
+                # Proven win or draw / 已证明的胜局或和局
+                move = solution.move
+                info = self.solver.info
+            elif profile.prove_wins and solution is None:
+                move = self.proof_strategy.get_move(board, player, on_info,
+                                                    deadline.share(PNS_TIME_SHARE))
+                info = self.proof_strategy.info
+            
+            # Use different strategies based on difficulty when nothing is proven
+            if move is None and profile.strategy == "mcts":
+                # Use MCTS for hard difficulty
+                move = self.mcts_strategy.get_move(board, player, on_info, deadline)
+                info = self.mcts_strategy.info
+            elif move is None:
+                # Use MinMax with alpha-beta pruning for easy/medium
+                move = self.minmax_strategy.get_move(
+                    board, 
+                    player, 
+                    self.depth,
+                    on_info,
+                    deadline
+                )
+                info = self.minmax_strategy.info
+            
+            info.record()
+            span.set(strategy=info.strategy, nodes=info.nodes, depth=info.depth)
         
-        logger.debug(f"AI selected move: {move}")
-        return move
+        self.deadline = None
+        self.last_info = info
+        logger.debug(f"AI selected move: {move} ({info.summary()})")
+        return (move, info) if return_info else move
+    
+    def stop(self):
+        """
+        Stop the running search, which returns its best move so far
+        停止正在进行的搜索，搜索返回目前最好的着法
+        """
+        deadline = self.deadline
+        if deadline is not None:
+            deadline.stop()
     
     def set_difficulty(self, difficulty: str):
         """
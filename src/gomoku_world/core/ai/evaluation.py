@@ -3,6 +3,7 @@ Board evaluation implementation
 灞闈㈣瘎浼板疄鐜?
 """ 
 
+import random
 from typing import List, Tuple, Dict
 import numpy as np
 from ...utils.logger import get_logger
@@ -14,8 +15,15 @@ class PositionEvaluator:
     Position evaluator for AI
     """
     
-    def __init__(self):
-        """Initialize evaluator"""
+    def __init__(self, noise: float = 0.0):
+        """
+        Initialize evaluator
+        
+        Args:
+            noise: Standard deviation of Gaussian noise added to every
+                   evaluation, in score points; weakens lower difficulties
+        """
+        self.noise = noise
         # Pattern scores
         self.pattern_scores = {
             "five": 100000,    # Five in a row
@@ -56,6 +64,8 @@ class PositionEvaluator:
         for diag in range(-board.shape[0]+1, board.shape[1]):
             score += self._evaluate_line(np.diagonal(flipped_board, diag), player)
             
+        if self.noise:
+            score += random.gauss(0.0, self.noise)
         return score
     
     def _evaluate_line(self, line: np.ndarray, player: int) -> float:
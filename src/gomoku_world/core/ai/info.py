@@ -0,0 +1,88 @@
+"""
+Search statistics
+搜索统计
+
+Every search fills a ``SearchInfo`` with what it did: nodes visited,
+depth and selective depth reached, alpha-beta cutoffs, transposition
+table probes, time spent, and the principal variation with its score.
+Strategies stream it through an optional callback while they search and
+keep the final one as ``info``; ``record`` feeds it into the metrics
+registry once per move.
+
+每次搜索都会生成一个``SearchInfo``：访问的节点数、达到的深度和选择性深度、
+alpha-beta剪枝次数、置换表探测、耗时，以及主要变例及其分数。策略在搜索中
+通过可选回调流式报告，并把最终结果保存在``info``中；``record``每步一次将其
+写入指标注册表。
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ...utils.monitoring import observe_search
+
+
+@dataclass
+class SearchInfo:
+    """
+    Statistics of one search
+    一次搜索的统计信息
+    """
+    strategy: str
+    nodes: int = 0
+    depth: int = 0
+    seldepth: int = 0
+    time: float = 0.0
+    cutoffs: int = 0
+    tt_probes: int = 0
+    tt_hits: int = 0
+    score: Optional[float] = None
+    pv: List[Tuple[int, int]] = field(default_factory=list)
+
+    @property
+    def move(self) -> Optional[Tuple[int, int]]:
+        """First move of the principal variation"""
+        return self.pv[0] if self.pv else None
+
+    @property
+    def nps(self) -> float:
+        """Nodes per second"""
+        return self.nodes / self.time if self.time > 0 else 0.0
+
+    @property
+    def tt_hit_rate(self) -> float:
+        """Share of transposition table probes that hit"""
+        return self.tt_hits / self.tt_probes if self.tt_probes else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        return {
+            'strategy': self.strategy,
+            'nodes': self.nodes,
+            'nps': self.nps,
+            'depth': self.depth,
+            'seldepth': self.seldepth,
+            'time': self.time,
+            'cutoffs': self.cutoffs,
+            'tt_hit_rate': self.tt_hit_rate,
+            'score': self.score,
+            'pv': [[int(row), int(col)] for row, col in self.pv]
+        }
+
+    def summary(self) -> str:
+        """One line for logs and the status bar"""
+        text = (f"depth {self.depth}/{self.seldepth}  nodes {self.nodes}  "
+                f"nps {self.nps:.0f}  time {self.time:.2f}s")
+        if self.score is not None:
+            text += f"  score {self.score:.2f}"
+        if self.pv:
+            text += "  pv " + " ".join(f"{row},{col}" for row, col in self.pv[:5])
+        return text
+
+    def record(self):
+        """Feed the final statistics of a move into the metrics registry"""
+        observe_search(self.strategy, self.nodes, self.depth, self.time,
+                       seldepth=self.seldepth, cutoffs=self.cutoffs,
+                       tt_hit_rate=self.tt_hit_rate if self.tt_probes else None)
+
+
+InfoCallback = Callable[[SearchInfo], None]
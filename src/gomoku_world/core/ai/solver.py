@@ -0,0 +1,447 @@
+"""
+Exact endgame solver
+精确残局求解器
+
+Small boards and late-game positions have too few empty cells for a
+heuristic search to be worth it: the solver plays them perfectly. It runs
+an alpha-beta search over the exact game value with a transposition
+table, looking only at the winning lines that can still be completed.
+Immediate wins and single blocks are played without branching, a double
+threat is a proven loss, and a position without a live line is a proven
+draw. All cells outside the live lines are interchangeable, so only one
+of them is ever tried. Proven root results go into a persistent on-disk
+cache, keyed by the position reduced over the eight board symmetries, so
+a position is solved once and answered instantly afterwards.
+
+小棋盘和残局中的空位太少，启发式搜索并不划算：求解器对其完美作答。它在精确的
+博弈值上进行带置换表的alpha-beta搜索，只考虑仍能连成的获胜线。立即获胜和唯一
+的堵点不做分支，双重威胁即已证明的负局，没有活线的局面即已证明的和局。活线之外
+的空位都是等价的，因此只尝试其中一个。已证明的根结果写入持久的磁盘缓存，以棋盘
+八种对称变换下的规范局面为键，一个局面只需求解一次，之后立即作答。
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from ..board import Board
+from .info import SearchInfo, InfoCallback
+from .timecontrol import SearchDeadline
+from ...config import (
+    WIN_LENGTH, AI_TIME_CHECK_INTERVAL, SOLVER_MAX_EMPTY, SOLVER_SMALL_BOARD,
+    SOLVER_NODE_BUDGET, SOLVER_TABLE_SIZE, SOLVER_CACHE_FILE
+)
+from ...utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+_EXACT, _LOWER, _UPPER = 0, 1, 2
+
+
+@dataclass
+class Solution:
+    """
+    Proven value of a position
+    局面的已证明值
+    """
+    result: int  # WIN, DRAW or LOSS for the side to move / 行棋方的胜、和、负
+    move: Optional[Tuple[int, int]]  # Best move, any move when lost / 最佳着法，负局时为任意着法
+
+
+class _AbortSearch(Exception):
+    """The budget ran out before the position was proven"""
+
+
+@lru_cache(maxsize=None)
+def _lines(size: int, length: int) -> Tuple[Tuple[int, ...], ...]:
+    """Cell indices of every ``length`` cells in a row on the board"""
+    lines = []
+    for row in range(size):
+        for col in range(size):
+            for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row, end_col = row + dr * (length - 1), col + dc * (length - 1)
+                if 0 <= end_row < size and 0 <= end_col < size:
+                    lines.append(tuple((row + dr * i) * size + col + dc * i for i in range(length)))
+    return tuple(lines)
+
+
+def _symmetries(size: int) -> List[List[int]]:
+    """Cell permutations of the eight board symmetries, identity first"""
+    maps = []
+    for flip in (False, True):
+        for turns in range(4):
+            mapping = []
+            for index in range(size * size):
+                row, col = divmod(index, size)
+                if flip:
+                    col = size - 1 - col
+                for _ in range(turns):
+                    row, col = col, size - 1 - row
+                mapping.append(row * size + col)
+            maps.append(mapping)
+    return maps
+
+
+class SolverCache:
+    """
+    Persistent table of solved positions
+    已求解局面的持久化表
+    """
+
+    def __init__(self, path: Optional[Union[str, Path]] = SOLVER_CACHE_FILE):
+        """
+        Load the cache
+
+        Args:
+            path: JSON file of the cache, kept in memory only if None
+        """
+        self.path = Path(path) if path is not None else None
+        self.entries: Dict[str, List[int]] = {}
+        self._symmetries: Dict[int, List[List[int]]] = {}
+        if self.path is not None and self.path.exists():
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self.entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable solver cache {self.path}: {e}")
+
+    def _canonical(self, cells: bytes, size: int) -> Tuple[bytes, List[int]]:
+        """Smallest image of the cells over the board symmetries and its mapping"""
+        if size not in self._symmetries:
+            self._symmetries[size] = _symmetries(size)
+        best, best_map = None, None
+        for mapping in self._symmetries[size]:
+            image = bytearray(len(cells))
+            for index, target in enumerate(mapping):
+                image[target] = cells[index]
+            image = bytes(image)
+            if best is None or image < best:
+                best, best_map = image, mapping
+        return best, best_map
+
+    def _key(self, image: bytes, size: int, win_length: int, player: int) -> str:
+        return f"{size}:{win_length}:{player}:{image.hex()}"
+
+    def get(self, cells: bytes, size: int, win_length: int, player: int) -> Optional[Solution]:
+        """Look up a position, None if it was never solved"""
+        image, mapping = self._canonical(cells, size)
+        entry = self.entries.get(self._key(image, size, win_length, player))
+        if entry is None:
+            return None
+        result, index = entry
+        move = None
+        if index >= 0:
+            move = divmod(mapping.index(index), size)
+        return Solution(result, move)
+
+    def put(self, cells: bytes, size: int, win_length: int, player: int, solution: Solution):
+        """Store a proven position and write the cache file"""
+        image, mapping = self._canonical(cells, size)
+        index = -1
+        if solution.move is not None:
+            index = mapping[solution.move[0] * size + solution.move[1]]
+        self.entries[self._key(image, size, win_length, player)] = [solution.result, index]
+        self.save()
+
+    def save(self):
+        """Write the cache file, creating the directory if needed"""
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write solver cache {self.path}: {e}")
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+_default_cache: Optional[SolverCache] = None
+
+
+def default_cache() -> SolverCache:
+    """Cache of ``SOLVER_CACHE_FILE`` shared by all solvers of the process"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = SolverCache()
+    return _default_cache
+
+
+class EndgameSolver:
+    """
+    Exact solver for small boards and near-full positions
+    小棋盘和接近下满局面的精确求解器
+    """
+
+    def __init__(self, max_empty: int = SOLVER_MAX_EMPTY, small_board: int = SOLVER_SMALL_BOARD,
+                 node_budget: int = SOLVER_NODE_BUDGET, win_length: int = WIN_LENGTH,
+                 table_size: int = SOLVER_TABLE_SIZE, cache: Optional[SolverCache] = None):
+        """
+        Initialize the solver
+
+        Args:
+            max_empty: Positions with at most this many empty cells are solved
+            small_board: Boards up to this size are solved from any position
+            node_budget: Nodes a solve may visit before giving up
+            win_length: Stones in a row needed to win
+            table_size: Transposition table entries kept between solves
+            cache: Persistent result cache, ``default_cache()`` if None
+        """
+        self.max_empty = max_empty
+        self.small_board = small_board
+        self.node_budget = node_budget
+        self.win_length = win_length
+        self.table_size = table_size
+        self.cache = cache if cache is not None else default_cache()
+        self.table: Dict[bytes, Tuple[int, int, int]] = {}  # key -> (value, bound, move index)
+        self.nodes = 0
+        self.info = SearchInfo("solver")  # Statistics of the last solve
+        self._deadline: Optional[SearchDeadline] = None
+        logger.info("Endgame solver initialized")
+
+    def applicable(self, board: Board) -> bool:
+        """Whether the position is small enough to be solved"""
+        return board.size <= self.small_board or len(board.get_empty_cells()) <= self.max_empty
+
+    def solve(self, board: Board, player: int, deadline: Optional[SearchDeadline] = None,
+              on_info: Optional[InfoCallback] = None) -> Optional[Solution]:
+        """
+        Solve a position
+
+        Args:
+            board: Current board, left unchanged
+            player: Player to move
+            deadline: Time budget and stop flag, the solve also gives up
+                      after ``node_budget`` nodes
+            on_info: Called with the statistics once the solve ends
+
+        Returns:
+            Optional[Solution]: Proven value and best move, None if the
+                                budget ran out first
+        """
+        start = time.perf_counter()
+        size = board.size
+        cells = bytes(int(value) for value in board.board.flat)
+        self.nodes = 0
+        self.info = SearchInfo("solver")
+
+        solution = self.cache.get(cells, size, self.win_length, player)
+        if solution is None:
+            self._deadline = deadline
+            self._prepare(cells, size)
+            if len(self.table) > self.table_size:
+                self.table.clear()
+            try:
+                value, index = self._root(player)
+            except _AbortSearch:
+                self._finish(None, start, on_info)
+                logger.debug(f"Solver gave up after {self.nodes} nodes")
+                return None
+            finally:
+                self._deadline = None
+            move = divmod(index, size) if index >= 0 else None
+            solution = Solution(value, move)
+            self.cache.put(cells, size, self.win_length, player, solution)
+        self.info.depth = cells.count(0)
+        self._finish(solution, start, on_info)
+        logger.debug(f"Solver proved {solution}")
+        return solution
+
+    def _finish(self, solution: Optional[Solution], start: float,
+                on_info: Optional[InfoCallback]):
+        """Fill in the statistics of the solve"""
+        info = self.info
+        info.nodes = self.nodes
+        info.time = time.perf_counter() - start
+        if solution is not None:
+            info.score = float(solution.result)
+            info.pv = [solution.move] if solution.move is not None else []
+        if on_info is not None:
+            on_info(info)
+
+    def _prepare(self, cells: bytes, size: int):
+        """Build the lines that can still be completed and their stone counts"""
+        self._size = size
+        # Small boards share one table entry for symmetric positions / 小棋盘的对称局面共用一个表项
+        self._maps = []
+        if size <= self.small_board:
+            for mapping in _symmetries(size):
+                inverse = [0] * len(mapping)
+                for index, target in enumerate(mapping):
+                    inverse[target] = index
+                self._maps.append((mapping, inverse, itemgetter(*inverse)))
+        self._cells = bytearray(cells)
+        self._empty_at_root = [index for index, value in enumerate(cells) if not value]
+        lines = []
+        for line in _lines(size, self.win_length):
+            stones = {cells[index] for index in line}
+            # Full or blocked lines never change the result / 已满或被堵的线不影响结果
+            if 0 in stones and not {1, 2} <= stones:
+                lines.append(line)
+        self._lines = lines
+        self._counts = [[0] * len(lines) for _ in range(3)]
+        self._cell_lines: Dict[int, List[int]] = {}
+        for number, line in enumerate(lines):
+            for index in line:
+                self._counts[cells[index]][number] += 1
+                self._cell_lines.setdefault(index, []).append(number)
+
+    def _play(self, index: int, player: int):
+        self._cells[index] = player
+        counts = self._counts[player]
+        for number in self._cell_lines.get(index, ()):
+            counts[number] += 1
+
+    def _undo(self, index: int, player: int):
+        self._cells[index] = 0
+        counts = self._counts[player]
+        for number in self._cell_lines.get(index, ()):
+            counts[number] -= 1
+
+    def _root(self, player: int) -> Tuple[int, int]:
+        """Search the root, returning its value and best move index"""
+        empty = len(self._empty_at_root)
+        # Null windows: can the side to move win, else can it hold the draw / 零窗口：能否获胜，否则能否守和
+        value, index = self._search(player, empty, DRAW, WIN, 0)
+        if value <= DRAW:
+            value, index = self._search(player, empty, LOSS, DRAW, 0)
+        if index < 0 and self._empty_at_root:
+            index = self._empty_at_root[0]
+        return value, index
+
+    def _search(self, player: int, empty: int, alpha: int, beta: int, ply: int) -> Tuple[int, int]:
+        """
+        Negamax over the game-theoretic value of the position
+
+        Returns:
+            Tuple[int, int]: Value for ``player`` and the best move index,
+                             -1 at terminal positions
+        """
+        self.nodes += 1
+        if self.nodes % AI_TIME_CHECK_INTERVAL == 0 and (
+                self.nodes >= self.node_budget
+                or (self._deadline is not None and self._deadline.expired())):
+            raise _AbortSearch()
+        if ply > self.info.seldepth:
+            self.info.seldepth = ply
+        if empty == 0:
+            return DRAW, -1
+
+        opponent = 3 - player
+        length = self.win_length
+        need = length - 1
+        # Moves left to each side / 双方剩余的着法数
+        my_moves, their_moves = (empty + 1) // 2, empty // 2
+        mine, theirs = self._counts[player], self._counts[opponent]
+        cells = self._cells
+        blocks = set()
+        weights: Dict[int, int] = {}
+        dead = bytearray(b'\x03' * len(cells))
+        can_win = can_lose = False
+        # Favour attack when only a win will do, defence when a draw is enough / 只有获胜才够时偏重进攻，和棋即可时偏重防守
+        attack, defence = (2, 1) if alpha >= DRAW else (1, 2) if beta <= DRAW else (1, 1)
+        for number, line in enumerate(self._lines):
+            own, other = mine[number], theirs[number]
+            # A line is open to a side that owns it alone and has the moves to fill it / 线只对独占且有足够着法填满它的一方开放
+            own_open = not other and length - own <= my_moves
+            other_open = not own and length - other <= their_moves
+            if not (own_open or other_open):
+                continue
+            for index in line:
+                dead[index] = 0
+            if own == need or other == need:
+                cell = next(index for index in line if not cells[index])
+                if own == need:
+                    # Completing five / 连成五子
+                    return WIN, cell
+                blocks.add(cell)
+                continue
+            can_win |= own_open
+            can_lose |= other_open
+            weight = (attack * (own + 1) ** 2 if own_open else 0) + (defence * (other + 1) ** 2 if other_open else 0)
+            for index in line:
+                if not cells[index]:
+                    weights[index] = weights.get(index, 0) + weight
+        if len(blocks) > 1:
+            # The opponent completes five next move / 对手下一步连成五子
+            return LOSS, next(iter(blocks))
+        if not blocks and not weights:
+            # No line can be completed any more / 再也没有可以连成的线
+            return DRAW, next(index for index, value in enumerate(cells) if not value)
+        # Bounds that already decide a null window / 已能决定零窗口的界
+        if not blocks and not can_win and alpha >= DRAW:
+            return DRAW, next(iter(weights))
+        if not blocks and not can_lose and beta <= DRAW:
+            return DRAW, next(iter(weights))
+
+        # Stones and empty cells off the live lines only count as a tempo / 活线外的棋子和空位只影响先后手
+        key = bytes(map(max, cells, dead))
+        mapping = inverse = None
+        if self._maps:
+            key, mapping, inverse = min((bytes(permute(key)), mapping, inverse)
+                                        for mapping, inverse, permute in self._maps)
+        key += bytes((player, empty - len(weights)))
+        entry = self.table.get(key)
+        self.info.tt_probes += 1
+        first = -1
+        if entry is not None:
+            self.info.tt_hits += 1
+            value, bound, first = entry
+            if inverse is not None:
+                first = inverse[first]
+            if bound == _EXACT:
+                return value, first
+            if bound == _LOWER and value >= beta:
+                return value, first
+            if bound == _UPPER and value <= alpha:
+                return value, first
+
+        if blocks:
+            moves = list(blocks)
+        else:
+            moves = sorted(weights, key=weights.get, reverse=True)
+            if len(moves) < empty:
+                # Cells off the live lines are interchangeable / 活线外的空位彼此等价
+                moves.append(next(index for index, value in enumerate(cells)
+                                  if not value and index not in weights))
+        if first in moves:
+            moves.remove(first)
+            moves.insert(0, first)
+
+        original_alpha = alpha
+        best_value, best_move = LOSS - 1, moves[0]
+        for index in moves:
+            self._play(index, player)
+            try:
+                value = -self._search(opponent, empty - 1, -beta, -alpha, ply + 1)[0]
+            finally:
+                self._undo(index, player)
+            if value > best_value:
+                best_value, best_move = value, index
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                self.info.cutoffs += 1
+                break
+
+        if best_value <= original_alpha:
+            bound = _UPPER
+        elif best_value >= beta:
+            bound = _LOWER
+        else:
+            bound = _EXACT
+        self.table[key] = (best_value, bound, mapping[best_move] if mapping is not None else best_move)
+        return best_value, best_move
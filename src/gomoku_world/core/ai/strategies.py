@@ -5,11 +5,17 @@ AI绛栫暐瀹炵幇
 
 import math
 import random
+import sys
 import time
 from typing import Tuple, List, Optional, Dict
 from ..board import Board
 from .evaluation import PositionEvaluator
+from .info import SearchInfo, InfoCallback
+from .timecontrol import SearchDeadline, forced_move
+from .utils import AIUtils
 from ...utils.logger import get_logger
+from ...utils.monitoring import profiler
+from ...config import AI_INFO_INTERVAL, AI_TIME_CHECK_INTERVAL
 import numpy as np
 
 logger = get_logger(__name__)
@@ -20,34 +26,121 @@ class MinMaxStrategy:
     鍏锋湁alpha-beta鍓灊鐨凪inMax绛栫暐
     """
     
-    def __init__(self):
-        """Initialize MinMax strategy"""
-        self.evaluator = PositionEvaluator()
+    def __init__(self, candidate_limit: int = 0, eval_noise: float = 0.0):
+        """
+        Initialize MinMax strategy
+        
+        Args:
+            candidate_limit: Moves searched per node, 0 for every empty cell
+            eval_noise: Standard deviation of the evaluation noise
+        """
+        self.candidate_limit = candidate_limit
+        self.evaluator = PositionEvaluator(eval_noise)
+        self.nodes = 0  # Positions visited by the last search
+        self.cutoffs = 0
+        self.seldepth = 0
+        self.info = SearchInfo("minmax")  # Statistics of the last search
+        self._depth = 0
+        self._pv: List[List[Tuple[int, int]]] = []
+        self._deadline: Optional[SearchDeadline] = None
+        self._aborted = False
         logger.info("MinMax strategy initialized")
     
-    def get_move(self, board: Board, player: int, depth: int) -> Tuple[int, int]:
+    def get_move(self, board: Board, player: int, depth: int,
+                 on_info: Optional[InfoCallback] = None,
+                 deadline: Optional[SearchDeadline] = None) -> Tuple[int, int]:
         """
         Get best move using MinMax algorithm
         浣跨敤MinMax绠楁硶鑾峰彇鏈浣崇Щ鍔?
         
+        Without a deadline the search runs to ``depth``. With one it
+        deepens iteratively up to ``depth``, answers forced moves at once,
+        stops deepening after the soft budget and returns the last
+        completed iteration when the hard or node budget aborts the search.
+        
         Args:
             board: Current game board
             player: Current player
             depth: Search depth
+            on_info: Called with the statistics whenever the best move changes
+            deadline: Time budget and stop flag of a timed move
             
         Returns:
             Tuple[int, int]: Best move coordinates
         """
+        start = time.perf_counter()
+        self.nodes = 0
+        self.cutoffs = 0
+        self.seldepth = 0
+        self._deadline = deadline
+        self._aborted = False
+        if deadline is None:
+            return self._search_root(board, player, depth, on_info, start)
+        
+        move = forced_move(board, player)
+        if move is not None:
+            self.info = SearchInfo("minmax", time=time.perf_counter() - start, pv=[move])
+            if on_info is not None:
+                on_info(self.info)
+            logger.debug(f"MinMax played forced move {move}")
+            return move
+        
+        best_move, best_info = None, None
+        for iteration in range(1, depth + 1):
+            move = self._search_root(board, player, iteration, on_info, start, first=best_move)
+            if self._aborted:
+                break
+            # An unstable best move earns more time / 最佳着法不稳定时延长时间
+            if best_move is not None and move != best_move:
+                deadline.extend()
+            best_move, best_info = move, self.info
+            if deadline.soft_expired(self.nodes):
+                break
+        
+        if best_move is None:
+            # Aborted during the first iteration / 第一次迭代中被中止
+            return move
+        self.info = best_info
+        self._update_info(best_info.score, best_info.pv, start)
+        return best_move
+    
+    def _search_root(self, board: Board, player: int, depth: int,
+                     on_info: Optional[InfoCallback], start: float,
+                     first: Optional[Tuple[int, int]] = None) -> Tuple[int, int]:
+        """
+        Search the root moves to a fixed depth
+        
+        Args:
+            board: Current game board
+            player: Current player
+            depth: Search depth
+            on_info: Called with the statistics whenever the best move changes
+            start: Start time of the move
+            first: Move searched first, the best one of the previous iteration
+            
+        Returns:
+            Tuple[int, int]: Best move among the root moves searched in full
+        """
         best_score = float('-inf')
         best_move = None
         alpha = float('-inf')
         beta = float('inf')
+        self._depth = depth
+        self._pv = [[] for _ in range(depth + 1)]
+        self.info = SearchInfo("minmax", depth=depth)
         
-        # Get all valid moves
-        valid_moves = board.get_empty_cells()
-        
-        # Randomize move order for variety
-        random.shuffle(valid_moves)
+        if self.candidate_limit:
+            # Most promising moves first / 最有希望的着法在前
+            valid_moves = AIUtils.get_candidate_moves(board, self.candidate_limit)
+        else:
+            # Get all valid moves
+            valid_moves = board.get_empty_cells()
+            
+            # Randomize move order for variety
+            random.shuffle(valid_moves)
+        if first in valid_moves:
+            valid_moves.remove(first)
+            valid_moves.insert(0, first)
         
         for move in valid_moves:
             # Try move
@@ -64,22 +157,51 @@ class MinMaxStrategy:
             
             # Undo move
             board.clear_cell(move[0], move[1])
+            if self._aborted:
+                break
             
             # Update best
             if score > best_score:
                 best_score = score
                 best_move = move
+                self._update_info(best_score, [move] + self._pv[1], start)
+                if on_info is not None:
+                    on_info(self.info)
             
             # Update alpha
             alpha = max(alpha, best_score)
             
             # Alpha-beta pruning
             if beta <= alpha:
+                self.cutoffs += 1
                 break
         
+        if best_move is None and valid_moves:
+            self.info.pv = [valid_moves[0]]
+        self._update_info(self.info.score, self.info.pv, start)
+        if on_info is not None:
+            on_info(self.info)
+        
         logger.debug(f"MinMax selected move {best_move} with score {best_score}")
         return best_move if best_move else valid_moves[0]
     
+    def _update_info(self, score: Optional[float], pv: List[Tuple[int, int]], start: float):
+        """Copy the running counters into the search statistics"""
+        info = self.info
+        info.nodes = self.nodes
+        info.seldepth = self.seldepth
+        info.cutoffs = self.cutoffs
+        info.time = time.perf_counter() - start
+        info.score = score
+        info.pv = pv
+    
+    def _out_of_time(self) -> bool:
+        """Check the deadline every ``AI_TIME_CHECK_INTERVAL`` nodes"""
+        if (not self._aborted and self._deadline is not None
+                and self.nodes % AI_TIME_CHECK_INTERVAL == 0 and self._deadline.expired(self.nodes)):
+            self._aborted = True
+        return self._aborted
+    
     def _min_value(self, board: Board, depth: int, 
                    alpha: float, beta: float, player: int) -> float:
         """
@@ -95,30 +217,45 @@ class MinMaxStrategy:
         Returns:
             float: Minimum value
         """
+        self.nodes += 1
+        if self._out_of_time():
+            return 0.0
+        ply = self._depth - depth
+        if ply > self.seldepth:
+            self.seldepth = ply
+        self._pv[ply] = []
         if depth == 0:
-            return self.evaluator.evaluate(board.board, player)
+            with profiler.region("evaluation"):
+                return self.evaluator.evaluate(board.board, player)
             
         value = float('inf')
         opponent = 3 - player  # Switch player
         
-        for move in board.get_empty_cells():
+        with profiler.region("move_generation"):
+            moves = AIUtils.get_candidate_moves(board, self.candidate_limit)
+        
+        for move in moves:
             # Try move
             board.place_piece(move[0], move[1], opponent)
             
             # Get score from MaxValue
-            value = min(
-                value,
-                self._max_value(board, depth - 1, alpha, beta, player)
-            )
+            score = self._max_value(board, depth - 1, alpha, beta, player)
             
             # Undo move
             board.clear_cell(move[0], move[1])
+            if self._aborted:
+                break
+            
+            if score < value:
+                value = score
+                self._pv[ply] = [move] + self._pv[ply + 1]
             
             # Update beta
             beta = min(beta, value)
             
             # Alpha-beta pruning
             if beta <= alpha:
+                self.cutoffs += 1
                 break
                 
         return value
@@ -138,29 +275,44 @@ class MinMaxStrategy:
         Returns:
             float: Maximum value
         """
+        self.nodes += 1
+        if self._out_of_time():
+            return 0.0
+        ply = self._depth - depth
+        if ply > self.seldepth:
+            self.seldepth = ply
+        self._pv[ply] = []
         if depth == 0:
-            return self.evaluator.evaluate(board.board, player)
+            with profiler.region("evaluation"):
+                return self.evaluator.evaluate(board.board, player)
             
         value = float('-inf')
         
-        for move in board.get_empty_cells():
+        with profiler.region("move_generation"):
+            moves = AIUtils.get_candidate_moves(board, self.candidate_limit)
+        
+        for move in moves:
             # Try move
             board.place_piece(move[0], move[1], player)
             
             # Get score from MinValue
-            value = max(
-                value,
-                self._min_value(board, depth - 1, alpha, beta, player)
-            )
+            score = self._min_value(board, depth - 1, alpha, beta, player)
             
             # Undo move
             board.clear_cell(move[0], move[1])
+            if self._aborted:
+                break
+            
+            if score > value:
+                value = score
+                self._pv[ply] = [move] + self._pv[ply + 1]
             
             # Update alpha
             alpha = max(alpha, value)
             
             # Alpha-beta pruning
             if beta <= alpha:
+                self.cutoffs += 1
                 break
                 
         return value
@@ -174,7 +326,8 @@ class MCTSNode:
     
     def __init__(self, board: Board, player: int,
                  parent: Optional['MCTSNode'] = None,
-                 move: Optional[Tuple[int, int]] = None):
+                 move: Optional[Tuple[int, int]] = None,
+                 candidate_limit: int = 0):
         """
         Initialize MCTS node
         鍒濆鍖朚CTS鑺傜偣
@@ -184,6 +337,7 @@ class MCTSNode:
             player: Player who made the move
             parent: Parent node
             move: Move that led to this node
+            candidate_limit: Moves expanded per node, 0 for every empty cell
         """
         self.board = board
         self.player = player
@@ -192,7 +346,8 @@ class MCTSNode:
         self.children = []
         self.visits = 0
         self.value = 0.0
-        self.untried_moves = board.get_empty_cells()
+        self.candidate_limit = candidate_limit
+        self.untried_moves = AIUtils.get_candidate_moves(board, candidate_limit)
         
     def is_terminal(self) -> bool:
         """
@@ -235,7 +390,8 @@ class MCTSNode:
             board=board,
             player=3 - self.player,
             parent=self,
-            move=move
+            move=move,
+            candidate_limit=self.candidate_limit
         )
         self.untried_moves.remove(move)
         self.children.append(child)
@@ -259,19 +415,29 @@ class MCTSStrategy:
     钂欑壒鍗℃礇鏍戞悳绱㈢瓥鐣?
     """
     
-    def __init__(self, simulation_limit: int = 1000):
+    def __init__(self, simulation_limit: int = 1000, candidate_limit: int = 0,
+                 eval_noise: float = 0.0):
         """
         Initialize MCTS strategy
         鍒濆鍖朚CTS绛栫暐
         
         Args:
             simulation_limit: Maximum number of simulations
+            candidate_limit: Moves expanded per node, 0 for every empty cell
+            eval_noise: Standard deviation of the evaluation noise
         """
         self.simulation_limit = simulation_limit
-        self.evaluator = PositionEvaluator()
+        self.candidate_limit = candidate_limit
+        self.evaluator = PositionEvaluator(eval_noise)
+        self.nodes = 0  # Simulations run by the last search
+        self.depth = 0  # Length of the most visited line of the last search
+        self.seldepth = 0  # Deepest node selected by the last search
+        self.info = SearchInfo("mcts")  # Statistics of the last search
         logger.info("MCTS strategy initialized")
     
-    def get_move(self, board: Board, player: int) -> Tuple[int, int]:
+    def get_move(self, board: Board, player: int,
+                 on_info: Optional[InfoCallback] = None,
+                 deadline: Optional[SearchDeadline] = None) -> Tuple[int, int]:
         """
         Get best move using MCTS
         浣跨敤MCTS鑾峰彇鏈浣崇Щ鍔?
@@ -279,26 +445,61 @@ class MCTSStrategy:
         Args:
             board: Current game board
             player: Current player
+            on_info: Called with the statistics every ``AI_INFO_INTERVAL``
+                     simulations and once at the end
+            deadline: Time budget and stop flag; when given the search
+                      runs until the soft or node budget instead of
+                      ``simulation_limit`` and answers forced moves at once
             
         Returns:
             Tuple[int, int]: Best move coordinates
         """
-        root = MCTSNode(board=board, player=player)
+        start = time.perf_counter()
+        if deadline is not None:
+            move = forced_move(board, player)
+            if move is not None:
+                self.info = SearchInfo("mcts", time=time.perf_counter() - start, pv=[move])
+                if on_info is not None:
+                    on_info(self.info)
+                return move
+        
+        root = MCTSNode(board=board, player=player, candidate_limit=self.candidate_limit)
+        self.seldepth = 0
+        limit = self.simulation_limit if deadline is None else sys.maxsize
+        leader = None
+        simulation = 0
         
         # Run simulations
-        for _ in range(self.simulation_limit):
+        while simulation < limit:
+            if simulation and deadline is not None and deadline.soft_expired(simulation):
+                break
+            simulation += 1
+            
             # Selection
-            node = self._select(root)
+            with profiler.region("selection"):
+                node = self._select(root)
             
             # Expansion
             if not node.is_terminal() and node.untried_moves:
-                node = self._expand(node)
+                with profiler.region("expansion"):
+                    node = self._expand(node)
             
             # Simulation
-            result = self._simulate(node)
+            with profiler.region("simulation"):
+                result = self._simulate(node)
             
             # Backpropagation
             self._backpropagate(node, result)
+            
+            if simulation % AI_INFO_INTERVAL == 0:
+                if on_info is not None:
+                    on_info(self._search_info(root, simulation, start))
+                if deadline is not None:
+                    # An unstable best move earns more time / 最佳着法不稳定时延长时间
+                    best = max(root.children, key=lambda c: c.visits).move
+                    if leader is not None and best != leader:
+                        deadline.extend()
+                    leader = best
         
         # Get best move
         best_child = max(
@@ -306,9 +507,31 @@ class MCTSStrategy:
             key=lambda c: c.visits
         )
         
+        self.info = self._search_info(root, simulation, start)
+        self.nodes = self.info.nodes
+        self.depth = self.info.depth
+        if on_info is not None:
+            on_info(self.info)
+        
         logger.debug(f"MCTS selected move {best_child.move}")
         return best_child.move
     
+    def _search_info(self, root: 'MCTSNode', simulations: int, start: float) -> SearchInfo:
+        """
+        Build statistics from the current tree
+        
+        The principal variation follows the most visited child at each
+        level, scored by the win rate of its first move.
+        """
+        pv = []
+        node = max(root.children, key=lambda c: c.visits) if root.children else None
+        score = node.value / node.visits if node is not None and node.visits else None
+        while node is not None:
+            pv.append(node.move)
+            node = max(node.children, key=lambda c: c.visits) if node.children else None
+        return SearchInfo("mcts", nodes=simulations, depth=len(pv), seldepth=self.seldepth,
+                          time=time.perf_counter() - start, score=score, pv=pv)
+    
     def _select(self, node: 'MCTSNode') -> 'MCTSNode':
         """
         Select a node for expansion
@@ -320,11 +543,15 @@ class MCTSStrategy:
         Returns:
             MCTSNode: Selected node
         """
+        depth = 0
         while node.children and not node.untried_moves:
             node = max(
                 node.children,
                 key=lambda c: c.uct_value()
             )
+            depth += 1
+        # The expansion below adds one more ply / 之后的扩展再增加一层
+        self.seldepth = max(self.seldepth, depth + 1 if node.untried_moves else depth)
         return node
     
     def _expand(self, node: 'MCTSNode') -> 'MCTSNode':
@@ -365,7 +592,8 @@ class MCTSStrategy:
             board.place_piece(move[0], move[1], current_player)
             current_player = 3 - current_player
         
-        return self.evaluator.evaluate(board.board, node.player)
+        with profiler.region("evaluation"):
+            return self.evaluator.evaluate(board.board, node.player)
     
     def _backpropagate(self, node: 'MCTSNode', result: float):
         """
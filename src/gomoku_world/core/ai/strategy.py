@@ -8,10 +8,15 @@
 - 时间控制
 """
 
-from typing import Dict
+import time
+from typing import Dict, Optional
 from ..board import Board
+from .info import SearchInfo
+from .timecontrol import SearchDeadline
+from .utils import AIUtils
 from ...utils.logger import get_logger
-from ...config import AI_THINKING_TIME
+from ...utils.monitoring import profiler, tracer
+from ...config.ai_config import AI_DIFFICULTY_LEVELS, get_difficulty
 
 logger = get_logger(__name__)
 
@@ -36,15 +41,18 @@ class AIStrategy:
                             AI难度级别（'easy'、'medium'、'hard'）。
         """
         self.strategy = self
-        if difficulty not in ["easy", "medium", "hard"]:
+        if difficulty not in AI_DIFFICULTY_LEVELS:
             difficulty = "medium"
         self.difficulty = difficulty
+        self.profile = get_difficulty(difficulty)  # 难度对应的搜索预算
         self.max_depth = self._get_depth_for_difficulty()
-        self.time_limit = AI_THINKING_TIME
+        self.time_limit = self.profile.time_budget
         self._move_cache = {}
+        self.info = SearchInfo("priority")  # 上次移动的统计信息
         logger.info(f"AI strategy initialized with {difficulty} difficulty / AI策略已初始化，难度为{difficulty}")
 
-    def get_move(self, board: Board, player: int) -> tuple[int, int]:
+    def get_move(self, board: Board, player: int,
+                 deadline: Optional[SearchDeadline] = None) -> tuple[int, int]:
         """Get AI's next move.
         
         获取AI的下一步移动。
@@ -52,30 +60,55 @@ class AIStrategy:
         Args:
             board (Board): Current board state.
             player (int): Current player (1 for black, 2 for white).
+            deadline (Optional[SearchDeadline]): Time budget; scoring stops
+                at the hard or node budget and keeps the best cell so far.
+                Defaults to the budgets of the difficulty.
+                时间预算；到达硬限制或节点预算时停止评分并保留目前最好的位置。
+                默认使用难度的预算。
             
         Returns:
             tuple[int, int]: The chosen move coordinates (row, col).
         """
-        board_key = str(board.board.tobytes())
-        if board_key in self._move_cache:
-            return self._move_cache[board_key]
+        with profiler.region("tt_probe"):
+            board_key = str(board.board.tobytes())
+            cached = self._move_cache.get(board_key)
+        if cached is not None:
+            # 置换表命中，不再评分
+            self.info = SearchInfo("priority", tt_probes=1, tt_hits=1, pv=[cached])
+            self.info.record()
+            return cached
             
-        # 获取所有空位
-        empty_cells = board.get_empty_cells()
-        if not empty_cells:
-            return (-1, -1)
+        with tracer.span("ai.get_move", strategy="priority") as span:
+            start = time.perf_counter()
+        
+            if deadline is None:
+                deadline = SearchDeadline(self.time_limit, self.time_limit, self.profile.node_budget)
+        
+            # 获取候选空位
+            empty_cells = AIUtils.get_candidate_moves(board, self.profile.candidate_limit)
+            if not empty_cells:
+                return (-1, -1)
             
-        # 根据优先级选择移动
-        moves_with_priority = [
-            (cell[0], cell[1], self.get_move_priority(board, cell[0], cell[1]))
-            for cell in empty_cells
-        ]
-        moves_with_priority.sort(key=lambda x: x[2], reverse=True)
+            # 根据优先级选择移动
+            moves_with_priority = []
+            for cell in empty_cells:
+                if moves_with_priority and deadline.expired(len(moves_with_priority)):
+                    break
+                moves_with_priority.append(
+                    (cell[0], cell[1], self.get_move_priority(board, cell[0], cell[1]))
+                )
+            moves_with_priority.sort(key=lambda x: x[2], reverse=True)
         
-        # 选择最优先的移动
-        chosen_move = moves_with_priority[0]
-        self._move_cache[board_key] = (chosen_move[0], chosen_move[1])
-        return chosen_move[0], chosen_move[1]
+            # 选择最优先的移动
+            chosen_move = moves_with_priority[0]
+            self._move_cache[board_key] = (chosen_move[0], chosen_move[1])
+            # Every empty cell is scored once, a search of depth 1 / 每个空位评分一次，相当于深度1的搜索
+            self.info = SearchInfo("priority", nodes=len(moves_with_priority), depth=1, seldepth=1,
+                                   time=time.perf_counter() - start, tt_probes=1,
+                                   score=chosen_move[2], pv=[(chosen_move[0], chosen_move[1])])
+            self.info.record()
+            span.set(nodes=len(moves_with_priority))
+            return chosen_move[0], chosen_move[1]
         
     def set_difficulty(self, difficulty: str):
         """Set AI difficulty level.
@@ -85,10 +118,12 @@ class AIStrategy:
         Args:
             difficulty (str): New difficulty level ('easy', 'medium', 'hard').
         """
-        if difficulty not in ["easy", "medium", "hard"]:
+        if difficulty not in AI_DIFFICULTY_LEVELS:
             return
         self.difficulty = difficulty
+        self.profile = get_difficulty(difficulty)
         self.max_depth = self._get_depth_for_difficulty()
+        self.time_limit = self.profile.time_budget
     
     def _get_depth_for_difficulty(self) -> int:
         """Get search depth based on difficulty level.
@@ -99,11 +134,7 @@ class AIStrategy:
             int: Search depth for the current difficulty level.
                  当前难度级别的搜索深度。
         """
-        return {
-            "easy": 2,    # 2 moves ahead / 提前2步
-            "medium": 3,  # 3 moves ahead / 提前3步
-            "hard": 4     # 4 moves ahead / 提前4步
-        }.get(self.difficulty, 3)
+        return get_difficulty(self.difficulty).max_depth
     
     def get_move_priority(self, board: Board, x: int, y: int) -> float:
         """Calculate priority score for a move.
@@ -0,0 +1,252 @@
+"""
+Time management for timed games
+计时对局的时间管理
+
+A ``GameClock`` holds one side's clock: main time, a Fischer increment
+added after every move, and byoyomi periods that start once the main
+time is used up. ``allocate_time`` turns it into a soft and a hard
+budget for the next move: the soft budget spreads the remaining time
+over the moves still to play, the hard budget is the most the move may
+take without risking the flag. A ``SearchDeadline`` carries both
+budgets, an optional node budget set by the difficulty, and a stop flag
+shared with the caller; strategies stop starting new work once the soft
+budget is spent, abort at the hard budget or when the flag is set,
+extend the soft budget while their best move keeps changing, and answer
+forced moves without searching.
+
+``GameClock``保存一方的棋钟：基本时间、每步后加上的费舍尔加秒，以及基本时间
+用完后开始的读秒次数。``allocate_time``据此为下一步计算软、硬两个预算：软预算
+把剩余时间分配到剩下的步数上，硬预算是这一步不至于超时的最长时间。
+``SearchDeadline``携带这两个预算、由难度设定的可选节点预算，以及与调用方共享的
+停止标志；策略在软预算用完后不再开始新的工作，在硬预算到达或标志被设置时中止，
+在最佳着法不断变化时延长软预算，并对唯一应着直接作答而不搜索。
+"""
+
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from ..board import Board
+from ..rules import Rules
+from ...config import (
+    AI_MOVE_OVERHEAD, AI_TIME_HORIZON, AI_TIME_HARD_FACTOR, AI_TIME_MAX_SHARE,
+    AI_TIME_INSTABILITY_FACTOR, AI_TIME_MIN_BUDGET
+)
+
+_CLOCK_SPEC = re.compile(r"^(\d+(?:\.\d+)?)(?:\+(\d+(?:\.\d+)?)(?:x(\d+))?)?$")
+
+
+@dataclass
+class GameClock:
+    """
+    Clock of one side
+    一方的棋钟
+    """
+    remaining: float  # Main time left in seconds / 剩余基本时间（秒）
+    increment: float = 0.0  # Fischer increment per move / 每步费舍尔加秒
+    byoyomi: float = 0.0  # Length of a byoyomi period / 每次读秒的时长
+    periods: int = 0  # Byoyomi periods left / 剩余读秒次数
+    moves_played: int = 0
+    moves_to_go: Optional[int] = None  # Moves until the next time control / 距下一时间控制的步数
+    flagged: bool = False  # Lost on time / 已超时判负
+
+    @classmethod
+    def parse(cls, spec: str) -> 'GameClock':
+        """
+        Parse a time control
+
+        Args:
+            spec: ``main+increment`` for Fischer (``60+0.5``) or
+                  ``main+periodxcount`` for byoyomi (``30+5x3``), seconds
+
+        Returns:
+            GameClock: Fresh clock
+
+        Raises:
+            ValueError: If the spec is malformed
+        """
+        match = _CLOCK_SPEC.match(spec.strip())
+        if match is None:
+            raise ValueError(f"Invalid time control: {spec}")
+        main, extra, periods = match.groups()
+        if periods is not None:
+            return cls(float(main), byoyomi=float(extra), periods=int(periods))
+        return cls(float(main), increment=float(extra or 0.0))
+
+    @property
+    def in_byoyomi(self) -> bool:
+        """Whether the main time is used up"""
+        return self.remaining <= 0 and self.periods > 0
+
+    def consume(self, elapsed: float) -> bool:
+        """
+        Charge the time of a move
+
+        Args:
+            elapsed: Seconds the move took
+
+        Returns:
+            bool: False if the flag fell
+        """
+        self.moves_played += 1
+        if self.moves_to_go is not None:
+            self.moves_to_go = max(1, self.moves_to_go - 1)
+        if self.remaining > 0:
+            self.remaining -= elapsed
+            if self.remaining >= 0:
+                self.remaining += self.increment
+                return True
+            elapsed, self.remaining = -self.remaining, 0.0
+        # Every period overrun is lost / 每超出一次读秒就失去一次
+        while self.periods > 0 and elapsed > self.byoyomi:
+            elapsed -= self.byoyomi
+            self.periods -= 1
+        if self.periods == 0 and elapsed > 0:
+            self.flagged = True
+        return not self.flagged
+
+
+@dataclass
+class TimeBudget:
+    """Soft and hard time budget of one move"""
+    soft: float
+    hard: float
+
+
+def allocate_time(clock: GameClock, overhead: float = AI_MOVE_OVERHEAD) -> TimeBudget:
+    """
+    Budget the next move
+
+    Args:
+        clock: Clock of the side to move
+        overhead: Seconds kept back for communication
+
+    Returns:
+        TimeBudget: Budgets, never below ``AI_TIME_MIN_BUDGET``
+    """
+    period = clock.byoyomi if clock.periods > 0 else 0.0
+    if clock.remaining > 0:
+        moves_left = clock.moves_to_go or AI_TIME_HORIZON
+        soft = clock.remaining / moves_left + 0.75 * clock.increment
+        hard = min(soft * AI_TIME_HARD_FACTOR,
+                   clock.remaining * AI_TIME_MAX_SHARE + clock.increment)
+        # A byoyomi period covers any overrun of the main time / 读秒可覆盖基本时间的超出
+        hard = max(hard, period)
+    else:
+        soft, hard = period / 2, period
+    hard = max(AI_TIME_MIN_BUDGET, hard - overhead)
+    return TimeBudget(max(AI_TIME_MIN_BUDGET, min(soft, hard)), hard)
+
+
+class SearchDeadline:
+    """
+    Time budget and stop flag shared by a search and its caller
+    搜索与调用方共享的时间预算和停止标志
+    """
+
+    def __init__(self, soft: float = math.inf, hard: float = math.inf,
+                 max_nodes: Optional[int] = None):
+        """
+        Start the clock of a search
+
+        Args:
+            soft: Seconds after which no new iteration is started
+            hard: Seconds after which the search is aborted
+            max_nodes: Nodes (MCTS simulations) after which the search is
+                       aborted, unlimited if None
+        """
+        self.start = time.perf_counter()
+        self.hard = hard
+        self.soft = min(soft, hard)
+        self.max_nodes = max_nodes
+        self._base = self.soft
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_clock(cls, clock: GameClock, overhead: float = AI_MOVE_OVERHEAD,
+                   max_nodes: Optional[int] = None) -> 'SearchDeadline':
+        """Deadline for the next move of a clock"""
+        budget = allocate_time(clock, overhead)
+        return cls(budget.soft, budget.hard, max_nodes)
+
+    def cap(self, seconds: float):
+        """Never allow more than ``seconds``"""
+        self.hard = min(self.hard, seconds)
+        self.soft = min(self.soft, self.hard)
+        self._base = min(self._base, self.soft)
+
+    def share(self, fraction: float) -> 'SearchDeadline':
+        """Deadline of a sub-search given ``fraction`` of the remaining hard budget, sharing the stop flag"""
+        seconds = max(0.0, self.hard - self.elapsed()) * fraction
+        deadline = SearchDeadline(seconds, seconds)
+        deadline._stop = self._stop
+        return deadline
+
+    def elapsed(self) -> float:
+        """Seconds since the search started"""
+        return time.perf_counter() - self.start
+
+    def stop(self):
+        """Ask the search to stop, safe to call from another thread"""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        """Whether ``stop`` was called"""
+        return self._stop.is_set()
+
+    def out_of_nodes(self, nodes: int) -> bool:
+        """Whether ``nodes`` exhaust the node budget"""
+        return self.max_nodes is not None and nodes >= self.max_nodes
+
+    def expired(self, nodes: int = 0) -> bool:
+        """Whether the search must abort now, after searching ``nodes``"""
+        return self._stop.is_set() or self.out_of_nodes(nodes) or self.elapsed() >= self.hard
+
+    def soft_expired(self, nodes: int = 0) -> bool:
+        """Whether the search should not start more work, after searching ``nodes``"""
+        return self._stop.is_set() or self.out_of_nodes(nodes) or self.elapsed() >= self.soft
+
+    def extend(self, factor: float = AI_TIME_INSTABILITY_FACTOR):
+        """
+        Give an unstable search more time
+
+        Each call adds ``factor - 1`` times the original soft budget,
+        never past the hard budget.
+        """
+        self.soft = min(self.hard, self.soft + self._base * (factor - 1))
+
+
+def forced_move(board: Board, player: int) -> Optional[Tuple[int, int]]:
+    """
+    Find a move that needs no search
+
+    That is the only empty cell, a move completing five, or the only
+    cell stopping the opponent from completing five.
+
+    Args:
+        board: Current board, left unchanged
+        player: Player to move
+
+    Returns:
+        Optional[Tuple[int, int]]: The move, or None if a search is needed
+    """
+    empty_cells = board.get_empty_cells()
+    if len(empty_cells) == 1:
+        return empty_cells[0]
+
+    def wins(row: int, col: int, stone: int) -> bool:
+        board.board[row, col] = stone
+        try:
+            return Rules.check_win(board, row, col)
+        finally:
+            board.board[row, col] = 0
+
+    for row, col in empty_cells:
+        if wins(row, col, player):
+            return row, col
+    blocks = [(row, col) for row, col in empty_cells if wins(row, col, 3 - player)]
+    return blocks[0] if len(blocks) == 1 else None
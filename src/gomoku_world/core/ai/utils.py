@@ -10,6 +10,7 @@
 """
 
 from typing import List, Tuple, Dict
+import numpy as np
 from ..board import Board
 from ...utils.logger import get_logger
 
@@ -151,4 +152,50 @@ class AIUtils:
         dx = 0 if row1 == row2 else (row2 - row1) // abs(row2 - row1)
         dy = 0 if col1 == col2 else (col2 - col1) // abs(col2 - col1)
         
-        return dx, dy
\ No newline at end of file
+        return dx, dy
+    
+    @staticmethod
+    def get_candidate_moves(board: Board, limit: int = 0) -> List[Tuple[int, int]]:
+        """Get the most promising empty cells.
+        
+        获取最有希望的空位。
+        
+        Cells are ranked by the stones around them, adjacent stones
+        counting twice as much as stones two cells away; cells with no
+        stone within two cells are skipped. An empty board offers the
+        center.
+        
+        按周围棋子为空位排序，相邻棋子的权重是相隔一格棋子的两倍；两格内没有
+        棋子的空位被跳过。空棋盘只提供中心点。
+        
+        Args:
+            board (Board): Game board.
+                         游戏棋盘。
+            limit (int): Maximum number of moves, 0 for every empty cell
+                        in board order.
+                        最多返回的着法数，0表示按棋盘顺序返回所有空位。
+                        
+        Returns:
+            List[Tuple[int, int]]: Candidate moves, best first.
+                                  候选着法，最好的在前。
+        """
+        if limit <= 0:
+            return board.get_empty_cells()
+        cells = board.board
+        size = cells.shape[0]
+        stones = (cells != 0).astype(np.int32)
+        if not stones.any():
+            return [(size // 2, size // 2)]
+        
+        padded = np.pad(stones, 2)
+        weights = np.zeros_like(stones)
+        for dr in range(-2, 3):
+            for dc in range(-2, 3):
+                if dr or dc:
+                    weight = 2 if max(abs(dr), abs(dc)) == 1 else 1
+                    weights += weight * padded[2 + dr:2 + dr + size, 2 + dc:2 + dc + size]
+        weights[stones == 1] = 0
+        
+        flat = weights.ravel()
+        order = np.argsort(-flat, kind='stable')[:limit]
+        return [(int(i) // size, int(i) % size) for i in order if flat[i] > 0]
@@ -14,6 +14,7 @@ from typing import List, Tuple, Optional
 from dataclasses import dataclass
 import logging
 import numpy as np
+from ..config import WIN_LENGTH
 from ..utils.logger import get_logger
 
 # Configure logging / 配置日志
@@ -360,3 +361,166 @@ class Board:
                   ASCII representation of the board.
         """
         return str(self.board)
+
+
+class CompactBoard:
+    """
+    Compact board stored as a flat bytearray of cells.
+    
+    以扁平字节数组存储的紧凑棋盘。
+    
+    Intended for places that hold many boards at once, such as server game
+    sessions: a 15x15 board costs 225 bytes, every operation is plain index
+    arithmetic, and ``check_win`` only scans the four lines through the last
+    move, so validating a move takes constant time regardless of how full
+    the board is.
+    
+    适用于同时持有大量棋盘的场景（如服务器游戏会话）。``check_win``只扫描
+    经过最后一步的四条线，因此每步验证的时间与棋盘填充程度无关。
+    
+    Attributes:
+        size (int): The size of the game board (size x size).
+        cells (bytearray): Row-major cell values (0 empty, 1 black, 2 white).
+        move_count (int): Number of occupied cells.
+        win_length (int): Stones in a row needed to win.
+    """
+    
+    __slots__ = ('size', 'cells', 'move_count', 'win_length')
+    
+    def __init__(self, size: int = 15, win_length: int = WIN_LENGTH):
+        """
+        Initialize an empty board.
+        
+        初始化空棋盘。
+        
+        Args:
+            size (int): The size of the board (default: 15).
+            win_length (int): Stones in a row needed to win (default: 5).
+        
+        Raises:
+            ValueError: If size is less than 5 or greater than 19.
+        """
+        if not 5 <= size <= 19:
+            raise ValueError("Board size must be between 5 and 19 / Game board size must be between 5 and 19")
+        
+        self.size = size
+        self.cells = bytearray(size * size)
+        self.move_count = 0
+        self.win_length = win_length
+    
+    def copy(self) -> 'CompactBoard':
+        """Create a copy of the board"""
+        new_board = CompactBoard(self.size, self.win_length)
+        new_board.cells[:] = self.cells
+        new_board.move_count = self.move_count
+        return new_board
+    
+    def in_bounds(self, row: int, col: int) -> bool:
+        """Check whether coordinates are on the board"""
+        return 0 <= row < self.size and 0 <= col < self.size
+    
+    def is_valid_move(self, row: int, col: int) -> bool:
+        """
+        Check if a move is valid.
+        
+        检查移动是否有效。
+        
+        Raises:
+            ValueError: If coordinates are out of board bounds.
+        """
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            raise ValueError(f"Coordinates ({row}, {col}) are out of board bounds")
+        return self.cells[row * self.size + col] == 0
+    
+    def place_piece(self, row: int, col: int, player: int) -> bool:
+        """
+        Place a piece on the board.
+        
+        在棋盘上放置棋子。
+        
+        Returns:
+            bool: True if the piece was placed, False if the cell is occupied.
+        
+        Raises:
+            ValueError: If coordinates are out of board bounds.
+        """
+        if not (0 <= row < self.size and 0 <= col < self.size):
+            raise ValueError(f"Coordinates ({row}, {col}) are out of board bounds")
+        
+        index = row * self.size + col
+        if self.cells[index]:
+            return False
+        self.cells[index] = player
+        self.move_count += 1
+        return True
+    
+    def clear_cell(self, row: int, col: int):
+        """Clear a cell on the board"""
+        index = row * self.size + col
+        if self.cells[index]:
+            self.cells[index] = 0
+            self.move_count -= 1
+    
+    def clear(self):
+        """Clear the entire board"""
+        self.cells = bytearray(self.size * self.size)
+        self.move_count = 0
+    
+    def get_piece(self, row: int, col: int) -> int:
+        """Get the piece at a specific position (0 empty, 1 black, 2 white)"""
+        return self.cells[row * self.size + col]
+    
+    def is_full(self) -> bool:
+        """Check if the board is full"""
+        return self.move_count == len(self.cells)
+    
+    def get_empty_cells(self) -> List[Tuple[int, int]]:
+        """Get all empty cells as (row, col) tuples"""
+        size = self.size
+        return [divmod(index, size) for index, value in enumerate(self.cells) if not value]
+    
+    def check_win(self, row: int, col: int) -> bool:
+        """
+        Check whether the stone at (row, col) completes a winning line.
+        
+        检查(row, col)处的棋子是否形成获胜连线。
+        
+        Only the four lines through the given cell are scanned, at most
+        ``win_length - 1`` cells in each direction.
+        
+        Args:
+            row (int): Row of the last move.
+            col (int): Column of the last move.
+        
+        Returns:
+            bool: True if the move wins.
+        """
+        size = self.size
+        cells = self.cells
+        player = cells[row * size + col]
+        if not player:
+            return False
+        
+        reach = self.win_length - 1
+        for dr, dc in ((0, 1), (1, 0), (1, 1), (1, -1)):
+            count = 1
+            for sign in (1, -1):
+                r, c = row + dr * sign, col + dc * sign
+                steps = 0
+                while (steps < reach and 0 <= r < size and 0 <= c < size
+                       and cells[r * size + c] == player):
+                    count += 1
+                    steps += 1
+                    r += dr * sign
+                    c += dc * sign
+            if count >= self.win_length:
+                return True
+        return False
+    
+    def __str__(self) -> str:
+        """Get string representation of the board"""
+        size = self.size
+        return "\n".join(
+            " ".join(str(v) for v in self.cells[r * size:(r + 1) * size])
+            for r in range(size)
+        )
@@ -0,0 +1,422 @@
+"""
+Compact move encoding module.
+
+紧凑着法编码模块。
+
+Moves are stored as board cell indices (``row * size + col``) instead of
+JSON dictionaries. A move list packs into a small header followed by one
+byte per move (two bytes on boards larger than 16x16, since 19x19 has 361
+cells) and an optional block of varint-encoded thinking times in
+milliseconds. The player of each move is implied by its position in the
+sequence (black moves first).
+
+着法以棋盘格索引（``row * size + col``）而非JSON字典存储。着法列表被打包为
+一个小的头部，后跟每步一个字节（大于16x16的棋盘为两个字节）以及可选的
+以varint编码的思考时间（毫秒）。每步的玩家由其在序列中的位置隐含（黑棋先行）。
+
+Layout / 格式::
+
+    version:u8 | board_size:u8 | flags:u8 | count:varint
+    | cells (count * cell_width bytes) | [times: count * varint]
+"""
+
+import base64
+import math
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..config import BOARD_SIZE
+
+CODEC_VERSION = 1
+FLAG_TIMINGS = 0x01
+MOVE_ENCODING = "packed-b64"
+
+
+def encode_varint(value: int, out: bytearray) -> None:
+    """
+    Append an unsigned LEB128 varint to a buffer.
+
+    向缓冲区追加一个无符号LEB128变长整数。
+
+    Args:
+        value: Non-negative integer to encode
+        out: Buffer to append to
+    """
+    if value < 0:
+        raise ValueError(f"Cannot encode negative varint: {value}")
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def decode_varint(data: bytes, pos: int) -> Tuple[int, int]:
+    """
+    Decode an unsigned LEB128 varint.
+
+    解码一个无符号LEB128变长整数。
+
+    Args:
+        data: Encoded bytes
+        pos: Offset of the first varint byte
+
+    Returns:
+        Tuple[int, int]: Decoded value and offset after the varint
+    """
+    result = 0
+    shift = 0
+    while True:
+        if pos >= len(data):
+            raise ValueError("Truncated varint in move data")
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class PackedMoves:
+    """
+    Move sequence stored as packed cell indices.
+
+    以打包格索引存储的着法序列。
+
+    Appending is O(1); serializing copies the packed buffer, so encoding a
+    full game costs a few hundred bytes instead of one dict per move.
+
+    追加为O(1)；序列化只复制打包缓冲区。
+    """
+
+    __slots__ = ('board_size', 'cell_width', '_cells', '_times')
+
+    def __init__(self, board_size: int = BOARD_SIZE):
+        """
+        Initialize an empty move sequence.
+
+        初始化空的着法序列。
+
+        Args:
+            board_size: Size of the board the moves belong to (5-19)
+        """
+        if not 5 <= board_size <= 19:
+            raise ValueError(f"Board size must be between 5 and 19, got {board_size}")
+        self.board_size = board_size
+        self.cell_width = 1 if board_size * board_size <= 256 else 2
+        self._cells = bytearray()
+        self._times: Optional[List[int]] = None
+
+    def __len__(self) -> int:
+        return len(self._cells) // self.cell_width
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        size = self.board_size
+        for cell in self.cells():
+            yield divmod(cell, size)
+
+    def __getitem__(self, index: int) -> Tuple[int, int]:
+        return divmod(self.cell_at(index), self.board_size)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, PackedMoves):
+            return NotImplemented
+        return (self.board_size == other.board_size and
+                self._cells == other._cells and
+                self.timings() == other.timings())
+
+    def __repr__(self) -> str:
+        return f"PackedMoves(board_size={self.board_size}, moves={len(self)})"
+
+    def cell_index(self, row: int, col: int) -> int:
+        """
+        Convert coordinates to a cell index.
+
+        将坐标转换为格索引。
+
+        Raises:
+            ValueError: If coordinates are out of board bounds
+        """
+        if not (0 <= row < self.board_size and 0 <= col < self.board_size):
+            raise ValueError(f"Coordinates ({row}, {col}) are out of board bounds")
+        return row * self.board_size + col
+
+    def cell_at(self, index: int) -> int:
+        """Get the cell index of the move at ``index``"""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("move index out of range")
+        if self.cell_width == 1:
+            return self._cells[index]
+        offset = index * 2
+        return (self._cells[offset] << 8) | self._cells[offset + 1]
+
+    def cells(self) -> List[int]:
+        """Get all moves as cell indices"""
+        if self.cell_width == 1:
+            return list(self._cells)
+        data = self._cells
+        return [(data[i] << 8) | data[i + 1] for i in range(0, len(data), 2)]
+
+    def timings(self) -> Optional[List[int]]:
+        """Get per-move thinking times in milliseconds, if recorded"""
+        return list(self._times) if self._times is not None else None
+
+    def append(self, row: int, col: int, time_ms: Optional[int] = None) -> int:
+        """
+        Append a move.
+
+        追加一步着法。
+
+        Args:
+            row: Row index
+            col: Column index
+            time_ms: Optional thinking time in milliseconds
+
+        Returns:
+            int: Cell index of the appended move
+        """
+        cell = self.cell_index(row, col)
+        self.append_cell(cell, time_ms)
+        return cell
+
+    def append_cell(self, cell: int, time_ms: Optional[int] = None) -> None:
+        """Append a move given as a cell index"""
+        if not 0 <= cell < self.board_size * self.board_size:
+            raise ValueError(f"Cell index {cell} is out of board bounds")
+        # Convert before appending so a bad time leaves the log unchanged
+        time_value = max(0, int(time_ms or 0))
+        if time_ms is not None and self._times is None:
+            self._times = [0] * len(self)
+        if self.cell_width == 1:
+            self._cells.append(cell)
+        else:
+            self._cells += bytes((cell >> 8, cell & 0xFF))
+        if self._times is not None:
+            self._times.append(time_value)
+
+    def pop(self) -> Tuple[int, int]:
+        """Remove and return the last move"""
+        if not self._cells:
+            raise IndexError("pop from empty move list")
+        move = self[-1]
+        del self._cells[-self.cell_width:]
+        if self._times is not None:
+            self._times.pop()
+        return move
+
+    def clear(self) -> None:
+        """Remove all moves"""
+        self._cells.clear()
+        self._times = None
+
+    def player_at(self, index: int) -> int:
+        """Get the player (1 black, 2 white) who made the move at ``index``"""
+        if index < 0:
+            index += len(self)
+        return 1 if index % 2 == 0 else 2
+
+    def to_bytes(self, start: int = 0) -> bytes:
+        """
+        Serialize moves to the packed binary format.
+
+        将着法序列化为打包二进制格式。
+
+        Args:
+            start: Index of the first move to include (for partial updates)
+
+        Returns:
+            bytes: Packed move data
+        """
+        start = max(0, min(start, len(self)))
+        count = len(self) - start
+        flags = FLAG_TIMINGS if self._times is not None else 0
+
+        out = bytearray((CODEC_VERSION, self.board_size, flags))
+        encode_varint(count, out)
+        out += self._cells[start * self.cell_width:]
+        if self._times is not None:
+            for value in self._times[start:]:
+                encode_varint(value, out)
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> 'PackedMoves':
+        """
+        Deserialize moves from the packed binary format.
+
+        从打包二进制格式反序列化着法。
+
+        Raises:
+            ValueError: If the data is malformed
+        """
+        if len(data) < 4:
+            raise ValueError("Move data too short")
+        version, board_size, flags = data[0], data[1], data[2]
+        if version != CODEC_VERSION:
+            raise ValueError(f"Unsupported move encoding version: {version}")
+
+        moves = cls(board_size)
+        count, pos = decode_varint(data, 3)
+        end = pos + count * moves.cell_width
+        if end > len(data):
+            raise ValueError("Truncated move data")
+
+        max_cell = board_size * board_size
+        cells = bytearray(data[pos:end])
+        moves._cells = cells
+        if any(cell >= max_cell for cell in moves.cells()):
+            raise ValueError("Cell index out of board bounds in move data")
+
+        pos = end
+        if flags & FLAG_TIMINGS:
+            times = []
+            for _ in range(count):
+                value, pos = decode_varint(data, pos)
+                times.append(value)
+            moves._times = times
+        return moves
+
+    def to_base64(self, start: int = 0) -> str:
+        """Serialize moves to a base64 string for JSON transports"""
+        return base64.b64encode(self.to_bytes(start)).decode('ascii')
+
+    @classmethod
+    def from_base64(cls, text: str) -> 'PackedMoves':
+        """Deserialize moves from a base64 string"""
+        try:
+            data = base64.b64decode(text, validate=True)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid base64 move data: {e}")
+        return cls.from_bytes(data)
+
+    def extend(self, other: 'PackedMoves') -> None:
+        """Append all moves of another sequence on the same board"""
+        if other.board_size != self.board_size:
+            raise ValueError("Cannot merge moves from different board sizes")
+        times = other.timings()
+        for i, cell in enumerate(other.cells()):
+            self.append_cell(cell, times[i] if times is not None else None)
+
+    def to_dicts(self, offset: int = 0) -> List[Dict]:
+        """
+        Expand moves into dictionaries.
+
+        将着法展开为字典。
+
+        Args:
+            offset: Game move number of the first move, used to derive
+                    colors when this sequence is a tail of a game
+
+        Returns:
+            List[Dict]: Moves as ``{'x': row, 'y': col, 'color': player}``,
+                        with ``'time_ms'`` when timings were recorded
+        """
+        result = []
+        times = self._times
+        for i, (row, col) in enumerate(self):
+            move = {'x': row, 'y': col, 'color': 1 if (offset + i) % 2 == 0 else 2}
+            if times is not None:
+                move['time_ms'] = times[i]
+            result.append(move)
+        return result
+
+    @classmethod
+    def from_dicts(cls, moves: Iterable[Dict],
+                   board_size: int = BOARD_SIZE) -> 'PackedMoves':
+        """
+        Pack move dictionaries.
+
+        打包着法字典。
+
+        Accepts ``x``/``y`` or ``row``/``col`` keys and an optional
+        ``time_ms`` entry.
+
+        Args:
+            moves: Move dictionaries in play order
+            board_size: Board size
+        """
+        packed = cls(board_size)
+        for move in moves:
+            row, col = move_coordinates(move)
+            packed.append(row, col, move.get('time_ms'))
+        return packed
+
+
+def move_coordinates(move: Dict) -> Tuple[int, int]:
+    """
+    Extract (row, col) from a move dictionary.
+
+    从着法字典中提取（行，列）。
+
+    Raises:
+        ValueError: If the dictionary has no usable coordinates
+    """
+    try:
+        if 'x' in move:
+            row, col = move['x'], move['y']
+        else:
+            row, col = move['row'], move['col']
+        if isinstance(row, bool) or isinstance(col, bool):
+            raise TypeError("Coordinates must not be booleans")
+        return int(row), int(col)
+    except (KeyError, TypeError, ValueError):
+        raise ValueError(f"Invalid move data: {move}")
+
+
+def move_time(move: Dict) -> Optional[int]:
+    """
+    Extract the thinking time from a move dictionary.
+
+    从着法字典中提取思考时间。
+
+    Returns:
+        Optional[int]: Thinking time in milliseconds, None if not given
+
+    Raises:
+        ValueError: If the time is not a finite non-negative number
+    """
+    time_ms = move.get('time_ms')
+    if time_ms is None:
+        return None
+    if (isinstance(time_ms, bool) or not isinstance(time_ms, (int, float))
+            or not 0 <= time_ms < math.inf):
+        raise ValueError(f"Invalid move time: {time_ms!r}")
+    return int(time_ms)
+
+
+def decode_moves_field(moves, offset: int = 0) -> List[Dict]:
+    """
+    Normalize a ``moves`` field that may be packed or a list of dicts.
+
+    规范化可能是打包字符串或字典列表的``moves``字段。
+
+    Args:
+        moves: Base64 packed string, raw bytes or a list of move dicts
+        offset: Game move number of the first packed move
+
+    Returns:
+        List[Dict]: Moves as dictionaries
+    """
+    if isinstance(moves, str):
+        return PackedMoves.from_base64(moves).to_dicts(offset)
+    if isinstance(moves, (bytes, bytearray, memoryview)):
+        return PackedMoves.from_bytes(bytes(moves)).to_dicts(offset)
+    return list(moves or [])
+
+
+def encode_moves_field(moves: Iterable[Dict], board_size: int = BOARD_SIZE) -> str:
+    """
+    Pack move dictionaries into a base64 string for JSON documents.
+
+    将着法字典打包为用于JSON文档的base64字符串。
+
+    Args:
+        moves: Move dictionaries in play order
+        board_size: Board size
+
+    Returns:
+        str: Base64 packed moves
+    """
+    if isinstance(moves, PackedMoves):
+        return moves.to_base64()
+    return PackedMoves.from_dicts(moves, board_size).to_base64()
@@ -18,13 +18,14 @@ This module implements the main game logic for Gomoku, including:
 - AI集成
 """
 
+import time
 from typing import Optional, Tuple, List
 from dataclasses import dataclass
 
 # 浣跨敤鐩稿瀵煎叆
 from .board import Board
 from .rules import Rules
-from .ai import AI
+from .ai import AI, GameClock
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -90,6 +91,8 @@ class Game:
         self.winner = None
         self.game_mode = game_mode
         self.ai = AI() if game_mode == "pvc" else None
+        self.time_control: Optional[str] = None  # AI time control, untimed if None / AI时间控制，None为不计时
+        self.ai_clock: Optional[GameClock] = None  # Clock of the AI side / AI一方的棋钟
         
         logger.info(f"Game initialized with {board_size}x{board_size} board, mode: {game_mode}")
     
@@ -158,7 +161,13 @@ class Game:
             return False
         
         try:
-            row, col = self.ai.get_move(self.board, self.current_player)
+            start = time.perf_counter()
+            row, col = self.ai.get_move(self.board, self.current_player, clock=self.ai_clock)
+            if self.ai_clock is not None and not self.ai_clock.consume(time.perf_counter() - start):
+                self.game_over = True
+                self.winner = 3 - self.current_player
+                logger.info("AI lost on time / AI超时判负")
+                return True
             return self.make_move(row, col)
         except Exception as e:
             logger.error(f"AI move error / AI移动错误: {e}")
@@ -214,8 +223,26 @@ class Game:
         self.current_player = 1
         self.game_over = False
         self.winner = None
+        self.ai_clock = GameClock.parse(self.time_control) if self.time_control else None
         logger.info("Game reset / 游戏已重置")
     
+    def set_time_control(self, time_control: Optional[str]):
+        """
+        Set the AI time control.
+        
+        设置AI的时间控制。
+        
+        Args:
+            time_control (Optional[str]): ``main+increment`` (Fischer) or
+                ``main+periodxcount`` (byoyomi) in seconds, None for untimed.
+                ``基本时间+加秒``（费舍尔）或``基本时间+读秒x次数``（读秒），单位为秒，None为不计时。
+        
+        Raises:
+            ValueError: If the time control is malformed.
+        """
+        self.ai_clock = GameClock.parse(time_control) if time_control else None
+        self.time_control = time_control
+    
     def set_game_mode(self, mode: str):
         """
         Set the game mode.
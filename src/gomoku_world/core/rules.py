@@ -81,7 +81,7 @@ class Rules:
                        board.get_piece(x, y) == player):
                     count += 1
                     if count >= 5:
-                        logger.info(f"Win detected for player {player}")
+                        logger.debug(f"Win detected for player {player}")
                         return True
                     x, y = x + dx, y + dy
                     
@@ -11,6 +11,8 @@ from dataclasses import dataclass, asdict
 
 from ..config import SAVE_DIR
 from ..utils.logger import get_logger
+from ..utils.monitoring import measure_save_io
+from .codec import MOVE_ENCODING, encode_moves_field, decode_moves_field
 
 logger = get_logger(__name__)
 
@@ -55,10 +57,10 @@ class SaveManager:
             save_path = self.save_dir / f"{game_data.id}_{int(game_data.timestamp)}.json"
             
             # Convert game data to dictionary
-            save_dict = asdict(game_data)
+            save_dict = self._pack_save(game_data)
             
             # Write to file
-            with open(save_path, 'w', encoding='utf-8') as f:
+            with measure_save_io("save", save_path), open(save_path, 'w', encoding='utf-8') as f:
                 json.dump(save_dict, f, indent=2, ensure_ascii=False)
             
             logger.info(f"Game saved to {save_path}")
@@ -89,11 +91,11 @@ class SaveManager:
             save_path = save_files[0]
             
             # Read save file
-            with open(save_path, 'r', encoding='utf-8') as f:
+            with measure_save_io("load", save_path), open(save_path, 'r', encoding='utf-8') as f:
                 save_dict = json.load(f)
             
             # Convert to GameSave object
-            game_save = GameSave(**save_dict)
+            game_save = GameSave(**self._unpack_save(save_dict))
             
             logger.info(f"Game loaded from {save_path}")
             return game_save
@@ -114,7 +116,7 @@ class SaveManager:
             saves = []
             for save_path in self.save_dir.glob("*.json"):
                 try:
-                    with open(save_path, 'r', encoding='utf-8') as f:
+                    with measure_save_io("list", save_path), open(save_path, 'r', encoding='utf-8') as f:
                         save_dict = json.load(f)
                         saves.append({
                             'id': save_dict['id'],
@@ -122,7 +124,7 @@ class SaveManager:
                             'black_player': save_dict['black_player'],
                             'white_player': save_dict['white_player'],
                             'winner': save_dict.get('winner'),
-                            'moves_count': len(save_dict['moves'])
+                            'moves_count': len(decode_moves_field(save_dict['moves']))
                         })
                 except Exception as e:
                     logger.warning(f"Error reading save file {save_path}: {e}")
@@ -162,6 +164,22 @@ class SaveManager:
             logger.error(f"Error deleting save file: {e}")
             return False
     
+    def _pack_save(self, game_data: GameSave) -> Dict:
+        """Convert save data to a dictionary with packed moves"""
+        save_dict = asdict(game_data)
+        try:
+            save_dict['moves'] = encode_moves_field(game_data.moves, game_data.board_size)
+            save_dict['move_encoding'] = MOVE_ENCODING
+        except ValueError as e:
+            logger.warning(f"Storing unpacked moves for {game_data.id}: {e}")
+        return save_dict
+    
+    def _unpack_save(self, save_dict: Dict) -> Dict:
+        """Expand packed moves in a loaded save dictionary"""
+        if save_dict.pop('move_encoding', None) == MOVE_ENCODING:
+            save_dict['moves'] = decode_moves_field(save_dict['moves'])
+        return save_dict
+    
     def create_save_data(self, game_id: str, black_player: str, white_player: str,
                         moves: List[Dict], board_size: int, game_mode: str,
                         winner: Optional[int] = None, metadata: Dict = None) -> GameSave:
@@ -210,10 +228,10 @@ class SaveManager:
             auto_save_path = self.save_dir / f"autosave_{game_data.id}.json"
             
             # Convert game data to dictionary
-            save_dict = asdict(game_data)
+            save_dict = self._pack_save(game_data)
             
             # Write to file
-            with open(auto_save_path, 'w', encoding='utf-8') as f:
+            with measure_save_io("auto_save", auto_save_path), open(auto_save_path, 'w', encoding='utf-8') as f:
                 json.dump(save_dict, f, indent=2, ensure_ascii=False)
             
             logger.debug(f"Game auto-saved to {auto_save_path}")
@@ -240,11 +258,11 @@ class SaveManager:
                 return None
             
             # Read auto-save file
-            with open(auto_save_path, 'r', encoding='utf-8') as f:
+            with measure_save_io("load_auto_save", auto_save_path), open(auto_save_path, 'r', encoding='utf-8') as f:
                 save_dict = json.load(f)
             
             # Convert to GameSave object
-            game_save = GameSave(**save_dict)
+            game_save = GameSave(**self._unpack_save(save_dict))
             
             logger.info(f"Auto-save loaded from {auto_save_path}")
             return game_save
@@ -5,11 +5,13 @@ Game list window implementation.
 """
 
 import tkinter as tk
+from bisect import bisect_left
 from tkinter import ttk
-from typing import Callable, Dict, List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 
 from ..i18n import i18n_manager
 from ..config import WINDOW_SIZE
+from ..network.lobby import lobby_sort_key
 from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -34,6 +36,11 @@ class GameListWindow(tk.Toplevel):
         
         self.on_spectate = on_spectate
         
+        # Rows shown, keyed by game ID (also the tree item ID), and their
+        # sort keys in display order
+        self._rows: Dict[str, Tuple[tuple, tuple]] = {}
+        self._order: List[tuple] = []
+        
         # Window setup
         self.title(i18n_manager.get_text("window.game_list"))
         self.geometry(f"{WINDOW_SIZE[0]}x{WINDOW_SIZE[1]}")  # Format: "widthxheight"
@@ -113,33 +120,77 @@ class GameListWindow(tk.Toplevel):
         Update the game list
         鏇存柊娓告垙鍒楄〃
         
+        Rows are diffed against the games shown: only new, changed and
+        vanished games touch the tree.
+        
         Args:
             games: List of game information
         """
         try:
-            # Clear current items
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # Add new items
+            current = {game.get("id", ""): game for game in games}
+            self._remove_rows(game_id for game_id in list(self._rows) if game_id not in current)
             for game in games:
-                self.tree.insert(
-                    "",
-                    tk.END,
-                    values=(
-                        game.get("black_player", "-"),
-                        game.get("white_player", "-"),
-                        game.get("status", "-"),
-                        game.get("spectator_count", 0)
-                    ),
-                    tags=(game.get("id", ""))
-                )
+                self._upsert_row(game)
             
             logger.debug(f"Updated game list with {len(games)} games")
             
         except Exception as e:
             logger.error(f"Error updating game list: {e}")
     
+    def apply_game_changes(self, updated: List[Dict], removed: List[str]):
+        """
+        Apply an incremental lobby update
+        
+        Args:
+            updated: Current rows of new or changed games on the page
+            removed: IDs of games that ended or left the page
+        """
+        try:
+            self._remove_rows(removed)
+            for game in updated:
+                self._upsert_row(game)
+            
+            logger.debug(f"Applied {len(updated)} updated and {len(removed)} removed games")
+            
+        except Exception as e:
+            logger.error(f"Error updating game list: {e}")
+    
+    def _upsert_row(self, game: Dict):
+        """Insert a game row or update it in place, keeping lobby order"""
+        game_id = game.get("id", "")
+        key = lobby_sort_key(game)
+        values = (
+            game.get("black_player", "-"),
+            game.get("white_player", "-"),
+            game.get("status", "-"),
+            game.get("spectator_count", 0)
+        )
+        
+        row = self._rows.get(game_id)
+        if row is None:
+            index = bisect_left(self._order, key)
+            self._order.insert(index, key)
+            self.tree.insert("", index, iid=game_id, values=values)
+        else:
+            old_key, old_values = row
+            if old_values != values:
+                self.tree.item(game_id, values=values)
+            if old_key != key:
+                del self._order[bisect_left(self._order, old_key)]
+                index = bisect_left(self._order, key)
+                self._order.insert(index, key)
+                self.tree.move(game_id, "", index)
+        self._rows[game_id] = (key, values)
+    
+    def _remove_rows(self, game_ids: Iterable[str]):
+        """Delete the rows of the given games"""
+        for game_id in game_ids:
+            row = self._rows.pop(game_id, None)
+            if row is None:
+                continue
+            del self._order[bisect_left(self._order, row[0])]
+            self.tree.delete(game_id)
+    
     def _on_select(self, event):
         """Handle game selection"""
         selected = self.tree.selection()
@@ -151,8 +202,8 @@ class GameListWindow(tk.Toplevel):
         """Handle spectate button click"""
         selected = self.tree.selection()
         if selected and self.on_spectate:
-            # Get game ID from item tags
-            game_id = self.tree.item(selected[0])["tags"][0]
+            # Item IDs are game IDs
+            game_id = selected[0]
             self.on_spectate(game_id)
             logger.info(f"Spectate requested for game {game_id}")
     
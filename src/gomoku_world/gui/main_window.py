@@ -159,6 +159,7 @@ class GomokuGUI:
         self.game.reset()
         self.board_canvas.redraw()
         self.status_bar.set_message(resource_manager.get_text("game.new_game"))
+        self.status_bar.set_search_info(None)
         sound_manager.play("start")
         logger.info("New game started")
     
@@ -189,6 +190,8 @@ class GomokuGUI:
         if self.game.make_move(row, col):
             self.board_canvas.redraw()
             sound_manager.play("place")
+            if self.game.ai is not None:
+                self.status_bar.set_search_info(self.game.ai.last_info)
             
             if self.game.winner is not None:
                 win_text = resource_manager.get_text(
@@ -222,7 +225,8 @@ class GomokuGUI:
             )
             self.game_list_window.on_refresh = self._refresh_game_list
             
-            # Initial game list update
+            # Initial game list update; a new window needs a full page
+            self.client.lobby_version = None
             asyncio.create_task(self._refresh_game_list())
     
     async def _refresh_game_list(self):
@@ -231,8 +235,13 @@ class GomokuGUI:
             return
             
         try:
-            games = await self.client.list_games()
-            self.game_list_window.update_game_list(games)
+            changes = await self.client.sync_lobby()
+            if changes is None:
+                raise ConnectionError("list_games failed")
+            if changes['full']:
+                self.game_list_window.update_game_list(changes['updated'])
+            else:
+                self.game_list_window.apply_game_changes(changes['updated'], changes['removed'])
         except Exception as e:
             logger.error(f"Error refreshing game list: {e}")
             messagebox.showerror(
@@ -274,10 +283,8 @@ class GomokuGUI:
             if await self.client.spectate_game(game_id):
                 # Register event handlers
                 self.client.on('game_state', window.update_game_state)
-                self.client.on('chat', lambda data: window.add_chat_message(
-                    data['sender'],
-                    data['message']
-                ))
+                self.client.on('chat_batch', window.add_chat_messages)
+                window.add_chat_messages(list(self.client.spectator_chat))
                 
                 # Register chat callback
                 window.on_chat_message = lambda msg: asyncio.create_task(
@@ -39,6 +39,9 @@ class SpectatorWindow(tk.Toplevel):
         self.game_id = game_id
         self.on_close = on_close
         
+        # Chat lines waiting for the next idle-time render
+        self._chat_pending: List[str] = []
+        
         # Window setup
         self.title(f"Watching Game - {game_id}")
         self.geometry(WINDOW_SIZE)
@@ -259,26 +262,52 @@ class SpectatorWindow(tk.Toplevel):
             sender: Message sender
             message: Chat message
         """
-        if not (SPECTATOR_FEATURES["chat"] and SPECTATOR_CHAT_ENABLED):
+        self.add_chat_messages([{'sender': sender, 'message': message}])
+    
+    def add_chat_messages(self, messages: List[Dict]):
+        """
+        Add a batch of chat messages
+        
+        Lines are rendered together when Tk is idle, and the widget never
+        holds more than ``SPECTATOR_CHAT_HISTORY`` lines, so a busy game
+        costs one widget update per batch and bounded memory.
+        
+        Args:
+            messages: Messages with ``sender``, ``message`` and optional ``time``
+        """
+        if not (SPECTATOR_FEATURES["chat"] and SPECTATOR_CHAT_ENABLED) or not messages:
             return
-            
+        
+        for message in messages:
+            sent = message.get('time')
+            stamp = datetime.fromtimestamp(sent) if sent is not None else datetime.now()
+            self._chat_pending.append(
+                f"[{stamp.strftime('%H:%M')}] {message.get('sender', '-')}: {message.get('message', '')}\n"
+            )
+        
+        if len(self._chat_pending) == len(messages):
+            self.after_idle(self._render_chat)
+    
+    def _render_chat(self):
+        """Append pending chat lines and trim the oldest ones"""
+        lines, self._chat_pending = self._chat_pending[-SPECTATOR_CHAT_HISTORY:], []
+        if not lines:
+            return
+        
         try:
-            # Format message
-            timestamp = datetime.now().strftime("%H:%M")
-            chat_text = f"[{timestamp}] {sender}: {message}\n"
-            
-            # Add to chat
             self.chat_text.configure(state=tk.NORMAL)
-            self.chat_text.insert(tk.END, chat_text)
+            self.chat_text.insert(tk.END, "".join(lines))
             
             # Limit chat history
-            if self.chat_text.index(tk.END) > str(SPECTATOR_CHAT_HISTORY):
-                self.chat_text.delete("1.0", "2.0")
+            count = int(self.chat_text.index("end-1c").split(".")[0]) - 1
+            excess = count - SPECTATOR_CHAT_HISTORY
+            if excess > 0:
+                self.chat_text.delete("1.0", f"{excess + 1}.0")
             
             self.chat_text.see(tk.END)
             self.chat_text.configure(state=tk.DISABLED)
             
-            logger.debug("Chat message added")
+            logger.debug(f"Rendered {len(lines)} chat messages")
             
         except Exception as e:
             logger.error(f"Error adding chat message: {e}")
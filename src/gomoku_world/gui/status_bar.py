@@ -47,6 +47,13 @@ class StatusBar(ttk.Frame):
             anchor=tk.W
         )
         
+        # Search statistics of the last AI move
+        self.search_label = ttk.Label(
+            self,
+            text="",
+            anchor=tk.E
+        )
+        
         # Progress bar (for future use)
         self.progress_bar = ttk.Progressbar(
             self,
@@ -66,6 +73,7 @@ class StatusBar(ttk.Frame):
         
         # Layout widgets
         self.message_label.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.search_label.pack(side=tk.RIGHT, padx=5)
         # Progress bar is packed only when needed
         
         logger.debug("Status bar layout completed")
@@ -81,6 +89,15 @@ class StatusBar(ttk.Frame):
         self.message_label.configure(text=message)
         logger.debug(f"Status message set to: {message}")
     
+    def set_search_info(self, info):
+        """
+        Show the statistics of the last AI search
+        
+        Args:
+            info: SearchInfo of the move, None to clear
+        """
+        self.search_label.configure(text=info.summary() if info is not None else "")
+    
     def start_progress(self):
         """
         Start progress bar animation
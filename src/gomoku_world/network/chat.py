@@ -0,0 +1,130 @@
+"""
+Spectator chat with batching and bounded history
+带批量发送和有界历史的观战聊天
+
+Each game has a chat room holding a ring buffer of its most recent
+messages, which late joiners receive with the game state. Messages posted
+within ``CHAT_BATCH_INTERVAL`` of the first pending one are sent to every
+spectator as a single ``chat_batch`` frame, encoded once, so a busy game
+costs one fan-out per interval instead of one per message.
+
+每局对局有一个聊天室，用环形缓冲区保存最近的消息，后加入的观战者随对局状态
+一起收到。在首条待发送消息后``CHAT_BATCH_INTERVAL``内发布的消息合并为一个
+``chat_batch``帧，只编码一次发送给所有观战者。
+"""
+
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from ..utils.logger import get_logger
+from ..config import SPECTATOR_CHAT_HISTORY, CHAT_BATCH_INTERVAL, CHAT_MAX_MESSAGE_LENGTH
+from .protocol import encode_frame
+
+logger = get_logger(__name__)
+
+
+class ChatRoom:
+    """
+    Chat state of one game
+    单局聊天状态
+    """
+
+    __slots__ = ('history', 'pending', 'flush_handle')
+
+    def __init__(self, history_size: int):
+        """Initialize room"""
+        self.history: Deque[Dict] = deque(maxlen=history_size)
+        self.pending: List[Dict] = []
+        self.flush_handle: Optional[asyncio.TimerHandle] = None
+
+
+class ChatManager:
+    """
+    Spectator chat rooms keyed by game ID
+    按对局ID管理的观战聊天室
+    """
+
+    def __init__(self, broadcast: Callable[[str, bytes], int],
+                 history_size: int = SPECTATOR_CHAT_HISTORY,
+                 batch_interval: float = CHAT_BATCH_INTERVAL):
+        """
+        Initialize chat manager
+
+        Args:
+            broadcast: Function sending a frame to all spectators of a game
+            history_size: Messages kept per game for late joiners
+            batch_interval: Seconds messages are collected before sending
+        """
+        self.broadcast = broadcast
+        self.history_size = history_size
+        self.batch_interval = batch_interval
+        self.rooms: Dict[str, ChatRoom] = {}
+        self._seq = itertools.count(1)
+
+    def post(self, game_id: str, sender: str, message: str) -> Dict:
+        """
+        Add a message and schedule the batch containing it
+
+        Args:
+            game_id: Game ID
+            sender: Sender name
+            message: Message text, truncated to ``CHAT_MAX_MESSAGE_LENGTH``
+
+        Returns:
+            Dict: The stored message
+        """
+        room = self.rooms.get(game_id)
+        if room is None:
+            room = self.rooms[game_id] = ChatRoom(self.history_size)
+
+        entry = {
+            'seq': next(self._seq),
+            'sender': sender,
+            'message': message[:CHAT_MAX_MESSAGE_LENGTH],
+            'time': time.time()
+        }
+        room.history.append(entry)
+        room.pending.append(entry)
+
+        if room.flush_handle is None:
+            loop = asyncio.get_running_loop()
+            room.flush_handle = loop.call_later(self.batch_interval, self.flush, game_id)
+        return entry
+
+    def flush(self, game_id: str) -> int:
+        """
+        Send the pending messages of a game as one frame
+
+        Returns:
+            int: Number of messages sent
+        """
+        room = self.rooms.get(game_id)
+        if room is None:
+            return 0
+        if room.flush_handle is not None:
+            room.flush_handle.cancel()
+            room.flush_handle = None
+
+        messages, room.pending = room.pending, []
+        if not messages:
+            return 0
+
+        frame = encode_frame({
+            'event': 'chat_batch',
+            'data': {'game_id': game_id, 'messages': messages}
+        })
+        self.broadcast(game_id, frame)
+        return len(messages)
+
+    def history(self, game_id: str) -> List[Dict]:
+        """Get the recent messages of a game, oldest first"""
+        room = self.rooms.get(game_id)
+        return list(room.history) if room is not None else []
+
+    def close(self, game_id: str):
+        """Send what is pending and drop a game's room"""
+        self.flush(game_id)
+        self.rooms.pop(game_id, None)
@@ -4,13 +4,21 @@ Game client implementation
 """
 
 import asyncio
-import json
+import itertools
 import uuid
-from typing import Optional, Callable, Dict, List
+from collections import deque
+from typing import Optional, Callable, Deque, Dict, List
 from dataclasses import dataclass
 
+from ..core.codec import MOVE_ENCODING, decode_moves_field
 from ..utils.logger import get_logger
-from ..config import DEFAULT_HOST, DEFAULT_PORT, SPECTATOR_UPDATE_INTERVAL
+from ..utils.monitoring import tracer
+from ..config import (
+    DEFAULT_HOST, DEFAULT_PORT, MAX_MESSAGE_SIZE, CLIENT_REQUEST_TIMEOUT,
+    SPECTATOR_CHAT_HISTORY
+)
+from .lobby import decode_cursor, lobby_sort_key
+from .protocol import encode_frame, decode_frame
 
 logger = get_logger(__name__)
 
@@ -31,8 +39,23 @@ class GameClient:
         self.player_id = str(uuid.uuid4())
         self.game_id: Optional[str] = None
         self.spectating_game_id: Optional[str] = None
+        self.spectator_state: Optional[Dict] = None
+        self.spectator_seq = 0
+        self.spectator_chat: Deque[Dict] = deque(maxlen=SPECTATOR_CHAT_HISTORY)
         self.callbacks: Dict[str, Callable] = {}
-        self.update_task: Optional[asyncio.Task] = None
+        self.resync_task: Optional[asyncio.Task] = None
+        
+        # Lobby rows of the page shown, the page (cursor, limit) and its version
+        self.lobby_games: Dict[str, Dict] = {}
+        self.lobby_version: Optional[int] = None
+        self.lobby_window: tuple = (None, None)
+        
+        # Single reader task; responses are matched to requests by ID
+        self.listen_task: Optional[asyncio.Task] = None
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._event_waiters: Dict[str, List[asyncio.Future]] = {}
+        self._write_lock: Optional[asyncio.Lock] = None
         
         logger.info(f"Game client initialized for {host}:{port}")
     
@@ -47,13 +70,15 @@ class GameClient:
         try:
             self.reader, self.writer = await asyncio.open_connection(
                 self.host, 
-                self.port
+                self.port,
+                limit=MAX_MESSAGE_SIZE
             )
             self.connected = True
+            self._write_lock = asyncio.Lock()
             logger.info("Connected to server")
             
-            # Start listening for server messages
-            asyncio.create_task(self._listen_for_messages())
+            # Start the only task that reads from the connection
+            self.listen_task = asyncio.create_task(self._listen_for_messages())
             
             return True
             
@@ -64,33 +89,114 @@ class GameClient:
     async def disconnect(self):
         """Disconnect from the server"""
         if self.connected:
-            # Stop spectating if active
-            if self.spectating_game_id:
+            listening = (self.listen_task is not None and not self.listen_task.done()
+                         and self.listen_task is not asyncio.current_task())
+            
+            # Stop spectating if active and the reader can still see the reply
+            if self.spectating_game_id and listening:
                 await self.leave_spectate()
             
-            # Cancel update task if running
-            if self.update_task:
-                self.update_task.cancel()
-                
+            # Cancel pending resync if running
+            if self.resync_task:
+                self.resync_task.cancel()
+            
+            self.connected = False
+            if listening:
+                self.listen_task.cancel()
+            self._fail_pending('Connection closed')
+            
             if self.writer:
                 self.writer.close()
-                await self.writer.wait_closed()
-            self.connected = False
+                try:
+                    await self.writer.wait_closed()
+                except Exception:
+                    pass
             logger.info("Disconnected from server")
     
-    async def list_games(self) -> List[Dict]:
+    async def list_games(self, cursor: Optional[str] = None,
+                         limit: Optional[int] = None) -> List[Dict]:
         """
         Get list of available games to spectate
         鑾峰彇鍙鎴樼殑娓告垙鍒楄〃
         
+        Args:
+            cursor: Cursor of the page to fetch, None for the first page
+            limit: Page size, None for the server default
+        
         Returns:
             List[Dict]: List of game information
         """
-        response = await self._send_message('list_games', {})
+        response = await self._send_message('list_games', self._lobby_request(cursor, limit))
         if response.get('status') == 'ok':
             return response.get('data', {}).get('games', [])
         return []
     
+    @staticmethod
+    def _lobby_request(cursor: Optional[str], limit: Optional[int]) -> dict:
+        data = {}
+        if cursor is not None:
+            data['cursor'] = cursor
+        if limit is not None:
+            data['limit'] = limit
+        return data
+    
+    async def sync_lobby(self, cursor: Optional[str] = None,
+                         limit: Optional[int] = None) -> Optional[Dict]:
+        """
+        Bring ``lobby_games`` up to date with the server for one page
+        
+        The first call, or a call for another page, fetches the page; later
+        calls send the lobby version held and receive only the changes to
+        that page. Rows pushed past the end of the page are dropped. If
+        unchanged rows slid into the page, or the server no longer has the
+        changes, the page is fetched again.
+        
+        Args:
+            cursor: Cursor the page starts after, None for the first page
+            limit: Page size, None for the server default
+        
+        Returns:
+            Optional[Dict]: ``{'full': bool, 'updated': [...], 'removed': [...]}``,
+                            None if the request failed
+        """
+        window = (cursor, limit)
+        data = self._lobby_request(cursor, limit)
+        if self.lobby_version is not None and window == self.lobby_window:
+            data['since'] = self.lobby_version
+        
+        response = await self._send_message('list_games', data)
+        if response.get('status') != 'ok':
+            return None
+        
+        result = response.get('data', {})
+        self.lobby_version = result.get('version')
+        self.lobby_window = window
+        if 'games' in result:
+            games = result['games']
+            fresh = {game['id']: game for game in games}
+            removed = [game_id for game_id in self.lobby_games if game_id not in fresh]
+            self.lobby_games = fresh
+            return {'full': True, 'updated': games, 'removed': removed}
+        
+        removed = [game_id for game_id in result.get('removed', [])
+                   if self.lobby_games.pop(game_id, None) is not None]
+        updated = result.get('updated', [])
+        for game in updated:
+            self.lobby_games[game['id']] = game
+        
+        if 'count' in result:
+            last = result.get('last')
+            end = decode_cursor(last) if last else None
+            for game_id, game in list(self.lobby_games.items()):
+                if end is None or lobby_sort_key(game) > end:
+                    del self.lobby_games[game_id]
+                    removed.append(game_id)
+            if len(self.lobby_games) != result['count']:
+                self.lobby_version = None
+                return await self.sync_lobby(cursor, limit)
+        
+        return {'full': False, 'updated': updated, 'removed': removed}
+    
     async def spectate_game(self, game_id: str) -> bool:
         """
         Start spectating a game
@@ -112,15 +218,16 @@ class GameClient:
         
         if response.get('status') == 'ok':
             self.spectating_game_id = game_id
+            self.spectator_state = None
+            self.spectator_seq = 0
             
-            # Start update task
-            self.update_task = asyncio.create_task(
-                self._spectator_update_loop()
-            )
+            # Recent chat comes with the state; later lines arrive in batches
+            data = response.get('data', {})
+            self.spectator_chat.clear()
+            self.spectator_chat.extend(data.pop('chat', []))
             
-            # Emit initial game state
-            if 'game_state' in self.callbacks:
-                self.callbacks['game_state'](response.get('data', {}))
+            # Emit initial game state; later updates arrive as pushed deltas
+            self._apply_game_update(data)
             
             logger.info(f"Started spectating game {game_id}")
             return True
@@ -143,12 +250,15 @@ class GameClient:
         })
         
         if response.get('status') == 'ok':
-            # Cancel update task
-            if self.update_task:
-                self.update_task.cancel()
-                self.update_task = None
+            # Cancel pending resync
+            if self.resync_task:
+                self.resync_task.cancel()
+                self.resync_task = None
             
             self.spectating_game_id = None
+            self.spectator_state = None
+            self.spectator_seq = 0
+            self.spectator_chat.clear()
             logger.info("Stopped spectating")
             return True
             
@@ -186,63 +296,222 @@ class GameClient:
         """
         self.callbacks[event] = callback
     
-    async def _spectator_update_loop(self):
-        """Update loop for spectator mode"""
+    def _apply_game_update(self, data: dict):
+        """
+        Apply a spectator snapshot or delta to the local game state
+        
+        Deltas are appended when their sequence number matches the number
+        of moves held locally; overlapping deltas are trimmed and a gap
+        triggers a resync from the last known sequence number.
+        """
+        if not data or data.get('game_id') != self.spectating_game_id:
+            return
+        
+        seq = data.get('seq', 0)
+        if data.get('snapshot', True):
+            state = self._decode_game_state(data)
+            state.pop('snapshot', None)
+            self.spectator_state = state
+            self.spectator_seq = len(state.get('moves', []))
+            new_moves = []
+        else:
+            if self.spectator_state is None or seq > self.spectator_seq:
+                self._request_resync()
+                return
+            
+            moves = decode_moves_field(data.get('moves'), seq)
+            new_moves = moves[self.spectator_seq - seq:]
+            self.spectator_state['moves'].extend(new_moves)
+            for key in ('status', 'winner'):
+                self.spectator_state[key] = data.get(key, self.spectator_state.get(key))
+            self.spectator_seq += len(new_moves)
+        
+        if 'move' in self.callbacks:
+            for move in new_moves:
+                self.callbacks['move'](move)
+        if 'game_state' in self.callbacks:
+            self.callbacks['game_state'](self.spectator_state)
+    
+    def _request_resync(self):
+        """Schedule a state request after a sequence gap"""
+        if self.resync_task and not self.resync_task.done():
+            return
+        self.resync_task = asyncio.create_task(self._resync_spectator())
+    
+    async def _resync_spectator(self):
+        """Fetch the moves missed since the last applied sequence number"""
         try:
-            while self.spectating_game_id:
-                response = await self._send_message('get_game_state', {
-                    'game_id': self.spectating_game_id
-                })
-                
-                if response.get('status') == 'ok':
-                    if 'game_state' in self.callbacks:
-                        self.callbacks['game_state'](response.get('data', {}))
-                
-                await asyncio.sleep(SPECTATOR_UPDATE_INTERVAL)
+            since = self.spectator_seq if self.spectator_state is not None else None
+            response = await self._send_message('get_game_state', {
+                'game_id': self.spectating_game_id,
+                'since': since
+            })
+            
+            if response.get('status') == 'ok':
+                self._apply_game_update(response.get('data', {}))
                 
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            logger.error(f"Error in spectator update loop: {e}")
+            logger.error(f"Error resyncing spectator state: {e}")
     
-    async def _send_message(self, cmd: str, data: dict) -> dict:
-        """Send message to server"""
+    @staticmethod
+    def _decode_game_state(data: dict) -> dict:
+        """Expand packed moves in a game state into move dictionaries"""
+        if data.get('move_encoding') == MOVE_ENCODING:
+            data = dict(data)
+            data['moves'] = decode_moves_field(data.get('moves'))
+            del data['move_encoding']
+        return data
+    
+    async def _send_message(self, cmd: str, data: dict,
+                            timeout: Optional[float] = CLIENT_REQUEST_TIMEOUT) -> dict:
+        """
+        Send a request and wait for its response
+        
+        The request carries a request ID that the server echoes back; the
+        reader task resolves the matching future, so several requests may be
+        in flight at once while pushed events keep flowing. The request is
+        timed as a span, and a sampled trace's context travels in the frame
+        so the server's spans join the same trace.
+        
+        Args:
+            cmd: Command name
+            data: Command data
+            timeout: Seconds to wait for the response, None to wait forever
+            
+        Returns:
+            dict: Server response, or an error response on failure
+        """
         if not self.connected:
             return {'status': 'error', 'message': 'Not connected'}
         
-        message = {
-            'cmd': cmd,
-            'data': data
-        }
+        rid = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[rid] = future
         
-        try:
-            self.writer.write(json.dumps(message).encode())
-            await self.writer.drain()
-            
-            response_data = await self.reader.read(1024)
-            response = json.loads(response_data.decode())
+        with tracer.span(f"client.{cmd}", rid=rid) as span:
+            request = {'cmd': cmd, 'data': data, 'rid': rid}
+            trace = tracer.inject()
+            if trace is not None:
+                request['trace'] = trace
             
-            return response
+            try:
+                async with self._write_lock:
+                    self.writer.write(encode_frame(request))
+                    await self.writer.drain()
+                
+                response = await asyncio.wait_for(future, timeout)
+                span.set(status=response.get('status'))
+                return response
+                
+            except asyncio.TimeoutError:
+                logger.warning(f"Request {cmd} timed out")
+                span.status = "error"
+                return {'status': 'error', 'message': 'Request timed out'}
+            except Exception as e:
+                logger.error(f"Error sending message: {e}")
+                span.status = "error"
+                return {'status': 'error', 'message': str(e)}
+            finally:
+                self._pending.pop(rid, None)
+    
+    def _resolve_response(self, message: dict):
+        """Hand a response to the request waiting for it"""
+        rid = message.pop('rid', None)
+        if rid is None:
+            # Servers answering without IDs answer in request order
+            rid = next((key for key, future in self._pending.items() if not future.done()), None)
+        future = self._pending.get(rid)
+        if future is not None and not future.done():
+            future.set_result(message)
+    
+    def _fail_pending(self, reason: str):
+        """Resolve every outstanding request with an error"""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result({'status': 'error', 'message': reason})
+        for waiters in self._event_waiters.values():
+            for future in waiters:
+                if not future.done():
+                    future.set_result(None)
+        self._event_waiters.clear()
+    
+    async def wait_for_event(self, event: str,
+                             timeout: Optional[float] = CLIENT_REQUEST_TIMEOUT) -> Optional[Dict]:
+        """
+        Wait for the next pushed event of a type
+        等待下一个指定类型的推送事件
+        
+        Args:
+            event: Event name, e.g. 'game_found'
+            timeout: Seconds to wait, None to wait forever
             
-        except Exception as e:
-            logger.error(f"Error sending message: {e}")
-            return {'status': 'error', 'message': str(e)}
+        Returns:
+            Optional[Dict]: Event data, or None on timeout or disconnect
+        """
+        future = asyncio.get_running_loop().create_future()
+        waiters = self._event_waiters.setdefault(event, [])
+        waiters.append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            if future in waiters:
+                waiters.remove(future)
+    
+    def _dispatch_event(self, event: str, data: dict):
+        """Route a pushed event to state updates, callbacks and waiters"""
+        if event == 'game_delta':
+            if data.get('game_id') == self.spectating_game_id:
+                self._apply_game_update(data)
+            elif 'game_delta' in self.callbacks:
+                # Seated players receive the same deltas as spectators
+                self.callbacks['game_delta'](data)
+        elif event == 'chat_batch':
+            if data.get('game_id') == self.spectating_game_id:
+                messages = data.get('messages', [])
+                self.spectator_chat.extend(messages)
+                if 'chat_batch' in self.callbacks:
+                    self.callbacks['chat_batch'](messages)
+                elif 'chat' in self.callbacks:
+                    for message in messages:
+                        self.callbacks['chat'](message)
+        elif event == 'resync':
+            # Server coalesced our backlog; fetch what we missed
+            if self.spectating_game_id:
+                self._request_resync()
+        elif event == 'ping':
+            # Answer liveness probes so idle connections are kept open
+            asyncio.create_task(self._send_message('ping', {}))
+        elif event in self.callbacks:
+            self.callbacks[event](data)
+        
+        for future in self._event_waiters.pop(event, ()):
+            if not future.done():
+                future.set_result(data)
     
     async def _listen_for_messages(self):
-        """Listen for server messages"""
+        """Read every server message, dispatching responses and pushed events"""
         try:
             while self.connected:
-                data = await self.reader.read(1024)
+                data = await self.reader.readline()
                 if not data:
                     break
                 
-                message = json.loads(data.decode())
+                message = decode_frame(data)
                 event = message.get('event')
                 
-                if event and event in self.callbacks:
-                    self.callbacks[event](message.get('data', {}))
+                if event is None:
+                    self._resolve_response(message)
+                else:
+                    self._dispatch_event(event, message.get('data', {}))
                 
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
             logger.error(f"Error listening for messages: {e}")
         finally:
+            self._fail_pending('Connection closed')
             await self.disconnect() 
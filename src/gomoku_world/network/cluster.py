@@ -0,0 +1,671 @@
+"""
+Multi-process server cluster
+多进程服务器集群
+
+Several ``GameServer`` workers accept client connections on one shared
+``SO_REUSEPORT`` socket, so the kernel spreads connections across processes
+and cores. Players and games are owned by the worker that created them and
+ownership is recorded in a ``SessionDirectory``. A ``ClusterRouter`` on each
+worker forwards game and spectator commands for games owned elsewhere over
+a peer link, and relays pushes for players connected to other workers back
+to them. Matchmaking is cluster-wide: worker 0 queues the players of every
+worker and starts each matched game on the worker black is connected to.
+
+多个``GameServer``工作进程共享一个``SO_REUSEPORT``套接字接受连接，由内核在
+进程和核心之间分配。玩家和游戏归创建它们的工作进程所有，归属记录在
+``SessionDirectory``中。每个工作进程的``ClusterRouter``把属于其他进程的游戏
+命令经对等链路转发，并把推送转交给连接在其他进程上的玩家。匹配在整个集群
+进行：0号工作进程为所有进程的玩家排队，并在黑方所在的进程上开始对局。
+"""
+
+import asyncio
+import itertools
+import multiprocessing
+import socket
+from dataclasses import asdict
+from typing import Callable, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from ..utils.logger import get_logger, setup_logging
+from ..config import DEFAULT_HOST, DEFAULT_PORT, MAX_MESSAGE_SIZE, CLUSTER_PEER_TIMEOUT
+from .errors import NetworkError, ConnectionError, MessageError
+from .fanout import ClientConnection
+from .protocol import decode_frame
+
+if TYPE_CHECKING:
+    from .server import GameServer, Player
+
+logger = get_logger(__name__)
+
+# Commands addressed to a game, routed to the worker owning data['game_id']
+GAME_COMMANDS = frozenset({'make_move', 'get_game_state', 'spectate_game'})
+# Commands addressed to the game a player spectates
+SPECTATOR_COMMANDS = frozenset({'leave_spectate', 'spectator_chat'})
+# Commands handled by the worker running the cluster-wide matchmaking queue
+MATCHMAKING_COMMANDS = frozenset({'find_game', 'cancel_match'})
+MATCHMAKING_WORKER = 0
+
+
+class SessionDirectory:
+    """
+    Directory of player and game ownership
+    玩家与游戏归属目录
+
+    With the default arguments the directory lives in plain dicts inside one
+    process. Passing ``multiprocessing.Manager`` dict proxies (see
+    ``create_shared_directory``) shares it between worker processes, standing
+    in for an external store.
+    """
+
+    def __init__(self, players=None, games=None, workers=None):
+        """
+        Initialize directory
+
+        Args:
+            players: Mapping of player ID to owning worker ID
+            games: Mapping of game ID to owning worker ID
+            workers: Mapping of worker ID to peer address
+        """
+        self.players = {} if players is None else players
+        self.games = {} if games is None else games
+        self.workers = {} if workers is None else workers
+
+    def register_worker(self, worker_id: int, address: Tuple[str, int]):
+        """Publish the peer address of a worker"""
+        self.workers[worker_id] = tuple(address)
+
+    def worker_ids(self) -> List[int]:
+        """Get the IDs of all registered workers"""
+        return list(self.workers.keys())
+
+    def worker_address(self, worker_id: int) -> Optional[Tuple[str, int]]:
+        """Get the peer address of a worker"""
+        address = self.workers.get(worker_id)
+        return tuple(address) if address is not None else None
+
+    def claim_player(self, player_id: str, worker_id: int) -> bool:
+        """
+        Record a player as connected to a worker
+
+        Returns:
+            bool: False if another worker already owns the player
+        """
+        return self.players.setdefault(player_id, worker_id) == worker_id
+
+    def release_player(self, player_id: str, worker_id: int):
+        """Forget a player if the worker still owns it"""
+        if self.players.get(player_id) == worker_id:
+            self.players.pop(player_id, None)
+
+    def player_owner(self, player_id: str) -> Optional[int]:
+        """Get the worker a player is connected to"""
+        return self.players.get(player_id)
+
+    def claim_game(self, game_id: str, worker_id: int) -> bool:
+        """
+        Record a game as hosted by a worker
+
+        Returns:
+            bool: False if another worker already hosts the game
+        """
+        return self.games.setdefault(game_id, worker_id) == worker_id
+
+    def release_game(self, game_id: str, worker_id: int):
+        """Forget a game if the worker still hosts it"""
+        if self.games.get(game_id) == worker_id:
+            self.games.pop(game_id, None)
+
+    def game_owner(self, game_id: str) -> Optional[int]:
+        """Get the worker hosting a game"""
+        return self.games.get(game_id)
+
+
+def create_shared_directory(manager) -> SessionDirectory:
+    """
+    Create a directory shared between processes
+
+    Args:
+        manager: A started ``multiprocessing.Manager``
+
+    Returns:
+        SessionDirectory: Directory backed by manager dict proxies
+    """
+    return SessionDirectory(manager.dict(), manager.dict(), manager.dict())
+
+
+class PeerLink:
+    """
+    Outbound connection to another worker
+    到其他工作进程的出站连接
+
+    Requests carry a request ID and are answered out of order; pushes are
+    fire-and-forget.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Initialize link and start reading responses"""
+        self.reader = reader
+        self.connection = ClientConnection(writer)
+        self.connection.start()
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._task = asyncio.create_task(self._read_loop())
+
+    @property
+    def closed(self) -> bool:
+        return self.connection.closed
+
+    async def request(self, payload: dict, timeout: float = CLUSTER_PEER_TIMEOUT) -> dict:
+        """
+        Send a request and wait for its response
+
+        Args:
+            payload: Request body
+            timeout: Seconds to wait for the response
+
+        Returns:
+            dict: Response from the peer
+
+        Raises:
+            ConnectionError: If the link is closed or the peer does not answer
+        """
+        rid = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[rid] = future
+
+        try:
+            if not self.connection.send_message(dict(payload, rid=rid), droppable=False):
+                raise ConnectionError("Peer link closed")
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise ConnectionError("Peer request timed out")
+        finally:
+            self._pending.pop(rid, None)
+
+    def push(self, client_ids: List[str], frame: bytes) -> bool:
+        """Ask the peer to deliver a frame to some of its clients"""
+        return self.connection.send_message({
+            'push': client_ids,
+            'frame': frame.decode('utf-8')
+        })
+
+    async def _read_loop(self):
+        """Resolve pending requests as responses arrive"""
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                try:
+                    message = decode_frame(line)
+                except MessageError:
+                    continue
+                future = self._pending.get(message.get('rid'))
+                if future is not None and not future.done():
+                    future.set_result(message.get('response', {}))
+        except Exception as e:
+            logger.debug(f"Peer link failed: {e}")
+        finally:
+            self.connection.abort()
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Peer link closed"))
+
+    async def close(self):
+        """Close the link"""
+        self._task.cancel()
+        await self.connection.close()
+
+
+class RemoteClient:
+    """
+    Client of another worker, as seen by a forwarded request
+    另一工作进程的客户端
+
+    Peer links only listen on the loopback interface, so the forwarding
+    worker is trusted to name the player its client logged in as.
+    """
+
+    def __init__(self, client_id: Optional[str]):
+        self.client_id = client_id
+
+
+class ClusterRouter:
+    """
+    Routes traffic between cluster workers
+    在集群工作进程之间路由流量
+
+    Directory calls are blocking proxy round trips in a real cluster, so the
+    router never makes them on the event loop. Game owners are read from the
+    worker-prefixed game ID, player owners are cached and dropped when the
+    owning worker announces a logout, and the remaining lookups and claims
+    run in the default executor.
+    """
+
+    def __init__(self, server: 'GameServer', directory: SessionDirectory):
+        """
+        Initialize router
+
+        Args:
+            server: Local game server
+            directory: Shared session directory
+        """
+        self.server = server
+        self.directory = directory
+        self.worker_id = server.worker_id
+        self.links: Dict[int, PeerLink] = {}
+        # Players of other workers seen in forwarded requests
+        self.remote_players: Dict[str, 'Player'] = {}
+        # Cached owner of players connected to other workers
+        self.owners: Dict[str, int] = {}
+        # Local players spectating a game hosted elsewhere -> owning worker
+        self.spectating: Dict[str, int] = {}
+        # Local players waiting in the matchmaking worker's queue
+        self.queued: Set[str] = set()
+        self._peer_server: Optional[asyncio.AbstractServer] = None
+        self._outbox: Dict[Tuple[int, bytes], List[str]] = {}
+        self._unresolved: List[Tuple[str, bytes]] = []
+        self._flush_scheduled = False
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def start(self, host: str = '127.0.0.1'):
+        """Start the peer listener and publish its address"""
+        self._peer_server = await asyncio.start_server(
+            self._handle_peer, host, 0, limit=MAX_MESSAGE_SIZE
+        )
+        address = self._peer_server.sockets[0].getsockname()[:2]
+        await self._directory(self.directory.register_worker, self.worker_id, address)
+        logger.info(f"Worker {self.worker_id} peer link on {address[0]}:{address[1]}")
+
+    async def stop(self):
+        """Close peer links and the peer listener"""
+        for task in list(self._tasks):
+            task.cancel()
+        for link in list(self.links.values()):
+            await link.close()
+        self.links.clear()
+        if self._peer_server is not None:
+            self._peer_server.close()
+            await self._peer_server.wait_closed()
+
+    async def _directory(self, method, *args):
+        """Call the shared directory off the event loop"""
+        return await asyncio.get_running_loop().run_in_executor(None, method, *args)
+
+    def _spawn(self, coro):
+        """Run a background task, keeping a reference until it finishes"""
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def game_owner(self, game_id: str) -> Optional[int]:
+        """Get the worker hosting a game from its ``game_<worker>_<n>`` ID"""
+        parts = game_id.split('_') if isinstance(game_id, str) else ()
+        if len(parts) == 3 and parts[0] == 'game' and parts[1].isdigit():
+            return int(parts[1])
+        return None
+
+    async def player_owner(self, player_id: str) -> Optional[int]:
+        """Get the worker a player is connected to, from cache or directory"""
+        owner = self.owners.get(player_id)
+        if owner is None:
+            owner = await self._directory(self.directory.player_owner, player_id)
+            if owner is not None and owner != self.worker_id:
+                self.owners[player_id] = owner
+        return owner
+
+    async def claim_player(self, player_id: str) -> bool:
+        """Record a local login in the directory"""
+        return await self._directory(self.directory.claim_player, player_id, self.worker_id)
+
+    async def release_player(self, player_id: str):
+        """
+        Forget a local player that logged out
+
+        Leaves the cluster matchmaking queue, releases the directory entry
+        and tells the other workers to drop their cached owner.
+        """
+        if player_id in self.queued:
+            await self.route({'cmd': 'cancel_match', 'data': {}}, player_id)
+        await self._directory(self.directory.release_player, player_id, self.worker_id)
+        for worker_id in await self._directory(self.directory.worker_ids):
+            if worker_id != self.worker_id:
+                await self._notify(worker_id, {'cluster': 'forget_player', 'player_id': player_id})
+
+    def game_started(self, game_id: str, players: List[str]):
+        """Record a new local game and point remote players at it"""
+        self._spawn(self._directory(self.directory.claim_game, game_id, self.worker_id))
+        for player_id in players:
+            self.queued.discard(player_id)
+            if player_id in self.server.players:
+                continue
+            self._spawn(self._notify_player(player_id, {
+                'cluster': 'assign_game', 'player_id': player_id, 'game_id': game_id
+            }))
+
+    def game_ended(self, game_id: str, players: List[str]):
+        """Release a finished local game and free its remote players"""
+        self._spawn(self._directory(self.directory.release_game, game_id, self.worker_id))
+        for player_id in players:
+            if player_id in self.server.players:
+                continue
+            self._spawn(self._notify_player(player_id, {
+                'cluster': 'clear_game', 'player_id': player_id, 'game_id': game_id
+            }))
+
+    async def forfeit(self, game_id: str, player_id: str):
+        """Resign a local player's game hosted on another worker"""
+        owner = self.game_owner(game_id)
+        if owner is not None and owner != self.worker_id:
+            await self._request(owner, {'cluster': 'forfeit', 'game_id': game_id,
+                                        'player_id': player_id})
+
+    def host_game(self, black: 'Player', white: 'Player'):
+        """Start a matched game on the worker black is connected to"""
+        self._spawn(self._host_game(black, white))
+
+    async def _host_game(self, black: 'Player', white: 'Player'):
+        """Ask black's worker to start the game, requeueing white on failure"""
+        response = await self._request(self.owners.get(black.id), {
+            'cluster': 'start_game',
+            'black': black.id,
+            'white': asdict(white),
+            'white_worker': self.owners.get(white.id, self.worker_id)
+        })
+        if response.get('status') != 'ok':
+            logger.warning(f"Could not start game for {black.id} and {white.id}: "
+                           f"{response.get('message')}")
+            self.server.matchmaker.add(white.id, white.rating)
+
+    async def route(self, message: dict, client_id: Optional[str]) -> Optional[dict]:
+        """
+        Forward a client command if another worker owns its target
+
+        Args:
+            message: Client message
+            client_id: Player bound to the client's connection, if logged in
+
+        Returns:
+            Optional[dict]: Response from the owning worker, None to handle locally
+        """
+        cmd = message.get('cmd')
+        data = message.get('data') or {}
+
+        if cmd in GAME_COMMANDS:
+            game_id = data.get('game_id')
+            if game_id is None or game_id in self.server.games:
+                return None
+            owner = self.game_owner(game_id)
+        elif cmd in SPECTATOR_COMMANDS:
+            owner = self.spectating.get(client_id)
+        elif cmd in MATCHMAKING_COMMANDS:
+            owner = MATCHMAKING_WORKER
+        else:
+            return None
+
+        if owner is None or owner == self.worker_id:
+            return None
+
+        response = await self.forward(owner, message, client_id)
+
+        if response.get('status') == 'ok':
+            if cmd == 'spectate_game':
+                self.spectating[client_id] = owner
+            elif cmd == 'leave_spectate':
+                self.spectating.pop(client_id, None)
+            elif cmd == 'find_game':
+                self.queued.add(client_id)
+        if cmd == 'cancel_match':
+            self.queued.discard(client_id)
+        return response
+
+    async def forward(self, worker_id: int, message: dict, client_id: Optional[str]) -> dict:
+        """
+        Process a message on another worker
+
+        Args:
+            worker_id: Target worker
+            message: Client message
+            client_id: Player the message acts for, vouched for by this worker
+
+        Returns:
+            dict: Response of the target worker
+        """
+        player = self.server.players.get(client_id)
+        return await self._request(worker_id, {
+            'origin': self.worker_id,
+            'message': message,
+            'client': client_id,
+            'player': asdict(player) if player else None
+        })
+
+    async def _request(self, worker_id: Optional[int], payload: dict) -> dict:
+        """Send a request over a peer link, turning link failures into an error response"""
+        try:
+            if worker_id is None:
+                raise ConnectionError("Unknown worker")
+            link = await self._link(worker_id)
+            return await link.request(payload)
+        except (NetworkError, OSError) as e:
+            what = (payload.get('message') or {}).get('cmd') or payload.get('cluster')
+            logger.warning(f"Forwarding {what} to worker {worker_id} failed: {e}")
+            return {'status': 'error', 'message': 'Game server unavailable'}
+
+    async def _notify(self, worker_id: int, payload: dict):
+        """Send a one-way message to another worker"""
+        try:
+            link = await self._link(worker_id)
+            link.connection.send_message(payload, droppable=False)
+        except (NetworkError, OSError) as e:
+            logger.debug(f"Dropping {payload.get('cluster')} for worker {worker_id}: {e}")
+
+    async def _notify_player(self, player_id: str, payload: dict):
+        """Send a one-way message to the worker a remote player is connected to"""
+        owner = await self.player_owner(player_id)
+        if owner is not None and owner != self.worker_id:
+            await self._notify(owner, payload)
+
+    def push(self, client_id: str, frame: bytes) -> bool:
+        """
+        Queue a frame for a client connected to another worker
+
+        Pushes queued in the same loop iteration are grouped per worker and
+        frame, so a broadcast sends each frame once per peer. Clients whose
+        owner is not cached yet are looked up when the batch is flushed.
+
+        Returns:
+            bool: False if the client is known to be connected here
+        """
+        owner = self.owners.get(client_id)
+        if owner == self.worker_id:
+            return False
+
+        if owner is None:
+            self._unresolved.append((client_id, frame))
+        else:
+            self._outbox.setdefault((owner, frame), []).append(client_id)
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._spawn(self._flush_pushes())
+        return True
+
+    async def _flush_pushes(self):
+        """Resolve uncached owners, then send grouped pushes to their workers"""
+        unresolved, self._unresolved = self._unresolved, []
+        for client_id, frame in unresolved:
+            owner = await self.player_owner(client_id)
+            if owner is not None and owner != self.worker_id:
+                self._outbox.setdefault((owner, frame), []).append(client_id)
+
+        outbox, self._outbox = self._outbox, {}
+        self._flush_scheduled = False
+        for (worker_id, frame), client_ids in outbox.items():
+            try:
+                link = await self._link(worker_id)
+                link.push(client_ids, frame)
+            except (NetworkError, OSError) as e:
+                logger.debug(f"Dropping push to worker {worker_id}: {e}")
+
+    async def _link(self, worker_id: int) -> PeerLink:
+        """Get or open the link to a worker"""
+        link = self.links.get(worker_id)
+        if link is not None and not link.closed:
+            return link
+
+        address = await self._directory(self.directory.worker_address, worker_id)
+        if address is None:
+            raise ConnectionError(f"Unknown worker {worker_id}")
+
+        reader, writer = await asyncio.open_connection(*address, limit=MAX_MESSAGE_SIZE)
+        link = self.links.get(worker_id)
+        if link is None or link.closed:
+            link = self.links[worker_id] = PeerLink(reader, writer)
+        else:
+            writer.close()
+        return link
+
+    async def _handle_peer(self, reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter):
+        """Serve requests, cluster messages and pushes from another worker"""
+        from .server import Player
+
+        connection = ClientConnection(writer)
+        connection.start()
+        try:
+            while not connection.closed:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    message = decode_frame(line)
+                except MessageError:
+                    continue
+
+                if 'push' in message:
+                    frame = message.get('frame', '').encode('utf-8')
+                    for client_id in message['push']:
+                        self.server.connections.send_frame(client_id, frame)
+                    continue
+
+                if 'cluster' in message:
+                    response = await self._handle_cluster(message)
+                    if 'rid' in message:
+                        connection.send_message({'rid': message['rid'], 'response': response},
+                                                droppable=False)
+                    continue
+
+                player = message.get('player')
+                if player:
+                    self.remote_players[player['id']] = Player(**player)
+                    self.owners[player['id']] = message.get('origin')
+
+                response = await self.server._process_message(message.get('message') or {},
+                                                              RemoteClient(message.get('client')))
+                connection.send_message({'rid': message.get('rid'), 'response': response},
+                                        droppable=False)
+        except Exception as e:
+            logger.error(f"Error handling peer link: {e}")
+        finally:
+            await connection.close()
+
+    async def _handle_cluster(self, message: dict) -> dict:
+        """Apply a message one worker sends another about shared state"""
+        from .server import Player
+
+        op = message.get('cluster')
+        player_id = message.get('player_id')
+        local = self.server.players.get(player_id)
+
+        if op == 'start_game':
+            black = self.server.players.get(message.get('black'))
+            if black is None or black.game_id:
+                return {'status': 'error', 'message': 'Player not available'}
+            white = Player(**message['white'])
+            self.remote_players[white.id] = white
+            self.owners[white.id] = message.get('white_worker')
+            game = self.server._start_game(black, white)
+            return {'status': 'ok', 'data': {'game_id': game.id}}
+
+        if op == 'forfeit':
+            await self.server._forfeit(message.get('game_id'), player_id)
+        elif op == 'assign_game':
+            self.queued.discard(player_id)
+            if local is not None:
+                local.game_id = message.get('game_id')
+        elif op == 'clear_game':
+            if local is not None and local.game_id == message.get('game_id'):
+                local.game_id = None
+        elif op == 'forget_player':
+            self.owners.pop(player_id, None)
+            self.remote_players.pop(player_id, None)
+        else:
+            return {'status': 'error', 'message': 'Unknown cluster message'}
+        return {'status': 'ok'}
+
+    def find_player(self, player_id: str):
+        """Look up a player of another worker seen in forwarded requests"""
+        return self.remote_players.get(player_id)
+
+    async def client_disconnected(self, player_id: str):
+        """Leave remote spectating for a disconnected local player"""
+        if player_id in self.spectating:
+            await self.route({'cmd': 'leave_spectate', 'data': {}}, player_id)
+
+
+def _run_worker(worker_id: int, host: str, port: int, directory: SessionDirectory):
+    """Entry point of a worker process"""
+    from .server import GameServer
+
+    setup_logging()
+    server = GameServer(host, port, worker_id=worker_id, directory=directory, reuse_port=True)
+    try:
+        asyncio.run(server.start())
+    except KeyboardInterrupt:
+        pass
+
+
+def run_cluster(workers: int, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                target: Optional[Callable] = None, kwargs: Optional[dict] = None):
+    """
+    Run the game server as several worker processes sharing one port
+
+    Args:
+        workers: Number of worker processes
+        host: Listen host
+        port: Listen port
+        target: Worker entry point, called in each process as
+                ``target(worker_id, host, port, directory, **kwargs)``;
+                it must serve a ``GameServer`` built with those arguments
+                and ``reuse_port=True``
+        kwargs: Extra keyword arguments for ``target``
+
+    Raises:
+        NetworkError: If the platform lacks ``SO_REUSEPORT``
+    """
+    if not hasattr(socket, 'SO_REUSEPORT'):
+        raise NetworkError("Multi-process mode requires SO_REUSEPORT")
+
+    with multiprocessing.Manager() as manager:
+        directory = create_shared_directory(manager)
+        processes = [
+            multiprocessing.Process(
+                target=target or _run_worker,
+                args=(worker_id, host, port, directory),
+                kwargs=kwargs or {},
+                name=f"gomoku-worker-{worker_id}",
+                daemon=True
+            )
+            for worker_id in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        logger.info(f"Started {workers} workers on {host}:{port}")
+
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
@@ -1,4 +1,28 @@
 """
 Network error definitions
-缃戠粶閿欒瀹氫箟
-""" 
+网络错误定义
+"""
+
+
+class NetworkError(Exception):
+    """
+    Base exception for all network related errors.
+    所有网络相关错误的基类。
+    """
+    pass
+
+
+class ConnectionError(NetworkError):
+    """
+    Raised when a connection cannot be established or is lost.
+    当无法建立连接或连接丢失时抛出。
+    """
+    pass
+
+
+class MessageError(NetworkError):
+    """
+    Raised when a message cannot be encoded, decoded or delivered.
+    当消息无法编码、解码或投递时抛出。
+    """
+    pass
@@ -0,0 +1,259 @@
+"""
+Outbound message fan-out
+出站消息扇出
+
+Each connected client owns a ``ClientConnection`` with a bounded queue of
+pending frames and a writer task that flushes them. Broadcasts serialize a
+message once and enqueue the same ``bytes`` object on every target
+connection, so the cost per spectator is a queue append rather than a JSON
+encode. Clients that cannot keep up have their droppable frames coalesced
+into a single ``resync`` notice and are disconnected if they keep lagging.
+
+每个客户端拥有一个带有有界待发送队列和写任务的``ClientConnection``。
+广播只序列化一次消息，并把同一个``bytes``对象放入每个目标连接的队列。
+跟不上的客户端其可丢弃帧会被合并为一个``resync``通知，持续落后则断开连接。
+"""
+
+import asyncio
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from ..utils.logger import get_logger
+from ..config import OUTBOUND_QUEUE_LIMIT, SLOW_CLIENT_MAX_OVERFLOWS, WRITE_BUFFER_HIGH_WATER
+from .protocol import encode_frame
+
+logger = get_logger(__name__)
+
+RESYNC_FRAME = encode_frame({'event': 'resync', 'data': {}})
+
+
+class ClientConnection:
+    """
+    Outbound side of a client connection
+    客户端连接的出站部分
+    """
+
+    def __init__(self, writer: asyncio.StreamWriter,
+                 max_pending: int = OUTBOUND_QUEUE_LIMIT,
+                 max_overflows: int = SLOW_CLIENT_MAX_OVERFLOWS):
+        """
+        Initialize connection
+
+        Args:
+            writer: Stream writer of the connection
+            max_pending: Maximum queued droppable frames before coalescing
+            max_overflows: Overflows tolerated before the client is dropped
+        """
+        self.writer = writer
+        self.client_id: Optional[str] = None
+        self.max_pending = max_pending
+        self.max_overflows = max_overflows
+        self.overflows = 0
+        self.frames_sent = 0
+        self.closed = False
+        self._closing = False
+        # (frame, droppable) pairs; responses are never dropped
+        self._pending: Deque[Tuple[bytes, bool]] = deque()
+        self._droppable = 0
+        self._wakeup = asyncio.Event()
+        # Cleared while drain() waits for the socket buffer to empty
+        self._writable = asyncio.Event()
+        self._writable.set()
+        self._task: Optional[asyncio.Task] = None
+        
+        transport = getattr(writer, 'transport', None)
+        if transport is not None:
+            transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH_WATER)
+
+    def start(self):
+        """Start the writer task"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._write_loop())
+
+    @property
+    def pending(self) -> int:
+        """Number of frames waiting to be written"""
+        return len(self._pending)
+
+    @property
+    def write_blocked(self) -> bool:
+        """Whether the socket buffer is above its high-water mark"""
+        return not self._writable.is_set()
+
+    async def wait_writable(self):
+        """Wait until a blocked write has drained"""
+        await self._writable.wait()
+
+    def send(self, frame: bytes, droppable: bool = True) -> bool:
+        """
+        Queue a frame for sending
+
+        Args:
+            frame: Encoded frame (shared between connections, never mutated)
+            droppable: Whether the frame may be coalesced for slow clients
+
+        Returns:
+            bool: True if the frame was queued
+        """
+        if self.closed:
+            return False
+
+        if droppable:
+            if self._droppable >= self.max_pending:
+                self._coalesce()
+                return False
+            self._droppable += 1
+
+        self._pending.append((frame, droppable))
+        self._wakeup.set()
+        return True
+
+    def send_message(self, message: dict, droppable: bool = True) -> bool:
+        """Encode and queue a single message"""
+        return self.send(encode_frame(message), droppable)
+
+    def _coalesce(self):
+        """Replace queued droppable frames with one resync notice"""
+        self.overflows += 1
+        if self.overflows > self.max_overflows:
+            logger.warning(f"Dropping slow client {self.client_id}")
+            self.abort()
+            return
+
+        self._pending = deque(item for item in self._pending if not item[1])
+        self._pending.append((RESYNC_FRAME, False))
+        self._droppable = 0
+        logger.debug(f"Coalesced backlog for slow client {self.client_id}")
+
+    async def _write_loop(self):
+        """Flush queued frames, batching everything queued since the last write"""
+        try:
+            while not self.closed:
+                await self._wakeup.wait()
+                self._wakeup.clear()
+
+                while self._pending and not self.closed:
+                    batch = [frame for frame, _ in self._pending]
+                    self._pending.clear()
+                    self._droppable = 0
+
+                    self.writer.write(b"".join(batch))
+                    self._writable.clear()
+                    await self.writer.drain()
+                    self._writable.set()
+                    self.frames_sent += len(batch)
+
+                if self._closing:
+                    break
+
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"Write failed for client {self.client_id}: {e}")
+            self.abort()
+
+    def abort(self):
+        """Close the connection immediately, discarding queued frames"""
+        if self.closed:
+            return
+        self.closed = True
+        self._pending.clear()
+        self._wakeup.set()
+        self._writable.set()
+        self.writer.close()
+
+    async def close(self, timeout: float = 1.0):
+        """
+        Flush pending frames and close the connection
+
+        Args:
+            timeout: Maximum seconds to wait for the flush
+        """
+        if self._task and not self.closed:
+            self._closing = True
+            self._wakeup.set()
+            try:
+                await asyncio.wait_for(asyncio.shield(self._task), timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                pass
+
+        self.abort()
+        if self._task:
+            self._task.cancel()
+        try:
+            await self.writer.wait_closed()
+        except Exception:
+            pass
+
+
+class ConnectionRegistry:
+    """
+    Registry of client connections keyed by player ID
+    以玩家ID为键的客户端连接注册表
+    """
+
+    def __init__(self):
+        """Initialize registry"""
+        self.connections: Dict[str, ClientConnection] = {}
+
+    def __len__(self) -> int:
+        return len(self.connections)
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self.connections
+
+    def register(self, client_id: str, connection: ClientConnection):
+        """Bind a connection to a player ID"""
+        connection.client_id = client_id
+        self.connections[client_id] = connection
+
+    def unregister(self, connection: ClientConnection):
+        """Remove a connection if it is still the one bound to its player"""
+        client_id = connection.client_id
+        if client_id is not None and self.connections.get(client_id) is connection:
+            del self.connections[client_id]
+
+    def get(self, client_id: str) -> Optional[ClientConnection]:
+        """Get the connection bound to a player ID"""
+        return self.connections.get(client_id)
+
+    def send_frame(self, client_id: str, frame: bytes, droppable: bool = True) -> bool:
+        """
+        Queue an encoded frame for one client
+
+        Args:
+            client_id: Target player ID
+            frame: Encoded frame
+            droppable: Whether the frame may be coalesced for slow clients
+
+        Returns:
+            bool: True if queued
+        """
+        connection = self.connections.get(client_id)
+        if connection is None:
+            return False
+        return connection.send(frame, droppable)
+
+    def send_message(self, client_id: str, message: dict, droppable: bool = True) -> bool:
+        """Encode and queue a message for one client"""
+        return self.send_frame(client_id, encode_frame(message), droppable)
+
+    def broadcast(self, client_ids: Iterable[str], message: dict) -> int:
+        """
+        Encode a message once and queue it on many connections
+
+        Args:
+            client_ids: Target player IDs
+            message: Message to broadcast
+
+        Returns:
+            int: Number of connections the frame was queued on
+        """
+        frame = encode_frame(message)
+        delivered = 0
+        connections = self.connections
+        for client_id in client_ids:
+            connection = connections.get(client_id)
+            if connection is not None and connection.send(frame):
+                delivered += 1
+        return delivered
@@ -0,0 +1,350 @@
+"""
+Load generation for the game server
+游戏服务器负载生成
+
+Simulated players are ordinary ``GameClient`` instances driven by asyncio
+tasks: they log in, queue for a match, play random legal moves until the
+game ends and then queue again. A share of the clients act as spectators
+that list games and watch them. Every request is timed per command and
+every received frame is counted, so a run reports latency percentiles and
+message throughput, plus the server's resident memory when it runs locally.
+
+模拟玩家是由asyncio任务驱动的普通``GameClient``：登录、排队匹配、随机落子直到
+对局结束后再次排队。部分客户端作为观战者浏览并观看对局。每个请求按命令计时，
+每个收到的帧都会计数，报告延迟百分位数、消息吞吐量以及本地服务器的常驻内存。
+"""
+
+import asyncio
+import os
+import random
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from ..core.codec import decode_moves_field
+from ..utils.logger import get_logger
+from ..config import BOARD_SIZE
+from .client import GameClient
+
+logger = get_logger(__name__)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    Nearest-rank percentile of a list of values
+
+    Args:
+        values: Samples (need not be sorted)
+        pct: Percentile between 0 and 100
+
+    Returns:
+        float: The percentile, 0.0 for an empty list
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(round(pct / 100 * len(ordered))))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def process_rss_mb(pid: Optional[int] = None) -> Optional[float]:
+    """
+    Resident set size of a process in megabytes
+
+    Uses ``psutil`` when installed and ``/proc`` otherwise.
+
+    Args:
+        pid: Process ID (defaults to the current process)
+
+    Returns:
+        Optional[float]: RSS in MB, None if it cannot be determined
+    """
+    pid = os.getpid() if pid is None else pid
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    except Exception:
+        return None
+
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class LoadStats:
+    """
+    Shared counters of a load test run
+    负载测试统计
+    """
+
+    def __init__(self):
+        """Initialize counters"""
+        self.latencies: Dict[str, List[float]] = {}
+        self.messages_sent = 0
+        self.messages_received = 0
+        self.errors: Dict[str, int] = {}
+        self.games_completed = 0
+        self.moves_played = 0
+
+    def record(self, cmd: str, seconds: float, ok: bool):
+        """Record one request"""
+        self.latencies.setdefault(cmd, []).append(seconds)
+        self.messages_sent += 1
+        self.messages_received += 1
+        if not ok:
+            self.errors[cmd] = self.errors.get(cmd, 0) + 1
+
+
+class LoadTestClient(GameClient):
+    """
+    Game client that reports its traffic to ``LoadStats``
+    向``LoadStats``报告流量的游戏客户端
+    """
+
+    def __init__(self, host: str, port: int, stats: LoadStats):
+        """Initialize client"""
+        super().__init__(host, port)
+        self.stats = stats
+
+    async def _send_message(self, cmd: str, data: dict, **kwargs) -> dict:
+        """Send a request and record its latency"""
+        start = time.perf_counter()
+        response = await super()._send_message(cmd, data, **kwargs)
+        self.stats.record(cmd, time.perf_counter() - start, response.get('status') == 'ok')
+        return response
+
+    def _dispatch_event(self, event: str, data: dict):
+        """Count pushed events"""
+        self.stats.messages_received += 1
+        super()._dispatch_event(event, data)
+
+
+class SimulatedPlayer:
+    """
+    Plays random legal games in a loop
+    循环进行随机合法对局的模拟玩家
+    """
+
+    def __init__(self, client: LoadTestClient, rng: random.Random):
+        """Initialize player"""
+        self.client = client
+        self.rng = rng
+        self.game_id: Optional[str] = None
+        self.color = 0
+        self.occupied: set = set()
+        self.move_count = 0
+        self.finished = False
+        self._changed = asyncio.Event()
+        client.on('game_delta', self._on_delta)
+
+    def _on_delta(self, data: dict):
+        """Track the board from pushed deltas"""
+        if data.get('game_id') != self.game_id:
+            return
+        seq = data.get('seq', 0)
+        moves = decode_moves_field(data.get('moves'), seq)
+        self.occupied.update((move['x'], move['y']) for move in moves)
+        self.move_count = max(self.move_count, seq + len(moves))
+        if data.get('status') == 'finished':
+            self.finished = True
+        self._changed.set()
+
+    async def run(self, deadline: float):
+        """Queue, play and requeue until the deadline"""
+        client = self.client
+        while time.monotonic() < deadline:
+            # Wait before asking so a match pushed right after the reply is not missed
+            waiter = asyncio.create_task(client.wait_for_event(
+                'game_found', timeout=max(0.0, deadline - time.monotonic())))
+            await asyncio.sleep(0)
+            response = await client._send_message('find_game', {'id': client.player_id})
+            if response.get('status') != 'ok':
+                waiter.cancel()
+                await asyncio.sleep(0.5)
+                continue
+
+            found = await waiter
+            if not found:
+                # Logging out takes the player out of the queue
+                return
+
+            await self._play(found, deadline)
+
+    async def _play(self, found: dict, deadline: float):
+        """Play one game to the end"""
+        self.game_id = found['game_id']
+        self.color = found['color']
+        self.occupied = set()
+        self.move_count = 0
+        self.finished = False
+        client = self.client
+        cells = BOARD_SIZE * BOARD_SIZE
+
+        while not self.finished and self.move_count < cells and time.monotonic() < deadline:
+            if self.move_count % 2 != self.color - 1:
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), max(0.0, deadline - time.monotonic()))
+                except asyncio.TimeoutError:
+                    return
+                continue
+
+            while True:
+                cell = (self.rng.randrange(BOARD_SIZE), self.rng.randrange(BOARD_SIZE))
+                if cell not in self.occupied:
+                    break
+
+            response = await client._send_message('make_move', {
+                'id': client.player_id,
+                'game_id': self.game_id,
+                'move': {'x': cell[0], 'y': cell[1]}
+            })
+            if response.get('status') != 'ok':
+                return
+
+            client.stats.moves_played += 1
+            self.occupied.add(cell)
+            self.move_count = max(self.move_count, response['data']['move_number'])
+            if response['data'].get('game_over'):
+                client.stats.games_completed += 1
+                self.finished = True
+
+
+async def _spectate(client: LoadTestClient, rng: random.Random, deadline: float,
+                    watch_seconds: float = 2.0):
+    """Repeatedly pick a running game and watch it for a while"""
+    while time.monotonic() < deadline:
+        games = await client.list_games()
+        if not games:
+            await asyncio.sleep(0.5)
+            continue
+        if await client.spectate_game(rng.choice(games)['id']):
+            remaining = deadline - time.monotonic()
+            if remaining <= watch_seconds:
+                # Logging out leaves the game, which the players are ending anyway
+                await asyncio.sleep(max(0.0, remaining))
+                return
+            await asyncio.sleep(watch_seconds)
+            state = client.spectator_state or {}
+            if state.get('status') == 'finished' or not await client.leave_spectate():
+                # The server drops spectators itself when a game ends
+                client.spectating_game_id = None
+
+
+@dataclass
+class LoadTestReport:
+    """Result of a load test run"""
+    clients: int
+    duration: float
+    latencies: Dict[str, Dict[str, float]]
+    messages: int
+    errors: Dict[str, int]
+    games_completed: int
+    moves_played: int
+    server_rss_mb: Optional[float] = None
+    connect_failures: int = 0
+
+    @property
+    def messages_per_second(self) -> float:
+        return self.messages / self.duration if self.duration else 0.0
+
+    def format(self) -> str:
+        """Render the report as a text table"""
+        lines = [
+            f"clients: {self.clients}  duration: {self.duration:.1f}s  "
+            f"connect failures: {self.connect_failures}",
+            f"messages: {self.messages} ({self.messages_per_second:.0f}/s)  "
+            f"moves: {self.moves_played}  games completed: {self.games_completed}",
+        ]
+        if self.server_rss_mb is not None:
+            lines.append(f"server RSS: {self.server_rss_mb:.1f} MB")
+        lines.append(f"{'command':<16}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        for cmd, row in sorted(self.latencies.items()):
+            lines.append(
+                f"{cmd:<16}{int(row['count']):>8}{row['p50'] * 1000:>10.2f}"
+                f"{row['p95'] * 1000:>10.2f}{row['p99'] * 1000:>10.2f}{self.errors.get(cmd, 0):>8}"
+            )
+        return "\n".join(lines)
+
+
+async def run_load_test(host: str, port: int, clients: int = 100, duration: float = 30.0,
+                        spectator_ratio: float = 0.2, seed: Optional[int] = None,
+                        server_pid: Optional[int] = None,
+                        connect_rate: float = 500.0) -> LoadTestReport:
+    """
+    Run simulated clients against a server
+
+    Args:
+        host: Server host
+        port: Server port
+        clients: Number of simulated clients
+        duration: Seconds to generate load
+        spectator_ratio: Share of clients that spectate instead of playing
+        seed: Random seed for reproducible runs
+        server_pid: Process ID of a local server whose RSS is reported
+        connect_rate: Maximum new connections per second
+
+    Returns:
+        LoadTestReport: Collected statistics
+    """
+    stats = LoadStats()
+    rng = random.Random(seed)
+    spectators = int(clients * spectator_ratio)
+
+    async def simulate(index: int):
+        await asyncio.sleep(index / connect_rate)
+        client = LoadTestClient(host, port, stats)
+        if not await client.connect():
+            return False
+        try:
+            await client._send_message('login', {'id': client.player_id, 'name': f"load{index}"})
+            client_rng = random.Random(rng.random())
+            if index < spectators:
+                await _spectate(client, client_rng, deadline)
+            else:
+                await SimulatedPlayer(client, client_rng).run(deadline)
+        finally:
+            # Logging out also ends spectating, so disconnect need not leave
+            client.spectating_game_id = None
+            await client._send_message('logout', {'id': client.player_id})
+            await client.disconnect()
+        return True
+
+    start = time.monotonic()
+    deadline = start + duration
+    results = await asyncio.gather(*(simulate(i) for i in range(clients)), return_exceptions=True)
+    elapsed = time.monotonic() - start
+
+    failures = [r for r in results if r is not True]
+    for result in failures:
+        if isinstance(result, Exception):
+            logger.debug(f"Simulated client failed: {result}")
+
+    latencies = {
+        cmd: {
+            'count': len(values),
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'p99': percentile(values, 99),
+        }
+        for cmd, values in stats.latencies.items()
+    }
+
+    return LoadTestReport(
+        clients=clients,
+        duration=elapsed,
+        latencies=latencies,
+        messages=stats.messages_sent + stats.messages_received,
+        errors=dict(stats.errors),
+        games_completed=stats.games_completed,
+        moves_played=stats.moves_played,
+        server_rss_mb=process_rss_mb(server_pid) if server_pid else None,
+        connect_failures=len(failures)
+    )
@@ -0,0 +1,245 @@
+"""
+Incremental lobby index of active games
+活跃对局的增量大厅索引
+
+Games are kept in a list of sort keys ordered by spectator count, then
+average rating, then game ID, maintained with ``bisect`` as games start,
+end or gain spectators. Pages are addressed by a cursor naming the last
+row a client saw, so serving a page costs the page size rather than the
+number of live games. Every change bumps a version number and is recorded
+in a bounded change log, letting clients that send their version receive
+only the changes to the page they show.
+
+对局按观战人数、平均等级分和对局ID排序，排序键列表通过``bisect``维护。分页使用
+游标（客户端看到的最后一行），每页的开销只与页大小有关。每次变化都会增加版本号
+并记录在有界变更日志中，客户端提交版本号即可只获取其所显示页面此后的变化。
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+from ..config import LOBBY_PAGE_SIZE, LOBBY_MAX_PAGE_SIZE, LOBBY_CHANGE_LOG_SIZE
+
+SortKey = Tuple[int, int, str]
+
+
+def lobby_sort_key(entry: Dict) -> SortKey:
+    """Sort key of a lobby row: most watched, then highest rated, then by ID"""
+    return (-entry.get('spectator_count', 0), -entry.get('rating', 0), entry['id'])
+
+
+def encode_cursor(key: SortKey) -> str:
+    """Encode a sort key as an opaque cursor string"""
+    return f"{-key[0]}:{-key[1]}:{key[2]}"
+
+
+def decode_cursor(cursor: str) -> SortKey:
+    """
+    Decode a cursor string
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    spectators, rating, game_id = cursor.split(':', 2)
+    return (-int(spectators), -int(rating), game_id)
+
+
+class LobbyIndex:
+    """
+    Sorted, versioned index of active games
+    有序、带版本的活跃对局索引
+    """
+
+    def __init__(self, log_size: int = LOBBY_CHANGE_LOG_SIZE):
+        """
+        Initialize index
+
+        Args:
+            log_size: Number of changes kept for incremental updates
+        """
+        self.entries: Dict[str, Dict] = {}
+        self._keys: List[SortKey] = []
+        self.version = 0
+        self._changes: Deque[Tuple[int, str]] = deque(maxlen=log_size)
+        # Oldest version from which every later change is still logged
+        self._log_start = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, game_id: str) -> bool:
+        return game_id in self.entries
+
+    def _record(self, game_id: str):
+        """Bump the version and log the change"""
+        self.version += 1
+        if len(self._changes) == self._changes.maxlen:
+            self._log_start = self._changes[0][0]
+        self._changes.append((self.version, game_id))
+
+    def _unlink(self, entry: Dict):
+        key = lobby_sort_key(entry)
+        del self._keys[bisect_left(self._keys, key)]
+
+    def add(self, game_id: str, black_player: str, white_player: str,
+            rating: int = 0, status: str = "playing", spectator_count: int = 0):
+        """
+        Add or replace a game
+
+        Args:
+            game_id: Game ID
+            black_player: Black player ID
+            white_player: White player ID
+            rating: Average rating of the two players
+            status: Game status
+            spectator_count: Number of spectators
+        """
+        old = self.entries.get(game_id)
+        if old is not None:
+            self._unlink(old)
+
+        entry = {
+            'id': game_id,
+            'black_player': black_player,
+            'white_player': white_player,
+            'status': status,
+            'spectator_count': spectator_count,
+            'rating': rating
+        }
+        self.entries[game_id] = entry
+        insort(self._keys, lobby_sort_key(entry))
+        self._record(game_id)
+
+    def update(self, game_id: str, **fields) -> bool:
+        """
+        Change fields of a listed game
+
+        Entries are replaced rather than mutated, so rows already handed out
+        in responses stay valid.
+
+        Returns:
+            bool: False if the game is not listed or nothing changed
+        """
+        old = self.entries.get(game_id)
+        if old is None or all(old.get(name) == value for name, value in fields.items()):
+            return False
+
+        self._unlink(old)
+        entry = dict(old, **fields)
+        self.entries[game_id] = entry
+        insort(self._keys, lobby_sort_key(entry))
+        self._record(game_id)
+        return True
+
+    def remove(self, game_id: str) -> bool:
+        """
+        Remove a game
+
+        Returns:
+            bool: False if the game was not listed
+        """
+        entry = self.entries.pop(game_id, None)
+        if entry is None:
+            return False
+        self._unlink(entry)
+        self._record(game_id)
+        return True
+
+    def _window(self, cursor: Optional[str], limit: int) -> List[SortKey]:
+        """Sort keys of the page after ``cursor``, at most ``limit`` long"""
+        limit = max(1, min(limit, LOBBY_MAX_PAGE_SIZE))
+        start = bisect_right(self._keys, decode_cursor(cursor)) if cursor else 0
+        return self._keys[start:start + limit]
+
+    def page(self, cursor: Optional[str] = None,
+             limit: int = LOBBY_PAGE_SIZE) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Get one page of games in lobby order
+
+        Args:
+            cursor: Cursor returned with the previous page, None for the first page
+            limit: Maximum number of games (capped at ``LOBBY_MAX_PAGE_SIZE``)
+
+        Returns:
+            Tuple[List[Dict], Optional[str]]: Games and the cursor of the next
+                                              page, None on the last page
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        keys = self._window(cursor, limit)
+        games = [self.entries[key[2]] for key in keys]
+        more = bool(keys) and bisect_right(self._keys, keys[-1]) < len(self._keys)
+        return games, encode_cursor(keys[-1]) if more else None
+
+    def _changed(self, version: int) -> Optional[List[str]]:
+        """IDs of games changed after ``version``, newest first, None if not logged"""
+        if version > self.version or version < self._log_start:
+            return None
+
+        changed = []
+        seen = set()
+        for change_version, game_id in reversed(self._changes):
+            if change_version <= version:
+                break
+            if game_id not in seen:
+                seen.add(game_id)
+                changed.append(game_id)
+        return changed
+
+    def changes_since(self, version: int) -> Optional[Tuple[List[Dict], List[str]]]:
+        """
+        Get the games changed after ``version``
+
+        Args:
+            version: Version the client holds
+
+        Returns:
+            Optional[Tuple[List[Dict], List[str]]]: Current rows of changed
+                games and IDs of removed games, None if the change log no
+                longer reaches back to ``version``
+        """
+        changed = self._changed(version)
+        if changed is None:
+            return None
+        updated = [self.entries[game_id] for game_id in changed if game_id in self.entries]
+        removed = [game_id for game_id in changed if game_id not in self.entries]
+        return updated, removed
+
+    def page_changes_since(self, version: int, cursor: Optional[str] = None,
+                           limit: int = LOBBY_PAGE_SIZE) -> Optional[Dict]:
+        """
+        Get the changes after ``version`` to one page
+
+        Only changed rows that are on the page now are sent; every other
+        changed game is listed as removed. ``count`` and ``last`` describe the
+        page now, so a client can drop rows pushed past its end and notice
+        unchanged rows that slid in, which it then fetches with the page.
+        The cost is bounded by the page size and the change log.
+
+        Args:
+            version: Version the client holds
+            cursor: Cursor the page starts after, None for the first page
+            limit: Page size
+
+        Returns:
+            Optional[Dict]: ``updated`` rows, ``removed`` IDs, page ``count``
+                and ``last`` cursor, None if the change log no longer
+                reaches back to ``version``
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        changed = self._changed(version)
+        if changed is None:
+            return None
+
+        keys = self._window(cursor, limit)
+        on_page = {key[2] for key in keys}
+        return {
+            'updated': [self.entries[game_id] for game_id in changed if game_id in on_page],
+            'removed': [game_id for game_id in changed if game_id not in on_page],
+            'count': len(keys),
+            'last': encode_cursor(keys[-1]) if keys else None
+        }
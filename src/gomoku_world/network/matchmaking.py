@@ -0,0 +1,181 @@
+"""
+Rating-based matchmaking queue
+基于等级分的匹配队列
+
+Waiting players are kept in buckets keyed by ``rating // bucket_size``.
+Joining and leaving the queue are dictionary operations, and the sorted
+list of non-empty bucket keys is maintained with ``bisect``. A matching
+pass walks tickets from the longest waiting one and only looks at buckets
+inside that ticket's rating window, which widens the longer it waits.
+
+等待中的玩家按``rating // bucket_size``分桶保存。加入和离开队列为字典操作，
+非空桶的有序键列表通过``bisect``维护。匹配时从等待最久的玩家开始，只查找其
+等级分窗口内的桶，窗口随等待时间增大。
+"""
+
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+from ..config import (
+    MATCHMAKING_BUCKET_SIZE,
+    MATCHMAKING_BASE_WINDOW,
+    MATCHMAKING_WINDOW_GROWTH,
+    MATCHMAKING_MAX_WINDOW
+)
+
+logger = get_logger(__name__)
+
+
+@dataclass
+class MatchTicket:
+    """A player waiting for a match"""
+    player_id: str
+    rating: int
+    enqueued_at: float
+
+
+class MatchmakingQueue:
+    """
+    Bucketed matchmaking queue
+    分桶匹配队列
+    """
+
+    def __init__(self, bucket_size: int = MATCHMAKING_BUCKET_SIZE,
+                 base_window: int = MATCHMAKING_BASE_WINDOW,
+                 window_growth: float = MATCHMAKING_WINDOW_GROWTH,
+                 max_window: int = MATCHMAKING_MAX_WINDOW):
+        """
+        Initialize queue
+
+        Args:
+            bucket_size: Rating range covered by one bucket
+            base_window: Rating difference accepted immediately
+            window_growth: Window growth per second of waiting
+            max_window: Upper bound of the rating window
+        """
+        self.bucket_size = bucket_size
+        self.base_window = base_window
+        self.window_growth = window_growth
+        self.max_window = max_window
+        # Tickets in enqueue order, for oldest-first matching
+        self.tickets: Dict[str, MatchTicket] = {}
+        self.buckets: Dict[int, Dict[str, MatchTicket]] = {}
+        self._bucket_keys: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.tickets)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self.tickets
+
+    def add(self, player_id: str, rating: int, now: Optional[float] = None) -> bool:
+        """
+        Put a player in the queue
+
+        Args:
+            player_id: Player ID
+            rating: Player rating
+            now: Enqueue timestamp (defaults to the monotonic clock)
+
+        Returns:
+            bool: False if the player was already queued
+        """
+        if player_id in self.tickets:
+            return False
+
+        ticket = MatchTicket(player_id, rating,
+                             time.monotonic() if now is None else now)
+        self.tickets[player_id] = ticket
+
+        key = rating // self.bucket_size
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = {}
+            insort(self._bucket_keys, key)
+        bucket[player_id] = ticket
+        return True
+
+    def remove(self, player_id: str) -> Optional[MatchTicket]:
+        """
+        Take a player out of the queue
+
+        Args:
+            player_id: Player ID
+
+        Returns:
+            Optional[MatchTicket]: The removed ticket, None if not queued
+        """
+        ticket = self.tickets.pop(player_id, None)
+        if ticket is None:
+            return None
+
+        key = ticket.rating // self.bucket_size
+        bucket = self.buckets[key]
+        del bucket[player_id]
+        if not bucket:
+            del self.buckets[key]
+            del self._bucket_keys[bisect_left(self._bucket_keys, key)]
+        return ticket
+
+    def window(self, ticket: MatchTicket, now: float) -> float:
+        """Rating difference a ticket accepts after waiting until ``now``"""
+        waited = max(0.0, now - ticket.enqueued_at)
+        return min(self.base_window + self.window_growth * waited, self.max_window)
+
+    def _find_opponent(self, ticket: MatchTicket, now: float) -> Optional[MatchTicket]:
+        """Find the closest-rated waiting opponent inside the ticket's window"""
+        window = self.window(ticket, now)
+        keys = self._bucket_keys
+        low = bisect_left(keys, int((ticket.rating - window) // self.bucket_size))
+        high_key = (ticket.rating + window) // self.bucket_size
+
+        best = None
+        best_diff = None
+        for index in range(low, len(keys)):
+            key = keys[index]
+            if key > high_key:
+                break
+            # Buckets iterate oldest first, so ties go to the longest waiting
+            for candidate in self.buckets[key].values():
+                if candidate is ticket:
+                    continue
+                diff = abs(candidate.rating - ticket.rating)
+                if diff <= window and (best_diff is None or diff < best_diff):
+                    best, best_diff = candidate, diff
+                    if diff == 0:
+                        return best
+        return best
+
+    def match(self, now: Optional[float] = None) -> List[Tuple[MatchTicket, MatchTicket]]:
+        """
+        Run one matching pass
+
+        Matched players are removed from the queue. In each pair the player
+        who waited longer comes first.
+
+        Args:
+            now: Timestamp used for window widening (defaults to the monotonic clock)
+
+        Returns:
+            List[Tuple[MatchTicket, MatchTicket]]: Matched pairs
+        """
+        if now is None:
+            now = time.monotonic()
+
+        pairs = []
+        for ticket in list(self.tickets.values()):
+            if ticket.player_id not in self.tickets:
+                continue
+            opponent = self._find_opponent(ticket, now)
+            if opponent is None:
+                continue
+            self.remove(ticket.player_id)
+            self.remove(opponent.player_id)
+            pairs.append((ticket, opponent))
+
+        if pairs:
+            logger.debug(f"Matched {len(pairs)} pairs, {len(self.tickets)} still waiting")
+        return pairs
@@ -1,262 +1,426 @@
 """
 Network module for online Gomoku gameplay.
-浜斿瓙妫嬬綉缁滃鎴樻ā鍧?
+五子棋网络对战模块
+
+The manager runs on the caller's asyncio event loop: one reader task, one
+writer task and one heartbeat task per connection, no threads. Messages use
+the newline-delimited framing of ``protocol``. Outgoing frames are queued on
+a ``ClientConnection``, which writes everything queued within one loop
+iteration as a single buffer and waits for ``drain``, so small messages are
+coalesced and a frame is never sent partially.
+
+管理器运行在调用方的asyncio事件循环上：每个连接一个读任务、一个写任务和一个
+心跳任务，不使用线程。同一轮事件循环内排队的消息合并为一次写入。
 """
 
-import socket
-import json
-import threading
-import logging
+import asyncio
+import itertools
 import time
-from typing import Dict, Optional, Tuple, Callable
-from queue import Queue
-from ..i18n import i18n_manager as i18n
-from .config import config
+from typing import Any, Callable, Dict, List, Optional
+
+from ..utils.logger import get_logger
+from ..config import (
+    DEFAULT_HOST, DEFAULT_PORT, MAX_MESSAGE_SIZE,
+    CLIENT_REQUEST_TIMEOUT, HEARTBEAT_INTERVAL, HEARTBEAT_TIMEOUT,
+    NETWORK_RETRY_INTERVAL, NETWORK_MAX_RETRIES
+)
+from .errors import MessageError
+from .fanout import ClientConnection
+from .protocol import encode_frame, decode_frame
+
+logger = get_logger(__name__)
 
-logger = logging.getLogger(__name__)
 
 class NetworkManager:
     """
     Network manager for handling online gameplay
-    缃戠粶瀵规垬绠＄悊鍣?
+    网络对战管理器
+
+    This class implements the singleton pattern; every instantiation returns
+    the same manager.
     """
-    
+
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+        return cls._instance
+
     def __init__(self):
         """Initialize network manager"""
-        self.server_address = config.get('network', 'server', 'localhost')
-        self.server_port = config.get('network', 'port', 5000)
-        self.username = config.get('network', 'username', '')
-        
-        self.socket: Optional[socket.socket] = None
+        if self._initialized:
+            return
+
+        self.host = DEFAULT_HOST
+        self.port = DEFAULT_PORT
+        self.username = ''
+
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.connection: Optional[ClientConnection] = None
         self.connected = False
         self.room_id: Optional[str] = None
         self.player_id: Optional[int] = None
-        
-        # Message queues
-        self.send_queue = Queue()
-        self.receive_queue = Queue()
-        
-        # Callback functions
-        self.callbacks: Dict[str, Callable] = {}
-        
-        logger.info(i18n.get('network_initialized'))
-    
-    def connect(self) -> bool:
+
+        # Outstanding requests keyed by request ID
+        self._request_ids = itertools.count(1)
+        self._pending: Dict[int, asyncio.Future] = {}
+
+        # Event callbacks
+        self.callbacks: Dict[str, List[Callable]] = {}
+
+        # Connection tasks
+        self._listen_task: Optional[asyncio.Task] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closing = False
+
+        # Statistics
+        self.latency: Optional[float] = None
+        self.last_received = 0.0
+        self.messages_sent = 0
+
+        self._initialized = True
+        logger.info("Network manager initialized")
+
+    def is_connected(self) -> bool:
+        """Check whether the manager holds a live connection"""
+        return self.connected
+
+    async def connect(self, host: Optional[str] = None, port: Optional[int] = None) -> bool:
         """
         Connect to game server
-        杩炴帴鍒版父鎴忔湇鍔″櫒
-        
+        连接到游戏服务器
+
+        Args:
+            host: Server host (defaults to the last used host)
+            port: Server port (defaults to the last used port)
+
         Returns:
             bool: True if connected successfully
         """
-        try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.connect((self.server_address, self.server_port))
-            self.connected = True
-            
-            # Start network threads
-            threading.Thread(target=self._receive_loop, daemon=True).start()
-            threading.Thread(target=self._send_loop, daemon=True).start()
-            
-            # Send login message
-            self.send_message({
-                'type': 'login',
-                'username': self.username
-            })
-            
-            logger.info(i18n.get('network_connected'))
+        if self.connected:
             return True
-        except Exception as e:
+
+        if host is not None:
+            self.host = host
+        if port is not None:
+            self.port = port
+
+        try:
+            reader, writer = await asyncio.open_connection(
+                self.host, self.port, limit=MAX_MESSAGE_SIZE
+            )
+        except OSError as e:
             logger.error(f"Connection error: {e}")
             self.connected = False
             return False
-    
-    def disconnect(self):
+
+        self.reader = reader
+        self.connection = ClientConnection(writer)
+        self.connection.start()
+        self.connected = True
+        self._closing = False
+        self.last_received = time.monotonic()
+
+        self._listen_task = asyncio.create_task(self._receive_loop())
+        self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
+
+        logger.info(f"Connected to {self.host}:{self.port}")
+        return True
+
+    async def disconnect(self):
         """
         Disconnect from game server
-        鏂紑涓庢父鎴忔湇鍔″櫒鐨勮繛鎺?
+        断开与游戏服务器的连接
         """
-        if self.connected:
-            try:
-                self.send_message({'type': 'logout'})
-                self.socket.close()
-            except Exception as e:
-                logger.error(f"Disconnect error: {e}")
-            finally:
-                self.connected = False
-                self.socket = None
-                logger.info(i18n.get('network_disconnected'))
-    
-    def create_room(self) -> Optional[str]:
+        self._closing = True
+        if self._reconnect_task and self._reconnect_task is not asyncio.current_task():
+            self._reconnect_task.cancel()
+        self._reconnect_task = None
+
+        if not self.connected and self.connection is None:
+            return
+
+        await self._close_connection()
+        self.room_id = None
+        self.player_id = None
+        logger.info("Disconnected from server")
+
+    async def _close_connection(self):
+        """Stop connection tasks and close the socket"""
+        self.connected = False
+        current = asyncio.current_task()
+        for task in (self._listen_task, self._heartbeat_task):
+            if task is not None and task is not current:
+                task.cancel()
+        self._listen_task = self._heartbeat_task = None
+
+        self._fail_pending('Connection closed')
+
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            await connection.close()
+
+    async def send_message(self, message: Dict[str, Any],
+                           timeout: Optional[float] = CLIENT_REQUEST_TIMEOUT) -> Optional[Dict[str, Any]]:
         """
-        Create a new game room
-        鍒涘缓鏂扮殑娓告垙鎴块棿
-        
+        Send a request to the server and wait for its response
+        向服务器发送请求并等待响应
+
+        Args:
+            message: Message to send
+            timeout: Seconds to wait for the response, None to wait forever
+
         Returns:
-            str: Room ID if created successfully
+            Optional[Dict[str, Any]]: Server response, None if not connected
+                                      or no response arrived in time
         """
         if not self.connected:
             return None
-        
-        self.send_message({'type': 'create_room'})
-        
-        # Wait for response
-        start_time = time.time()
-        while time.time() - start_time < 5:  # 5 second timeout
-            if not self.receive_queue.empty():
-                msg = self.receive_queue.get()
-                if msg.get('type') == 'room_created':
-                    self.room_id = msg.get('room_id')
-                    self.player_id = 1  # Creator is player 1
-                    logger.info(i18n.get('room_created', self.room_id))
-                    return self.room_id
-        
-        logger.error(i18n.get('room_creation_failed'))
+
+        rid = next(self._request_ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[rid] = future
+
+        try:
+            if not self._queue(dict(message, rid=rid)):
+                return None
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"No response to {message.get('cmd', message.get('type'))}")
+            return None
+        finally:
+            self._pending.pop(rid, None)
+
+    def post_message(self, message: Dict[str, Any]) -> bool:
+        """
+        Queue a message without waiting for a response
+        发送消息而不等待响应
+
+        Returns:
+            bool: True if the message was queued
+        """
+        if not self.connected:
+            return False
+        return self._queue(message)
+
+    def _queue(self, message: Dict[str, Any]) -> bool:
+        """Encode a message and queue it on the connection"""
+        try:
+            frame = encode_frame(message)
+        except MessageError as e:
+            logger.error(f"Send error: {e}")
+            return False
+
+        if not self.connection.send(frame, droppable=False):
+            return False
+        self.messages_sent += 1
+        logger.debug(f"Sent: {message}")
+        return True
+
+    async def create_room(self) -> Optional[str]:
+        """
+        Create a new game room
+        创建新的游戏房间
+
+        Returns:
+            str: Room ID if created successfully
+        """
+        response = await self.send_message({'cmd': 'create_room', 'data': {'name': self.username}})
+        if response and response.get('status') == 'ok':
+            self.room_id = response.get('data', {}).get('room_id')
+            self.player_id = 1  # Creator is player 1
+            logger.info(f"Room created: {self.room_id}")
+            return self.room_id
+
+        logger.error("Room creation failed")
         return None
-    
-    def join_room(self, room_id: str) -> bool:
+
+    async def join_room(self, room_id: str) -> bool:
         """
         Join an existing game room
-        鍔犲叆鐜版湁鐨勬父鎴忔埧闂?
-        
+        加入现有的游戏房间
+
         Args:
-            room_id: Room ID to join (鎴块棿ID)
-        
+            room_id: Room ID to join
+
         Returns:
             bool: True if joined successfully
         """
-        if not self.connected:
-            return False
-        
-        self.send_message({
-            'type': 'join_room',
-            'room_id': room_id
-        })
-        
-        # Wait for response
-        start_time = time.time()
-        while time.time() - start_time < 5:  # 5 second timeout
-            if not self.receive_queue.empty():
-                msg = self.receive_queue.get()
-                if msg.get('type') == 'room_joined':
-                    self.room_id = room_id
-                    self.player_id = 2  # Joiner is player 2
-                    logger.info(i18n.get('room_joined', room_id))
-                    return True
-                elif msg.get('type') == 'room_join_failed':
-                    logger.error(i18n.get('room_join_failed', msg.get('reason', '')))
-                    return False
-        
-        logger.error(i18n.get('room_join_timeout'))
+        response = await self.send_message({'cmd': 'join_room', 'data': {'room_id': room_id}})
+        if response and response.get('status') == 'ok':
+            self.room_id = room_id
+            self.player_id = 2  # Joiner is player 2
+            logger.info(f"Joined room {room_id}")
+            return True
+
+        logger.error(f"Failed to join room {room_id}: {(response or {}).get('message', 'timeout')}")
         return False
-    
+
     def leave_room(self):
         """
         Leave current game room
-        绂诲紑褰撳墠娓告垙鎴块棿
+        离开当前游戏房间
         """
         if self.room_id:
-            self.send_message({'type': 'leave_room'})
+            self.post_message({'cmd': 'leave_room', 'data': {'room_id': self.room_id}})
             self.room_id = None
             self.player_id = None
-            logger.info(i18n.get('room_left'))
-    
+            logger.info("Left room")
+
     def make_move(self, row: int, col: int) -> bool:
         """
         Send a move to the server
-        鍚戞湇鍔″櫒鍙戦佽惤瀛愪俊鎭?
-        
+        向服务器发送落子信息
+
         Args:
-            row: Row number (琛屽彿)
-            col: Column number (鍒楀彿)
-        
+            row: Row number
+            col: Column number
+
         Returns:
-            bool: True if move was sent successfully
+            bool: True if move was queued
         """
         if not (self.connected and self.room_id):
             return False
-        
-        self.send_message({
-            'type': 'move',
-            'row': row,
-            'col': col
+
+        return self.post_message({
+            'cmd': 'make_move',
+            'data': {'game_id': self.room_id, 'move': {'x': row, 'y': col}}
         })
-        logger.debug(i18n.get('move_sent', row, col))
-        return True
-    
-    def register_callback(self, event_type: str, callback: Callable):
-        """
-        Register a callback function for network events
-        娉ㄥ唽缃戠粶浜嬩欢鐨勫洖璋冨嚱鏁?
-        
-        Args:
-            event_type: Event type (浜嬩欢绫诲瀷)
-            callback: Callback function (鍥炶皟鍑芥暟)
-        """
-        self.callbacks[event_type] = callback
-        logger.debug(i18n.get('callback_registered', event_type))
-    
-    def send_message(self, message: Dict):
+
+    def on(self, event: str, callback: Callable):
         """
-        Send a message to the server
-        鍚戞湇鍔″櫒鍙戦佹秷鎭?
-        
+        Register a callback for a server event
+        注册服务器事件回调
+
         Args:
-            message: Message to send (瑕佸彂閫佺殑娑堟伅)
+            event: Event name
+            callback: Function or coroutine function taking the event data
         """
-        if self.connected:
-            self.send_queue.put(message)
-    
-    def _receive_loop(self):
+        self.callbacks.setdefault(event, []).append(callback)
+
+    def off(self, event: str, callback: Callable):
+        """Remove a registered callback"""
+        callbacks = self.callbacks.get(event, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def register_callback(self, event_type: str, callback: Callable):
         """
-        Background thread for receiving messages
-        鎺ユ敹娑堟伅鐨勫悗鍙扮嚎绋?
+        Register a callback function for network events
+        注册网络事件的回调函数
         """
-        while self.connected:
+        self.on(event_type, callback)
+
+    async def _handle_event(self, message: Dict[str, Any]):
+        """Dispatch a pushed event to its callbacks"""
+        event = message.get('event')
+        data = message.get('data')
+        for callback in list(self.callbacks.get(event, ())):
             try:
-                data = self.socket.recv(4096)
-                if not data:
+                result = callback(data)
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Error in {event} callback: {e}")
+
+    def _resolve_response(self, message: Dict[str, Any]):
+        """Hand a response to the request waiting for it"""
+        future = self._pending.get(message.pop('rid', None))
+        if future is not None and not future.done():
+            future.set_result(message)
+
+    def _fail_pending(self, reason: str):
+        """Resolve every outstanding request with an error"""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_result({'status': 'error', 'message': reason})
+
+    async def _receive_loop(self):
+        """Read framed messages and dispatch responses and events"""
+        try:
+            while self.connected:
+                line = await self.reader.readline()
+                if not line:
                     break
-                
-                message = json.loads(data.decode())
-                msg_type = message.get('type')
-                
-                # Handle system messages
-                if msg_type in ['ping', 'pong']:
+                self.last_received = time.monotonic()
+
+                try:
+                    message = decode_frame(line)
+                except MessageError as e:
+                    logger.warning(f"Dropping malformed message: {e}")
                     continue
-                
-                logger.debug(f"Received: {message}")
-                
-                # Put message in queue
-                self.receive_queue.put(message)
-                
-                # Call registered callback
-                if msg_type in self.callbacks:
-                    self.callbacks[msg_type](message)
-            except Exception as e:
-                logger.error(f"Receive error: {e}")
-                break
-        
+
+                if message.get('event') == 'ping':
+                    # Answer the server's liveness probe
+                    self.post_message({'cmd': 'ping', 'data': {}})
+                elif 'event' in message:
+                    await self._handle_event(message)
+                else:
+                    self._resolve_response(message)
+        except asyncio.CancelledError:
+            return
+        except Exception as e:
+            logger.error(f"Receive error: {e}")
+
+        if self.connected:
+            self._connection_lost()
+
+    async def _heartbeat_loop(self):
+        """Ping the server and treat a missing pong as a dead connection"""
+        try:
+            while self.connected:
+                await asyncio.sleep(HEARTBEAT_INTERVAL)
+                sent = time.monotonic()
+                response = await self.send_message({'cmd': 'ping', 'data': {}},
+                                                   timeout=HEARTBEAT_TIMEOUT)
+                if response is None or response.get('status') != 'ok':
+                    if self.connected:
+                        logger.warning("Heartbeat timed out")
+                        self._connection_lost()
+                    return
+                self.latency = time.monotonic() - sent
+        except asyncio.CancelledError:
+            pass
+
+    def _connection_lost(self):
+        """Tear down a dead connection and start reconnecting"""
+        logger.warning("Connection lost")
         self.connected = False
-        logger.info(i18n.get('network_disconnected'))
-    
-    def _send_loop(self):
-        """
-        Background thread for sending messages
-        鍙戦佹秷鎭殑鍚庡彴绾跨▼
-        """
-        while self.connected:
+        self._fail_pending('Connection lost')
+
+        connection, self.connection = self.connection, None
+        if connection is not None:
+            connection.abort()
+
+        if not self._closing and (self._reconnect_task is None or self._reconnect_task.done()):
             try:
-                message = self.send_queue.get()
-                if message:
-                    data = json.dumps(message).encode()
-                    self.socket.send(data)
-                    logger.debug(f"Sent: {message}")
-            except Exception as e:
-                logger.error(f"Send error: {e}")
-                break
-        
-        self.connected = False
+                self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
+            except RuntimeError:
+                # No running loop; the caller reconnects explicitly
+                pass
+
+    async def _reconnect(self):
+        """Try to re-establish the connection with a fixed back-off"""
+        current = asyncio.current_task()
+        for task in (self._listen_task, self._heartbeat_task):
+            if task is not None and task is not current:
+                task.cancel()
+
+        for attempt in range(1, NETWORK_MAX_RETRIES + 1):
+            await asyncio.sleep(NETWORK_RETRY_INTERVAL * attempt)
+            if self._closing:
+                return
+            if await self.connect():
+                logger.info(f"Reconnected after {attempt} attempt(s)")
+                await self._handle_event({'event': 'reconnected', 'data': {}})
+                return
+
+        logger.error("Giving up reconnecting")
+        await self._handle_event({'event': 'disconnected', 'data': {}})
+
 
 # Create global instance
-network = NetworkManager() 
+network = NetworkManager()
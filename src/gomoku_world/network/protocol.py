@@ -0,0 +1,65 @@
+"""
+Wire protocol framing
+网络协议分帧
+
+Messages are JSON objects serialized on a single line and terminated by
+``\\n`` (newline-delimited JSON). Compact separators keep frames small and
+``json.dumps`` never emits a raw newline, so a frame boundary is always the
+next newline byte.
+
+消息为单行JSON对象，以``\\n``结尾（换行分隔的JSON）。
+"""
+
+import json
+from typing import Any, Dict
+
+from .errors import MessageError
+
+FRAME_DELIMITER = b"\n"
+
+_encoder = json.JSONEncoder(separators=(',', ':'), ensure_ascii=False)
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    """
+    Serialize a message into a wire frame.
+
+    将消息序列化为网络帧。
+
+    Args:
+        message: JSON-serializable message
+
+    Returns:
+        bytes: UTF-8 encoded frame including the trailing delimiter
+
+    Raises:
+        MessageError: If the message cannot be serialized
+    """
+    try:
+        return _encoder.encode(message).encode('utf-8') + FRAME_DELIMITER
+    except (TypeError, ValueError) as e:
+        raise MessageError(f"Cannot encode message: {e}")
+
+
+def decode_frame(frame: bytes) -> Dict[str, Any]:
+    """
+    Parse a wire frame into a message.
+
+    将网络帧解析为消息。
+
+    Args:
+        frame: Frame bytes, with or without the trailing delimiter
+
+    Returns:
+        Dict[str, Any]: Decoded message
+
+    Raises:
+        MessageError: If the frame is not a JSON object
+    """
+    try:
+        message = json.loads(frame)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise MessageError(f"Invalid message frame: {e}")
+    if not isinstance(message, dict):
+        raise MessageError("Message frame must be a JSON object")
+    return message
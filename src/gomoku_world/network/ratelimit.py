@@ -0,0 +1,109 @@
+"""
+Token-bucket rate limiting for client requests
+客户端请求的令牌桶限流
+
+Every connection owns a ``RequestLimiter`` with one bucket for all of its
+requests and one bucket per limited command. A request is admitted only if
+every bucket it touches has a token left. Buckets refill lazily when they
+are checked, so idle connections cost nothing, and the limiter goes away
+with its connection.
+
+每个连接拥有一个``RequestLimiter``：一个桶限制全部请求，每个受限命令另有一个桶。
+只有所有相关桶都有令牌时请求才被接受。令牌在检查时惰性补充，空闲连接没有开销，
+限流器随连接一起释放。
+"""
+
+import time
+from typing import Dict, Mapping, Optional, Tuple
+
+from ..config import PLAYER_RATE_LIMIT, COMMAND_RATE_LIMITS
+
+RATE_LIMITED_RESPONSE = {'status': 'error', 'message': 'Rate limit exceeded'}
+
+
+class TokenBucket:
+    """
+    Token bucket holding up to ``burst`` tokens refilled at ``rate`` per second
+    令牌桶
+    """
+
+    __slots__ = ('rate', 'burst', 'tokens', 'updated')
+
+    def __init__(self, rate: float, burst: int, now: float):
+        """
+        Initialize a full bucket
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity
+            now: Current monotonic time
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def refill(self, now: float) -> float:
+        """Add the tokens earned since the last update and return the level"""
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.burst, self.tokens + elapsed * self.rate)
+            self.updated = now
+        return self.tokens
+
+
+class RequestLimiter:
+    """
+    Per-connection request limiter
+    单连接请求限流器
+    """
+
+    def __init__(self, player_limit: Optional[Tuple[float, int]] = PLAYER_RATE_LIMIT,
+                 command_limits: Optional[Mapping[str, Tuple[float, int]]] = None):
+        """
+        Initialize limiter
+
+        Args:
+            player_limit: (rate, burst) for all requests, None for no limit
+            command_limits: (rate, burst) per command name
+        """
+        self.player_limit = player_limit
+        self.command_limits = COMMAND_RATE_LIMITS if command_limits is None else command_limits
+        self._player_bucket: Optional[TokenBucket] = None
+        self._command_buckets: Dict[str, TokenBucket] = {}
+        self.rejected = 0
+
+    def allow(self, cmd: str, now: Optional[float] = None) -> bool:
+        """
+        Check whether a request may be processed and take its tokens
+
+        Args:
+            cmd: Command name
+            now: Current monotonic time
+
+        Returns:
+            bool: False if the request exceeds a limit
+        """
+        if now is None:
+            now = time.monotonic()
+
+        player = self._player_bucket
+        if player is None and self.player_limit is not None:
+            player = self._player_bucket = TokenBucket(*self.player_limit, now)
+
+        command = self._command_buckets.get(cmd)
+        if command is None and cmd in self.command_limits:
+            command = self._command_buckets[cmd] = TokenBucket(*self.command_limits[cmd], now)
+
+        # Take tokens only when both buckets can pay, so a rejected request
+        # does not drain the other bucket
+        if (player is not None and player.refill(now) < 1) or \
+                (command is not None and command.refill(now) < 1):
+            self.rejected += 1
+            return False
+
+        if player is not None:
+            player.tokens -= 1
+        if command is not None:
+            command.tokens -= 1
+        return True
@@ -4,18 +4,58 @@ Game server implementation
 """
 
 import asyncio
-import json
-from typing import Dict, Set, Optional
-from dataclasses import dataclass, asdict
+import itertools
+from typing import Dict, Optional, TYPE_CHECKING
+from dataclasses import dataclass, asdict, field
 
+from ..core.board import CompactBoard
+from ..core.codec import PackedMoves, MOVE_ENCODING, move_coordinates, move_time
 from ..utils.logger import get_logger
+from ..utils.monitoring import command_stats, tracer, health_checker
 from ..config import (
+    BOARD_SIZE,
     DEFAULT_HOST, DEFAULT_PORT,
     MAX_SPECTATORS_PER_GAME,
-    SPECTATOR_UPDATE_INTERVAL
+    LOBBY_PAGE_SIZE,
+    MAX_MESSAGE_SIZE,
+    MATCHMAKING_INTERVAL,
+    MAX_CONNECTIONS,
+    CONNECTION_IDLE_TIMEOUT,
+    HEARTBEAT_INTERVAL,
+    HEALTH_THRESHOLDS
 )
+from .chat import ChatManager
+from .errors import MessageError
+from .fanout import ClientConnection, ConnectionRegistry
+from .lobby import LobbyIndex
+from .matchmaking import MatchmakingQueue
+from .protocol import encode_frame, decode_frame
+from .ratelimit import RequestLimiter, RATE_LIMITED_RESPONSE
 from .spectator import SpectatorManager
 
+if TYPE_CHECKING:
+    from .cluster import SessionDirectory
+
+PING_FRAME = encode_frame({'event': 'ping', 'data': {}})
+SERVER_FULL_FRAME = encode_frame({'status': 'error', 'message': 'Server full'})
+NOT_AUTHORIZED_RESPONSE = {'status': 'error', 'message': 'Not logged in as this player'}
+
+# Handler method for each command, bound once per server
+COMMAND_HANDLERS = {
+    'login': '_handle_login',
+    'logout': '_handle_logout',
+    'find_game': '_handle_find_game',
+    'make_move': '_handle_make_move',
+    'cancel_match': '_handle_cancel_match',
+    'get_status': '_handle_get_status',
+    'get_game_state': '_handle_get_game_state',
+    'ping': '_handle_ping',
+    'list_games': '_handle_list_games',
+    'spectate_game': '_handle_spectate_game',
+    'leave_spectate': '_handle_leave_spectate',
+    'spectator_chat': '_handle_spectator_chat'
+}
+
 logger = get_logger(__name__)
 
 @dataclass
@@ -33,9 +73,30 @@ class Game:
     id: str
     black_player: str
     white_player: str
-    moves: list
+    moves: PackedMoves = field(default_factory=PackedMoves)
     status: str = "waiting"  # waiting/playing/finished
     spectator_count: int = 0
+    winner: Optional[int] = None  # 1 black, 2 white, 0 draw
+    board: CompactBoard = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Build the authoritative board, replaying any existing moves"""
+        self.board = CompactBoard(self.moves.board_size)
+        for index, (row, col) in enumerate(self.moves):
+            self.board.place_piece(row, col, 1 if index % 2 == 0 else 2)
+    
+    @property
+    def current_player(self) -> int:
+        """Color to move: 1 black, 2 white"""
+        return 1 if len(self.moves) % 2 == 0 else 2
+    
+    def player_color(self, player_id: str) -> int:
+        """Color of a player in this game, 0 if not seated"""
+        if player_id == self.black_player:
+            return 1
+        if player_id == self.white_player:
+            return 2
+        return 0
 
 class GameServer:
     """
@@ -43,87 +104,245 @@ class GameServer:
     澶勭悊澶氫釜娓告垙浼氳瘽鐨勬父鎴忔湇鍔″櫒
     """
     
-    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
-        """Initialize game server"""
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                 worker_id: int = 0, directory: Optional['SessionDirectory'] = None,
+                 reuse_port: bool = False):
+        """
+        Initialize game server
+        
+        Args:
+            host: Listen host
+            port: Listen port
+            worker_id: Worker number when running as part of a cluster
+            directory: Session directory shared with other workers, if any
+            reuse_port: Accept on a ``SO_REUSEPORT`` socket shared with other workers
+        """
         self.host = host
         self.port = port
+        self.worker_id = worker_id
+        self.reuse_port = reuse_port
         self.players: Dict[str, Player] = {}
         self.games: Dict[str, Game] = {}
-        self.waiting_players: Set[str] = set()
+        
+        # Connection management
+        self.max_connections = MAX_CONNECTIONS
+        self.idle_timeout = CONNECTION_IDLE_TIMEOUT
+        self.heartbeat_interval = HEARTBEAT_INTERVAL
+        self._connection_slots: Optional[asyncio.Semaphore] = None
+        self.open_connections = 0
+        
+        # Players waiting for an opponent, paired by the matchmaking task
+        self.matchmaker = MatchmakingQueue()
+        self._game_ids = itertools.count(1)
+        self._matchmaking_task: Optional[asyncio.Task] = None
         
         # Initialize spectator manager
         self.spectator_manager = SpectatorManager()
+        self.chat = ChatManager(self._broadcast_to_spectators)
+        
+        # Outbound connections keyed by player ID
+        self.connections = ConnectionRegistry()
+        
+        # Command dispatch and accounting
+        self._handlers = {cmd: getattr(self, name) for cmd, name in COMMAND_HANDLERS.items()}
+        self.command_stats = command_stats
+        self.tracer = tracer
+        self.health = health_checker
+        
+        # Active games in lobby order; the default first page is cached per version
+        self.lobby = LobbyIndex()
+        self._game_list: Optional[dict] = None
+        self._game_list_version = -1
+        
+        # Routing to other workers in multi-process mode
+        self.router = None
+        if directory is not None:
+            from .cluster import ClusterRouter
+            self.router = ClusterRouter(self, directory)
         
         logger.info(f"Game server initialized on {host}:{port}")
     
     async def start(self):
         """Start the server"""
+        if self.router is not None:
+            await self.router.start()
+        
         server = await asyncio.start_server(
             self._handle_client,
             self.host,
-            self.port
+            self.port,
+            limit=MAX_MESSAGE_SIZE,
+            reuse_port=self.reuse_port or None
         )
         
         logger.info(f"Server running on {self.host}:{self.port}")
         
-        async with server:
-            await server.serve_forever()
+        self.register_health_probes()
+        self.health.start()
+        self._matchmaking_task = asyncio.create_task(self._matchmaking_loop())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self._matchmaking_task.cancel()
+            if self.router is not None:
+                await self.router.stop()
+    
+    def register_health_probes(self):
+        """Add the server's probes to the health checker"""
+        degraded, critical = HEALTH_THRESHOLDS['clients']
+        self.health.register("clients", lambda: self.open_connections,
+                             degraded * self.max_connections, critical * self.max_connections)
+        self.health.register("matchmaking_queue", lambda: len(self.matchmaker),
+                             *HEALTH_THRESHOLDS['matchmaking_queue'])
     
     async def _handle_client(self, reader: asyncio.StreamReader, 
                            writer: asyncio.StreamWriter):
-        """Handle client connection"""
+        """Handle client connection, refusing it when all slots are taken"""
+        if self._connection_slots is None:
+            self._connection_slots = asyncio.Semaphore(self.max_connections)
+        
+        if self._connection_slots.locked():
+            logger.warning("Connection limit reached, refusing client")
+            writer.write(SERVER_FULL_FRAME)
+            writer.close()
+            return
+        
+        async with self._connection_slots:
+            self.open_connections += 1
+            try:
+                await self._serve_client(reader, writer)
+            finally:
+                self.open_connections -= 1
+    
+    async def _serve_client(self, reader: asyncio.StreamReader,
+                            writer: asyncio.StreamWriter):
+        """
+        Serve one client connection
+        
+        Silent connections are probed with a ``ping`` event every heartbeat
+        interval and closed once they stay silent for the idle timeout.
+        Reading pauses while the socket write buffer is above its high-water
+        mark, so a client that does not read cannot grow server memory.
+        On disconnect the player is logged out, which also ends their game
+        and removes them from matchmaking and spectating.
+        """
         addr = writer.get_extra_info('peername')
         logger.info(f"New connection from {addr}")
         
+        loop = asyncio.get_running_loop()
+        connection = ClientConnection(writer)
+        connection.start()
+        limiter = RequestLimiter()
+        last_activity = loop.time()
+        
         try:
-            while True:
-                data = await reader.read(1024)
-                if not data:
+            while not connection.closed:
+                try:
+                    line = await asyncio.wait_for(reader.readline(), self.heartbeat_interval)
+                except asyncio.TimeoutError:
+                    if loop.time() - last_activity >= self.idle_timeout:
+                        logger.info(f"Closing idle connection {addr}")
+                        break
+                    connection.send(PING_FRAME, droppable=False)
+                    continue
+                
+                if not line:
                     break
+                last_activity = loop.time()
+                
+                try:
+                    message = decode_frame(line)
+                except MessageError as e:
+                    connection.send_message({'status': 'error', 'message': str(e)}, droppable=False)
+                    continue
+                
+                response = None
+                if not limiter.allow(message.get('cmd'), last_activity):
+                    self.command_stats.record_rejected(message.get('cmd'))
+                    response = RATE_LIMITED_RESPONSE
+                elif self.router is not None:
+                    response = await self.router.route(message, connection.client_id)
+                if response is None:
+                    response = await self._process_message(message, connection)
+                
+                # Bind the connection to the player so pushes can reach it
+                if message.get('cmd') == 'login' and response.get('status') == 'ok':
+                    self.connections.register(message['data']['id'], connection)
                 
-                message = json.loads(data.decode())
-                response = await self._process_message(message)
+                # Echo the request ID so the client can match the response
+                if 'rid' in message:
+                    response = dict(response, rid=message['rid'])
                 
-                writer.write(json.dumps(response).encode())
-                await writer.drain()
+                connection.send(encode_frame(response), droppable=False)
+                
+                # Backpressure: stop reading until the client drains its socket
+                if connection.write_blocked:
+                    await connection.wait_writable()
                 
         except Exception as e:
             logger.error(f"Error handling client {addr}: {e}")
         finally:
-            writer.close()
-            await writer.wait_closed()
+            player_id = connection.client_id
+            owned = player_id is not None and self.connections.get(player_id) is connection
+            self.connections.unregister(connection)
+            if self.router is not None and player_id is not None:
+                await self.router.client_disconnected(player_id)
+            if owned:
+                await self._remove_player(player_id)
+            await connection.close()
             logger.info(f"Connection closed for {addr}")
     
-    async def _process_message(self, message: dict) -> dict:
-        """Process client message"""
+    async def _process_message(self, message: dict,
+                               connection: Optional[ClientConnection] = None) -> dict:
+        """
+        Process client message
+        
+        The handler runs inside a span that continues the client's trace
+        when the request carries one.
+        
+        Args:
+            message: Client message
+            connection: Connection the message arrived on; its ``client_id``,
+                        bound at login, is the player the request acts for
+        """
         cmd = message.get('cmd')
         data = message.get('data', {})
         
-        handlers = {
-            'login': self._handle_login,
-            'logout': self._handle_logout,
-            'find_game': self._handle_find_game,
-            'make_move': self._handle_make_move,
-            'cancel_match': self._handle_cancel_match,
-            'get_status': self._handle_get_status,
-            # Add spectator handlers
-            'list_games': self._handle_list_games,
-            'spectate_game': self._handle_spectate_game,
-            'leave_spectate': self._handle_leave_spectate,
-            'spectator_chat': self._handle_spectator_chat
-        }
+        handler = self._handlers.get(cmd)
+        if handler is None:
+            return {'status': 'error', 'message': 'Unknown command'}
         
-        handler = handlers.get(cmd)
-        if handler:
+        parent = self.tracer.extract(message.get('trace'))
+        with self.command_stats.measure(cmd), \
+                self.tracer.span(f"server.{cmd}", parent=parent, worker=self.worker_id) as span:
             try:
-                return await handler(data)
+                response = await handler(data, connection)
             except Exception as e:
                 logger.error(f"Error processing {cmd}: {e}")
+                span.status = "error"
                 return {'status': 'error', 'message': str(e)}
-        else:
-            return {'status': 'error', 'message': 'Unknown command'}
+            span.set(status=response.get('status'))
+            return response
     
-    async def _handle_login(self, data: dict) -> dict:
+    @staticmethod
+    def _acting_player(data: dict, connection: Optional[ClientConnection]) -> Optional[str]:
+        """
+        Get the player a request acts for
+        
+        The identity is the one bound to the connection at login, never the
+        client-supplied ``id``; a request naming another player is refused.
+        
+        Returns:
+            Optional[str]: Player ID, None if the request may not act
+        """
+        player_id = connection.client_id if connection is not None else None
+        if player_id is None or data.get('id', player_id) != player_id:
+            return None
+        return player_id
+    
+    async def _handle_login(self, data: dict,
+                            connection: Optional[ClientConnection] = None) -> dict:
         """Handle player login"""
         player_id = data.get('id')
         name = data.get('name')
@@ -134,6 +353,12 @@ class GameServer:
         if player_id in self.players:
             return {'status': 'error', 'message': 'Player already logged in'}
         
+        if connection is not None and connection.client_id is not None:
+            return {'status': 'error', 'message': 'Connection already logged in'}
+        
+        if self.router is not None and not await self.router.claim_player(player_id):
+            return {'status': 'error', 'message': 'Player already logged in'}
+        
         player = Player(id=player_id, name=name)
         self.players[player_id] = player
         
@@ -143,81 +368,176 @@ class GameServer:
             'data': asdict(player)
         }
     
-    async def _handle_logout(self, data: dict) -> dict:
+    async def _handle_logout(self, data: dict,
+                             connection: Optional[ClientConnection] = None) -> dict:
         """Handle player logout"""
-        player_id = data.get('id')
+        player_id = self._acting_player(data, connection)
+        if player_id is None:
+            return NOT_AUTHORIZED_RESPONSE
         
-        if player_id in self.players:
-            player = self.players[player_id]
-            if player.game_id:
-                await self._end_game(player.game_id)
-            
-            self.waiting_players.discard(player_id)
-            del self.players[player_id]
-            
-            logger.info(f"Player {player.name} logged out")
+        if await self._remove_player(player_id):
+            self.connections.unregister(connection)
+            connection.client_id = None
             return {'status': 'ok'}
         
         return {'status': 'error', 'message': 'Player not found'}
     
-    async def _handle_find_game(self, data: dict) -> dict:
+    async def _remove_player(self, player_id: str) -> bool:
+        """
+        Remove a player and everything that references them
+        
+        Leaves matchmaking and spectating, and ends the player's game with
+        the opponent as winner if it was still in progress.
+        
+        Returns:
+            bool: False if the player was not logged in
+        """
+        player = self.players.pop(player_id, None)
+        if player is None:
+            return False
+        
+        self.matchmaker.remove(player_id)
+        
+        spectator = self.spectator_manager.get_spectator_info(player_id)
+        if spectator and self.spectator_manager.remove_spectator(player_id):
+            game = self.games.get(spectator.game_id)
+            if game is not None:
+                game.spectator_count -= 1
+                self.lobby.update(game.id, spectator_count=game.spectator_count)
+        
+        if player.game_id in self.games:
+            await self._forfeit(player.game_id, player_id)
+        elif player.game_id and self.router is not None:
+            await self.router.forfeit(player.game_id, player_id)
+        
+        if self.router is not None:
+            await self.router.release_player(player_id)
+        
+        logger.info(f"Player {player.name} logged out")
+        return True
+    
+    async def _forfeit(self, game_id: str, player_id: str):
+        """End a game, with the opponent as winner if it was still in progress"""
+        game = self.games.get(game_id)
+        if game is None:
+            return
+        color = game.player_color(player_id)
+        if game.winner is None and color:
+            game.winner = 3 - color
+        await self._end_game(game_id)
+    
+    def _player(self, player_id: str) -> Optional[Player]:
+        """Look up a player connected here or, in a cluster, seen from another worker"""
+        player = self.players.get(player_id)
+        if player is None and self.router is not None:
+            player = self.router.find_player(player_id)
+        return player
+    
+    async def _handle_find_game(self, data: dict,
+                                connection: Optional[ClientConnection] = None) -> dict:
         """Handle game matchmaking"""
-        player_id = data.get('id')
+        player_id = self._acting_player(data, connection)
+        if player_id is None:
+            return NOT_AUTHORIZED_RESPONSE
         
-        if player_id not in self.players:
+        player = self._player(player_id)
+        if player is None:
             return {'status': 'error', 'message': 'Player not found'}
         
-        player = self.players[player_id]
-        
         # If player is already in a game
         if player.game_id:
             return {'status': 'error', 'message': 'Player already in game'}
         
-        # Add to waiting list
-        self.waiting_players.add(player_id)
+        # Pairing happens in the matchmaking task, which pushes 'game_found';
+        # in a cluster one worker queues players of every worker
+        self.matchmaker.add(player_id, player.rating)
         
-        # Try to match with another player
-        if len(self.waiting_players) >= 2:
-            players = list(self.waiting_players)[:2]
-            game_id = f"game_{len(self.games)}"
-            
-            game = Game(
-                id=game_id,
-                black_player=players[0],
-                white_player=players[1],
-                moves=[]
-            )
-            
-            self.games[game_id] = game
-            self.players[players[0]].game_id = game_id
-            self.players[players[1]].game_id = game_id
-            
-            self.waiting_players.remove(players[0])
-            self.waiting_players.remove(players[1])
-            
-            logger.info(f"Game {game_id} started between {players[0]} and {players[1]}")
+        return {
+            'status': 'ok',
+            'message': 'Waiting for opponent'
+        }
+    
+    async def _matchmaking_loop(self):
+        """Periodically pair waiting players"""
+        while True:
+            await asyncio.sleep(MATCHMAKING_INTERVAL)
+            try:
+                self._run_matchmaking()
+            except Exception as e:
+                logger.error(f"Matchmaking pass failed: {e}")
+    
+    def _run_matchmaking(self, now: Optional[float] = None) -> int:
+        """
+        Run one matchmaking pass and start a game for every pair
+        
+        Args:
+            now: Timestamp used for window widening
             
-            return {
-                'status': 'ok',
+        Returns:
+            int: Number of games started
+        """
+        started = 0
+        for first, second in self.matchmaker.match(now):
+            black = self._player(first.player_id)
+            white = self._player(second.player_id)
+            if black is None or white is None or black.game_id or white.game_id:
+                continue
+            # Games run on the worker black is connected to
+            if black.id in self.players:
+                self._start_game(black, white)
+            else:
+                self.router.host_game(black, white)
+            started += 1
+        return started
+    
+    def _start_game(self, black: Player, white: Player) -> Game:
+        """Create a game for two matched players and notify them"""
+        # Worker-prefixed ids stay unique across a cluster
+        if self.router is not None:
+            game_id = f"game_{self.worker_id}_{next(self._game_ids)}"
+        else:
+            game_id = f"game_{next(self._game_ids)}"
+        game = Game(
+            id=game_id,
+            black_player=black.id,
+            white_player=white.id,
+            moves=PackedMoves(BOARD_SIZE),
+            status="playing"
+        )
+        
+        self.games[game_id] = game
+        self.lobby.add(game_id, black.id, white.id, rating=(black.rating + white.rating) // 2)
+        black.game_id = game_id
+        white.game_id = game_id
+        if self.router is not None:
+            self.router.game_started(game_id, [black.id, white.id])
+        
+        for player, color, opponent in ((black, 1, white), (white, 2, black)):
+            self._send_message_to_client(player.id, {
+                'event': 'game_found',
                 'data': {
                     'game_id': game_id,
-                    'black_player': self.players[players[0]].name,
-                    'white_player': self.players[players[1]].name
+                    'color': color,
+                    'black_player': black.name,
+                    'white_player': white.name,
+                    'opponent_rating': opponent.rating
                 }
-            }
+            }, droppable=False)
         
-        return {
-            'status': 'ok',
-            'message': 'Waiting for opponent'
-        }
+        logger.info(f"Game {game_id} started between {black.id} and {white.id}")
+        return game
     
-    async def _handle_make_move(self, data: dict) -> dict:
+    async def _handle_make_move(self, data: dict,
+                                connection: Optional[ClientConnection] = None) -> dict:
         """Handle game move"""
-        player_id = data.get('id')
+        player_id = self._acting_player(data, connection)
+        if player_id is None:
+            return NOT_AUTHORIZED_RESPONSE
+        
         game_id = data.get('game_id')
         move = data.get('move')
         
-        if not all([player_id, game_id, move]):
+        if not game_id or move is None:
             return {'status': 'error', 'message': 'Invalid move data'}
         
         if game_id not in self.games:
@@ -227,64 +547,167 @@ class GameServer:
         if game.status != "playing":
             return {'status': 'error', 'message': 'Game not in progress'}
         
-        # Validate move
-        # TODO: Implement move validation
-        
-        game.moves.append(move)
+        # Moves arrive either as a packed cell index or as {'x', 'y'} dict
+        try:
+            if isinstance(move, int) and not isinstance(move, bool):
+                row, col = divmod(move, game.moves.board_size)
+                time_ms = None
+            elif isinstance(move, dict):
+                row, col = move_coordinates(move)
+                time_ms = move_time(move)
+            else:
+                raise ValueError(f"Invalid move data: {move}")
+            cell = game.moves.cell_index(row, col)
+        except ValueError as e:
+            return {'status': 'error', 'message': str(e)}
+        
+        # The server board is authoritative: check seat, turn and cell
+        color = game.player_color(player_id)
+        if not color:
+            return {'status': 'error', 'message': 'Player not in this game'}
+        if color != game.current_player:
+            return {'status': 'error', 'message': 'Not your turn'}
+        if not game.board.is_valid_move(row, col):
+            return {'status': 'error', 'message': 'Position already occupied'}
+        
+        # Everything is checked, so the log and the board change together
+        game.moves.append_cell(cell, time_ms)
+        game.board.place_piece(row, col, color)
+        move_number = len(game.moves)
+        
+        if game.board.check_win(row, col):
+            game.winner = color
+        elif game.board.is_full():
+            game.winner = 0
+        
+        logger.info(f"Move made in game {game_id}: ({row}, {col})")
+        
+        if game.winner is not None:
+            # One delta carries both the final move and the finished status
+            await self._end_game(game_id, since=move_number - 1)
+        else:
+            await self._broadcast_game_delta(game_id, move_number - 1)
         
-        logger.info(f"Move made in game {game_id}: {move}")
         return {
             'status': 'ok',
-            'data': {'move': move}
+            'data': {
+                'move': {'x': row, 'y': col},
+                'cell': cell,
+                'move_number': move_number,
+                'game_over': game.winner is not None,
+                'winner': game.winner
+            }
         }
     
-    async def _handle_cancel_match(self, data: dict) -> dict:
+    async def _handle_cancel_match(self, data: dict,
+                                   connection: Optional[ClientConnection] = None) -> dict:
         """Handle match cancellation"""
-        player_id = data.get('id')
+        player_id = self._acting_player(data, connection)
+        if player_id is None:
+            return NOT_AUTHORIZED_RESPONSE
         
-        if player_id in self.waiting_players:
-            self.waiting_players.remove(player_id)
+        if self.matchmaker.remove(player_id):
             logger.info(f"Player {player_id} cancelled matchmaking")
             return {'status': 'ok'}
         
         return {'status': 'error', 'message': 'Player not in matchmaking'}
     
-    async def _handle_get_status(self, data: dict) -> dict:
+    async def _handle_ping(self, data: dict,
+                           connection: Optional[ClientConnection] = None) -> dict:
+        """Handle heartbeat ping"""
+        return {'status': 'ok', 'data': {'pong': True}}
+    
+    async def _handle_get_status(self, data: dict,
+                                 connection: Optional[ClientConnection] = None) -> dict:
         """Handle status request"""
         return {
             'status': 'ok',
             'data': {
                 'players_online': len(self.players),
                 'games_active': len(self.games),
-                'players_waiting': len(self.waiting_players)
+                'players_waiting': len(self.matchmaker)
             }
         }
     
-    async def _handle_list_games(self, data: dict) -> dict:
-        """Handle game list request"""
-        active_games = [
-            {
-                'id': game_id,
-                'black_player': game.black_player,
-                'white_player': game.white_player,
-                'status': game.status,
-                'spectator_count': self.spectator_manager.get_spectator_count(game_id)
-            }
-            for game_id, game in self.games.items()
-            if game.status == "playing"
-        ]
+    async def _handle_get_game_state(self, data: dict,
+                                     connection: Optional[ClientConnection] = None) -> dict:
+        """Handle game state request (snapshot or delta from ``since``)"""
+        game_id = data.get('game_id')
+        
+        if not game_id or game_id not in self.games:
+            return {'status': 'error', 'message': 'Game not found'}
         
         return {
+            'status': 'ok',
+            'data': self._game_state_since(self.games[game_id], data.get('since'))
+        }
+    
+    async def _handle_list_games(self, data: dict,
+                                 connection: Optional[ClientConnection] = None) -> dict:
+        """
+        Handle game list request
+        
+        Returns one page of active games in lobby order together with the
+        lobby version. ``cursor`` continues after the previous page and
+        ``limit`` sets the page size. A client that sends the ``since``
+        version it holds gets only the changes to that page (see
+        ``LobbyIndex.page_changes_since``), or the page itself if that
+        version is too old.
+        """
+        cursor = data.get('cursor')
+        limit = data.get('limit', LOBBY_PAGE_SIZE)
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            return {'status': 'error', 'message': 'Invalid limit'}
+        
+        since = data.get('since')
+        if isinstance(since, int) and not isinstance(since, bool):
+            try:
+                changes = self.lobby.page_changes_since(since, cursor, limit)
+            except (AttributeError, ValueError):
+                return {'status': 'error', 'message': 'Invalid cursor'}
+            if changes is not None:
+                return {
+                    'status': 'ok',
+                    'data': dict(changes, version=self.lobby.version)
+                }
+        
+        first_page = cursor is None and limit == LOBBY_PAGE_SIZE
+        if first_page and self._game_list_version == self.lobby.version:
+            return self._game_list
+        
+        try:
+            games, next_cursor = self.lobby.page(cursor, limit)
+        except (AttributeError, ValueError):
+            return {'status': 'error', 'message': 'Invalid cursor'}
+        
+        response = {
             'status': 'ok',
             'data': {
-                'games': active_games
+                'games': games,
+                'version': self.lobby.version,
+                'next_cursor': next_cursor
             }
         }
+        if first_page:
+            self._game_list = response
+            self._game_list_version = self.lobby.version
+        return response
     
-    async def _handle_spectate_game(self, data: dict) -> dict:
-        """Handle spectate game request"""
-        player_id = data.get('id')
+    async def _handle_spectate_game(self, data: dict,
+                                    connection: Optional[ClientConnection] = None) -> dict:
+        """
+        Handle spectate game request
+        
+        Spectators that already hold part of the move log pass ``since``
+        (the number of moves they have) and receive only the missing tail;
+        everyone else gets a full snapshot.
+        """
+        player_id = self._acting_player(data, connection)
+        if player_id is None:
+            return NOT_AUTHORIZED_RESPONSE
+        
         game_id = data.get('game_id')
+        since = data.get('since')
         
         if not game_id or game_id not in self.games:
             return {'status': 'error', 'message': 'Game not found'}
@@ -298,33 +721,32 @@ class GameServer:
         if current_count >= MAX_SPECTATORS_PER_GAME:
             return {'status': 'error', 'message': 'Game has reached spectator limit'}
         
-        # Add spectator
-        player = self.players.get(player_id)
+        # Add spectator; players of other workers arrive through the router
+        player = self._player(player_id)
         if not player:
             return {'status': 'error', 'message': 'Player not found'}
             
         if self.spectator_manager.add_spectator(player_id, player.name, game_id):
             # Update game state
             game.spectator_count = current_count + 1
+            self.lobby.update(game_id, spectator_count=game.spectator_count)
             
-            # Return initial game state
+            # Return initial game state with recent chat for late joiners
+            state = self._game_state_since(game, since)
+            state['chat'] = self.chat.history(game_id)
             return {
                 'status': 'ok',
-                'data': {
-                    'game_id': game_id,
-                    'black_player': game.black_player,
-                    'white_player': game.white_player,
-                    'moves': game.moves,
-                    'status': game.status,
-                    'spectator_count': game.spectator_count
-                }
+                'data': state
             }
         else:
             return {'status': 'error', 'message': 'Failed to add spectator'}
     
-    async def _handle_leave_spectate(self, data: dict) -> dict:
+    async def _handle_leave_spectate(self, data: dict,
+                                     connection: Optional[ClientConnection] = None) -> dict:
         """Handle leave spectate request"""
-        player_id = data.get('id')
+        player_id = self._acting_player(data, connection)
+        if player_id is None:
+            return NOT_AUTHORIZED_RESPONSE
         
         spectator = self.spectator_manager.get_spectator_info(player_id)
         if not spectator:
@@ -336,71 +758,126 @@ class GameServer:
             if game_id in self.games:
                 game = self.games[game_id]
                 game.spectator_count -= 1
+                self.lobby.update(game.id, spectator_count=game.spectator_count)
             
             return {'status': 'ok'}
         else:
             return {'status': 'error', 'message': 'Failed to remove spectator'}
     
-    async def _handle_spectator_chat(self, data: dict) -> dict:
-        """Handle spectator chat message"""
-        player_id = data.get('id')
+    async def _handle_spectator_chat(self, data: dict,
+                                     connection: Optional[ClientConnection] = None) -> dict:
+        """Handle spectator chat message; delivery is batched per game"""
+        player_id = self._acting_player(data, connection)
+        if player_id is None:
+            return NOT_AUTHORIZED_RESPONSE
+        
         message = data.get('message')
         
         spectator = self.spectator_manager.get_spectator_info(player_id)
         if not spectator:
             return {'status': 'error', 'message': 'Not spectating any game'}
         
-        # Broadcast chat message to all spectators
-        chat_data = {
-            'event': 'chat',
-            'data': {
-                'sender': spectator.name,
-                'message': message
-            }
-        }
-        
-        self.spectator_manager.broadcast_to_spectators(
-            spectator.game_id,
-            chat_data,
-            self._send_message_to_client
-        )
+        if not isinstance(message, str) or not message.strip():
+            return {'status': 'error', 'message': 'Invalid chat message'}
         
+        self.chat.post(spectator.game_id, spectator.name, message)
         return {'status': 'ok'}
     
-    async def _send_message_to_client(self, client_id: str, message: dict):
-        """Send message to specific client"""
-        # TODO: Implement actual message sending
-        pass
+    def _send_message_to_client(self, client_id: str, message: dict,
+                                droppable: bool = True) -> bool:
+        """Queue a message for a specific client"""
+        return self._send_frame(client_id, encode_frame(message), droppable)
     
-    async def _broadcast_game_state(self, game_id: str):
-        """Broadcast game state to spectators"""
-        if game_id not in self.games:
-            return
-            
-        game = self.games[game_id]
-        state = {
-            'event': 'game_state',
-            'data': {
-                'game_id': game_id,
-                'black_player': game.black_player,
-                'white_player': game.white_player,
-                'moves': game.moves,
-                'status': game.status,
-                'spectator_count': game.spectator_count
-            }
+    def _broadcast_to_spectators(self, game_id: str, frame: bytes) -> int:
+        """Queue an encoded frame for every spectator of a game"""
+        return self.spectator_manager.broadcast_to_spectators(game_id, frame, self._send_frame)
+    
+    def _send_frame(self, client_id: str, frame: bytes, droppable: bool = True) -> bool:
+        """Queue a frame for a client connected here or, in a cluster, elsewhere"""
+        if self.connections.send_frame(client_id, frame, droppable):
+            return True
+        if self.router is not None and client_id not in self.connections:
+            return self.router.push(client_id, frame)
+        return False
+    
+    def _game_snapshot(self, game: Game) -> dict:
+        """Build a full game state snapshot"""
+        return {
+            'game_id': game.id,
+            'snapshot': True,
+            'seq': len(game.moves),
+            'black_player': game.black_player,
+            'white_player': game.white_player,
+            'moves': game.moves.to_base64(),
+            'move_encoding': MOVE_ENCODING,
+            'status': game.status,
+            'winner': game.winner,
+            'spectator_count': game.spectator_count
         }
+    
+    def _game_delta(self, game: Game, since: int) -> dict:
+        """
+        Build a delta carrying the moves from sequence number ``since``
+        
+        ``seq`` is the move number of the first move in the delta; a client
+        holding ``seq`` moves appends the delta and then holds
+        ``seq + len(moves)``. Cost depends only on the delta size.
+        """
+        return {
+            'game_id': game.id,
+            'snapshot': False,
+            'seq': since,
+            'moves': game.moves.to_base64(since),
+            'move_encoding': MOVE_ENCODING,
+            'status': game.status,
+            'winner': game.winner
+        }
+    
+    def _game_state_since(self, game: Game, since: Optional[int]) -> dict:
+        """Build a delta if ``since`` is a valid sequence number, else a snapshot"""
+        if isinstance(since, int) and not isinstance(since, bool) and 0 <= since <= len(game.moves):
+            return self._game_delta(game, since)
+        return self._game_snapshot(game)
+    
+    async def _broadcast_game_delta(self, game_id: str, since: int):
+        """Broadcast new moves to both players and all spectators"""
+        game = self.games.get(game_id)
+        if game is None:
+            return
         
-        self.spectator_manager.broadcast_to_spectators(
-            game_id,
-            state,
-            self._send_message_to_client
-        )
+        with self.tracer.span("server.broadcast", game_id=game_id) as span:
+            frame = encode_frame({
+                'event': 'game_delta',
+                'data': self._game_delta(game, since)
+            })
+            
+            self._send_frame(game.black_player, frame)
+            self._send_frame(game.white_player, frame)
+            sent = self.spectator_manager.broadcast_to_spectators(
+                game_id,
+                frame,
+                self._send_frame
+            )
+            span.set(spectators=sent, bytes=len(frame))
     
-    async def _end_game(self, game_id: str):
-        """End a game session"""
+    async def _end_game(self, game_id: str, since: Optional[int] = None):
+        """
+        End a game session
+        
+        Args:
+            game_id: Game ID
+            since: First move number to include in the final delta
+                   (defaults to none, i.e. a status-only delta)
+        """
         if game_id in self.games:
             game = self.games[game_id]
             game.status = "finished"
+            self.lobby.remove(game_id)
+            
+            # Let players and spectators see the final state before cleanup
+            if since is None:
+                since = len(game.moves)
+            await self._broadcast_game_delta(game_id, since)
             
             # Clear player game references
             if game.black_player in self.players:
@@ -408,8 +885,11 @@ class GameServer:
             if game.white_player in self.players:
                 self.players[game.white_player].game_id = None
             
-            # Clean up spectators
+            # Deliver pending chat, then clean up spectators
+            self.chat.close(game_id)
             self.spectator_manager.cleanup_game(game_id)
             
             logger.info(f"Game {game_id} ended")
-            del self.games[game_id] 
+            del self.games[game_id]
+            if self.router is not None:
+                self.router.game_ended(game_id, [game.black_player, game.white_player]) 
@@ -3,10 +3,11 @@ Spectator management module
 瑙傛垬绠＄悊妯″潡
 """
 
-from typing import Dict, Set, Optional
+from typing import Callable, Dict, Set, Optional, Union
 from dataclasses import dataclass
 
 from ..utils.logger import get_logger
+from .protocol import encode_frame
 
 logger = get_logger(__name__)
 
@@ -143,28 +144,42 @@ class SpectatorManager:
         """
         return len(self.game_spectators.get(game_id, set()))
     
-    def broadcast_to_spectators(self, game_id: str, message: dict,
-                              callback) -> None:
+    def broadcast_to_spectators(self, game_id: str, message: Union[dict, bytes],
+                              callback: Callable[[str, bytes], bool]) -> int:
         """
         Broadcast message to all spectators of a game
-        鍚戞父鎴忕殑鎵鏈夎鎴樿呭箍鎾秷鎭?
+        向游戏的所有观战者广播消息
+        
+        The message is encoded into a wire frame once and the same frame is
+        handed to ``callback`` for every spectator.
+        消息只编码一次，同一帧交给每个观战者的回调。
         
         Args:
             game_id: Game ID
-            message: Message to broadcast
-            callback: Callback function to send message
+            message: Message to broadcast, or an already encoded frame
+            callback: Synchronous function queuing a frame for a spectator,
+                      returning True if queued
+            
+        Returns:
+            int: Number of spectators the frame was queued for
         """
+        spectators = self.game_spectators.get(game_id)
+        if not spectators:
+            return 0
+        
         try:
-            spectators = self.get_game_spectators(game_id)
+            frame = message if isinstance(message, bytes) else encode_frame(message)
+            delivered = 0
             for spectator_id in spectators:
-                spectator = self.get_spectator_info(spectator_id)
-                if spectator:
-                    callback(spectator_id, message)
+                if callback(spectator_id, frame):
+                    delivered += 1
             
-            logger.debug(f"Broadcasted message to {len(spectators)} spectators")
+            logger.debug(f"Broadcasted message to {delivered}/{len(spectators)} spectators")
+            return delivered
             
         except Exception as e:
             logger.error(f"Error broadcasting to spectators: {e}")
+            return 0
     
     def cleanup_game(self, game_id: str) -> None:
         """
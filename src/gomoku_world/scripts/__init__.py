@@ -5,5 +5,7 @@ Scripts package for Gomoku World
 
 from . import server
 from . import client
+from . import loadtest
+from . import benchmark
 
-__all__ = ['server', 'client'] 
+__all__ = ['server', 'client', 'loadtest', 'benchmark'] 
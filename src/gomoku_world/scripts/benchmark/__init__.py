@@ -0,0 +1,213 @@
+"""
+Benchmark launcher module
+基准测试启动模块
+"""
+
+import argparse
+import json
+import sys
+
+from ...benchmark import (
+    BACKENDS, CORPUS, GAUNTLET, ROUND_ROBIN, STRATEGIES, compare, cross_check, format_perft,
+    format_results, generate_puzzles, get_positions, load_results, parse_engine, run_ai_benchmark,
+    run_perft, run_tournament, save_puzzles, save_results
+)
+from ...config import (
+    BENCHMARK_BASELINE, BENCHMARK_DEPTH, BENCHMARK_SEED, BENCHMARK_SIMULATIONS,
+    BENCHMARK_TOLERANCE, PUZZLE_COUNT, PUZZLE_FILE, PUZZLE_MIN_DEPTH, PUZZLE_NODE_BUDGET,
+    TOURNAMENT_ROUNDS, TOURNAMENT_WORKERS
+)
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Gomoku World benchmarks")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ai = commands.add_parser('ai', help="Benchmark the AI strategies on the position corpus")
+    ai.add_argument('--strategies', nargs='+', choices=STRATEGIES, default=list(STRATEGIES),
+                    help="Strategies to benchmark")
+    ai.add_argument('--positions', nargs='+', choices=[position.name for position in CORPUS],
+                    default=None, help="Corpus positions, all by default")
+    ai.add_argument('--depth', type=int, default=BENCHMARK_DEPTH,
+                    help="Search depth of depth-limited strategies")
+    ai.add_argument('--simulations', type=int, default=BENCHMARK_SIMULATIONS,
+                    help="MCTS simulations per move")
+    ai.add_argument('--seed', type=int, default=BENCHMARK_SEED, help="Random seed")
+    ai.add_argument('--rounds', type=int, default=1,
+                    help="Runs per timed position, the fastest one counts")
+    ai.add_argument('--output', default=None, help="Write the results as JSON")
+    ai.add_argument('--baseline', nargs='?', const=str(BENCHMARK_BASELINE), default=None,
+                    help="Compare against a baseline file (default: %(const)s)")
+    ai.add_argument('--tolerance', type=float, default=BENCHMARK_TOLERANCE,
+                    help="Allowed relative slowdown against the baseline")
+    ai.add_argument('--save-baseline', action='store_true',
+                    help="Store the results as the new baseline")
+
+    perft = commands.add_parser('perft', help="Count move sequences on every board backend")
+    perft.add_argument('--positions', nargs='+', choices=[position.name for position in CORPUS],
+                       default=None, help="Corpus positions, all by default")
+    perft.add_argument('--depth', type=int, default=2, help="Sequence length")
+    perft.add_argument('--backends', nargs='+', choices=list(BACKENDS), default=list(BACKENDS),
+                       help="Board backends to run")
+    perft.add_argument('--copy', action='store_true',
+                       help="Copy the board for every move instead of undoing it")
+    perft.add_argument('--output', default=None, help="Write the results as JSON")
+
+    tournament = commands.add_parser('tournament', help="Play a self-play tournament")
+    tournament.add_argument('engines', nargs='+', type=parse_engine,
+                            help="Engine specs, e.g. minmax:depth=2 mcts:simulations=100 "
+                                 "engine:difficulty=hard priority")
+    tournament.add_argument('--mode', choices=[ROUND_ROBIN, GAUNTLET], default=ROUND_ROBIN,
+                            help="Pairing scheme, a gauntlet pits the first engine against the rest")
+    tournament.add_argument('--openings', nargs='+',
+                            choices=[position.name for position in CORPUS if not position.is_puzzle],
+                            default=None, help="Opening positions, all plain positions by default")
+    tournament.add_argument('--rounds', type=int, default=TOURNAMENT_ROUNDS,
+                            help="Repetitions of the schedule")
+    tournament.add_argument('--workers', type=int, default=TOURNAMENT_WORKERS,
+                            help="Worker processes")
+    tournament.add_argument('--seed', type=int, default=BENCHMARK_SEED, help="Random seed")
+    tournament.add_argument('--time-control', default=None,
+                            help="Clock of each engine in seconds: main+increment (60+0.5) "
+                                 "or main+periodxcount (30+5x3); untimed by default")
+    tournament.add_argument('--save', action='store_true',
+                            help="Store the games with the save manager")
+    tournament.add_argument('--output', default=None, help="Write the results as JSON")
+
+    puzzles = commands.add_parser('puzzles', help="Generate forced-win puzzles from self-play")
+    puzzles.add_argument('--count', type=int, default=PUZZLE_COUNT, help="Puzzles to generate")
+    puzzles.add_argument('--min-depth', type=int, default=PUZZLE_MIN_DEPTH,
+                         help="Shortest winning line in moves")
+    puzzles.add_argument('--node-budget', type=int, default=PUZZLE_NODE_BUDGET,
+                         help="Proof-number nodes per position")
+    puzzles.add_argument('--size', type=int, default=15, help="Board size")
+    puzzles.add_argument('--seed', type=int, default=BENCHMARK_SEED, help="Random seed")
+    puzzles.add_argument('--output', default=str(PUZZLE_FILE),
+                         help="Write the puzzles as JSON (default: %(default)s)")
+    return parser.parse_args(argv)
+
+
+def _run_ai(args: argparse.Namespace) -> int:
+    """Run the AI benchmark and return the exit status"""
+    results = run_ai_benchmark(
+        strategies=args.strategies,
+        positions=args.positions,
+        depth=args.depth,
+        simulations=args.simulations,
+        seed=args.seed,
+        rounds=args.rounds
+    )
+    print(format_results(results))
+
+    if args.output:
+        save_results(results, args.output)
+        print(f"\nResults written to {args.output}")
+
+    baseline_path = args.baseline or str(BENCHMARK_BASELINE)
+    if args.save_baseline:
+        save_results(results, baseline_path)
+        print(f"Baseline written to {baseline_path}")
+        return 0
+
+    if args.baseline is None:
+        return 0
+    try:
+        regressions = compare(results, load_results(baseline_path), args.tolerance)
+    except FileNotFoundError:
+        print(f"No baseline at {baseline_path}, run with --save-baseline first")
+        return 2
+    except ValueError as e:
+        print(f"Cannot compare with {baseline_path}: {e}")
+        return 2
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {baseline_path}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"\nNo regressions against {baseline_path}")
+    return 0
+
+
+def _run_perft(args: argparse.Namespace) -> int:
+    """Run perft and return the exit status"""
+    results = run_perft(args.positions, args.depth, args.backends, args.copy)
+    print(format_perft(results))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump([result.to_dict() for result in results], f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    mismatches = cross_check(results)
+    if mismatches:
+        print(f"\n{len(mismatches)} backend mismatch(es):")
+        for mismatch in mismatches:
+            print(f"  {mismatch}")
+        return 1
+    return 0
+
+
+def _run_tournament(args: argparse.Namespace) -> int:
+    """Run a tournament and return the exit status"""
+    try:
+        result = run_tournament(
+            args.engines,
+            openings=get_positions(args.openings, puzzles=False),
+            mode=args.mode,
+            rounds=args.rounds,
+            workers=args.workers,
+            seed=args.seed,
+            save=args.save,
+            time_control=args.time_control
+        )
+    except ValueError as e:
+        print(f"Cannot run tournament: {e}")
+        return 2
+    print(result.format())
+
+    if args.output:
+        save_results(result.to_dict(), args.output)
+        print(f"\nResults written to {args.output}")
+    return 0
+
+
+def _run_puzzles(args: argparse.Namespace) -> int:
+    """Generate puzzles and return the exit status"""
+    def report(puzzle, depth):
+        print(f"{puzzle.name}: {depth} moves to win after {puzzle.moves}, "
+              f"solutions {puzzle.solutions}")
+
+    puzzles = generate_puzzles(args.count, args.seed, args.size, args.min_depth,
+                               args.node_budget, on_puzzle=report)
+    if not puzzles:
+        print("No puzzles found")
+        return 1
+    save_puzzles(puzzles, args.output)
+    print(f"\n{len(puzzles)} puzzle(s) written to {args.output}")
+    return 0
+
+
+_COMMANDS = {
+    'ai': _run_ai,
+    'perft': _run_perft,
+    'tournament': _run_tournament,
+    'puzzles': _run_puzzles,
+}
+
+
+def main(argv=None):
+    """Main entry point"""
+    args = _parse_args(argv)
+    run = _COMMANDS[args.command]
+    try:
+        status = run(args)
+    except KeyboardInterrupt:
+        print("\nBenchmark stopped by user")
+        status = 130
+    sys.exit(status)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Load test launcher module
+负载测试启动模块
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import sys
+import time
+
+from ...config import DEFAULT_HOST
+from ...network.loadtest import run_load_test
+from ...network.server import GameServer
+
+
+def _serve(host: str, port: int):
+    """Run a game server in a child process"""
+    try:
+        asyncio.run(GameServer(host, port).start())
+    except KeyboardInterrupt:
+        pass
+
+
+def _free_port(host: str) -> int:
+    """Pick an unused TCP port"""
+    with socket.socket() as sock:
+        sock.bind((host, 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_server(host: str, port: int, timeout: float = 10.0) -> bool:
+    """Wait until the server accepts connections"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return True
+        except OSError:
+            time.sleep(0.1)
+    return False
+
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Gomoku World server load test")
+    parser.add_argument('--clients', type=int, default=200, help="Simulated clients")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds of load")
+    parser.add_argument('--spectators', type=float, default=0.2,
+                        help="Share of clients that spectate instead of playing")
+    parser.add_argument('--connect-rate', type=float, default=500.0,
+                        help="New connections per second during ramp-up")
+    parser.add_argument('--seed', type=int, default=None, help="Random seed")
+    parser.add_argument('--host', default=None,
+                        help="Target an existing server instead of starting one")
+    parser.add_argument('--port', type=int, default=None, help="Port of the target server")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Main entry point"""
+    args = _parse_args(argv)
+
+    server = None
+    host = args.host or DEFAULT_HOST
+    port = args.port
+    if args.host is None:
+        # Run a local server in its own process so its RSS can be reported
+        port = port or _free_port(host)
+        server = multiprocessing.Process(target=_serve, args=(host, port), daemon=True)
+        server.start()
+        if not _wait_for_server(host, port):
+            server.terminate()
+            print("Error starting server")
+            sys.exit(1)
+    elif port is None:
+        print("--port is required with --host")
+        sys.exit(2)
+
+    try:
+        report = asyncio.run(run_load_test(
+            host, port,
+            clients=args.clients,
+            duration=args.duration,
+            spectator_ratio=args.spectators,
+            seed=args.seed,
+            server_pid=server.pid if server else None,
+            connect_rate=args.connect_rate
+        ))
+        print(report.format())
+    except KeyboardInterrupt:
+        print("\nLoad test stopped by user")
+    finally:
+        if server is not None:
+            # SDL may trap SIGTERM in the child, so fall back to SIGKILL
+            server.terminate()
+            server.join(2)
+            if server.is_alive():
+                server.kill()
+                server.join()
+
+
+if __name__ == '__main__':
+    main()
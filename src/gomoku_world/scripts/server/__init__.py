@@ -3,25 +3,144 @@ Server launcher module
 鏈嶅姟鍣ㄥ惎鍔ㄦā鍧?
 """
 
+import argparse
 import asyncio
+import os
 import sys
 
+from typing import Optional
+
+from ...config import (
+    DEFAULT_HOST, DEFAULT_PORT, METRICS_PORT, METRICS_DUMP_INTERVAL, PROFILER_SIGNAL,
+    TRACE_FILE, TRACE_EXPORT_INTERVAL, HEALTH_PORT, game_config
+)
+from ...network.cluster import run_cluster
 from ...network.server import GameServer
 from ...utils.logger import setup_logging
+from ...utils.monitoring import metrics_collector, profiler, tracer, health_checker
+
+async def _dump_metrics(path: str):
+    """Write the metrics exposition to a file periodically"""
+    while True:
+        await asyncio.sleep(METRICS_DUMP_INTERVAL)
+        try:
+            metrics_collector.write(path)
+        except OSError as e:
+            print(f"Error writing metrics: {e}")
 
-async def _run_server():
-    """Run the server"""
+async def _export_traces(path: str):
+    """Append finished spans to a JSON-lines file periodically"""
+    while True:
+        await asyncio.sleep(TRACE_EXPORT_INTERVAL)
+        try:
+            tracer.export(path)
+        except OSError as e:
+            print(f"Error writing traces: {e}")
+
+async def _run_server(host: str, port: int, metrics_port: Optional[int] = None,
+                      metrics_file: Optional[str] = None, profile: bool = False,
+                      trace_file: Optional[str] = None, health_port: Optional[int] = None,
+                      trace_rate: Optional[float] = None, worker_id: int = 0,
+                      directory=None):
+    """Run the server, as a cluster worker when a session directory is given"""
     # Setup logging
     setup_logging()
     
+    if trace_rate is not None:
+        tracer.sample_rate = trace_rate
+    
+    # The profiler can be switched on and off later by sending the signal
+    profiler.install_signal_handler()
+    if profile or game_config.get("debug.profiler", False):
+        profiler.start()
+    
+    if metrics_port is not None:
+        metrics_collector.serve(metrics_port)
+    if health_port is not None:
+        await health_checker.serve(health_port)
+    # Keep references so the tasks are not garbage collected
+    background = set()
+    if metrics_file:
+        background.add(asyncio.create_task(_dump_metrics(metrics_file)))
+    if trace_file:
+        background.add(asyncio.create_task(_export_traces(trace_file)))
+    
     # Create and start server
-    server = GameServer()
-    await server.start()
+    server = GameServer(host, port, worker_id=worker_id, directory=directory,
+                        reuse_port=directory is not None)
+    try:
+        await server.start()
+    finally:
+        for task in background:
+            task.cancel()
+        await asyncio.gather(*background, return_exceptions=True)
+
+def _worker_path(path: Optional[str], worker_id: int) -> Optional[str]:
+    """Give each worker its own file by adding its ID before the suffix"""
+    if not path:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.{worker_id}{ext}"
+
+def _run_worker(worker_id: int, host: str, port: int, directory, **options):
+    """
+    Entry point of a cluster worker process
+    
+    Ports are offset by the worker ID and files get the worker ID added, so
+    every worker exposes its own metrics, health checks and traces.
+    """
+    for name in ('metrics_port', 'health_port'):
+        if options.get(name) is not None:
+            options[name] += worker_id
+    for name in ('metrics_file', 'trace_file'):
+        options[name] = _worker_path(options.get(name), worker_id)
+    try:
+        asyncio.run(_run_server(host, port, worker_id=worker_id, directory=directory, **options))
+    except KeyboardInterrupt:
+        pass
+
+def _parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Gomoku World game server")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Listen host")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Listen port")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes sharing the port (SO_REUSEPORT)")
+    parser.add_argument('--metrics-port', type=int, nargs='?', const=METRICS_PORT,
+                        help=f"Serve Prometheus metrics on a local port (default {METRICS_PORT}); "
+                             "worker N of a cluster uses port + N")
+    parser.add_argument('--metrics-file',
+                        help="Write Prometheus metrics to this file periodically; "
+                             "cluster workers add their ID to the name")
+    parser.add_argument('--profile', action='store_true',
+                        help=f"Start the sampling profiler (toggle at runtime with {PROFILER_SIGNAL})")
+    parser.add_argument('--trace-file', nargs='?', const=str(TRACE_FILE),
+                        help=f"Export sampled request traces as JSON lines (default {TRACE_FILE}); "
+                             "cluster workers add their ID to the name")
+    parser.add_argument('--trace-rate', type=float,
+                        help="Share of requests traced, 0 to 1")
+    parser.add_argument('--health-port', type=int, nargs='?', const=HEALTH_PORT,
+                        help=f"Serve health checks on a local port (default {HEALTH_PORT}); "
+                             "worker N of a cluster uses port + N")
+    return parser.parse_args(argv)
 
-def main():
+def main(argv=None):
     """Main entry point"""
+    args = _parse_args(argv)
+    options = {
+        'metrics_port': args.metrics_port,
+        'metrics_file': args.metrics_file,
+        'profile': args.profile,
+        'trace_file': args.trace_file,
+        'health_port': args.health_port,
+        'trace_rate': args.trace_rate
+    }
     try:
-        asyncio.run(_run_server())
+        if args.workers > 1:
+            setup_logging()
+            run_cluster(args.workers, args.host, args.port, target=_run_worker, kwargs=options)
+        else:
+            asyncio.run(_run_server(args.host, args.port, **options))
     except KeyboardInterrupt:
         print("\nServer stopped by user")
     except Exception as e:
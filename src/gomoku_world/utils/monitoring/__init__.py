@@ -5,25 +5,30 @@ Monitoring module
 
 from .metrics import MetricsCollector
 from .profiler import Profiler
-from .tracer import Tracer
+from .tracer import Tracer, Span, current_span
 from .health import HealthChecker
-from .instances import metrics_collector, profiler, tracer, health_checker
+from .commands import CommandStats
+from .instances import (
+    metrics_collector, profiler, tracer, health_checker, command_stats,
+    observe_search, measure_save_io
+)
 
 __all__ = [
     # Classes
     'MetricsCollector',
     'Profiler',
     'Tracer',
+    'Span',
     'HealthChecker',
+    'CommandStats',
     # Global instances
     'metrics_collector',
     'profiler',
     'tracer',
-    'health_checker'
+    'health_checker',
+    'command_stats',
+    # Instrumentation helpers
+    'observe_search',
+    'measure_save_io',
+    'current_span'
 ]
-
-# Create global instances
-metrics = MetricsCollector()
-profiler = Profiler()
-tracer = Tracer()
-health_checker = HealthChecker() 
@@ -0,0 +1,92 @@
+"""
+Per-command cost accounting
+按命令统计处理开销
+
+Counts calls, CPU time, wall time and rate-limit rejections for each
+command a server processes. Updates are plain dictionary arithmetic on the
+event loop thread, cheap enough to run on every request. When given a
+latency histogram, each request's wall time is also observed there so it
+appears in the metrics exposition.
+
+统计服务器处理的每个命令的调用次数、CPU时间、墙钟时间和被限流次数。
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from typing import Dict, Iterator, Optional
+
+from .metrics import Histogram
+
+
+@dataclass
+class CommandCost:
+    """Accumulated cost of one command"""
+    calls: int = 0
+    cpu_time: float = 0.0
+    wall_time: float = 0.0
+    rejected: int = 0
+
+
+class CommandStats:
+    """
+    Per-command counters
+    命令统计
+    """
+
+    def __init__(self, latency: Optional[Histogram] = None):
+        """
+        Initialize counters
+
+        Args:
+            latency: Histogram labelled by command receiving wall times
+        """
+        self._costs: Dict[str, CommandCost] = {}
+        self.latency = latency
+
+    def _cost(self, cmd: str) -> CommandCost:
+        cost = self._costs.get(cmd)
+        if cost is None:
+            cost = self._costs[cmd] = CommandCost()
+        return cost
+
+    def record(self, cmd: str, cpu_time: float, wall_time: float):
+        """Add one processed request"""
+        cost = self._cost(cmd)
+        cost.calls += 1
+        cost.cpu_time += cpu_time
+        cost.wall_time += wall_time
+        if self.latency is not None:
+            self.latency.labels(cmd).observe(wall_time)
+
+    def record_rejected(self, cmd: str):
+        """Add one request refused by rate limiting"""
+        self._cost(cmd).rejected += 1
+
+    @contextmanager
+    def measure(self, cmd: str) -> Iterator[None]:
+        """
+        Time a block as one call of ``cmd``
+
+        CPU time is the thread CPU time, so work done by other tasks while
+        an asynchronous handler is suspended is included.
+        """
+        cpu = time.thread_time()
+        wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(cmd, time.thread_time() - cpu, time.perf_counter() - wall)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Get a copy of all counters
+
+        Returns:
+            Dict[str, Dict[str, float]]: Counters keyed by command
+        """
+        return {cmd: asdict(cost) for cmd, cost in self._costs.items()}
+
+    def reset(self):
+        """Clear all counters"""
+        self._costs.clear()
@@ -1,4 +1,278 @@
 """
 Health checker implementation
-鍋ュ悍妫鏌ュ櫒瀹炵幇
-""" 
+健康检查器实现
+
+A health report is built from probes: functions returning a number, such
+as event-loop lag, resident memory or connected clients, each with a
+degraded and a critical threshold. The checker measures event-loop lag
+with a task that sleeps for a fixed interval and records how late it
+woke up; a check reports the worst lag seen since the previous check.
+Reports are served as JSON from a small HTTP endpoint running on the
+event loop, and every probe (including the asynchronous TCP check) is
+non-blocking, so a health check never stalls the game server.
+
+健康报告由探针构成：探针返回一个数值（如事件循环延迟、常驻内存或连接客户端数），
+并各有降级和严重阈值。检查器用一个定时休眠的任务测量事件循环延迟，记录其唤醒的
+滞后时间，每次检查报告自上次检查以来的最大延迟。报告由运行在事件循环上的小型
+HTTP端点以JSON提供，所有探针（包括异步TCP检查）都不阻塞，因此健康检查不会拖慢
+游戏服务器。
+"""
+
+import asyncio
+import inspect
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from ..logger import get_logger
+from ...config import HEALTH_HOST, HEALTH_LAG_INTERVAL, HEALTH_THRESHOLDS
+
+logger = get_logger(__name__)
+
+OK = "ok"
+DEGRADED = "degraded"
+CRITICAL = "critical"
+UNKNOWN = "unknown"
+
+READY = "ready"
+NOT_READY = "not_ready"
+
+ProbeValue = Optional[float]
+
+
+def process_rss_mb() -> ProbeValue:
+    """Resident set size of this process in megabytes"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / 1024 / 1024
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def open_fd_ratio() -> ProbeValue:
+    """Open file descriptors as a share of the soft limit"""
+    try:
+        import resource
+        limit = resource.getrlimit(resource.RLIMIT_NOFILE)[0]
+        count = len(os.listdir("/proc/self/fd"))
+    except (ImportError, OSError):
+        return None
+    if limit <= 0 or limit == getattr(resource, 'RLIM_INFINITY', -1):
+        return None
+    return count / limit
+
+
+async def tcp_latency(host: str, port: int, timeout: float) -> ProbeValue:
+    """
+    Time an asynchronous TCP connect
+
+    Args:
+        host: Target host
+        port: Target port
+        timeout: Seconds before giving up
+
+    Returns:
+        Optional[float]: Connect time in seconds, None if unreachable
+    """
+    start = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    latency = time.perf_counter() - start
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+    return latency
+
+
+@dataclass
+class Probe:
+    """A measured value with thresholds"""
+    name: str
+    check: Callable[[], Union[ProbeValue, Awaitable[ProbeValue]]]
+    degraded: Optional[float] = None
+    critical: Optional[float] = None
+    unit: str = ""
+
+    def status(self, value: ProbeValue) -> str:
+        """Classify a value against the thresholds"""
+        if value is None:
+            return UNKNOWN
+        if self.critical is not None and value >= self.critical:
+            return CRITICAL
+        if self.degraded is not None and value >= self.degraded:
+            return DEGRADED
+        return OK
+
+
+class HealthChecker:
+    """
+    Health checker
+    健康检查器
+    """
+
+    def __init__(self, lag_interval: float = HEALTH_LAG_INTERVAL):
+        """
+        Initialize checker with the process probes
+
+        Args:
+            lag_interval: Seconds between event-loop lag measurements
+        """
+        self.lag_interval = lag_interval
+        self.loop_lag: ProbeValue = None
+        self._peak_lag: ProbeValue = None
+        self.probes: Dict[str, Probe] = {}
+        self._lag_task: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+
+        self.register("loop_lag", self._take_peak_lag, *HEALTH_THRESHOLDS['loop_lag'], unit="s")
+        self.register("rss", process_rss_mb, *HEALTH_THRESHOLDS['rss'], unit="MB")
+        self.register("open_fds", open_fd_ratio, *HEALTH_THRESHOLDS['open_fds'], unit="ratio")
+
+    def register(self, name: str, check: Callable, degraded: Optional[float] = None,
+                 critical: Optional[float] = None, unit: str = ""):
+        """
+        Add or replace a probe
+
+        Args:
+            name: Probe name
+            check: Function or coroutine function returning the value, None if unknown
+            degraded: Value from which the probe reports degraded
+            critical: Value from which the probe reports critical
+            unit: Unit shown in reports
+        """
+        self.probes[name] = Probe(name, check, degraded, critical, unit)
+
+    def unregister(self, name: str):
+        """Remove a probe"""
+        self.probes.pop(name, None)
+
+    def start(self):
+        """Start measuring event-loop lag on the running loop"""
+        if self._lag_task is None or self._lag_task.done():
+            self._lag_task = asyncio.get_running_loop().create_task(self._measure_lag())
+
+    async def stop(self):
+        """Stop lag measurement and the HTTP endpoint"""
+        if self._lag_task is not None:
+            self._lag_task.cancel()
+            try:
+                await self._lag_task
+            except asyncio.CancelledError:
+                pass
+            self._lag_task = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _measure_lag(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.lag_interval)
+            self.loop_lag = max(0.0, loop.time() - start - self.lag_interval)
+            if self._peak_lag is None or self.loop_lag > self._peak_lag:
+                self._peak_lag = self.loop_lag
+
+    def _take_peak_lag(self) -> ProbeValue:
+        """Largest lag since the previous check, so short stalls are not missed"""
+        peak, self._peak_lag = self._peak_lag, None
+        return peak if peak is not None else self.loop_lag
+
+    async def check(self) -> Dict[str, Any]:
+        """
+        Run every probe
+
+        A probe that raises counts as critical.
+
+        Returns:
+            Dict[str, Any]: Overall status ("ready", "degraded" or
+                            "not_ready") and the result of each probe
+        """
+        results = {}
+        for name, probe in list(self.probes.items()):
+            try:
+                value = probe.check()
+                if inspect.isawaitable(value):
+                    value = await value
+                results[name] = {'value': value, 'status': probe.status(value), 'unit': probe.unit}
+            except Exception as e:
+                results[name] = {'value': None, 'status': CRITICAL, 'unit': probe.unit,
+                                 'error': str(e)}
+
+        statuses = {result['status'] for result in results.values()}
+        if CRITICAL in statuses:
+            status = NOT_READY
+        elif DEGRADED in statuses:
+            status = DEGRADED
+        else:
+            status = READY
+        return {'status': status, 'time': time.time(), 'probes': results}
+
+    async def serve(self, port: int, host: str = HEALTH_HOST) -> int:
+        """
+        Serve health reports over HTTP on the running loop
+
+        ``/health`` returns the full report, ``/ready`` only the status.
+        Both answer 503 when the process is not ready.
+
+        Args:
+            port: Listen port, 0 for any free port
+            host: Listen host
+
+        Returns:
+            int: Bound port
+        """
+        self.start()
+        self._server = await asyncio.start_server(self._handle_http, host, port)
+        bound = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Serving health checks on http://{host}:{bound}/health")
+        return bound
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            request = await asyncio.wait_for(reader.readline(), 5.0)
+            parts = request.decode('latin-1').split()
+            path = parts[1].split('?', 1)[0] if len(parts) > 1 else ""
+
+            if path in ('/health', '/healthz', '/'):
+                report = await self.check()
+                body = report
+            elif path in ('/ready', '/readyz'):
+                report = await self.check()
+                body = {'status': report['status']}
+            else:
+                report, body = None, {'error': 'not found'}
+
+            if report is None:
+                code = "404 Not Found"
+            elif report['status'] == NOT_READY:
+                code = "503 Service Unavailable"
+            else:
+                code = "200 OK"
+
+            payload = json.dumps(body).encode('utf-8')
+            writer.write(
+                f"HTTP/1.1 {code}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode('latin-1')
+                + payload
+            )
+            await writer.drain()
+        except (OSError, asyncio.TimeoutError):
+            pass
+        finally:
+            writer.close()
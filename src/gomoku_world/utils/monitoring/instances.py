@@ -1,22 +1,108 @@
 """
 Global instances for monitoring
-鐩戞帶鍏ㄥ眬瀹炰緥
+监控全局实例
 """
 
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional, Union
+from pathlib import Path
+
 from .metrics import MetricsCollector
 from .profiler import Profiler
 from .tracer import Tracer
 from .health import HealthChecker
+from .commands import CommandStats
 
 # Create global instances
 metrics_collector = MetricsCollector()
 profiler = Profiler()
 tracer = Tracer()
 health_checker = HealthChecker()
+command_stats = CommandStats(latency=metrics_collector.histogram(
+    'gomoku_server_command_seconds', "Wall time of processed server commands", ('command',)))
+
+# Pre-wired metrics / 预置指标
+ai_moves = metrics_collector.counter(
+    'gomoku_ai_moves_total', "Moves chosen by the AI", ('strategy',))
+ai_nodes = metrics_collector.counter(
+    'gomoku_ai_nodes_total', "Positions searched by the AI", ('strategy',))
+ai_move_seconds = metrics_collector.histogram(
+    'gomoku_ai_move_seconds', "Time the AI spent choosing a move", ('strategy',))
+ai_nodes_per_second = metrics_collector.gauge(
+    'gomoku_ai_nodes_per_second', "Search speed of the last AI move", ('strategy',))
+ai_search_depth = metrics_collector.gauge(
+    'gomoku_ai_search_depth', "Search depth of the last AI move", ('strategy',))
+ai_seldepth = metrics_collector.gauge(
+    'gomoku_ai_seldepth', "Deepest ply reached by the last AI move", ('strategy',))
+ai_cutoffs = metrics_collector.counter(
+    'gomoku_ai_cutoffs_total', "Alpha-beta cutoffs during AI searches", ('strategy',))
+ai_tt_hit_rate = metrics_collector.gauge(
+    'gomoku_ai_tt_hit_rate', "Transposition table hit rate of the last AI move", ('strategy',))
+save_io_seconds = metrics_collector.histogram(
+    'gomoku_save_io_seconds', "Time spent reading and writing save files", ('op',))
+save_io_bytes = metrics_collector.counter(
+    'gomoku_save_io_bytes_total', "Bytes of save files read and written", ('op',))
+
+
+def observe_search(strategy: str, nodes: int, depth: int, seconds: float,
+                   seldepth: Optional[int] = None, cutoffs: int = 0,
+                   tt_hit_rate: Optional[float] = None):
+    """
+    Record one AI move
+
+    Called once per move rather than per node, so the search loop itself
+    stays uninstrumented.
+
+    Args:
+        strategy: Strategy name used as label
+        nodes: Positions searched
+        depth: Search depth reached
+        seconds: Time spent
+        seldepth: Deepest ply reached, defaults to depth
+        cutoffs: Alpha-beta cutoffs
+        tt_hit_rate: Transposition table hit rate, None if not probed
+    """
+    ai_moves.labels(strategy).inc()
+    ai_nodes.labels(strategy).inc(nodes)
+    ai_move_seconds.labels(strategy).observe(seconds)
+    ai_search_depth.labels(strategy).set(depth)
+    ai_seldepth.labels(strategy).set(depth if seldepth is None else seldepth)
+    if cutoffs:
+        ai_cutoffs.labels(strategy).inc(cutoffs)
+    if tt_hit_rate is not None:
+        ai_tt_hit_rate.labels(strategy).set(tt_hit_rate)
+    if seconds > 0:
+        ai_nodes_per_second.labels(strategy).set(nodes / seconds)
+
+
+@contextmanager
+def measure_save_io(op: str, path: Union[str, Path]) -> Iterator[None]:
+    """
+    Time a save file operation and count the file's size
+
+    Args:
+        op: Operation name used as label ("save", "load", ...)
+        path: File read or written
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        save_io_seconds.labels(op).observe(time.perf_counter() - start)
+        try:
+            save_io_bytes.labels(op).inc(os.path.getsize(path))
+        except OSError:
+            pass
+
 
 __all__ = [
     'metrics_collector',
     'profiler',
     'tracer',
-    'health_checker'
-] 
+    'health_checker',
+    'command_stats',
+    'observe_search',
+    'measure_save_io'
+]
@@ -1,4 +1,420 @@
 """
 Metrics collector implementation
-鎸囨爣鏀堕泦鍣ㄥ疄鐜?
-""" 
+指标收集器实现
+
+A small registry of counters, gauges and histograms that renders the
+Prometheus text exposition format. Counters and histograms accumulate into
+a cell owned by the calling thread, so recording takes no lock; a lock is
+only taken the first time a thread touches a metric, and readers sum the
+cells of all threads. Histograms use fixed bucket bounds chosen when the
+metric is created. The exposition can be written to a file or served over
+HTTP from a daemon thread.
+
+一个渲染Prometheus文本格式的计数器、仪表和直方图注册表。计数器和直方图累加到
+调用线程自己的单元中，记录时无需加锁；只有线程首次使用某个指标时才加锁，读取时
+汇总所有线程的单元。直方图在创建时确定固定的桶边界。指标可写入文件，或由后台
+线程通过HTTP提供。
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from ..logger import get_logger
+from ...config import METRICS_HOST, METRICS_LATENCY_BUCKETS
+
+logger = get_logger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value for the exposition format"""
+    if value == float('inf'):
+        return "+Inf"
+    if value == float('-inf'):
+        return "-Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    """Escape a label value"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(pairs: Sequence[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+class _Metric:
+    """
+    Base of all metric types
+    指标基类
+
+    A metric created with label names is a family: ``labels()`` returns the
+    child holding the samples for one set of label values.
+    """
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str = "",
+                 labelnames: Sequence[str] = ()):
+        """
+        Initialize metric
+
+        Args:
+            name: Metric name
+            documentation: Help text
+            labelnames: Label names of the family, empty for a single series
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], '_Metric'] = {}
+        self._lock = threading.Lock()
+
+    def _child(self) -> '_Metric':
+        return type(self)(self.name, self.documentation)
+
+    def labels(self, *values) -> '_Metric':
+        """
+        Get the series for one set of label values
+
+        Raises:
+            ValueError: If the number of values does not match the label names
+        """
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {key}")
+            with self._lock:
+                child = self._children.setdefault(key, self._child())
+        return child
+
+    def _series(self) -> List[Tuple[Tuple[Tuple[str, str], ...], '_Metric']]:
+        """Label pairs and metric of every series"""
+        if not self.labelnames:
+            return [((), self)]
+        return [(tuple(zip(self.labelnames, key)), child)
+                for key, child in sorted(self._children.items())]
+
+    def _samples(self, labels: Tuple[Tuple[str, str], ...]) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        """Render the metric as exposition lines"""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for labels, series in self._series():
+            lines.extend(series._samples(labels))
+        return lines
+
+
+class _ThreadCells:
+    """
+    Per-thread accumulation cells
+    线程本地累加单元
+    """
+
+    __slots__ = ('_local', '_cells', '_lock', '_size')
+
+    def __init__(self, size: int):
+        self._local = threading.local()
+        self._cells: List[List[float]] = []
+        self._lock = threading.Lock()
+        self._size = size
+
+    def get(self) -> List[float]:
+        """Get the calling thread's cell"""
+        try:
+            return self._local.cell
+        except AttributeError:
+            cell = [0] * self._size
+            with self._lock:
+                self._cells.append(cell)
+            self._local.cell = cell
+            return cell
+
+    def totals(self) -> List[float]:
+        """Sum the cells of all threads"""
+        with self._lock:
+            cells = list(self._cells)
+        return [sum(values) for values in zip(*cells)] if cells else [0] * self._size
+
+    def clear(self):
+        with self._lock:
+            for cell in self._cells:
+                cell[:] = [0] * self._size
+
+
+class Counter(_Metric):
+    """
+    Monotonically increasing counter
+    单调递增计数器
+    """
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str = "",
+                 labelnames: Sequence[str] = ()):
+        """Initialize counter"""
+        super().__init__(name, documentation, labelnames)
+        self._cells = _ThreadCells(1)
+
+    def inc(self, amount: float = 1):
+        """Add to the counter"""
+        self._cells.get()[0] += amount
+
+    @property
+    def value(self) -> float:
+        return self._cells.totals()[0]
+
+    def _samples(self, labels):
+        return [f"{self.name}{_format_labels(labels)} {_format_value(self.value)}"]
+
+
+class Gauge(_Metric):
+    """
+    Value that can go up and down
+    可增可减的仪表
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str = "",
+                 labelnames: Sequence[str] = ()):
+        """Initialize gauge"""
+        super().__init__(name, documentation, labelnames)
+        self.value = 0.0
+
+    def set(self, value: float):
+        """Set the gauge"""
+        self.value = value
+
+    def inc(self, amount: float = 1):
+        """Increase the gauge"""
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1):
+        """Decrease the gauge"""
+        with self._lock:
+            self.value -= amount
+
+    def _samples(self, labels):
+        return [f"{self.name}{_format_labels(labels)} {_format_value(self.value)}"]
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observations over fixed buckets
+    固定桶的观测值分布
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str = "",
+                 labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = METRICS_LATENCY_BUCKETS):
+        """
+        Initialize histogram
+
+        Args:
+            buckets: Ascending upper bounds; a +Inf bucket is always added
+        """
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(float(bound) for bound in buckets))
+        # One count per bucket, one for +Inf, then the sum
+        self._cells = _ThreadCells(len(self.buckets) + 2)
+
+    def _child(self) -> 'Histogram':
+        return Histogram(self.name, self.documentation, buckets=self.buckets)
+
+    def observe(self, value: float):
+        """Record one observation"""
+        cell = self._cells.get()
+        cell[bisect_left(self.buckets, value)] += 1
+        cell[-1] += value
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Observe the wall time of a block in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    @property
+    def count(self) -> int:
+        return int(sum(self._cells.totals()[:-1]))
+
+    @property
+    def sum(self) -> float:
+        return self._cells.totals()[-1]
+
+    def bucket_counts(self) -> List[Tuple[float, int]]:
+        """
+        Get cumulative counts per upper bound, ending with +Inf
+
+        Returns:
+            List[Tuple[float, int]]: (upper bound, observations <= bound)
+        """
+        totals = self._cells.totals()
+        counts = []
+        running = 0
+        for bound, count in zip(self.buckets + (float('inf'),), totals[:-1]):
+            running += count
+            counts.append((bound, int(running)))
+        return counts
+
+    def _samples(self, labels):
+        lines = []
+        totals = self._cells.totals()
+        running = 0
+        for bound, count in zip(self.buckets + (float('inf'),), totals[:-1]):
+            running += count
+            bucket_labels = labels + (('le', _format_value(bound)),)
+            lines.append(f"{self.name}_bucket{_format_labels(bucket_labels)} {int(running)}")
+        lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(totals[-1])}")
+        lines.append(f"{self.name}_count{_format_labels(labels)} {int(running)}")
+        return lines
+
+
+class MetricsCollector:
+    """
+    Metrics collector
+    指标收集器
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._http_server: Optional[ThreadingHTTPServer] = None
+
+    def _register(self, cls, name: str, documentation: str,
+                  labelnames: Sequence[str], **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise ValueError(f"Metric {name} already registered as {metric.kind} "
+                                 f"with labels {metric.labelnames}")
+            return metric
+
+    def counter(self, name: str, documentation: str = "",
+                labelnames: Sequence[str] = ()) -> Counter:
+        """Get or create a counter"""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str = "",
+              labelnames: Sequence[str] = ()) -> Gauge:
+        """Get or create a gauge"""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str = "",
+                  labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = METRICS_LATENCY_BUCKETS) -> Histogram:
+        """Get or create a histogram"""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        """Get a registered metric by name"""
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+
+        Returns:
+            str: Exposition text
+        """
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda metric: metric.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Union[str, Path]):
+        """
+        Write the exposition to a file
+
+        The file is replaced atomically, so a scraper reading it (such as the
+        node exporter textfile collector) never sees a partial write.
+        """
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(self.render(), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def serve(self, port: int, host: str = METRICS_HOST) -> int:
+        """
+        Serve the exposition over HTTP from a daemon thread
+
+        Args:
+            port: Listen port, 0 for any free port
+            host: Listen host
+
+        Returns:
+            int: Bound port
+        """
+        if self._http_server is not None:
+            return self._http_server.server_address[1]
+
+        collector = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = collector.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._http_server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self._http_server.daemon_threads = True
+        threading.Thread(target=self._http_server.serve_forever,
+                         name="metrics-http", daemon=True).start()
+        bound = self._http_server.server_address[1]
+        logger.info(f"Serving metrics on http://{host}:{bound}/metrics")
+        return bound
+
+    def stop(self):
+        """Stop the HTTP endpoint"""
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+
+    def reset(self):
+        """Zero every counter and histogram and all gauges"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            for _, series in metric._series():
+                if isinstance(series, Gauge):
+                    series.value = 0.0
+                else:
+                    series._cells.clear()
@@ -1,4 +1,218 @@
 """
 Tracer implementation
-杩借釜鍣ㄥ疄鐜?
-""" 
+追踪器实现
+
+Spans record how long a named piece of work took and which span started
+it. The active span lives in a ``contextvars`` variable, so it follows
+each asyncio task and thread without being passed around, and a request
+frame carries the trace and span IDs to the server so both sides of a
+round trip share one trace. Whether a trace is recorded is decided once,
+when its first span starts (head sampling); spans of unsampled traces are
+never stored. Finished spans go to a bounded in-memory ring buffer that
+can be exported as JSON lines.
+
+Span记录一段命名工作的耗时及其父Span。当前Span保存在``contextvars``变量中，
+随asyncio任务和线程传递而无需显式传参；请求帧把追踪ID和Span ID带到服务器，
+使往返两端属于同一条追踪。是否记录在追踪的第一个Span开始时决定一次（头部采样），
+未采样追踪的Span不会被保存。完成的Span进入有界内存环形缓冲区，可导出为JSON行。
+"""
+
+import json
+import random
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Union
+
+from ...config import TRACE_SAMPLE_RATE, TRACE_BUFFER_SIZE
+
+
+class Span:
+    """
+    One timed operation of a trace
+    追踪中的一次计时操作
+    """
+
+    __slots__ = ('name', 'trace_id', 'span_id', 'parent_id', 'sampled',
+                 'start', 'duration', 'attributes', 'status')
+
+    def __init__(self, name: str, trace_id: str, span_id: str,
+                 parent_id: Optional[str], sampled: bool,
+                 attributes: Optional[Dict[str, Any]] = None):
+        """Initialize span"""
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.start = 0.0
+        self.duration = 0.0
+        self.attributes = attributes if attributes is not None else {}
+        self.status = "ok"
+
+    def set(self, **attributes):
+        """Add attributes to the span"""
+        if self.sampled:
+            self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to an exportable dictionary"""
+        return {
+            'name': self.name,
+            'trace_id': self.trace_id,
+            'span_id': self.span_id,
+            'parent_id': self.parent_id,
+            'start': self.start,
+            'duration': self.duration,
+            'status': self.status,
+            'attributes': self.attributes
+        }
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar('gomoku_current_span', default=None)
+
+
+def current_span() -> Optional[Span]:
+    """Get the span active in the current context"""
+    return _current_span.get()
+
+
+class Tracer:
+    """
+    Request tracer
+    请求追踪器
+    """
+
+    def __init__(self, sample_rate: float = TRACE_SAMPLE_RATE,
+                 buffer_size: int = TRACE_BUFFER_SIZE):
+        """
+        Initialize tracer
+
+        Args:
+            sample_rate: Share of new traces that are recorded, 0 to 1
+            buffer_size: Finished spans kept in memory
+        """
+        self.sample_rate = sample_rate
+        self._buffer: Deque[Span] = deque(maxlen=buffer_size)
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None,
+             **attributes) -> Iterator[Span]:
+        """
+        Time a block as a span
+
+        Without a parent the span joins the trace of the current span, or
+        starts a new trace and makes its sampling decision.
+
+        Args:
+            name: Span name
+            parent: Explicit parent, e.g. one returned by ``extract``
+            **attributes: Initial attributes
+
+        Yields:
+            Span: The active span
+        """
+        if parent is None:
+            parent = _current_span.get()
+
+        if parent is not None:
+            sampled = parent.sampled
+            trace_id = parent.trace_id
+            parent_id = parent.span_id
+        else:
+            sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+            trace_id = f"{random.getrandbits(128):032x}" if sampled else ""
+            parent_id = None
+
+        if sampled:
+            span = Span(name, trace_id, f"{random.getrandbits(64):016x}", parent_id, True, attributes)
+            span.start = time.time()
+        else:
+            span = Span(name, trace_id, "", parent_id, False)
+
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            _current_span.reset(token)
+            if sampled:
+                span.duration = time.perf_counter() - start
+                self._buffer.append(span)
+
+    def inject(self) -> Optional[Dict[str, str]]:
+        """
+        Get the current trace context for a request frame
+
+        Returns:
+            Optional[Dict[str, str]]: Trace and span IDs, None when the
+                                      current trace is not sampled
+        """
+        span = _current_span.get()
+        if span is None or not span.sampled:
+            return None
+        return {'trace_id': span.trace_id, 'span_id': span.span_id}
+
+    def extract(self, carrier: Any) -> Optional[Span]:
+        """
+        Turn a received trace context into a parent span
+
+        Args:
+            carrier: Value produced by ``inject`` on the sender
+
+        Returns:
+            Optional[Span]: Remote parent, None if the carrier is missing or invalid
+        """
+        if not isinstance(carrier, dict):
+            return None
+        trace_id = carrier.get('trace_id')
+        span_id = carrier.get('span_id')
+        if not isinstance(trace_id, str) or not isinstance(span_id, str) or not trace_id:
+            return None
+        return Span("remote", trace_id, span_id, None, True)
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        """
+        Get buffered spans, oldest first
+
+        Args:
+            trace_id: Only return spans of this trace
+        """
+        spans = list(self._buffer)
+        if trace_id is not None:
+            spans = [span for span in spans if span.trace_id == trace_id]
+        return spans
+
+    def export(self, path: Union[str, Path], clear: bool = True) -> int:
+        """
+        Append buffered spans to a JSON-lines file
+
+        Args:
+            path: Output file
+            clear: Remove the exported spans from the buffer
+
+        Returns:
+            int: Number of spans written
+        """
+        if clear:
+            spans = []
+            while self._buffer:
+                spans.append(self._buffer.popleft())
+        else:
+            spans = list(self._buffer)
+
+        if spans:
+            with open(path, 'a', encoding='utf-8') as f:
+                for span in spans:
+                    f.write(json.dumps(span.to_dict(), default=str) + "\n")
+        return len(spans)
+
+    def clear(self):
+        """Discard buffered spans"""
+        self._buffer.clear()
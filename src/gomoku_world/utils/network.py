@@ -9,14 +9,23 @@ This module provides network status monitoring and management functionality:
 - Network event callbacks
 - Automatic reconnection handling
 
+Checks run as a task on the asyncio event loop and use non-blocking TCP
+connects to the configured hosts (the game server by default), so they
+never block the loop. Started outside a loop, as from Tk, the monitor
+runs on an event loop in a thread of its own.
+
 本模块提供网络状态监控和管理功能：
 - 实时连接状态监控
 - 连接质量指标
 - 网络事件回调
 - 自动重连处理
+
+检查作为asyncio事件循环上的任务运行，对配置的主机（默认是游戏服务器）使用非阻塞
+TCP连接，因此不会阻塞事件循环。在事件循环之外（例如Tk中）启动时，监控器在自己
+线程中的事件循环上运行。
 """
 
-import socket
+import asyncio
 import threading
 import time
 import statistics
@@ -26,11 +35,11 @@ from ..config.settings import (
     NETWORK_CHECK_HOSTS,
     NETWORK_CHECK_INTERVAL,
     NETWORK_MAX_RETRIES,
-    NETWORK_RETRY_DELAY,
-    NETWORK_PROXY_SETTINGS
+    NETWORK_RETRY_INTERVAL
 )
 from ..utils.logger import get_logger
 from ..i18n import i18n_manager
+from .monitoring.health import tcp_latency
 
 logger = get_logger(__name__)
 
@@ -68,7 +77,8 @@ class NetworkMonitor:
         self._check_interval = check_interval
         self._is_running = False
         self._is_online = False
-        self._monitor_thread: Optional[threading.Thread] = None
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._monitor_thread: Optional[threading.Thread] = None  # Loop thread outside asyncio
         self._callbacks: List[Callable[[bool], None]] = []
         self._metrics: Dict[str, float] = {
             "latency": 0.0,
@@ -83,12 +93,26 @@ class NetworkMonitor:
         Start network monitoring.
         
         启动网络监控。
+        
+        The checks run as a task on the running event loop, or on an
+        event loop in a daemon thread when there is none.
+        
+        检查在当前运行的事件循环上作为任务运行，没有运行的事件循环时在守护线程
+        中的事件循环上运行。
         """
         if not self._is_running:
             self._is_running = True
-            self._monitor_thread = threading.Thread(target=self._monitor_loop)
-            self._monitor_thread.daemon = True
-            self._monitor_thread.start()
+            try:
+                loop = asyncio.get_running_loop()
+            except RuntimeError:
+                loop = asyncio.new_event_loop()
+                self._monitor_task = loop.create_task(self._monitor_loop())
+                self._monitor_thread = threading.Thread(target=self._run_loop,
+                                                        args=(self._monitor_task,),
+                                                        name="network-monitor", daemon=True)
+                self._monitor_thread.start()
+            else:
+                self._monitor_task = loop.create_task(self._monitor_loop())
             logger.info(i18n_manager.get_text("network.status.monitoring_started"))
             
     def stop(self):
@@ -99,11 +123,33 @@ class NetworkMonitor:
         """
         if self._is_running:
             self._is_running = False
-            if self._monitor_thread:
-                self._monitor_thread.join()
+            task, thread = self._monitor_task, self._monitor_thread
+            if thread is not None:
+                try:
+                    task.get_loop().call_soon_threadsafe(task.cancel)
+                except RuntimeError:
+                    pass  # The loop already finished / 事件循环已结束
+                thread.join()
+            elif task is not None:
+                task.cancel()
+            self._monitor_task = None
             self._monitor_thread = None
             logger.info(i18n_manager.get_text("network.status.monitoring_stopped"))
             
+    def _run_loop(self, task: asyncio.Task):
+        """
+        Run the monitoring task on the thread's own event loop.
+        
+        在线程自己的事件循环上运行监控任务。
+        """
+        loop = task.get_loop()
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            loop.close()
+            
     def add_callback(self, callback: Callable[[bool], None]):
         """
         Add a status change callback.
@@ -167,28 +213,29 @@ class NetworkMonitor:
                                           percent=round(self._metrics["uptime"] * 100, 1))
         }
         
-    def check_connection(self) -> bool:
+    async def check_connection(self) -> bool:
         """
         Check current network connection.
         
         检查当前网络连接。
         
+        All hosts are probed concurrently with non-blocking connects.
+        
         Returns:
             bool: True if connection is available, False otherwise.
                  如果连接可用则为True，否则为False。
         """
+        results = await asyncio.gather(*(
+            tcp_latency(host, port, NETWORK_CHECK_TIMEOUT) for host, port in NETWORK_CHECK_HOSTS
+        ))
         latencies = []
-        for host in NETWORK_CHECK_HOSTS:
-            try:
-                start_time = time.time()
-                socket.create_connection((host, 80), NETWORK_CHECK_TIMEOUT)
-                latency = time.time() - start_time
-                latencies.append(latency)
-                self._retry_count = 0  # Reset retry count on successful connection
-            except (socket.timeout, socket.error) as e:
+        for (host, port), latency in zip(NETWORK_CHECK_HOSTS, results):
+            if latency is None:
                 logger.warning(i18n_manager.get_text("network.error.connection_failed",
-                                                   host=host, error=str(e)))
+                                                   host=f"{host}:{port}", error="unreachable"))
                 continue
+            latencies.append(latency)
+            self._retry_count = 0  # Reset retry count on successful connection
                 
         is_online = len(latencies) > 0
         if is_online != self._is_online:
@@ -229,7 +276,7 @@ class NetworkMonitor:
                                            max_retries=NETWORK_MAX_RETRIES)
             return i18n_manager.get_text("network.status.offline")
             
-    def _monitor_loop(self):
+    async def _monitor_loop(self):
         """
         Main monitoring loop.
         
@@ -237,21 +284,23 @@ class NetworkMonitor:
         """
         while self._is_running:
             try:
-                if not self.check_connection() and self._retry_count < NETWORK_MAX_RETRIES:
+                if not await self.check_connection() and self._retry_count < NETWORK_MAX_RETRIES:
                     self._retry_count += 1
                     logger.info(i18n_manager.get_text("network.status.retry",
                                                     retry=self._retry_count,
                                                     max_retries=NETWORK_MAX_RETRIES))
-                    time.sleep(NETWORK_RETRY_DELAY)
+                    await asyncio.sleep(NETWORK_RETRY_INTERVAL)
                     continue
                     
                 self._last_check_time = time.time()
-                time.sleep(self._check_interval)
+                await asyncio.sleep(self._check_interval)
                 
+            except asyncio.CancelledError:
+                raise
             except Exception as e:
                 logger.error(i18n_manager.get_text("network.error.monitoring_failed",
                                                  error=str(e)))
-                time.sleep(NETWORK_RETRY_DELAY)
+                await asyncio.sleep(NETWORK_RETRY_INTERVAL)
                 
     def _notify_callbacks(self):
         """
@@ -26,7 +26,9 @@ from dataclasses import dataclass, asdict
 import shutil
 
 from ..config import SAVE_DIR, AUTO_SAVE_DIR
+from ..core.codec import MOVE_ENCODING, encode_moves_field, decode_moves_field
 from .logger import get_logger
+from .monitoring import measure_save_io
 
 logger = get_logger(__name__)
 
@@ -136,8 +138,8 @@ class SaveManager:
                 shutil.copy2(save_path, backup_path)
             
             # Save new data / 保存新数据
-            with open(save_path, "w", encoding="utf-8") as f:
-                json.dump(asdict(game_data), f, indent=4, ensure_ascii=False)
+            with measure_save_io("save", save_path), open(save_path, "w", encoding="utf-8") as f:
+                json.dump(self._pack_save(game_data), f, indent=4, ensure_ascii=False)
                 
             logger.info(f"Game saved successfully: {game_data.id} / "
                        f"游戏保存成功：{game_data.id}")
@@ -169,9 +171,9 @@ class SaveManager:
                              f"未找到存档文件：{save_id}")
                 return None
             
-            with open(save_path, "r", encoding="utf-8") as f:
+            with measure_save_io("load", save_path), open(save_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                game_save = GameSave(**data)
+                game_save = GameSave(**self._unpack_save(data))
                 logger.info(f"Game loaded successfully: {save_id} / "
                            f"游戏加载成功：{save_id}")
                 return game_save
@@ -200,7 +202,7 @@ class SaveManager:
         try:
             for save_file in self.save_dir.glob("*.json"):
                 try:
-                    with open(save_file, "r", encoding="utf-8") as f:
+                    with measure_save_io("list", save_file), open(save_file, "r", encoding="utf-8") as f:
                         data = json.load(f)
                         saves.append({
                             "id": data["id"],
@@ -254,6 +256,35 @@ class SaveManager:
                         f"删除存档{save_id}失败：{e}")
             return False
     
+    def _pack_save(self, game_data: GameSave) -> Dict:
+        """
+        Convert save data to a dictionary with packed moves.
+        
+        将存档数据转换为带有打包着法的字典。
+        
+        Moves are stored as a base64 packed string; saves whose moves
+        cannot be packed keep the plain list.
+        着法以base64打包字符串存储；无法打包的着法保留原始列表。
+        """
+        save_dict = asdict(game_data)
+        try:
+            save_dict["moves"] = encode_moves_field(game_data.moves, game_data.board_size)
+            save_dict["move_encoding"] = MOVE_ENCODING
+        except ValueError as e:
+            logger.warning(f"Storing unpacked moves for {game_data.id}: {e} / "
+                           f"以未打包形式存储{game_data.id}的着法：{e}")
+        return save_dict
+    
+    def _unpack_save(self, data: Dict) -> Dict:
+        """
+        Expand packed moves in a loaded save dictionary.
+        
+        展开已加载存档字典中的打包着法。
+        """
+        if data.pop("move_encoding", None) == MOVE_ENCODING:
+            data["moves"] = decode_moves_field(data["moves"])
+        return data
+    
     def create_save_data(self, game_id: str, black_player: str, white_player: str,
                         moves: List[Dict], board_size: int, game_mode: str,
                         winner: Optional[int] = None, metadata: Dict = None) -> GameSave:
@@ -319,8 +350,8 @@ class SaveManager:
                 shutil.copy2(auto_save_path, backup_path)
             
             # Save new auto-save / 保存新的自动存档
-            with open(auto_save_path, "w", encoding="utf-8") as f:
-                json.dump(asdict(game_data), f, indent=4, ensure_ascii=False)
+            with measure_save_io("auto_save", auto_save_path), open(auto_save_path, "w", encoding="utf-8") as f:
+                json.dump(self._pack_save(game_data), f, indent=4, ensure_ascii=False)
                 
             logger.info(f"Auto-save successful: {game_data.id} / "
                        f"自动保存成功：{game_data.id}")
@@ -352,9 +383,9 @@ class SaveManager:
                              f"未找到自动存档：{game_id}")
                 return None
             
-            with open(auto_save_path, "r", encoding="utf-8") as f:
+            with measure_save_io("load_auto_save", auto_save_path), open(auto_save_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
-                game_save = GameSave(**data)
+                game_save = GameSave(**self._unpack_save(data))
                 logger.info(f"Auto-save loaded successfully: {game_id} / "
                            f"自动存档加载成功：{game_id}")
                 return game_save
@@ -31,3 +31,75 @@ def winning_board():
     for i in range(5):
         board.place_piece(7, i, 1)
     return board 
+
+@pytest.fixture
+def player_connection():
+    """Factory for server-side connections bound to a player, as after login"""
+    from gomoku_world.network.fanout import ClientConnection
+
+    def connect(player_id):
+        connection = ClientConnection(None)
+        connection.client_id = player_id
+        return connection
+    return connect
+
+@pytest.fixture
+def server_options():
+    """
+    Settings for the server started by ``served``
+    
+    Override in a test module to change them: keys name ``GameServer``
+    attributes to set, and ``matchmaking`` runs the matchmaking task.
+    """
+    return {}
+
+@pytest.fixture
+async def served(server_options):
+    """Run a game server on an ephemeral port with fresh counters; yields (server, port)"""
+    import asyncio
+    from gomoku_world.network.server import GameServer
+    from gomoku_world.utils.monitoring import command_stats
+    
+    command_stats.reset()
+    options = dict(server_options)
+    matchmaking = options.pop('matchmaking', False)
+    server = GameServer()
+    for name, value in options.items():
+        setattr(server, name, value)
+    listener = await asyncio.start_server(server._handle_client, '127.0.0.1', 0)
+    task = asyncio.create_task(server._matchmaking_loop()) if matchmaking else None
+    yield server, listener.sockets[0].getsockname()[1]
+    if task is not None:
+        task.cancel()
+    listener.close()
+    await listener.wait_closed()
+    command_stats.reset()
+
+@pytest.fixture
+def login(served):
+    """Factory that opens a raw connection to ``served`` and logs in; returns (reader, writer)"""
+    import asyncio
+    from gomoku_world.network.protocol import encode_frame, decode_frame
+    _, port = served
+    
+    async def connect(player_id):
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(encode_frame({'cmd': 'login', 'data': {'id': player_id, 'name': player_id}}))
+        await writer.drain()
+        assert decode_frame(await reader.readline())['status'] == 'ok'
+        return reader, writer
+    return connect
+
+@pytest.fixture
+def connected_client(served):
+    """Factory for a GameClient connected and logged in to ``served``"""
+    from gomoku_world.network.client import GameClient
+    _, port = served
+    
+    async def connect(name='P'):
+        client = GameClient('127.0.0.1', port)
+        assert await client.connect()
+        response = await client._send_message('login', {'id': client.player_id, 'name': name})
+        assert response['status'] == 'ok'
+        return client
+    return connect
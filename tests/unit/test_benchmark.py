@@ -0,0 +1,92 @@
+"""
+AI benchmark suite unit tests
+AI基准测试套件单元测试
+"""
+
+import copy
+
+import pytest
+from gomoku_world.benchmark import (
+    CORPUS, compare, format_moves, get_positions, load_results, parse_moves,
+    run_ai_benchmark, save_results
+)
+from gomoku_world.core.rules import Rules
+
+
+def _winning_cells(board, player):
+    cells = set()
+    for row, col in board.get_empty_cells():
+        board.board[row, col] = player
+        if Rules.check_win(board, row, col):
+            cells.add((int(row), int(col)))
+        board.board[row, col] = 0
+    return cells
+
+
+def test_move_strings_round_trip():
+    """Test parsing and formatting of move strings"""
+    assert parse_moves("A1 H8 O15") == [(0, 0), (7, 7), (14, 14)]
+    assert format_moves([(0, 0), (7, 7), (14, 14)]) == "A1 H8 O15"
+
+
+@pytest.mark.parametrize("position", CORPUS, ids=lambda position: position.name)
+def test_corpus_position_is_valid(position):
+    """Test that every position is legal, unfinished and correctly solved"""
+    moves = parse_moves(position.moves)
+    assert len(set(moves)) == len(moves)
+    board = position.board()
+    assert not any(Rules.check_win(board, row, col) for row, col in moves)
+
+    player, opponent = position.player, 3 - position.player
+    solutions = set(position.solution_moves())
+    if position.kind == "win":
+        assert _winning_cells(board, player) == solutions
+    elif position.kind == "defend":
+        assert not _winning_cells(board, player)
+        assert _winning_cells(board, opponent) == solutions
+    elif position.kind == "double_threat":
+        double_threats = set()
+        for row, col in board.get_empty_cells():
+            board.board[row, col] = player
+            if len(_winning_cells(board, player)) >= 2:
+                double_threats.add((int(row), int(col)))
+            board.board[row, col] = 0
+        assert double_threats == solutions
+    else:
+        assert not solutions
+
+
+def test_get_positions_filters():
+    """Test selecting positions by name and kind"""
+    assert all(position.is_puzzle for position in get_positions(puzzles=True))
+    assert [position.name for position in get_positions(["edge_fight"])] == ["edge_fight"]
+    with pytest.raises(KeyError):
+        get_positions(["missing"])
+
+
+def test_run_and_compare(tmp_path):
+    """Test a small benchmark run, its file format and the baseline gate"""
+    results = run_ai_benchmark(strategies=["minmax", "priority"], depth=1,
+                               positions=["opening_center", "open_four_row"])
+    minmax = results['strategies']['minmax']
+    assert minmax['nodes'] > 0 and minmax['nps'] > 0
+    assert set(minmax['time_to_depth']) == {"1"}
+    assert minmax['puzzles'] == 1
+    assert results['evaluator']['evals_per_second'] > 0
+
+    path = tmp_path / "results.json"
+    save_results(results, path)
+    baseline = load_results(path)
+    assert compare(results, baseline) == []
+
+    slower = copy.deepcopy(results)
+    slower['strategies']['minmax']['nps'] = baseline['strategies']['minmax']['nps'] * 0.5
+    slower['strategies']['minmax']['time_to_depth']["1"] *= 2
+    slower['strategies']['priority']['solve_rate'] = -1.0
+    metrics = {regression.metric for regression in compare(slower, baseline, tolerance=0.2)}
+    assert metrics == {"minmax.nps", "minmax.time_to_depth.1", "priority.solve_rate"}
+
+    other = copy.deepcopy(results)
+    other['settings']['depth'] = 2
+    with pytest.raises(ValueError):
+        compare(other, baseline)
@@ -0,0 +1,92 @@
+"""
+Client request/event channel unit tests
+客户端请求/事件通道单元测试
+"""
+
+import asyncio
+
+import pytest
+from gomoku_world.network.client import GameClient
+from gomoku_world.network.protocol import encode_frame, decode_frame
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_matched(served, connected_client):
+    """Test that responses reach the request that asked for them"""
+    server, port = served
+    client = await connected_client()
+
+    status, games, bogus = await asyncio.gather(
+        client._send_message('get_status', {}),
+        client._send_message('list_games', {}),
+        client._send_message('no_such_command', {}),
+    )
+
+    assert status['data']['players_online'] == 1
+    assert 'games' in games['data']
+    assert bogus['message'] == 'Unknown command'
+    assert 'rid' not in status
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_events_interleave_with_responses(served, connected_client):
+    """Test that a push arriving mid-request goes to callbacks and waiters"""
+    server, port = served
+    client = await connected_client()
+    pushed = []
+    client.on('notice', pushed.append)
+
+    waiter = asyncio.create_task(client.wait_for_event('notice'))
+    await asyncio.sleep(0)
+    server._send_message_to_client(client.player_id, {'event': 'notice', 'data': {'n': 1}})
+    response = await client._send_message('get_status', {})
+
+    assert response['status'] == 'ok'
+    assert await waiter == {'n': 1}
+    assert pushed == [{'n': 1}]
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_request_timeout_and_disconnect():
+    """Test timeouts and failure of outstanding requests on disconnect"""
+    async def silent(reader, writer):
+        await reader.readline()
+        await reader.readline()
+        writer.close()
+
+    listener = await asyncio.start_server(silent, '127.0.0.1', 0)
+    client = GameClient('127.0.0.1', listener.sockets[0].getsockname()[1])
+    assert await client.connect()
+
+    timed_out = await client._send_message('get_status', {}, timeout=0.05)
+    assert timed_out['message'] == 'Request timed out'
+
+    closed = await client._send_message('get_status', {}, timeout=2)
+    assert closed['message'] == 'Connection closed'
+    assert not client.connected
+
+    listener.close()
+    await listener.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_responses_without_ids_are_matched_in_order():
+    """Test compatibility with servers that do not echo request IDs"""
+    async def legacy(reader, writer):
+        while line := await reader.readline():
+            writer.write(encode_frame({'status': 'ok', 'echo': decode_frame(line)['cmd']}))
+            await writer.drain()
+
+    listener = await asyncio.start_server(legacy, '127.0.0.1', 0)
+    client = GameClient('127.0.0.1', listener.sockets[0].getsockname()[1])
+    await client.connect()
+
+    first, second = await asyncio.gather(
+        client._send_message('a', {}), client._send_message('b', {}))
+    assert (first['echo'], second['echo']) == ('a', 'b')
+
+    await client.disconnect()
+    listener.close()
+    await listener.wait_closed()
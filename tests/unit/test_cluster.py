@@ -0,0 +1,162 @@
+"""
+Server cluster unit tests
+服务器集群单元测试
+"""
+
+import asyncio
+import multiprocessing
+
+import pytest
+from gomoku_world.network.cluster import SessionDirectory, create_shared_directory
+from gomoku_world.network.protocol import encode_frame, decode_frame
+from gomoku_world.network.server import GameServer
+
+
+class Client:
+    """Minimal line-protocol client"""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def request(self, cmd, data):
+        self.writer.write(encode_frame({'cmd': cmd, 'data': data}))
+        await self.writer.drain()
+        while True:
+            message = await self.read()
+            if 'event' not in message:
+                return message
+
+    async def read(self):
+        return decode_frame(await asyncio.wait_for(self.reader.readline(), 2))
+
+
+async def start_worker(worker_id, directory):
+    """Start a worker with its peer link and client listener"""
+    server = GameServer('127.0.0.1', 0, worker_id=worker_id, directory=directory)
+    await server.router.start()
+    listener = await asyncio.start_server(server._handle_client, '127.0.0.1', 0)
+    return server, listener
+
+
+async def connect(listener, player_id):
+    """Connect and log in a player"""
+    port = listener.sockets[0].getsockname()[1]
+    client = Client(*await asyncio.open_connection('127.0.0.1', port))
+    assert (await client.request('login', {'id': player_id, 'name': player_id}))['status'] == 'ok'
+    return client
+
+
+def test_directory_ownership():
+    """Test claim and release semantics"""
+    directory = SessionDirectory()
+    assert directory.claim_player("p1", 0)
+    assert not directory.claim_player("p1", 1)
+    directory.release_player("p1", 1)
+    assert directory.player_owner("p1") == 0
+    directory.release_player("p1", 0)
+    assert directory.player_owner("p1") is None
+
+    directory.register_worker(1, ["127.0.0.1", 9000])
+    assert directory.worker_address(1) == ("127.0.0.1", 9000)
+
+
+def test_shared_directory_across_processes():
+    """Test the manager-backed stand-in seen from another process"""
+    with multiprocessing.Manager() as manager:
+        directory = create_shared_directory(manager)
+        process = multiprocessing.Process(target=directory.claim_game, args=("g1", 3))
+        process.start()
+        process.join(5)
+
+        assert directory.game_owner("g1") == 3
+        assert not directory.claim_game("g1", 0)
+
+
+@pytest.mark.asyncio
+async def test_spectator_routed_to_owning_worker():
+    """Test that spectating and pushes cross workers transparently"""
+    directory = SessionDirectory()
+    (host, host_listener), (edge, edge_listener) = [
+        await start_worker(i, directory) for i in range(2)
+    ]
+
+    black = await connect(host_listener, "black")
+    white = await connect(host_listener, "white")
+    watcher = await connect(edge_listener, "watcher")
+
+    game = host._start_game(host.players["black"], host.players["white"])
+    await black.read()
+    found = await white.read()
+    assert found['event'] == 'game_found' and found['data']['color'] == 2
+    assert host.router.game_owner(game.id) == 0
+
+    response = await watcher.request('spectate_game', {'id': 'watcher', 'game_id': game.id})
+    assert response['status'] == 'ok'
+    assert directory.game_owner(game.id) == 0
+    assert host.spectator_manager.get_spectator_count(game.id) == 1
+
+    await black.request('make_move', {'id': 'black', 'game_id': game.id, 'move': {'x': 7, 'y': 7}})
+    event = await watcher.read()
+    assert event['event'] == 'game_delta'
+    assert event['data']['game_id'] == game.id
+
+    left = await watcher.request('leave_spectate', {'id': 'watcher'})
+    assert left['status'] == 'ok'
+    assert host.spectator_manager.get_spectator_count(game.id) == 0
+
+    for server, listener in ((host, host_listener), (edge, edge_listener)):
+        listener.close()
+        await server.router.stop()
+
+
+@pytest.mark.asyncio
+async def test_login_is_exclusive_across_workers(player_connection):
+    """Test that one player cannot log in on two workers"""
+    directory = SessionDirectory()
+    first = GameServer(worker_id=0, directory=directory)
+    second = GameServer(worker_id=1, directory=directory)
+
+    assert (await first._handle_login({'id': 'p', 'name': 'P'}))['status'] == 'ok'
+    assert (await second._handle_login({'id': 'p', 'name': 'P'}))['status'] == 'error'
+    await first._handle_logout({'id': 'p'}, player_connection('p'))
+    assert (await second._handle_login({'id': 'p', 'name': 'P'}))['status'] == 'ok'
+
+
+@pytest.mark.asyncio
+async def test_matchmaking_pairs_players_across_workers():
+    """Test that players queued on different workers meet in one game"""
+    directory = SessionDirectory()
+    workers = [await start_worker(i, directory) for i in range(3)]
+    (matcher, _), (first, first_listener), (second, second_listener) = workers
+
+    black = await connect(first_listener, "black")
+    white = await connect(second_listener, "white")
+    for client in (black, white):
+        assert (await client.request('find_game', {}))['status'] == 'ok'
+    assert len(matcher.matchmaker) == 2 and len(first.matchmaker) == 0
+
+    assert matcher._run_matchmaking() == 1
+    found = [await client.read() for client in (black, white)]
+    assert [event['data']['color'] for event in found] == [1, 2]
+    game_id = found[0]['data']['game_id']
+    host = first if game_id in first.games else second
+    assert host.router.game_owner(game_id) == host.worker_id
+    assert all(server.players[pid].game_id == game_id
+               for server, pid in ((first, "black"), (second, "white")))
+
+    for client, x in ((black, 7), (white, 8)):
+        response = await client.request('make_move', {'game_id': game_id, 'move': {'x': x, 'y': 7}})
+        assert response['status'] == 'ok'
+    assert len(host.games[game_id].moves) == 2
+
+    await white.request('logout', {})
+    await asyncio.sleep(0.1)
+    assert game_id not in host.games
+    assert all(server.players.get(pid) is None or server.players[pid].game_id is None
+               for server, pid in ((first, "black"), (second, "white")))
+
+    for server, listener in workers:
+        listener.close()
+        await server.router.stop()
+
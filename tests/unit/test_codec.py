@@ -0,0 +1,127 @@
+"""
+Move codec unit tests
+着法编码单元测试
+"""
+
+import json
+
+import pytest
+from gomoku_world.core import PackedMoves
+from gomoku_world.core.codec import (
+    encode_varint, decode_varint, decode_moves_field, encode_moves_field, move_time
+)
+
+
+def test_varint_roundtrip():
+    """Test varint encoding of small and large values"""
+    for value in (0, 1, 127, 128, 300, 2 ** 21, 2 ** 35):
+        out = bytearray()
+        encode_varint(value, out)
+        decoded, pos = decode_varint(bytes(out), 0)
+        assert decoded == value
+        assert pos == len(out)
+
+
+def test_one_byte_per_move():
+    """Test that a 15x15 game packs to one byte per move plus header"""
+    moves = PackedMoves(15)
+    for i in range(10):
+        moves.append(i, 14 - i)
+
+    data = moves.to_bytes()
+    assert len(data) == 4 + 10
+    assert PackedMoves.from_bytes(data) == moves
+    assert list(PackedMoves.from_bytes(data)) == [(i, 14 - i) for i in range(10)]
+
+
+def test_large_board_uses_two_bytes():
+    """Test that 19x19 boards (361 cells) still roundtrip"""
+    moves = PackedMoves(19)
+    moves.append(18, 18)
+    moves.append(0, 0)
+
+    assert moves.cell_width == 2
+    restored = PackedMoves.from_bytes(moves.to_bytes())
+    assert restored.cells() == [360, 0]
+
+
+def test_timings_roundtrip():
+    """Test optional per-move timing data"""
+    moves = PackedMoves(15)
+    moves.append(7, 7)
+    moves.append(7, 8, time_ms=1500)
+
+    restored = PackedMoves.from_base64(moves.to_base64())
+    assert restored.timings() == [0, 1500]
+    assert restored.to_dicts()[1] == {'x': 7, 'y': 8, 'color': 2, 'time_ms': 1500}
+
+
+def test_partial_encoding():
+    """Test encoding only the tail of a move list"""
+    moves = PackedMoves(15)
+    for i in range(5):
+        moves.append(0, i)
+
+    tail = PackedMoves.from_bytes(moves.to_bytes(start=3))
+    assert list(tail) == [(0, 3), (0, 4)]
+
+
+def test_invalid_data():
+    """Test rejection of malformed input"""
+    moves = PackedMoves(15)
+    with pytest.raises(ValueError):
+        moves.append(15, 0)
+    with pytest.raises(ValueError):
+        PackedMoves.from_bytes(b"\x01\x0f\x00\x05\x01")
+    with pytest.raises(ValueError):
+        PackedMoves.from_bytes(bytes((1, 15, 0, 1, 250)))
+    with pytest.raises(ValueError):
+        PackedMoves.from_base64("not base64!")
+
+
+def test_bad_time_leaves_moves_unchanged():
+    """Test that a rejected timing does not append half a move"""
+    moves = PackedMoves(15)
+    moves.append(7, 7, time_ms=100)
+    with pytest.raises(ValueError):
+        moves.append(7, 8, time_ms='x')
+    assert len(moves) == 1 and moves.timings() == [100]
+    assert PackedMoves.from_base64(moves.to_base64()) == moves
+
+    assert move_time({'x': 1, 'y': 2}) is None
+    assert move_time({'time_ms': 12.7}) == 12
+    for bad in ('x', -1, True, float('nan'), float('inf'), [1]):
+        with pytest.raises(ValueError):
+            move_time({'time_ms': bad})
+
+
+def test_moves_field_helpers():
+    """Test JSON field helpers accept packed and plain forms"""
+    plain = [{'row': 7, 'col': 7}, {'x': 7, 'y': 8}]
+    packed = encode_moves_field(plain, 15)
+
+    assert isinstance(json.loads(json.dumps(packed)), str)
+    assert decode_moves_field(packed) == [
+        {'x': 7, 'y': 7, 'color': 1},
+        {'x': 7, 'y': 8, 'color': 2},
+    ]
+    assert decode_moves_field(plain) == plain
+
+
+def test_save_manager_packs_moves(tmp_path):
+    """Test that saves store packed moves and load them back as dicts"""
+    from gomoku_world.core.save_manager import SaveManager
+
+    manager = SaveManager()
+    manager.save_dir = tmp_path
+    moves = [{'x': 7, 'y': 7, 'color': 1}, {'x': 8, 'y': 8, 'color': 2}]
+    save = manager.create_save_data("g1", "alice", "bob", moves, 15, "pvp")
+
+    assert manager.save_game(save)
+    raw = json.loads(next(tmp_path.glob("g1_*.json")).read_text())
+    assert raw['move_encoding'] == 'packed-b64'
+    assert isinstance(raw['moves'], str)
+
+    loaded = manager.load_game("g1")
+    assert loaded.moves == moves
+    assert manager.list_saves()[0]['moves_count'] == 2
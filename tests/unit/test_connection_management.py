@@ -0,0 +1,124 @@
+"""
+Server connection management unit tests
+服务器连接管理单元测试
+"""
+
+import asyncio
+
+import pytest
+from gomoku_world.network.fanout import ClientConnection
+from gomoku_world.network.protocol import decode_frame
+
+
+@pytest.fixture
+def server_options():
+    """Short heartbeat and idle timeouts"""
+    return {'heartbeat_interval': 0.05, 'idle_timeout': 0.2}
+
+
+@pytest.mark.asyncio
+async def test_idle_connection_is_pinged_then_reaped(served, login):
+    """Test that a silent client gets pings, then is closed and logged out"""
+    server, port = served
+    reader, writer = await login("idle")
+
+    events = []
+    while line := await asyncio.wait_for(reader.readline(), 1):
+        events.append(decode_frame(line)['event'])
+
+    assert events and set(events) == {'ping'}
+    await asyncio.sleep(0.01)
+    assert "idle" not in server.players
+    assert len(server.connections) == 0
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_responsive_client_stays_connected(served, connected_client):
+    """Test that answering pings keeps a connection alive past the idle timeout"""
+    server, _ = served
+    client = await connected_client()
+
+    await asyncio.sleep(0.5)
+    assert client.connected
+    assert client.player_id in server.players
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_connection_limit(served, login):
+    """Test that clients beyond the limit are refused"""
+    server, port = served
+    server.max_connections = 1
+    _, first = await login("first")
+
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    assert decode_frame(await reader.readline())['message'] == 'Server full'
+    assert await reader.read() == b""
+    first.close()
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cleans_up_game_and_queues(served, login):
+    """Test that a dropped player forfeits and leaves every index"""
+    server, port = served
+    connections = {pid: await login(pid) for pid in ("a", "b", "w", "q")}
+    game = server._start_game(server.players["a"], server.players["b"])
+    await server._handle_spectate_game({'game_id': game.id}, server.connections.get('w'))
+    server.matchmaker.add("q", 1500)
+
+    for pid in ("a", "w", "q"):
+        connections[pid][1].close()
+    await asyncio.sleep(0.1)
+
+    assert set(server.players) == {"b"}
+    assert game.winner == 2 and game.id not in server.games
+    assert server.players["b"].game_id is None
+    assert server.spectator_manager.get_spectator_info("w") is None
+    assert len(server.matchmaker) == 0
+    connections["b"][1].close()
+
+
+@pytest.mark.asyncio
+async def test_state_stays_flat_under_churn(served, login):
+    """Test that repeated connect/login/drop cycles leave nothing behind"""
+    server, port = served
+    for i in range(50):
+        _, writer = await login(f"p{i}")
+        writer.close()
+    await asyncio.sleep(0.1)
+
+    assert not server.players
+    assert len(server.connections) == 0
+    assert server._connection_slots._value == server.max_connections
+
+
+@pytest.mark.asyncio
+async def test_write_blocked_while_drain_lags():
+    """Test that a lagging drain is visible to the reader loop"""
+    release = asyncio.Event()
+
+    class SlowWriter:
+        def write(self, data):
+            pass
+
+        async def drain(self):
+            await release.wait()
+
+        def close(self):
+            pass
+
+        async def wait_closed(self):
+            pass
+
+    connection = ClientConnection(SlowWriter())
+    connection.start()
+    connection.send(b"x\n", droppable=False)
+    await asyncio.sleep(0.01)
+    assert connection.write_blocked
+
+    release.set()
+    await asyncio.wait_for(connection.wait_writable(), 1)
+    assert not connection.write_blocked
+    await connection.close()
@@ -0,0 +1,87 @@
+"""
+Difficulty budget unit tests
+难度预算单元测试
+"""
+
+import time
+
+import pytest
+from gomoku_world.config import AI_DEPTH_EASY, AI_DEPTH_HARD, AI_DEPTH_MEDIUM, AI_TIME_CHECK_INTERVAL
+from gomoku_world.config.ai_config import AI_DIFFICULTY_LEVELS, get_difficulty
+from gomoku_world.core.ai import AI, MCTSStrategy, MinMaxStrategy, PositionEvaluator, SearchDeadline
+from gomoku_world.core.ai.strategy import AIStrategy
+from gomoku_world.core.ai.utils import AIUtils
+from gomoku_world.core.board import Board
+
+
+@pytest.fixture
+def board():
+    """Open middle-game position"""
+    board = Board(15)
+    for i, (row, col) in enumerate([(7, 7), (7, 8), (8, 8), (6, 6)]):
+        board.place_piece(row, col, 1 if i % 2 == 0 else 2)
+    return board
+
+
+def test_depths_agree():
+    """Test that every engine reads the same difficulty table"""
+    assert (AI_DEPTH_EASY, AI_DEPTH_MEDIUM, AI_DEPTH_HARD) == tuple(
+        AI_DIFFICULTY_LEVELS[name].max_depth for name in ("easy", "medium", "hard"))
+    for name, profile in AI_DIFFICULTY_LEVELS.items():
+        assert AI(name).depth == profile.max_depth
+        assert AIStrategy(name).max_depth == profile.max_depth
+        assert AIStrategy(name).time_limit == profile.time_budget
+    assert get_difficulty("unknown") == AI_DIFFICULTY_LEVELS["medium"]
+
+
+def test_candidate_moves(board):
+    """Test that candidates are the ranked neighbours of stones"""
+    assert AIUtils.get_candidate_moves(Board(15), 5) == [(7, 7)]
+    assert len(AIUtils.get_candidate_moves(board, 0)) == 225 - 4
+
+    candidates = AIUtils.get_candidate_moves(board, 10)
+    assert len(candidates) == 10
+    assert all(board.is_valid_move(row, col) for row, col in candidates)
+    assert all(max(abs(row - 7), abs(col - 7)) <= 3 for row, col in candidates)
+    # (6, 7) touches three stones and sees a fourth two cells away / (6, 7)与三子相邻，两格外还有一子
+    assert candidates[0] == (6, 7)
+    assert AIUtils.get_candidate_moves(board, 500)[-1] != (0, 0)
+
+
+def test_evaluation_noise(board):
+    """Test that noise perturbs evaluations only when configured"""
+    exact = PositionEvaluator()
+    assert exact.evaluate(board.board, 1) == exact.evaluate(board.board, 1)
+    noisy = PositionEvaluator(noise=100.0)
+    scores = {noisy.evaluate(board.board, 1) for _ in range(5)}
+    assert len(scores) == 5
+
+
+def test_minmax_node_budget(board):
+    """Test that the node budget bounds a deep search"""
+    strategy = MinMaxStrategy(candidate_limit=10)
+    move = strategy.get_move(board, 1, 8, deadline=SearchDeadline(max_nodes=1000))
+    assert board.is_valid_move(*move)
+    assert strategy.nodes <= 1000 + AI_TIME_CHECK_INTERVAL
+    assert 1 <= strategy.info.depth < 8
+
+
+def test_mcts_node_budget(board):
+    """Test that the node budget counts MCTS simulations"""
+    strategy = MCTSStrategy(simulation_limit=10 ** 6, candidate_limit=5)
+    move = strategy.get_move(board, 1, deadline=SearchDeadline(max_nodes=30))
+    assert strategy.info.nodes == 30
+    assert move in AIUtils.get_candidate_moves(board, 5)
+
+
+@pytest.mark.parametrize("difficulty", ["easy", "medium", "hard"])
+def test_engine_respects_budgets(board, difficulty):
+    """Test that a move costs at most the budgets of its difficulty"""
+    profile = get_difficulty(difficulty)
+    ai = AI(difficulty)
+    start = time.perf_counter()
+    move, info = ai.get_move(board, 1, return_info=True)
+    assert time.perf_counter() - start < profile.time_budget + 1.0
+    assert info.nodes <= profile.node_budget + AI_TIME_CHECK_INTERVAL
+    assert board.is_valid_move(*move)
+    assert info.strategy == profile.strategy
@@ -0,0 +1,124 @@
+"""
+Spectator fan-out unit tests
+观战扇出单元测试
+"""
+
+import asyncio
+
+import pytest
+from gomoku_world.network.fanout import ClientConnection, ConnectionRegistry, RESYNC_FRAME
+from gomoku_world.network.protocol import encode_frame, decode_frame
+from gomoku_world.network.server import GameServer, Game
+from gomoku_world.network.spectator import SpectatorManager
+
+
+class FakeWriter:
+    """Stream writer stand-in recording written bytes"""
+
+    def __init__(self):
+        self.chunks = []
+        self.closed = False
+
+    def write(self, data):
+        self.chunks.append(data)
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    async def wait_closed(self):
+        pass
+
+
+def test_broadcast_encodes_once():
+    """Test that every spectator receives the very same frame object"""
+    manager = SpectatorManager()
+    for i in range(5):
+        manager.add_spectator(f"s{i}", f"S{i}", "g1")
+
+    frames = []
+    delivered = manager.broadcast_to_spectators(
+        "g1", {'event': 'x'}, lambda sid, frame: frames.append(frame) or True)
+
+    assert delivered == 5
+    assert all(frame is frames[0] for frame in frames)
+    assert decode_frame(frames[0]) == {'event': 'x'}
+
+
+@pytest.mark.asyncio
+async def test_connection_batches_writes():
+    """Test that frames queued in one tick are flushed in one write"""
+    writer = FakeWriter()
+    connection = ClientConnection(writer)
+    connection.start()
+
+    for i in range(3):
+        connection.send_message({'n': i})
+    await asyncio.sleep(0.01)
+
+    assert len(writer.chunks) == 1
+    assert writer.chunks[0].count(b"\n") == 3
+    await connection.close()
+    assert writer.closed
+
+
+def test_slow_consumer_is_coalesced_then_dropped():
+    """Test overflow handling for clients that never drain"""
+    writer = FakeWriter()
+    connection = ClientConnection(writer, max_pending=2, max_overflows=1)
+    response = encode_frame({'status': 'ok'})
+
+    connection.send(response, droppable=False)
+    assert connection.send(b"a\n") and connection.send(b"b\n")
+    assert not connection.send(b"c\n")
+    assert [frame for frame, _ in connection._pending] == [response, RESYNC_FRAME]
+
+    connection.send(b"d\n")
+    connection.send(b"e\n")
+    connection.send(b"f\n")
+    assert connection.closed
+    assert writer.closed
+
+
+@pytest.mark.asyncio
+async def test_server_pushes_deltas_to_spectators():
+    """Test end-to-end delivery of a move delta over a real socket"""
+    server = GameServer(port=0)
+    tcp_server = await asyncio.start_server(server._handle_client, '127.0.0.1', 0)
+    port = tcp_server.sockets[0].getsockname()[1]
+
+    server.games["g1"] = Game(id="g1", black_player="a", white_player="b", status="playing")
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+    async def request(cmd, data):
+        writer.write(encode_frame({'cmd': cmd, 'data': data}))
+        await writer.drain()
+        return decode_frame(await reader.readline())
+
+    assert (await request('login', {'id': 'watcher', 'name': 'W'}))['status'] == 'ok'
+    assert (await request('spectate_game', {'id': 'watcher', 'game_id': 'g1'}))['status'] == 'ok'
+
+    server.games["g1"].moves.append(7, 7)
+    await server._broadcast_game_delta("g1", 0)
+    event = decode_frame(await asyncio.wait_for(reader.readline(), 1))
+
+    assert event['event'] == 'game_delta'
+    assert event['data']['seq'] == 0
+
+    writer.close()
+    tcp_server.close()
+    await tcp_server.wait_closed()
+
+
+def test_registry_unregister_keeps_newer_connection():
+    """Test that a stale connection does not evict a re-login"""
+    registry = ConnectionRegistry()
+    old = ClientConnection(FakeWriter())
+    new = ClientConnection(FakeWriter())
+    registry.register("p1", old)
+    registry.register("p1", new)
+
+    registry.unregister(old)
+    assert registry.get("p1") is new
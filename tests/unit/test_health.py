@@ -0,0 +1,159 @@
+"""
+Health checker unit tests
+健康检查器单元测试
+"""
+
+import asyncio
+import json
+import time
+
+import pytest
+from gomoku_world.network.server import GameServer
+from gomoku_world.utils import network as network_module
+from gomoku_world.utils.monitoring import HealthChecker
+from gomoku_world.utils.monitoring.health import Probe, tcp_latency
+from gomoku_world.utils.network import NetworkMonitor
+
+
+async def _get(port: int, path: str):
+    """Send a plain HTTP GET and return status code and JSON body"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, body = raw.split(b"\r\n\r\n", 1)
+    return int(head.split()[1]), json.loads(body)
+
+
+@pytest.fixture
+async def listener():
+    """Run a TCP listener that accepts and closes connections"""
+    async def accept(reader, writer):
+        writer.close()
+
+    server = await asyncio.start_server(accept, '127.0.0.1', 0)
+    yield server.sockets[0].getsockname()[1]
+    server.close()
+    await server.wait_closed()
+
+
+def test_probe_thresholds():
+    """Test classification against degraded and critical thresholds"""
+    probe = Probe("queue", lambda: 0, degraded=10, critical=100)
+    assert probe.status(None) == "unknown"
+    assert probe.status(5) == "ok"
+    assert probe.status(10) == "degraded"
+    assert probe.status(100) == "critical"
+
+
+@pytest.mark.asyncio
+async def test_overall_status():
+    """Test that the worst probe decides readiness"""
+    checker = HealthChecker()
+    checker.probes.clear()
+    values = {'a': 1.0}
+    checker.register("a", lambda: values['a'], degraded=5, critical=10)
+
+    async def async_probe():
+        return 2.0
+    checker.register("b", async_probe, degraded=5)
+
+    report = await checker.check()
+    assert report['status'] == "ready"
+    assert report['probes']['b'] == {'value': 2.0, 'status': "ok", 'unit': ""}
+
+    values['a'] = 6.0
+    assert (await checker.check())['status'] == "degraded"
+
+    def failing():
+        raise RuntimeError("probe broke")
+    checker.register("c", failing)
+    report = await checker.check()
+    assert report['status'] == "not_ready"
+    assert report['probes']['c']['error'] == "probe broke"
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_is_measured():
+    """Test that a blocked event loop shows up as lag"""
+    checker = HealthChecker(lag_interval=0.02)
+    checker.start()
+    try:
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)
+        await asyncio.sleep(0.05)
+        report = await checker.check()
+        assert report['probes']['loop_lag']['value'] >= 0.1
+        assert report['probes']['loop_lag']['status'] == "degraded"
+        assert report['probes']['rss']['unit'] == "MB"
+    finally:
+        await checker.stop()
+
+
+@pytest.mark.asyncio
+async def test_http_endpoint():
+    """Test the health and readiness endpoints"""
+    checker = HealthChecker()
+    checker.probes.clear()
+    values = {'load': 0.0}
+    checker.register("load", lambda: values['load'], degraded=1, critical=2)
+    port = await checker.serve(0)
+    try:
+        status, body = await _get(port, "/health")
+        assert status == 200
+        assert body['status'] == "ready"
+        assert body['probes']['load']['value'] == 0.0
+
+        values['load'] = 3.0
+        status, body = await _get(port, "/ready")
+        assert status == 503
+        assert body == {'status': "not_ready"}
+
+        status, _ = await _get(port, "/missing")
+        assert status == 404
+    finally:
+        await checker.stop()
+
+
+@pytest.mark.asyncio
+async def test_tcp_latency(listener):
+    """Test the asynchronous connect probe"""
+    assert await tcp_latency('127.0.0.1', listener, 1.0) >= 0
+    assert await tcp_latency('127.0.0.1', 1, 1.0) is None
+
+
+@pytest.mark.asyncio
+async def test_network_monitor_checks_local_host(listener, monkeypatch):
+    """Test that connectivity checks use the configured local hosts"""
+    monitor = NetworkMonitor()
+    changes = []
+    monitor.add_callback(changes.append)
+
+    monkeypatch.setattr(network_module, 'NETWORK_CHECK_HOSTS', [('127.0.0.1', listener)])
+    assert await monitor.check_connection()
+    assert monitor.is_online()
+
+    monkeypatch.setattr(network_module, 'NETWORK_CHECK_HOSTS', [('127.0.0.1', 1)])
+    assert not await monitor.check_connection()
+    assert changes == [True, False]
+
+
+@pytest.mark.asyncio
+async def test_server_probes():
+    """Test that the game server reports open connections"""
+    server = GameServer()
+    server.health = HealthChecker()
+    server.register_health_probes()
+    listener = await asyncio.start_server(server._handle_client, '127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        await asyncio.sleep(0.05)
+        report = await server.health.check()
+        assert report['probes']['clients']['value'] == 1
+        assert report['probes']['matchmaking_queue']['value'] == 0
+        writer.close()
+    finally:
+        listener.close()
+        await listener.wait_closed()
@@ -0,0 +1,49 @@
+"""
+Load test harness unit tests
+负载测试工具单元测试
+"""
+
+import asyncio
+
+import pytest
+from gomoku_world.network.loadtest import percentile, process_rss_mb, run_load_test
+
+
+@pytest.fixture
+def server_options():
+    """Run the matchmaking task"""
+    return {'matchmaking': True}
+
+
+def test_percentile():
+    """Test nearest-rank percentiles"""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(list(reversed(values)), 100) == 100
+    assert percentile([], 50) == 0.0
+
+
+def test_process_rss():
+    """Test that the current process reports a resident size"""
+    assert process_rss_mb() > 0
+
+
+@pytest.mark.asyncio
+async def test_small_load_run(served):
+    """Test that simulated clients play, spectate and clean up after themselves"""
+    server, port = served
+    report = await run_load_test('127.0.0.1', port, clients=6, duration=2.5,
+                                 spectator_ratio=0.34, seed=7)
+
+    assert report.connect_failures == 0
+    assert report.moves_played > 0
+    assert not report.errors
+    assert report.latencies['login']['count'] == 6
+    assert report.latencies['make_move']['p50'] <= report.latencies['make_move']['p99']
+    assert report.messages_per_second > 0
+    assert 'make_move' in report.format()
+
+    await asyncio.sleep(0.05)
+    assert not server.players
+    assert not server.games
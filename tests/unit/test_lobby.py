@@ -0,0 +1,138 @@
+"""
+Lobby index and incremental game list unit tests
+大厅索引和增量对局列表单元测试
+"""
+
+import pytest
+from gomoku_world.network.client import GameClient
+from gomoku_world.network.lobby import LobbyIndex
+
+
+@pytest.fixture
+def lobby():
+    """Provide an index with games of different popularity"""
+    index = LobbyIndex(log_size=8)
+    index.add("g1", "a", "b", rating=1500)
+    index.add("g2", "c", "d", rating=1700)
+    index.add("g3", "e", "f", rating=1600, spectator_count=3)
+    return index
+
+
+def test_lobby_order(lobby):
+    """Test that games sort by spectators, then rating"""
+    games, cursor = lobby.page()
+    assert [g['id'] for g in games] == ["g3", "g2", "g1"]
+    assert cursor is None
+
+    lobby.update("g1", spectator_count=5)
+    assert [g['id'] for g in lobby.page()[0]] == ["g1", "g3", "g2"]
+
+
+def test_cursor_pagination_is_stable(lobby):
+    """Test that pages continue after the last row even when rows move"""
+    first, cursor = lobby.page(limit=2)
+    assert [g['id'] for g in first] == ["g3", "g2"]
+
+    lobby.add("g0", "x", "y", rating=1550)
+    second, cursor = lobby.page(cursor, limit=2)
+    assert [g['id'] for g in second] == ["g0", "g1"]
+    assert cursor is None
+
+    with pytest.raises(ValueError):
+        lobby.page("garbage")
+
+
+def test_changes_since(lobby):
+    """Test incremental changes and expiry of the change log"""
+    version = lobby.version
+    assert lobby.changes_since(version) == ([], [])
+
+    lobby.update("g2", spectator_count=1)
+    lobby.remove("g1")
+    updated, removed = lobby.changes_since(version)
+    assert [g['id'] for g in updated] == ["g2"]
+    assert removed == ["g1"]
+
+    assert not lobby.update("g2", spectator_count=1)
+    for i in range(10):
+        lobby.update("g3", spectator_count=10 + i)
+    assert lobby.changes_since(version) is None
+    assert lobby.changes_since(lobby.version + 1) is None
+
+
+def test_page_changes_since(lobby):
+    """Test that changes are scoped to one page and describe its end"""
+    version = lobby.version
+    lobby.update("g1", spectator_count=1)
+    changes = lobby.page_changes_since(version, limit=2)
+    assert [g['id'] for g in changes['updated']] == ["g1"]
+    assert changes['removed'] == []
+    assert changes['count'] == 2 and changes['last'] == "1:1500:g1"
+
+    version = lobby.version
+    lobby.update("g2", spectator_count=2)
+    lobby.remove("g3")
+    changes = lobby.page_changes_since(version, "1:1500:g1", limit=2)
+    assert changes['updated'] == [] and changes['removed'] == ["g3", "g2"]
+    assert changes['count'] == 0 and changes['last'] is None
+    assert lobby.page_changes_since(lobby.version + 1, limit=2) is None
+
+
+@pytest.mark.asyncio
+async def test_client_page_stays_bounded(served):
+    """Test that a client showing one page never holds rows from other pages"""
+    server, port = served
+    for pid in "abcdef":
+        await server._handle_login({'id': pid, 'name': pid})
+    games = [server._start_game(server.players[a], server.players[b])
+             for a, b in ("ab", "cd", "ef")]
+    top = games[0]
+    server.lobby.update(top.id, spectator_count=5)
+
+    client = GameClient('127.0.0.1', port)
+    await client.connect()
+    assert (await client.sync_lobby(limit=1))['full']
+    assert list(client.lobby_games) == [top.id]
+
+    for i, game in enumerate(games[1:]):
+        server.lobby.update(game.id, spectator_count=1 + i)
+    delta = await client.sync_lobby(limit=1)
+    assert not delta['full'] and delta['updated'] == [] and delta['removed'] == []
+    assert list(client.lobby_games) == [top.id]
+
+    await server._end_game(top.id)
+    refreshed = await client.sync_lobby(limit=1)
+    assert refreshed['full'] and list(client.lobby_games) == [games[2].id]
+
+    await client.disconnect()
+
+
+@pytest.mark.asyncio
+async def test_client_sync_receives_only_changes(served, player_connection):
+    """Test that a client holding a version gets only the games that changed"""
+    server, port = served
+
+    for pid in "abcdw":
+        await server._handle_login({'id': pid, 'name': pid})
+    first = server._start_game(server.players["a"], server.players["b"])
+
+    client = GameClient('127.0.0.1', port)
+    await client.connect()
+    full = await client.sync_lobby()
+    assert full['full'] and list(client.lobby_games) == [first.id]
+
+    second = server._start_game(server.players["c"], server.players["d"])
+    await server._handle_spectate_game({'game_id': first.id}, player_connection('w'))
+    await server._end_game(second.id)
+
+    delta = await client.sync_lobby()
+    assert not delta['full']
+    assert [g['spectator_count'] for g in delta['updated']] == [1]
+    assert delta['removed'] == [] and second.id not in client.lobby_games
+    assert client.lobby_games[first.id]['spectator_count'] == 1
+
+    assert (await client.sync_lobby())['updated'] == []
+    page = await client._send_message('list_games', {'cursor': 42})
+    assert page['message'] == 'Invalid cursor'
+
+    await client.disconnect()
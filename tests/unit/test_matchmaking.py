@@ -0,0 +1,71 @@
+"""
+Matchmaking unit tests
+匹配系统单元测试
+"""
+
+import pytest
+from gomoku_world.network.matchmaking import MatchmakingQueue
+from gomoku_world.network.server import GameServer, Player
+
+
+@pytest.fixture
+def queue():
+    """Create a queue with a 100 point window growing 10 points per second"""
+    return MatchmakingQueue(bucket_size=100, base_window=100,
+                            window_growth=10, max_window=500)
+
+
+def test_add_and_remove(queue):
+    """Test queue membership and empty bucket cleanup"""
+    assert queue.add("a", 1500, now=0)
+    assert not queue.add("a", 1500, now=0)
+    queue.add("b", 1720, now=0)
+
+    assert len(queue) == 2 and "a" in queue
+    assert queue.remove("a").rating == 1500
+    assert queue.remove("a") is None
+    assert list(queue.buckets) == [17]
+    assert queue._bucket_keys == [17]
+
+
+def test_pairs_closest_rating(queue):
+    """Test that the closest rated opponent inside the window is chosen"""
+    queue.add("a", 1500, now=0)
+    queue.add("far", 1590, now=0)
+    queue.add("near", 1520, now=0)
+
+    assert [(x.player_id, y.player_id) for x, y in queue.match(now=0)] == [("a", "near")]
+    assert len(queue) == 1
+
+
+def test_window_widens_with_wait(queue):
+    """Test that distant ratings are paired only after waiting"""
+    queue.add("a", 1500, now=0)
+    queue.add("b", 1800, now=0)
+
+    assert queue.match(now=10) == []
+    pairs = queue.match(now=20)
+    assert len(pairs) == 1
+    assert queue.window(pairs[0][0], now=1000) == 500
+
+
+def test_server_matches_and_notifies():
+    """Test that a matchmaking pass starts games with unique ids"""
+    server = GameServer()
+    for pid, rating in (("a", 1500), ("b", 1510), ("c", 1500), ("d", 1505)):
+        server.players[pid] = Player(id=pid, name=pid.upper(), rating=rating)
+        server.matchmaker.add(pid, rating, now=0)
+
+    assert server._run_matchmaking(now=0) == 2
+    first_ids = set(server.games)
+    assert all(game.status == "playing" for game in server.games.values())
+
+    game_id = server.players["a"].game_id
+    del server.games[game_id]
+    for pid in ("a", "b"):
+        server.players[pid].game_id = None
+        server.matchmaker.add(pid, 1500, now=0)
+    server._run_matchmaking(now=0)
+
+    assert server.players["a"].game_id not in first_ids
+    assert len(server.games) == 2
@@ -0,0 +1,138 @@
+"""
+Metrics collector unit tests
+指标收集器单元测试
+"""
+
+import threading
+import urllib.request
+
+import pytest
+from gomoku_world.core.ai.engine import AI
+from gomoku_world.core.board import Board
+from gomoku_world.utils.monitoring import (
+    MetricsCollector, CommandStats, metrics_collector, measure_save_io
+)
+
+
+@pytest.fixture
+def collector():
+    """Create an empty collector and stop its endpoint afterwards"""
+    collector = MetricsCollector()
+    yield collector
+    collector.stop()
+
+
+def test_counter_sums_all_threads(collector):
+    """Test that per-thread counter cells are summed on read"""
+    counter = collector.counter('test_total', "Test counter")
+
+    def work():
+        for _ in range(1000):
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    counter.inc(5)
+
+    assert counter.value == 4005
+
+
+def test_registration_is_idempotent(collector):
+    """Test that a name returns the same metric and rejects another type"""
+    counter = collector.counter('test_total', "Test counter", ('kind',))
+    assert collector.counter('test_total', "Test counter", ('kind',)) is counter
+    with pytest.raises(ValueError):
+        collector.gauge('test_total')
+    with pytest.raises(ValueError):
+        counter.labels('a', 'b')
+
+
+def test_histogram_buckets(collector):
+    """Test that observations land in fixed cumulative buckets"""
+    histogram = collector.histogram('test_seconds', "Test histogram", buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 2.0):
+        histogram.observe(value)
+
+    assert histogram.bucket_counts() == [(0.1, 2), (1.0, 3), (float('inf'), 4)]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(2.65)
+
+
+def test_exposition_format(collector):
+    """Test the Prometheus text rendering"""
+    collector.counter('requests_total', "Requests", ('cmd',)).labels('login').inc(3)
+    collector.gauge('players', "Online players").set(7)
+    collector.histogram('latency_seconds', "Latency", buckets=(0.5,)).observe(0.25)
+
+    text = collector.render()
+
+    assert '# TYPE requests_total counter\nrequests_total{cmd="login"} 3\n' in text
+    assert '# TYPE players gauge\nplayers 7\n' in text
+    assert 'latency_seconds_bucket{le="0.5"} 1\n' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 1\n' in text
+    assert 'latency_seconds_sum 0.25\n' in text
+    assert 'latency_seconds_count 1\n' in text
+
+
+def test_label_values_are_escaped(collector):
+    """Test that quotes and backslashes in label values are escaped"""
+    collector.counter('names_total', "Names", ('name',)).labels('a"b\\c').inc()
+    assert 'names_total{name="a\\"b\\\\c"} 1' in collector.render()
+
+
+def test_write_and_serve(collector, tmp_path):
+    """Test the file dump and the HTTP endpoint"""
+    collector.counter('hits_total', "Hits").inc()
+
+    path = tmp_path / "metrics.prom"
+    collector.write(path)
+    assert 'hits_total 1' in path.read_text(encoding="utf-8")
+
+    port = collector.serve(0)
+    with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+        assert response.status == 200
+        assert 'hits_total 1' in response.read().decode('utf-8')
+
+
+def test_command_stats_feed_latency_histogram(collector):
+    """Test that command accounting observes wall times per command"""
+    histogram = collector.histogram('command_seconds', "Commands", ('command',))
+    stats = CommandStats(latency=histogram)
+    with stats.measure('login'):
+        pass
+    stats.record('login', 0.0, 0.2)
+
+    assert histogram.labels('login').count == 2
+    assert stats.snapshot()['login']['calls'] == 2
+
+
+def test_ai_move_is_recorded():
+    """Test that an AI move updates the search metrics"""
+    moves = metrics_collector.get('gomoku_ai_moves_total').labels('minmax')
+    nodes = metrics_collector.get('gomoku_ai_nodes_total').labels('minmax')
+    before_moves, before_nodes = moves.value, nodes.value
+
+    board = Board()
+    board.place_piece(7, 7, 1)
+    AI("easy").get_move(board, 2)
+
+    assert moves.value == before_moves + 1
+    assert nodes.value > before_nodes
+    assert metrics_collector.get('gomoku_ai_search_depth').labels('minmax').value == 2
+
+
+def test_save_io_is_recorded(tmp_path):
+    """Test that save file operations are timed and sized"""
+    path = tmp_path / "save.json"
+    bytes_total = metrics_collector.get('gomoku_save_io_bytes_total').labels('save')
+    seconds = metrics_collector.get('gomoku_save_io_seconds').labels('save')
+    before_bytes, before_count = bytes_total.value, seconds.count
+
+    with measure_save_io('save', path), open(path, 'w', encoding='utf-8') as f:
+        f.write('{"id": "x"}')
+
+    assert bytes_total.value == before_bytes + 11
+    assert seconds.count == before_count + 1
@@ -0,0 +1,99 @@
+"""
+Asyncio network transport unit tests
+异步网络传输单元测试
+"""
+
+import asyncio
+import threading
+
+import pytest
+from gomoku_world.config import DEFAULT_HOST, DEFAULT_PORT
+from gomoku_world.network.network import NetworkManager
+from gomoku_world.network.protocol import encode_frame, decode_frame
+from gomoku_world.network.server import GameServer
+
+
+@pytest.fixture
+async def manager():
+    """Provide the manager connected to a server on an ephemeral port"""
+    server = GameServer()
+    listener = await asyncio.start_server(server._handle_client, '127.0.0.1', 0)
+    manager = NetworkManager()
+    assert await manager.connect('127.0.0.1', listener.sockets[0].getsockname()[1])
+    yield manager
+    await manager.disconnect()
+    manager.host, manager.port = DEFAULT_HOST, DEFAULT_PORT
+    listener.close()
+    await listener.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_request_response_without_threads(manager):
+    """Test framed request/response and that no threads are spawned"""
+    threads = threading.active_count()
+
+    pong, unknown = await asyncio.gather(
+        manager.send_message({'cmd': 'ping', 'data': {}}),
+        manager.send_message({'cmd': 'nope', 'data': {}}),
+    )
+
+    assert pong == {'status': 'ok', 'data': {'pong': True}}
+    assert unknown['message'] == 'Unknown command'
+    assert threading.active_count() == threads
+
+
+@pytest.mark.asyncio
+async def test_small_messages_are_coalesced(manager):
+    """Test that messages queued in one tick leave in one write"""
+    writes = []
+    writer = manager.connection.writer
+    original = writer.write
+    writer.write = lambda data: writes.append(data) or original(data)
+
+    for i in range(20):
+        manager.post_message({'cmd': 'ping', 'data': {'n': i}})
+    await asyncio.sleep(0.05)
+
+    assert len(writes) == 1
+    assert writes[0].count(b"\n") == 20
+
+
+@pytest.mark.asyncio
+async def test_large_messages_survive_stream_splits():
+    """Test that frames larger than one recv are reassembled"""
+    payload = 'x' * 50000
+
+    async def echo(reader, writer):
+        message = decode_frame(await reader.readline())
+        writer.write(encode_frame({'rid': message['rid'], 'echo': message['data']}))
+        await writer.drain()
+
+    listener = await asyncio.start_server(echo, '127.0.0.1', 0)
+    manager = NetworkManager()
+    await manager.connect('127.0.0.1', listener.sockets[0].getsockname()[1])
+
+    response = await manager.send_message({'cmd': 'echo', 'data': payload})
+    assert response['echo'] == payload
+
+    await manager.disconnect()
+    manager.host, manager.port = DEFAULT_HOST, DEFAULT_PORT
+    listener.close()
+    await listener.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_events_and_reconnect(manager, monkeypatch):
+    """Test event dispatch and automatic reconnection after a drop"""
+    import gomoku_world.network.network as network_module
+    monkeypatch.setattr(network_module, 'NETWORK_RETRY_INTERVAL', 0.01)
+
+    events = []
+    manager.on('reconnected', events.append)
+    manager._connection_lost()
+    assert not manager.is_connected()
+
+    await asyncio.sleep(0.2)
+    assert manager.is_connected()
+    assert events == [{}]
+    manager.off('reconnected', events.append)
+    assert manager.callbacks['reconnected'] == []
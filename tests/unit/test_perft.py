@@ -0,0 +1,45 @@
+"""
+Perft benchmark unit tests
+Perft基准测试单元测试
+"""
+
+import pytest
+from gomoku_world.benchmark import (
+    BACKENDS, BenchmarkPosition, PerftResult, cross_check, perft, run_perft
+)
+
+
+@pytest.mark.parametrize("name", list(BACKENDS))
+def test_empty_small_board_counts(name):
+    """Test the closed-form counts of an empty 5x5 board"""
+    backend = BACKENDS[name].from_position(BenchmarkPosition("empty", "", size=5))
+    assert [perft(backend, 1, depth).nodes for depth in (1, 2, 3)] == [25, 600, 13800]
+
+
+@pytest.mark.parametrize("copy", [False, True])
+def test_win_cutoff_and_backends_agree(copy):
+    """Test that winning moves end their line on every backend"""
+    results = run_perft(["open_four_row"], depth=2, copy=copy)
+    # 217 empty cells, 2 of them win; every other move has 216 replies
+    assert {(result.nodes, result.wins) for result in results} == {(2 + 215 * 216, 2)}
+    assert cross_check(results) == []
+    assert all(result.moves_per_second > 0 for result in results)
+
+
+def test_position_is_restored():
+    """Test that make/unmake leaves the starting position intact"""
+    backend = BACKENDS["compact"].from_position(BenchmarkPosition("small", "C3 B2", size=5))
+    before = bytes(backend.board.cells)
+    perft(backend, 1, 2)
+    assert bytes(backend.board.cells) == before
+
+
+def test_cross_check_reports_mismatch():
+    """Test that differing counts are reported per position"""
+    results = [
+        PerftResult("board", "p", 2, 100, 1, 120, 0.1),
+        PerftResult("compact", "p", 2, 101, 1, 120, 0.1),
+    ]
+    mismatches = cross_check(results)
+    assert len(mismatches) == 1
+    assert "board=100/1/120" in mismatches[0]
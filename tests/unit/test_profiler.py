@@ -0,0 +1,129 @@
+"""
+Sampling profiler unit tests
+采样分析器单元测试
+"""
+
+import os
+import signal
+import threading
+import time
+
+import pytest
+from gomoku_world.core.ai.strategies import MinMaxStrategy
+from gomoku_world.core.board import Board
+from gomoku_world.utils.monitoring import Profiler, profiler as global_profiler
+
+
+@pytest.fixture
+def profiler(tmp_path):
+    """Create a profiler writing into a temporary directory"""
+    profiler = Profiler(interval=0.001, output_dir=tmp_path)
+    yield profiler
+    profiler.stop()
+
+
+def _busy_wait(stop: threading.Event):
+    while not stop.is_set():
+        sum(range(100))
+
+
+def test_regions_only_count_while_enabled(profiler):
+    """Test that regions are free when off and timed when on"""
+    with profiler.region("evaluation"):
+        pass
+    assert profiler.regions() == {}
+
+    profiler.start()
+    for _ in range(3):
+        with profiler.region("evaluation"):
+            time.sleep(0.001)
+    stats = profiler.regions()["evaluation"]
+    assert stats['calls'] == 3
+    assert stats['total'] >= 0.003
+
+
+def test_sampler_captures_running_threads(profiler):
+    """Test that the sampler thread records the stacks of other threads"""
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_wait, args=(stop,), name="busy")
+    worker.start()
+    profiler.start()
+    time.sleep(0.1)
+    profiler.stop()
+    stop.set()
+    worker.join()
+
+    assert profiler.samples > 0
+    assert not profiler.enabled
+    assert any(line.startswith("busy;") and "_busy_wait (test_profiler.py:" in line
+               for line in profiler.collapsed().splitlines())
+
+
+def test_dump_writes_collapsed_stacks(profiler, tmp_path):
+    """Test the collapsed-stack file format"""
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_wait, args=(stop,))
+    worker.start()
+    profiler.sample()
+    profiler.sample()
+    stop.set()
+    worker.join()
+    path = profiler.dump()
+
+    assert path.parent == tmp_path
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines
+    for line in lines:
+        stack, count = line.rsplit(" ", 1)
+        assert int(count) >= 1
+        assert ";" in stack
+
+
+def test_toggle_and_reset(profiler):
+    """Test switching the profiler and discarding its data"""
+    assert profiler.toggle()
+    with profiler.region("tt_probe"):
+        pass
+    assert not profiler.toggle()
+    assert "tt_probe" in profiler.regions()
+
+    profiler.reset()
+    assert profiler.regions() == {}
+    assert profiler.samples == 0
+
+
+@pytest.mark.skipif(not hasattr(signal, "SIGUSR2"), reason="needs SIGUSR2")
+def test_signal_toggles_and_dumps(profiler, tmp_path):
+    """Test that the signal starts the profiler and a second one dumps it"""
+    previous = signal.getsignal(signal.SIGUSR2)
+    try:
+        assert profiler.install_signal_handler("SIGUSR2")
+        os.kill(os.getpid(), signal.SIGUSR2)
+        deadline = time.monotonic() + 5
+        while not profiler.enabled and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert profiler.enabled
+
+        os.kill(os.getpid(), signal.SIGUSR2)
+        while profiler.enabled or not list(tmp_path.glob("*.folded")):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+
+
+def test_minmax_search_regions():
+    """Test that the search strategies report their regions"""
+    board = Board()
+    board.place_piece(7, 7, 1)
+    global_profiler.reset()
+    global_profiler.start()
+    try:
+        MinMaxStrategy().get_move(board, 2, 2)
+    finally:
+        global_profiler.stop()
+
+    regions = global_profiler.regions()
+    global_profiler.reset()
+    assert regions["evaluation"]['calls'] > 0
+    assert regions["move_generation"]['calls'] > 0
@@ -0,0 +1,130 @@
+"""
+Proof-number search unit tests
+证明数搜索单元测试
+"""
+
+import gc
+import weakref
+
+import pytest
+from gomoku_world.benchmark import BenchmarkPosition, generate_puzzles, load_puzzles, save_puzzles
+from gomoku_world.benchmark.corpus import get_positions
+from gomoku_world.config import AI_TIME_CHECK_INTERVAL
+from gomoku_world.core.ai import AI, ProofNumberStrategy, SearchDeadline
+from gomoku_world.core.rules import Rules
+from gomoku_world.utils.monitoring import health_checker
+
+# Black wins with a seven-move threat sequence starting at F8 / 黑方从F8开始以七步威胁序列获胜
+VCF = BenchmarkPosition("vcf", "I10 I8 I6 H8 J7 J8 K8 I9 J9 I7 J10 H6 K9 G8", "F8", "forced_win")
+
+
+@pytest.fixture
+def quiet_board():
+    """Middle game without a forced win / 没有强制胜利的中局"""
+    return get_positions(["midgame_cluster"])[0].board()
+
+
+def test_proves_threat_sequence():
+    """Test that the winning line is found and ends in five"""
+    board = VCF.board()
+    strategy = ProofNumberStrategy()
+    assert strategy.prove(board, 1) is True
+    assert strategy.get_move(board, 1) == (7, 5)
+    assert len(strategy.proof) == 7
+    assert strategy.info.strategy == "pns"
+    assert strategy.info.pv == strategy.proof
+
+    for i, (row, col) in enumerate(strategy.proof):
+        assert board.place_piece(row, col, 1 if i % 2 == 0 else 2)
+    assert Rules.check_win(board, *strategy.proof[-1])
+
+
+def test_disproves_quiet_position(quiet_board):
+    """Test that positions without a winning threat sequence are disproved"""
+    strategy = ProofNumberStrategy(threes=False)
+    assert strategy.prove(quiet_board, 1) is False
+    assert strategy.get_move(quiet_board, 1) is None
+    assert strategy.proof == []
+    # The defender to move refutes a lone four / 防守方行棋可化解单个冲四
+    board = get_positions(["block_diagonal_four"])[0].board()
+    assert strategy.prove(board, 1, to_move=2) is False
+
+
+def test_budget_and_progress(quiet_board):
+    """Test that the node budget stops the search and progress is streamed"""
+    updates = []
+    strategy = ProofNumberStrategy(node_budget=3000)
+    assert strategy.prove(quiet_board, 1, on_info=lambda info: updates.append(info.nodes)) is None
+    assert strategy.nodes <= 3000 + AI_TIME_CHECK_INTERVAL
+    assert len(updates) >= 3
+    assert updates == sorted(updates)
+
+    stopped = SearchDeadline()
+    stopped.stop()
+    assert ProofNumberStrategy().prove(quiet_board, 1, deadline=stopped) is None
+
+
+def test_table_is_bounded(quiet_board):
+    """Test that the table is trimmed to its size"""
+    strategy = ProofNumberStrategy(node_budget=5000, table_size=200)
+    strategy.prove(quiet_board, 1)
+    assert 0 < len(strategy.table) <= 200
+    assert 0 < strategy.fill_ratio() <= 1
+
+
+def test_engine_reports_table_fill(quiet_board):
+    """Test that one probe reports the fullest table of the live engines"""
+    gc.collect()  # Drop engines left over from other tests / 清除其他测试遗留的引擎
+    probe = health_checker.probes["tt_fill"]
+    full, empty = AI("hard"), AI("hard")
+    assert health_checker.probes["tt_fill"] is probe
+    full.proof_strategy.table_size = 200
+    full.proof_strategy.prove(quiet_board, 1)
+    assert probe.check() == full.proof_strategy.fill_ratio() > 0
+
+    # The probe does not keep engines alive / 探针不会让引擎保持存活
+    engine = weakref.ref(full)
+    del full
+    gc.collect()
+    assert engine() is None
+    assert probe.check() == empty.proof_strategy.fill_ratio()
+
+
+def test_winning_moves():
+    """Test that every winning first move is listed"""
+    position = get_positions(["open_three_to_open_four"])[0]
+    moves = ProofNumberStrategy().winning_moves(position.board(), position.player)
+    assert set(moves) == set(position.solution_moves())
+
+
+def test_engine_plays_proven_win():
+    """Test that the hard engine plays the proof and the others search"""
+    board = VCF.board()
+    move, info = AI("hard").get_move(board, 1, return_info=True)
+    assert move == (7, 5)
+    assert info.strategy == "pns"
+
+    _, info = AI("medium").get_move(board, 1, return_info=True)
+    assert info.strategy == "minmax"
+
+
+def test_puzzle_generator(tmp_path):
+    """Test that generated puzzles are proven wins and round-trip through JSON"""
+    found = []
+    puzzles = generate_puzzles(2, seed=1, min_depth=3, node_budget=2000,
+                               on_puzzle=lambda puzzle, depth: found.append(depth))
+    assert len(puzzles) == 2
+    assert all(depth >= 3 for depth in found)
+
+    strategy = ProofNumberStrategy()
+    for puzzle in puzzles:
+        assert puzzle.kind == "forced_win" and puzzle.is_puzzle
+        board = puzzle.board()
+        for row, col in puzzle.solution_moves():
+            board.place_piece(row, col, puzzle.player)
+            assert strategy.prove(board, puzzle.player, to_move=3 - puzzle.player)
+            board.clear_cell(row, col)
+
+    path = tmp_path / "puzzles.json"
+    save_puzzles(puzzles, path)
+    assert load_puzzles(path) == puzzles
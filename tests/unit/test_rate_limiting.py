@@ -0,0 +1,75 @@
+"""
+Request dispatch, rate limiting and accounting unit tests
+请求分发、限流和统计单元测试
+"""
+
+import asyncio
+
+import pytest
+from gomoku_world.network.protocol import encode_frame, decode_frame
+from gomoku_world.network.ratelimit import RequestLimiter
+from gomoku_world.utils.monitoring import command_stats
+
+
+def test_bucket_burst_and_refill():
+    """Test that a command bucket allows its burst and then refills"""
+    limiter = RequestLimiter(None, {'chat': (2.0, 3)})
+    assert [limiter.allow('chat', 0.0) for _ in range(4)] == [True, True, True, False]
+    assert limiter.allow('chat', 0.5)
+    assert not limiter.allow('chat', 0.5)
+    assert limiter.allow('other', 0.5)
+    assert limiter.rejected == 2
+
+
+def test_rejection_does_not_drain_other_bucket():
+    """Test that a request refused by one bucket leaves the other untouched"""
+    limiter = RequestLimiter((1.0, 2), {'chat': (1.0, 1)})
+    assert limiter.allow('chat', 0.0)
+    assert not limiter.allow('chat', 0.0)
+    assert limiter.allow('ping', 0.0)
+    assert not limiter.allow('ping', 0.0)
+
+
+@pytest.mark.asyncio
+async def test_flooding_client_is_throttled(served):
+    """Test that a flood is refused, counted and does not stop other commands"""
+    server, port = served
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    writer.write(b"".join(encode_frame({'cmd': 'list_games', 'data': {}}) for _ in range(30)))
+    writer.write(encode_frame({'cmd': 'ping', 'data': {}}))
+    await writer.drain()
+
+    responses = [decode_frame(await reader.readline()) for _ in range(31)]
+    limited = [r for r in responses if r.get('message') == 'Rate limit exceeded']
+
+    assert len(limited) == 20
+    assert responses[-1] == {'status': 'ok', 'data': {'pong': True}}
+    stats = command_stats.snapshot()
+    assert stats['list_games']['calls'] == 10
+    assert stats['list_games']['rejected'] == 20
+    assert stats['ping']['cpu_time'] >= 0
+    writer.close()
+
+
+@pytest.mark.asyncio
+async def test_game_list_cached_until_games_change(served, player_connection):
+    """Test that the game list is reused and rebuilt after a change"""
+    server, _ = served
+    for pid in ("a", "b", "w"):
+        await server._handle_login({'id': pid, 'name': pid})
+
+    first = await server._handle_list_games({})
+    assert await server._handle_list_games({}) is first
+    assert first['data']['games'] == []
+
+    game = server._start_game(server.players["a"], server.players["b"])
+    started = await server._handle_list_games({})
+    assert started is not first
+    assert [g['id'] for g in started['data']['games']] == [game.id]
+
+    await server._handle_spectate_game({'game_id': game.id}, player_connection('w'))
+    watched = await server._handle_list_games({})
+    assert watched['data']['games'][0]['spectator_count'] == 1
+
+    await server._end_game(game.id)
+    assert (await server._handle_list_games({}))['data']['games'] == []
@@ -0,0 +1,100 @@
+"""
+Search statistics unit tests
+搜索统计单元测试
+"""
+
+import json
+
+import pytest
+from gomoku_world.config import AI_INFO_INTERVAL
+from gomoku_world.core.ai import AI, MCTSStrategy, SearchInfo
+from gomoku_world.core.ai.strategy import AIStrategy
+from gomoku_world.core.board import Board
+from gomoku_world.utils.monitoring import metrics_collector
+
+
+@pytest.fixture
+def board():
+    """Create a small board with one stone"""
+    board = Board(size=9)
+    board.place_piece(4, 4, 1)
+    return board
+
+
+def test_derived_values():
+    """Test nps, hit rate and serialization"""
+    info = SearchInfo("minmax", nodes=500, depth=2, seldepth=2, time=0.5,
+                      tt_probes=4, tt_hits=1, score=1.5, pv=[(3, 4), (5, 5)])
+    assert info.move == (3, 4)
+    assert info.nps == 1000
+    assert info.tt_hit_rate == 0.25
+    assert SearchInfo("mcts").nps == 0.0
+    assert SearchInfo("mcts").tt_hit_rate == 0.0
+
+    data = json.loads(json.dumps(info.to_dict()))
+    assert data['pv'] == [[3, 4], [5, 5]]
+    assert "depth 2/2" in info.summary()
+    assert "pv 3,4 5,5" in info.summary()
+
+
+def test_minmax_returns_and_streams_info(board):
+    """Test that the engine returns the statistics and streams updates"""
+    streamed = []
+    ai = AI("easy")
+    move, info = ai.get_move(board, 2, return_info=True, on_info=streamed.append)
+
+    assert info is ai.last_info
+    assert info.strategy == "minmax"
+    assert info.move == move
+    assert info.depth == info.seldepth == 2
+    assert len(info.pv) == 2
+    assert info.nodes > 0 and info.cutoffs > 0
+    assert info.score is not None and info.time > 0
+    assert streamed and streamed[-1] is info
+    for row, col in info.pv:
+        assert board.board[row][col] == 0
+
+
+def test_plain_move_without_info(board):
+    """Test that callers not asking for statistics still get a coordinate"""
+    move = AI("easy").get_move(board, 2)
+    assert len(move) == 2
+
+
+def test_mcts_streams_at_interval(board):
+    """Test periodic updates from the MCTS strategy"""
+    strategy = MCTSStrategy(simulation_limit=AI_INFO_INTERVAL * 2)
+    streamed = []
+    move = strategy.get_move(board, 2, on_info=lambda i: streamed.append(i.nodes))
+    info = strategy.info
+
+    assert streamed == [AI_INFO_INTERVAL, AI_INFO_INTERVAL * 2, AI_INFO_INTERVAL * 2]
+    assert info.strategy == "mcts"
+    assert info.move == move
+    assert info.depth == len(info.pv) >= 1
+    assert info.seldepth >= 1
+
+
+def test_statistics_feed_metrics(board):
+    """Test that a move updates the selective depth and cutoff metrics"""
+    cutoffs = metrics_collector.get('gomoku_ai_cutoffs_total').labels('minmax')
+    before = cutoffs.value
+
+    _, info = AI("easy").get_move(board, 2, return_info=True)
+
+    assert cutoffs.value == before + info.cutoffs
+    assert metrics_collector.get('gomoku_ai_seldepth').labels('minmax').value == info.seldepth
+
+
+def test_move_cache_reports_hit_rate(board):
+    """Test that the priority strategy reports its move cache hits"""
+    strategy = AIStrategy("easy")
+    gauge = metrics_collector.get('gomoku_ai_tt_hit_rate').labels('priority')
+
+    move = strategy.get_move(board, 2)
+    assert strategy.info.tt_probes == 1 and strategy.info.tt_hits == 0
+    assert gauge.value == 0.0
+
+    assert strategy.get_move(board, 2) == move
+    assert strategy.info.tt_hit_rate == 1.0
+    assert gauge.value == 1.0
@@ -0,0 +1,141 @@
+"""
+Server move validation unit tests
+服务器着法验证单元测试
+"""
+
+import pytest
+from gomoku_world.core import CompactBoard
+from gomoku_world.network.server import GameServer, Game, Player, NOT_AUTHORIZED_RESPONSE
+from gomoku_world.core.codec import PackedMoves
+
+
+@pytest.fixture
+def server(player_connection):
+    """Create a server with one game in progress between a and b"""
+    server = GameServer()
+    for pid in ("a", "b", "c"):
+        server.players[pid] = Player(id=pid, name=pid.upper())
+    server.games["g1"] = Game(id="g1", black_player="a", white_player="b",
+                              moves=PackedMoves(15), status="playing")
+    server.players["a"].game_id = server.players["b"].game_id = "g1"
+    server.test_connections = {pid: player_connection(pid) for pid in server.players}
+    return server
+
+
+async def move(server, player_id, x, y, claimed_id=None, **extra):
+    """Send a make_move command on a player's connection"""
+    return await server._process_message({
+        'cmd': 'make_move',
+        'data': {'id': claimed_id or player_id, 'game_id': 'g1', 'move': dict(x=x, y=y, **extra)}
+    }, server.test_connections[player_id])
+
+
+def test_compact_board_check_win():
+    """Test win detection in all four directions and board bookkeeping"""
+    lines = (
+        [(3, c) for c in range(5)],
+        [(r, 3) for r in range(5)],
+        [(i, i) for i in range(5)],
+        [(i, 6 - i) for i in range(5)],
+    )
+    for line in lines:
+        board = CompactBoard(15)
+        for row, col in line[:-1]:
+            board.place_piece(row, col, 1)
+            assert not board.check_win(row, col)
+        board.place_piece(*line[-1], 1)
+        assert board.check_win(*line[-1])
+
+    board = CompactBoard(5)
+    assert board.place_piece(0, 0, 2)
+    assert not board.place_piece(0, 0, 1)
+    assert board.move_count == 1
+    assert len(board.get_empty_cells()) == 24
+    with pytest.raises(ValueError):
+        board.place_piece(5, 0, 1)
+
+
+@pytest.mark.asyncio
+async def test_rejects_illegal_moves(server):
+    """Test seat, turn, occupancy and bounds checks"""
+    assert (await move(server, "c", 7, 7))['message'] == 'Player not in this game'
+    assert (await move(server, "b", 7, 7))['message'] == 'Not your turn'
+    assert (await move(server, "a", 7, 7))['status'] == 'ok'
+    assert (await move(server, "b", 7, 7))['message'] == 'Position already occupied'
+    assert (await move(server, "b", 15, 0))['status'] == 'error'
+    assert len(server.games["g1"].moves) == 1
+
+
+@pytest.mark.asyncio
+async def test_rejects_malformed_payloads(server):
+    """Test that booleans and other non-moves never reach the board"""
+    game = server.games["g1"]
+    for payload in (True, False, "7,7", [7, 7], {'x': True, 'y': 1}, {'row': 7}):
+        response = await server._process_message({
+            'cmd': 'make_move', 'data': {'id': 'a', 'game_id': 'g1', 'move': payload}
+        }, server.test_connections["a"])
+        assert response['status'] == 'error'
+    assert game.board.get_piece(0, 1) == 0
+    assert len(game.moves) == 0 and game.board.move_count == 0
+
+    response = await server._process_message({
+        'cmd': 'make_move', 'data': {'id': 'a', 'game_id': 'g1', 'move': 1}
+    }, server.test_connections["a"])
+    assert response['data']['move'] == {'x': 0, 'y': 1}
+
+
+@pytest.mark.asyncio
+async def test_bad_move_time_changes_nothing(server):
+    """Test that an invalid time is rejected before the board or log change"""
+    game = server.games["g1"]
+    assert (await move(server, "a", 7, 7, time_ms='x'))['status'] == 'error'
+    assert game.board.get_piece(7, 7) == 0
+    assert len(game.moves) == 0
+
+    assert (await move(server, "a", 7, 7, time_ms=250))['status'] == 'ok'
+    assert (await move(server, "b", 7, 8))['status'] == 'ok'
+    assert PackedMoves.from_base64(game.moves.to_base64()).timings() == [250, 0]
+
+
+@pytest.mark.asyncio
+async def test_identity_comes_from_connection(server):
+    """Test that a player cannot move for the opponent by naming their id"""
+    assert (await move(server, "b", 7, 7, claimed_id="a")) == NOT_AUTHORIZED_RESPONSE
+    assert (await server._process_message({
+        'cmd': 'make_move',
+        'data': {'id': 'a', 'game_id': 'g1', 'move': {'x': 7, 'y': 7}}
+    }))['status'] == 'error'
+    assert len(server.games["g1"].moves) == 0
+
+    for cmd in ('leave_spectate', 'spectator_chat', 'spectate_game', 'logout'):
+        response = await server._process_message(
+            {'cmd': cmd, 'data': {'id': 'a', 'game_id': 'g1', 'message': 'hi'}},
+            server.test_connections["c"])
+        assert response == NOT_AUTHORIZED_RESPONSE
+    assert "a" in server.players
+
+
+@pytest.mark.asyncio
+async def test_winning_move_ends_game(server):
+    """Test that five in a row finishes the game with the right winner"""
+    for i in range(4):
+        await move(server, "a", 0, i)
+        await move(server, "b", 1, i)
+
+    response = await move(server, "a", 0, 4)
+    assert response['data']['game_over'] is True
+    assert response['data']['winner'] == 1
+    assert "g1" not in server.games
+    assert server.players["a"].game_id is None
+
+
+def test_game_replays_existing_moves():
+    """Test that a game restored from a move log rebuilds its board"""
+    moves = PackedMoves(15)
+    moves.append(7, 7)
+    moves.append(7, 8)
+    game = Game(id="g2", black_player="a", white_player="b", moves=moves)
+
+    assert game.board.get_piece(7, 7) == 1
+    assert game.board.get_piece(7, 8) == 2
+    assert game.current_player == 1
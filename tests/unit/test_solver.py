@@ -0,0 +1,121 @@
+"""
+Endgame solver unit tests
+残局求解器单元测试
+"""
+
+import pytest
+from gomoku_world.config import AI_TIME_CHECK_INTERVAL
+from gomoku_world.core.ai import AI, EndgameSolver, SearchDeadline, SolverCache
+from gomoku_world.core.ai.solver import DRAW, LOSS, WIN
+from gomoku_world.core.board import Board
+
+
+def make_board(size, black, white):
+    """Board with black and white stones at the given cells"""
+    board = Board(size)
+    for row, col in black:
+        board.place_piece(row, col, 1)
+    for row, col in white:
+        board.place_piece(row, col, 2)
+    return board
+
+
+@pytest.fixture
+def small_board():
+    """Drawn 5x5 position / 5x5和棋局面"""
+    return make_board(5, [(2, 2), (0, 1), (4, 0)], [(1, 1), (3, 3), (2, 4)])
+
+
+@pytest.fixture
+def solver():
+    """Solver with an in-memory cache"""
+    return EndgameSolver(cache=SolverCache(None))
+
+
+def test_immediate_win(solver):
+    """Test that a four is completed"""
+    board = make_board(15, [(7, 3), (7, 4), (7, 5), (7, 6)], [(0, 0), (0, 1), (0, 2)])
+    solution = solver.solve(board, 1)
+    assert solution.result == WIN
+    assert solution.move in ((7, 2), (7, 7))
+
+
+def test_double_threat_is_lost(solver):
+    """Test that two open ends of a four lose for the defender"""
+    board = make_board(15, [(7, 3), (7, 4), (7, 5), (7, 6)], [(0, 0), (0, 1), (0, 2)])
+    assert solver.solve(board, 2).result == LOSS
+
+
+def test_small_board_draw(solver, small_board):
+    """Test that a 5x5 position is solved as a draw"""
+    solution = solver.solve(small_board, 1)
+    assert solution.result == DRAW
+    assert small_board.is_valid_move(*solution.move)
+    assert len(small_board.get_empty_cells()) == 19
+    assert solver.info.depth == 19
+
+
+def test_small_board_win_with_short_lines():
+    """Test a forced win when four in a row suffice"""
+    solver = EndgameSolver(win_length=4, cache=SolverCache(None))
+    # An open two in the middle row wins with four to connect / 四子即胜时中间一行的活二必胜
+    board = make_board(6, [(2, 2), (2, 3)], [(0, 0)])
+    solution = solver.solve(board, 1)
+    assert solution.result == WIN
+    board.place_piece(*solution.move, 1)
+    assert solver.solve(board, 2).result == LOSS
+
+
+def test_endgame_without_live_lines(solver):
+    """Test that a blocked near-full board is a draw"""
+    board = Board(15)
+    for row in range(15):
+        for col in range(15):
+            if row * 15 + col >= 220:
+                break
+            # Runs of at most two stones in every direction / 各方向最多两子相连
+            board.place_piece(row, col, 1 + ((col + 2 * row) % 4 < 2))
+    assert solver.applicable(board)
+    assert not EndgameSolver(cache=SolverCache(None)).applicable(make_board(15, [(7, 7)], []))
+    solution = solver.solve(board, 1)
+    assert solution.result == DRAW
+    assert solver.info.nodes <= 2
+
+
+def test_budget_gives_up():
+    """Test that an exhausted budget returns None"""
+    solver = EndgameSolver(node_budget=500, cache=SolverCache(None))
+    assert solver.solve(Board(6), 1) is None
+    assert solver.info.nodes <= 500 + AI_TIME_CHECK_INTERVAL
+    stopped = SearchDeadline()
+    stopped.stop()
+    assert EndgameSolver(cache=SolverCache(None)).solve(Board(5), 1, stopped) is None
+
+
+def test_persistent_cache(tmp_path, small_board):
+    """Test that solved positions are reloaded under any symmetry"""
+    path = tmp_path / "endgame.json"
+    first = EndgameSolver(cache=SolverCache(path)).solve(small_board, 1)
+    assert path.exists()
+
+    # The mirror image is answered from disk / 镜像局面从磁盘直接作答
+    mirrored = make_board(5, [(2, 2), (0, 3), (4, 4)], [(1, 3), (3, 1), (2, 0)])
+    solver = EndgameSolver(cache=SolverCache(path))
+    solution = solver.solve(mirrored, 1)
+    assert solver.info.nodes == 0
+    assert solution.result == first.result
+    assert solution.move == (first.move[0], 4 - first.move[1])
+
+
+def test_engine_uses_solver(tmp_path, small_board):
+    """Test that the engine plays proven endgames and respects the difficulty"""
+    board = small_board
+    ai = AI("medium")
+    ai.solver = EndgameSolver(cache=SolverCache(tmp_path / "endgame.json"))
+    move, info = ai.get_move(board, 1, return_info=True, deadline=SearchDeadline())
+    assert info.strategy == "solver"
+    assert info.score == DRAW
+    assert board.is_valid_move(*move)
+
+    _, info = AI("easy").get_move(board, 1, return_info=True)
+    assert info.strategy == "minmax"
@@ -0,0 +1,67 @@
+"""
+Spectator chat batching and history unit tests
+观战聊天批量发送和历史记录单元测试
+"""
+
+import asyncio
+
+import pytest
+from gomoku_world.network.chat import ChatManager
+from gomoku_world.network.protocol import decode_frame
+
+
+@pytest.mark.asyncio
+async def test_messages_within_interval_share_one_frame():
+    """Test that a burst is sent as one batch and history stays bounded"""
+    frames = []
+    chat = ChatManager(lambda game_id, frame: frames.append((game_id, frame)),
+                       history_size=3, batch_interval=0.02)
+
+    for i in range(5):
+        chat.post("g1", "amy", f"line {i}")
+    assert frames == []
+
+    await asyncio.sleep(0.05)
+    assert len(frames) == 1
+    batch = decode_frame(frames[0][1])
+    assert batch['event'] == 'chat_batch'
+    assert [m['message'] for m in batch['data']['messages']] == [f"line {i}" for i in range(5)]
+    assert [m['message'] for m in chat.history("g1")] == ["line 2", "line 3", "line 4"]
+
+    chat.post("g1", "bob", "x" * 10000)
+    chat.close("g1")
+    assert len(frames) == 2
+    assert len(decode_frame(frames[1][1])['data']['messages'][0]['message']) == 500
+    assert chat.history("g1") == []
+
+
+@pytest.mark.asyncio
+async def test_late_joiner_gets_history_and_batches(served, connected_client):
+    """Test chat history on spectate and batched delivery to clients"""
+    server, _ = served
+    server.chat.batch_interval = 0.02
+
+    for pid in ("a", "b"):
+        await server._handle_login({'id': pid, 'name': pid})
+    game = server._start_game(server.players["a"], server.players["b"])
+
+    early = await connected_client('early')
+    assert await early.spectate_game(game.id)
+    batches = []
+    early.on('chat_batch', batches.append)
+
+    for i in range(3):
+        assert (await early.send_spectator_chat(f"hi {i}"))
+    assert (await early._send_message('spectator_chat', {'id': early.player_id, 'message': ' '}))['status'] == 'error'
+    await asyncio.sleep(0.1)
+
+    assert len(batches) == 1 and len(batches[0]) == 3
+    assert [m['sender'] for m in early.spectator_chat] == ['early'] * 3
+
+    late = await connected_client('late')
+    assert await late.spectate_game(game.id)
+    assert [m['message'] for m in late.spectator_chat] == ["hi 0", "hi 1", "hi 2"]
+    assert 'chat' not in late.spectator_state
+
+    await early.disconnect()
+    await late.disconnect()
@@ -0,0 +1,100 @@
+"""
+Spectator delta feed unit tests
+观战增量推送单元测试
+"""
+
+import pytest
+from gomoku_world.network.server import GameServer, Game
+from gomoku_world.network.client import GameClient
+from gomoku_world.core.codec import PackedMoves
+
+
+@pytest.fixture
+def server_with_game():
+    """Create a server holding one game with three moves"""
+    server = GameServer()
+    game = Game(id="g1", black_player="a", white_player="b", status="playing")
+    for move in ((7, 7), (7, 8), (8, 8)):
+        game.moves.append(*move)
+    server.games["g1"] = game
+    return server
+
+
+@pytest.mark.asyncio
+async def test_snapshot_and_delta(server_with_game):
+    """Test that requests without ``since`` get a snapshot, others a delta"""
+    snapshot = await server_with_game._process_message(
+        {'cmd': 'get_game_state', 'data': {'game_id': 'g1'}})
+    assert snapshot['data']['snapshot'] is True
+    assert snapshot['data']['seq'] == 3
+
+    delta = await server_with_game._process_message(
+        {'cmd': 'get_game_state', 'data': {'game_id': 'g1', 'since': 2}})
+    assert delta['data']['snapshot'] is False
+    assert delta['data']['seq'] == 2
+    assert list(PackedMoves.from_base64(delta['data']['moves'])) == [(8, 8)]
+
+    stale = await server_with_game._process_message(
+        {'cmd': 'get_game_state', 'data': {'game_id': 'g1', 'since': 10}})
+    assert stale['data']['snapshot'] is True
+
+
+def test_delta_size_independent_of_game_length(server_with_game):
+    """Test that a one-move delta does not grow with the move log"""
+    game = server_with_game.games["g1"]
+    short = len(server_with_game._game_delta(game, 2)['moves'])
+    for i in range(100):
+        game.moves.append(i // 15, i % 15)
+    long = len(server_with_game._game_delta(game, len(game.moves) - 1)['moves'])
+    assert short == long
+
+
+def test_client_applies_deltas_in_order(server_with_game):
+    """Test client-side delta application, overlap trimming and colors"""
+    game = server_with_game.games["g1"]
+    client = GameClient()
+    client.spectating_game_id = "g1"
+    states = []
+    client.on('game_state', states.append)
+
+    client._apply_game_update(server_with_game._game_snapshot(game))
+    assert client.spectator_seq == 3
+
+    game.moves.append(9, 9)
+    client._apply_game_update(server_with_game._game_delta(game, 2))
+    assert client.spectator_seq == 4
+    assert states[-1]['moves'][-1] == {'x': 9, 'y': 9, 'color': 2}
+    assert len(states[-1]['moves']) == 4
+    assert states[-1]['winner'] is None
+
+    # The game-ending delta carries the result / 结束对局的增量携带结果
+    game.moves.append(10, 10)
+    game.status, game.winner = "finished", 2
+    client._apply_game_update(server_with_game._game_delta(game, 4))
+    assert states[-1]['status'] == "finished"
+    assert states[-1]['winner'] == 2
+
+
+@pytest.mark.asyncio
+async def test_client_resyncs_on_gap(server_with_game):
+    """Test that a sequence gap triggers a resync instead of applying"""
+    game = server_with_game.games["g1"]
+    client = GameClient()
+    client.spectating_game_id = "g1"
+    requests = []
+
+    async def fake_send(cmd, data):
+        requests.append((cmd, data))
+        return await server_with_game._process_message({'cmd': cmd, 'data': data})
+
+    client._send_message = fake_send
+    client._apply_game_update(server_with_game._game_snapshot(game))
+
+    game.moves.append(9, 9)
+    game.moves.append(10, 10)
+    client._apply_game_update(server_with_game._game_delta(game, 4))
+    assert client.spectator_seq == 3
+
+    await client.resync_task
+    assert requests == [('get_game_state', {'game_id': 'g1', 'since': 3})]
+    assert client.spectator_seq == 5
@@ -0,0 +1,148 @@
+"""
+AI time management unit tests
+AI时间管理单元测试
+"""
+
+import threading
+import time
+
+import pytest
+from gomoku_world.benchmark import BenchmarkPosition, parse_engine, play_game
+from gomoku_world.core.ai import (
+    AI, GameClock, MCTSStrategy, MinMaxStrategy, SearchDeadline, allocate_time, forced_move
+)
+from gomoku_world.core.board import Board
+
+
+@pytest.fixture
+def board():
+    """Open middle-game position without threats"""
+    board = Board(15)
+    for i, (row, col) in enumerate([(7, 7), (7, 8), (8, 8), (6, 6)]):
+        board.place_piece(row, col, 1 if i % 2 == 0 else 2)
+    return board
+
+
+def test_parse_clock():
+    """Test time control specs"""
+    assert GameClock.parse("60+0.5") == GameClock(60.0, increment=0.5)
+    assert GameClock.parse("300") == GameClock(300.0)
+    assert GameClock.parse("30+5x3") == GameClock(30.0, byoyomi=5.0, periods=3)
+    with pytest.raises(ValueError):
+        GameClock.parse("five minutes")
+
+
+def test_fischer_clock():
+    """Test increments and flag fall"""
+    clock = GameClock(10.0, increment=2.0)
+    assert clock.consume(3.0)
+    assert clock.remaining == pytest.approx(9.0)
+    assert clock.moves_played == 1
+    assert not clock.consume(9.5)
+    assert clock.flagged
+
+
+def test_byoyomi_clock():
+    """Test that byoyomi starts after the main time and loses overrun periods"""
+    clock = GameClock(5.0, byoyomi=2.0, periods=2)
+    assert clock.consume(6.0)
+    assert clock.in_byoyomi and clock.periods == 2
+    assert clock.consume(1.5)
+    assert clock.periods == 2
+    assert clock.consume(2.5)
+    assert clock.periods == 1
+    assert not clock.consume(3.0)
+
+
+def test_allocate_time():
+    """Test soft and hard budgets"""
+    budget = allocate_time(GameClock(60.0, increment=1.0), overhead=0.0)
+    assert budget.soft == pytest.approx(60 / 30 + 0.75)
+    assert budget.hard == pytest.approx(3 * budget.soft)
+
+    # Never more than half of a short clock / 短棋钟最多用一半
+    short = allocate_time(GameClock(1.0, moves_to_go=1), overhead=0.0)
+    assert short.hard == pytest.approx(0.5) and short.soft <= short.hard
+
+    byoyomi = allocate_time(GameClock(0.0, byoyomi=4.0, periods=1), overhead=0.5)
+    assert byoyomi.hard == pytest.approx(3.5)
+    assert byoyomi.soft == pytest.approx(2.0)
+
+    assert allocate_time(GameClock(0.0), overhead=0.0).hard > 0
+
+
+def test_deadline_extend_and_stop():
+    """Test extensions up to the hard budget and the stop flag"""
+    deadline = SearchDeadline(soft=1.0, hard=1.8)
+    deadline.extend(1.5)
+    assert deadline.soft == pytest.approx(1.5)
+    deadline.extend(1.5)
+    assert deadline.soft == pytest.approx(1.8)
+    assert not deadline.expired()
+    deadline.stop()
+    assert deadline.stopped and deadline.expired() and deadline.soft_expired()
+
+
+def test_forced_move():
+    """Test wins, single blocks and open positions"""
+    board = Board(15)
+    for col in range(4):
+        board.place_piece(7, col, 1)
+    assert forced_move(board, 1) == (7, 4)
+    assert forced_move(board, 2) == (7, 4)
+    board.place_piece(7, 4, 2)
+    assert forced_move(board, 1) is None
+
+
+def test_minmax_forced_move_skips_search(board):
+    """Test that a timed MinMax answers a forced move without searching"""
+    # A four against the edge has one blocking cell / 靠边的四只有一个堵点
+    for col in range(11, 15):
+        board.place_piece(0, col, 2)
+    strategy = MinMaxStrategy()
+    assert strategy.get_move(board, 1, 3, deadline=SearchDeadline(5, 5)) == (0, 10)
+    assert strategy.info.nodes == 0
+
+
+def test_minmax_honours_hard_deadline(board):
+    """Test that a deep MinMax search returns within the hard budget"""
+    strategy = MinMaxStrategy()
+    start = time.perf_counter()
+    move = strategy.get_move(board, 1, 6, deadline=SearchDeadline(soft=0.3, hard=0.3))
+    assert time.perf_counter() - start < 1.0
+    assert board.is_valid_move(*move)
+    assert 1 <= strategy.info.depth < 6
+    assert len(board.get_empty_cells()) == 225 - 4
+
+
+def test_mcts_runs_to_the_clock(board):
+    """Test that a timed MCTS ignores its simulation limit"""
+    strategy = MCTSStrategy(simulation_limit=1)
+    start = time.perf_counter()
+    move = strategy.get_move(board, 1, deadline=SearchDeadline(soft=0.3, hard=0.6))
+    assert 0.3 <= time.perf_counter() - start < 1.5
+    assert board.is_valid_move(*move)
+    assert strategy.info.nodes > 1
+
+
+def test_ai_stop_from_another_thread(board):
+    """Test the shared stop flag"""
+    ai = AI("medium")
+    ai.depth = 6
+    deadline = SearchDeadline()
+    threading.Timer(0.3, ai.stop).start()
+    start = time.perf_counter()
+    move, info = ai.get_move(board, 1, return_info=True, deadline=deadline)
+    assert time.perf_counter() - start < 2.0
+    assert deadline.stopped
+    assert board.is_valid_move(*move)
+    assert ai.deadline is None
+
+
+def test_timed_tournament_game():
+    """Test a game played on clocks"""
+    opening = BenchmarkPosition("small", "E5 E4", size=9)
+    record = play_game(parse_engine("minmax:depth=3"), parse_engine("priority"), opening,
+                       time_control="2+0.1")
+    assert record.reason in ("five", "full")
+    assert record.stats["minmax:depth=3"]['time'] < 2 + 0.1 * record.stats["minmax:depth=3"]['moves']
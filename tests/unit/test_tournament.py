@@ -0,0 +1,120 @@
+"""
+Self-play tournament unit tests
+自对弈锦标赛单元测试
+"""
+
+import pytest
+from gomoku_world.benchmark import (
+    GAUNTLET, ROUND_ROBIN, BenchmarkPosition, EngineConfig, GameRecord, elo_estimate,
+    parse_engine, play_game, run_tournament, schedule, standings
+)
+from gomoku_world.utils.save_manager import save_manager
+
+
+@pytest.fixture
+def openings():
+    """Small-board openings keeping games short"""
+    return [
+        BenchmarkPosition("small_center", "E5 E4", size=9),
+        BenchmarkPosition("small_corner", "C3 D4 C4", size=9),
+    ]
+
+
+@pytest.fixture
+def engines():
+    """Fast engines"""
+    return [parse_engine("priority"), parse_engine("minmax:depth=1")]
+
+
+def test_parse_engine():
+    """Test engine specs"""
+    assert parse_engine("minmax:depth=3") == EngineConfig("minmax:depth=3", "minmax", depth=3)
+    assert parse_engine("mcts:simulations=20").simulations == 20
+    assert parse_engine("engine:difficulty=hard").difficulty == "hard"
+    with pytest.raises(ValueError):
+        parse_engine("alphazero")
+    with pytest.raises(ValueError):
+        parse_engine("minmax:width=3")
+
+
+def test_schedule_swaps_colours(engines, openings):
+    """Test that every opening is played with both colours"""
+    third = parse_engine("mcts:simulations=5")
+    games = schedule(engines + [third], openings, ROUND_ROBIN)
+    assert len(games) == 3 * len(openings) * 2
+    pairs = {(black.name, white.name, opening.name) for black, white, opening in games}
+    assert ("priority", "minmax:depth=1", "small_center") in pairs
+    assert ("minmax:depth=1", "priority", "small_center") in pairs
+
+    gauntlet = schedule(engines + [third], openings, GAUNTLET, rounds=2)
+    assert len(gauntlet) == 2 * 2 * len(openings) * 2
+    assert all("priority" in (black.name, white.name) for black, white, _ in gauntlet)
+    with pytest.raises(ValueError):
+        schedule(engines[:1], openings)
+
+
+def test_elo_estimate():
+    """Test Elo from scores"""
+    assert elo_estimate(5, 0, 5) == (0.0, pytest.approx(elo_estimate(5, 0, 5)[1]))
+    elo, margin = elo_estimate(3, 0, 1)
+    assert elo == pytest.approx(190.8, abs=0.1)
+    assert margin > 0
+    assert elo_estimate(10, 0, 0)[0] == pytest.approx(1199.8, abs=0.1)
+    # A sweep still has a margin, narrowing with more games / 全胜也有误差范围，随对局数缩小
+    assert elo_estimate(100, 0, 0)[1] < elo_estimate(10, 0, 0)[1]
+    assert elo_estimate(100, 0, 0)[1] > 0
+    assert elo_estimate(0, 0, 10)[1] == pytest.approx(elo_estimate(10, 0, 0)[1])
+    assert elo_estimate(0, 0, 0) == (0.0, 0.0)
+
+
+def test_play_game(engines, openings):
+    """Test a single game record"""
+    record = play_game(engines[0], engines[1], openings[1])
+    assert record.reason in ("five", "full")
+    assert record.moves and all('time_ms' in move for move in record.moves)
+    # White moves first after a three-stone opening
+    assert record.stats["minmax:depth=1"]['moves'] >= record.stats["priority"]['moves']
+    assert record.stats["minmax:depth=1"]['nodes'] > 0
+
+
+def test_standings():
+    """Test scoring of game records"""
+    games = [
+        GameRecord("a", "b", "o", "", winner=1, stats={'a': {'moves': 2, 'time': 1.0, 'nodes': 10},
+                                                         'b': {'moves': 2, 'time': 3.0, 'nodes': 0}}),
+        GameRecord("b", "a", "o", "", winner=None),
+    ]
+    table = {standing.name: standing for standing in standings(games)}
+    assert (table['a'].wins, table['a'].draws, table['a'].losses) == (1, 1, 0)
+    assert table['a'].score == 0.75
+    assert table['b'].score == 0.25
+    assert table['a'].time_per_move == 0.5 and table['a'].nodes_per_move == 5
+    assert table['a'].elo[0] == pytest.approx(-table['b'].elo[0])
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_tournament(engines, openings, workers):
+    """Test a tournament in this process and on worker processes"""
+    result = run_tournament(engines, openings, rounds=1, workers=workers)
+    assert len(result.games) == 4
+    assert sum(standing.games for standing in result.standings) == 8
+    assert sum(standing.score * standing.games for standing in result.standings) == 4
+    assert "priority" in result.format()
+    assert len(result.to_dict()['games']) == 4
+
+    with pytest.raises(ValueError):
+        run_tournament([engines[0], engines[0]], openings)
+
+
+def test_run_tournament_saves_games(engines, openings, tmp_path, monkeypatch):
+    """Test that games are stored with the save manager"""
+    monkeypatch.setattr(save_manager, 'save_dir', tmp_path)
+    result = run_tournament(engines, openings[:1], workers=1, save=True)
+    saves = sorted(tmp_path.glob("tournament_*.json"))
+    assert len(saves) == len(result.games)
+
+    loaded = save_manager.load_game(saves[0].stem)
+    assert loaded.game_mode == "tournament"
+    assert loaded.metadata['opening'] == "small_center"
+    assert (loaded.moves[0]['x'], loaded.moves[0]['y']) == (4, 4)
+    assert len(loaded.moves) == 2 + len(result.games[0].moves)
@@ -0,0 +1,139 @@
+"""
+Request tracing unit tests
+请求追踪单元测试
+"""
+
+import asyncio
+import json
+
+import pytest
+from gomoku_world.core.ai.engine import AI
+from gomoku_world.core.board import Board
+from gomoku_world.network.client import GameClient
+from gomoku_world.network.server import GameServer
+from gomoku_world.utils.monitoring import Tracer, current_span, tracer as global_tracer
+
+
+@pytest.fixture
+def traced():
+    """Record every trace of the global tracer during a test"""
+    rate = global_tracer.sample_rate
+    global_tracer.sample_rate = 1.0
+    global_tracer.clear()
+    yield global_tracer
+    global_tracer.sample_rate = rate
+    global_tracer.clear()
+
+
+def test_nested_spans_share_trace():
+    """Test parent links and context restoration"""
+    tracer = Tracer(sample_rate=1.0)
+    with tracer.span("outer", kind="test") as outer:
+        with tracer.span("inner") as inner:
+            assert current_span() is inner
+        assert current_span() is outer
+    assert current_span() is None
+
+    inner_span, outer_span = tracer.spans()
+    assert inner_span.trace_id == outer_span.trace_id
+    assert inner_span.parent_id == outer_span.span_id
+    assert outer_span.parent_id is None
+    assert outer_span.attributes == {'kind': 'test'}
+    assert outer_span.duration >= inner_span.duration
+
+
+def test_head_sampling_covers_whole_trace():
+    """Test that an unsampled trace records none of its spans"""
+    tracer = Tracer(sample_rate=0.0)
+    with tracer.span("outer"):
+        assert tracer.inject() is None
+        with tracer.span("inner") as inner:
+            inner.set(ignored=True)
+    assert tracer.spans() == []
+
+
+def test_error_status_and_ring_buffer():
+    """Test that failures are marked and the buffer stays bounded"""
+    tracer = Tracer(sample_rate=1.0, buffer_size=2)
+    with pytest.raises(ValueError):
+        with tracer.span("failing"):
+            raise ValueError("bad")
+    assert tracer.spans()[0].status == "error"
+    assert "ValueError: bad" in tracer.spans()[0].attributes['error']
+
+    for i in range(3):
+        with tracer.span(f"span{i}"):
+            pass
+    assert [span.name for span in tracer.spans()] == ["span1", "span2"]
+
+
+def test_inject_extract_and_export(tmp_path):
+    """Test context propagation and the JSON-lines exporter"""
+    tracer = Tracer(sample_rate=1.0)
+    with tracer.span("client") as client_span:
+        carrier = tracer.inject()
+    assert carrier == {'trace_id': client_span.trace_id, 'span_id': client_span.span_id}
+    assert tracer.extract({'trace_id': 5}) is None
+    assert tracer.extract(None) is None
+
+    with tracer.span("server", parent=tracer.extract(carrier)):
+        pass
+
+    path = tmp_path / "traces.jsonl"
+    assert tracer.export(path) == 2
+    assert tracer.spans() == []
+    records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert [record['name'] for record in records] == ["client", "server"]
+    assert records[1]['parent_id'] == records[0]['span_id']
+    assert records[1]['trace_id'] == records[0]['trace_id']
+
+
+def test_ai_move_span(traced):
+    """Test that an AI move is recorded under the current span"""
+    board = Board()
+    board.place_piece(7, 7, 1)
+    with traced.span("turn") as turn:
+        AI("easy").get_move(board, 2)
+
+    ai_span = next(span for span in traced.spans() if span.name == "ai.get_move")
+    assert ai_span.parent_id == turn.span_id
+    assert ai_span.attributes['strategy'] == "minmax"
+    assert ai_span.attributes['nodes'] > 0
+
+
+@pytest.mark.asyncio
+async def test_make_move_round_trip_is_one_trace(traced):
+    """Test that client, server handler and broadcast spans join one trace"""
+    server = GameServer()
+    listener = await asyncio.start_server(server._handle_client, '127.0.0.1', 0)
+    port = listener.sockets[0].getsockname()[1]
+    clients = []
+    try:
+        for name in ("black", "white"):
+            client = GameClient('127.0.0.1', port)
+            assert await client.connect()
+            await client._send_message('login', {'id': client.player_id, 'name': name})
+            clients.append(client)
+        game = server._start_game(server.players[clients[0].player_id],
+                                  server.players[clients[1].player_id])
+        traced.clear()
+
+        response = await clients[0]._send_message('make_move', {
+            'id': clients[0].player_id, 'game_id': game.id, 'move': {'x': 7, 'y': 7}
+        })
+        assert response['status'] == 'ok'
+
+        by_name = {span.name: span for span in traced.spans()}
+        request = by_name['client.make_move']
+        handler = by_name['server.make_move']
+        broadcast = by_name['server.broadcast']
+        assert handler.trace_id == request.trace_id == broadcast.trace_id
+        assert handler.parent_id == request.span_id
+        assert broadcast.parent_id == handler.span_id
+        assert handler.attributes['status'] == 'ok'
+        assert request.duration >= handler.duration
+    finally:
+        for client in clients:
+            await client.disconnect()
+        listener.close()
+        await listener.wait_closed()